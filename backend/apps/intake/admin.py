@@ -3,13 +3,30 @@ Admin configuration for Student Intake submissions.
 """
 
 from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
 from django.db import transaction
 from django.utils import timezone
 from django.utils.html import format_html
 
+from .duplicates import find_duplicates, sync_student_keys
 from .models import StudentIntakeSubmission
 
 
+class IntakeChangeList(ChangeList):
+    """Changelist that checks duplicates for the whole page with one query."""
+
+    def get_results(self, request):
+        super().get_results(request)
+        page = list(self.result_list)
+        for submission, duplicates in zip(page, find_duplicates(page), strict=True):
+            submission._duplicates = duplicates
+
+
+def _duplicates_of(submission):
+    duplicates = getattr(submission, "_duplicates", None)
+    return duplicates if duplicates is not None else submission.check_duplicates()
+
+
 @admin.register(StudentIntakeSubmission)
 class StudentIntakeSubmissionAdmin(admin.ModelAdmin):
     """Admin interface for managing student intake submissions."""
@@ -23,6 +40,7 @@ class StudentIntakeSubmissionAdmin(admin.ModelAdmin):
         "mobile_display",
         "email_display",
         "status",
+        "duplicates_flag",
         "created_at",
         "approved_by",
     ]
@@ -145,10 +163,20 @@ class StudentIntakeSubmissionAdmin(admin.ModelAdmin):
 
     email_display.short_description = "Email"
 
+    def get_changelist(self, request, **kwargs):
+        return IntakeChangeList
+
+    def duplicates_flag(self, obj):
+        """Whether the submission has any duplicates (prefetched per page)."""
+        return not any(_duplicates_of(obj).values())
+
+    duplicates_flag.boolean = True
+    duplicates_flag.short_description = "Unique"
+
     def duplicate_check_display(self, obj):
         """Display duplicate check results."""
         if obj.pk:
-            duplicates = obj.check_duplicates()
+            duplicates = _duplicates_of(obj)
             has_duplicates = any(duplicates.values())
 
             if not has_duplicates:
@@ -194,14 +222,14 @@ class StudentIntakeSubmissionAdmin(admin.ModelAdmin):
         blocked_count = 0
         error_count = 0
 
-        for submission in queryset:
+        submissions = list(queryset)
+        # Check duplicates for every selected submission with one query
+        for submission, duplicates in zip(submissions, find_duplicates(submissions), strict=True):
             if submission.status == "APPROVED":
                 continue
 
             try:
                 with transaction.atomic():
-                    # Check for duplicates
-                    duplicates = submission.check_duplicates()
                     has_duplicates = any(duplicates.values())
 
                     if has_duplicates and not submission.force_approve:
@@ -253,6 +281,7 @@ class StudentIntakeSubmissionAdmin(admin.ModelAdmin):
                             # Note: Documents are not copied to Student model in this phase
                             # Program/Batch/Group are NOT assigned in this phase
                         )
+                        sync_student_keys([student])
 
                         # Link student to submission
                         submission.created_student = student
@@ -0,0 +1,150 @@
+"""
+Batched duplicate detection for intake submissions.
+
+Every submission and student has a row in ``IdentityKey`` for each of its
+identity values (CNIC/B-Form, mobile, email, MDCAT roll number), normalized so
+that formatting differences still match. Checking a page of submissions, or a
+whole intake, is then one indexed query on (kind, value).
+
+Submissions refresh their keys in ``save()``. Students are indexed by the
+code that writes them (the student API and admin, the student import and
+intake approval) through ``sync_student_keys``. Rows written any other way,
+such as ``update()`` or raw SQL, need ``manage.py rebuild_identity_keys``.
+"""
+
+import re
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import IdentityKey, normalize_cnic
+
+KINDS = (IdentityKey.KIND_CNIC, IdentityKey.KIND_MOBILE, IdentityKey.KIND_EMAIL, IdentityKey.KIND_MDCAT)
+
+
+def normalize_identity(kind, value):
+    """Normalize an identity value for matching; empty values normalize to ''."""
+    value = str(value or "").strip()
+    if not value:
+        return ""
+    if kind == IdentityKey.KIND_CNIC:
+        return normalize_cnic(value)
+    if kind == IdentityKey.KIND_MOBILE:
+        return re.sub(r"\D", "", value)
+    if kind == IdentityKey.KIND_EMAIL:
+        return value.lower()
+    return value.upper()
+
+
+def _identities(raw):
+    pairs = ((kind, normalize_identity(kind, value)) for kind, value in raw.items())
+    return {(kind, value) for kind, value in pairs if value}
+
+
+def submission_identities(submission):
+    """(kind, normalized value) pairs of a submission."""
+    raw = {
+        IdentityKey.KIND_CNIC: submission.cnic_or_bform,
+        IdentityKey.KIND_MOBILE: submission.mobile,
+        IdentityKey.KIND_EMAIL: submission.email,
+        IdentityKey.KIND_MDCAT: submission.mdcat_roll_number,
+    }
+    return _identities(raw)
+
+
+def student_identities(student):
+    """(kind, normalized value) pairs of a student (Student records only carry email and phone)."""
+    raw = {IdentityKey.KIND_MOBILE: student.phone, IdentityKey.KIND_EMAIL: student.email}
+    return _identities(raw)
+
+
+def sync_submission_keys(submission):
+    """Replace a saved submission's identity keys."""
+    with transaction.atomic():
+        IdentityKey.objects.filter(submission=submission).delete()
+        IdentityKey.objects.bulk_create(
+            [
+                IdentityKey(kind=kind, value=value, submission=submission)
+                for kind, value in submission_identities(submission)
+            ]
+        )
+
+
+def sync_student_keys(students):
+    """Replace the identity keys of saved ``students`` with one delete and one insert."""
+    students = list(students)
+    if not students:
+        return
+    with transaction.atomic():
+        IdentityKey.objects.filter(student_id__in=[student.pk for student in students]).delete()
+        IdentityKey.objects.bulk_create(
+            [
+                IdentityKey(kind=kind, value=value, student_id=student.pk)
+                for student in students
+                for kind, value in student_identities(student)
+            ]
+        )
+
+
+def rebuild_identity_keys(batch_size=1000):
+    """Re-index every submission and student; returns the number of keys written."""
+    from sims_backend.students.models import Student
+
+    from .models import StudentIntakeSubmission
+
+    keys = []
+    for submission in StudentIntakeSubmission.objects.only(
+        "cnic_or_bform", "mobile", "email", "mdcat_roll_number"
+    ).iterator(chunk_size=batch_size):
+        keys.extend(
+            IdentityKey(kind=k, value=v, submission_id=submission.pk) for k, v in submission_identities(submission)
+        )
+    for student in Student.objects.only("phone", "email").iterator(chunk_size=batch_size):
+        keys.extend(IdentityKey(kind=k, value=v, student_id=student.pk) for k, v in student_identities(student))
+    with transaction.atomic():
+        IdentityKey.objects.all().delete()
+        IdentityKey.objects.bulk_create(keys, batch_size=batch_size)
+    return len(keys)
+
+
+def find_duplicates(submissions):
+    """
+    Duplicate report for each of ``submissions``, with one query in total.
+
+    Returns a list aligned with ``submissions``. Each item maps 'cnic',
+    'mobile', 'email' and 'mdcat' to the matching submission IDs, followed by
+    ``STUDENT-<id>`` for matching students. A submission never matches itself
+    or the student created from it.
+    """
+    submissions = list(submissions)
+    identities = [submission_identities(submission) for submission in submissions]
+    wanted = {}
+    for pairs in identities:
+        for kind, value in pairs:
+            wanted.setdefault(kind, set()).add(value)
+
+    matches = {}
+    if wanted:
+        condition = Q()
+        for kind, values in wanted.items():
+            condition |= Q(kind=kind, value__in=values)
+        rows = (
+            IdentityKey.objects.filter(condition)
+            .order_by("submission__submission_id", "student_id")
+            .values_list("kind", "value", "submission_id", "submission__submission_id", "student_id")
+        )
+        for kind, value, submission_pk, submission_ref, student_pk in rows:
+            matches.setdefault((kind, value), []).append((submission_pk, submission_ref, student_pk))
+
+    reports = []
+    for submission, pairs in zip(submissions, identities, strict=True):
+        report = {kind: [] for kind in KINDS}
+        for kind, value in pairs:
+            found = matches.get((kind, value), [])
+            report[kind] = [ref for pk, ref, _ in found if pk is not None and pk != submission.pk] + [
+                f"STUDENT-{student_pk}"
+                for _, _, student_pk in found
+                if student_pk is not None and student_pk != submission.created_student_id
+            ]
+        reports.append(report)
+    return reports
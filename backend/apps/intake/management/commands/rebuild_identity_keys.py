@@ -0,0 +1,21 @@
+"""
+Management command to rebuild the intake duplicate-detection index.
+
+Run it after loading submissions or students in bulk (``bulk_create``,
+``update()`` or raw SQL), which bypasses the per-save index maintenance.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.intake.duplicates import rebuild_identity_keys
+
+
+class Command(BaseCommand):
+    help = "Rebuild IdentityKey rows for every intake submission and student."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows read and written per batch")
+
+    def handle(self, *args, **options):
+        count = rebuild_identity_keys(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} identity keys."))
@@ -0,0 +1,114 @@
+# Generated by Django 5.1.4 on 2026-10-19 05:19
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Normalization as of this migration; kept inline so later changes to
+# apps.intake.duplicates cannot alter the backfill
+def normalize(kind, value):
+    value = str(value or "").strip()
+    if not value:
+        return ""
+    if kind == "cnic":
+        return re.sub(r"[-\s]", "", value)
+    if kind == "mobile":
+        return re.sub(r"\D", "", value)
+    if kind == "email":
+        return value.lower()
+    return value.upper()
+
+
+def identities(raw):
+    pairs = ((kind, normalize(kind, value)) for kind, value in raw.items())
+    return {(kind, value) for kind, value in pairs if value}
+
+
+def backfill_identity_keys(apps, schema_editor):
+    IdentityKey = apps.get_model("intake", "IdentityKey")
+    StudentIntakeSubmission = apps.get_model("intake", "StudentIntakeSubmission")
+    Student = apps.get_model("students", "Student")
+    keys = [
+        IdentityKey(kind=kind, value=value, submission_id=submission.pk)
+        for submission in StudentIntakeSubmission.objects.iterator()
+        for kind, value in identities(
+            {
+                "cnic": submission.cnic_or_bform,
+                "mobile": submission.mobile,
+                "email": submission.email,
+                "mdcat": submission.mdcat_roll_number,
+            }
+        )
+    ]
+    keys += [
+        IdentityKey(kind=kind, value=value, student_id=student.pk)
+        for student in Student.objects.iterator()
+        for kind, value in identities({"mobile": student.phone, "email": student.email})
+    ]
+    IdentityKey.objects.bulk_create(keys, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("intake", "0003_rename_student_int_cnic_or_12345_idx_student_int_cnic_or_09bf9f_idx_and_more"),
+        ("students", "0007_importjob_progress"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdentityKey",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("cnic", "CNIC/B-Form"),
+                            ("mobile", "Mobile"),
+                            ("email", "Email"),
+                            ("mdcat", "MDCAT Roll Number"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("value", models.CharField(help_text="Normalized value", max_length=254)),
+                (
+                    "student",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="identity_keys",
+                        to="students.student",
+                    ),
+                ),
+                (
+                    "submission",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="identity_keys",
+                        to="intake.studentintakesubmission",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "intake_identity_keys",
+                "indexes": [models.Index(fields=["kind", "value"], name="intake_iden_kind_221993_idx")],
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            models.Q(("student__isnull", True), ("submission__isnull", False)),
+                            models.Q(("student__isnull", False), ("submission__isnull", True)),
+                            _connector="OR",
+                        ),
+                        name="identity_key_single_owner",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_identity_keys, migrations.RunPython.noop),
+    ]
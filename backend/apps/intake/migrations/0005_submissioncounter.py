@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-19 05:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("intake", "0004_identitykey"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubmissionCounter",
+            fields=[
+                ("day", models.DateField(primary_key=True, serialize=False)),
+                ("last_number", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "intake_submission_counters",
+            },
+        ),
+    ]
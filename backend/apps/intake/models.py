@@ -7,7 +7,8 @@ import re
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.validators import FileExtensionValidator, MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
 from django.utils import timezone
 
 User = get_user_model()
@@ -31,6 +32,49 @@ def intake_upload_path(instance, filename):
     return f"intake/{identifier}/{filename}"
 
 
+class SubmissionCounter(models.Model):
+    """Last submission number issued on a day, so IDs are allocated without scanning submissions."""
+
+    day = models.DateField(primary_key=True)
+    last_number = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "intake_submission_counters"
+
+    def __str__(self):
+        return f"{self.day}: {self.last_number}"
+
+    @classmethod
+    def next_number(cls, day):
+        """Atomically take the next submission number for ``day``.
+
+        The increment and read-back run in their own short transaction, so
+        the counter row is locked only for that long when this is called
+        outside a transaction (as ``StudentIntakeSubmission.save`` does).
+        Numbers are not returned if the caller later fails, so a day's
+        numbering may have gaps. A day's counter starts from the highest
+        number already issued that day.
+        """
+        with transaction.atomic():
+            cls.objects.get_or_create(day=day, defaults={"last_number": lambda: _last_issued_number(day)})
+            cls.objects.filter(day=day).update(last_number=F("last_number") + 1)
+            return cls.objects.values_list("last_number", flat=True).get(day=day)
+
+
+def _last_issued_number(day):
+    """Highest STU-YYYYMMDD-NNNN number issued on ``day`` (0 if none)."""
+    last = (
+        StudentIntakeSubmission.objects.filter(submission_id__startswith=f"STU-{day.strftime('%Y%m%d')}-")
+        .order_by("-submission_id")
+        .values_list("submission_id", flat=True)
+        .first()
+    )
+    try:
+        return int(last.split("-")[-1]) if last else 0
+    except ValueError:
+        return 0
+
+
 class StudentIntakeSubmission(models.Model):
     """Represents a student intake form submission awaiting verification."""
 
@@ -231,111 +275,79 @@ class StudentIntakeSubmission(models.Model):
                 raise ValidationError({"guardian_phone_whatsapp": "Guardian WhatsApp number must be 10-15 digits."})
 
     def save(self, *args, **kwargs):
-        """Override save to generate submission_id if not set."""
+        """Override save to generate submission_id if not set.
+
+        The number is taken before the insert transaction opens, so concurrent
+        submissions only wait on the counter increment, not on validation,
+        document uploads or indexing. If the save then fails, the instance
+        keeps its ID for a retry; otherwise the number is skipped.
+        """
         if not self.submission_id:
             # Generate submission_id: STU-YYYYMMDD-XXXX
             today = timezone.now().date()
-            date_str = today.strftime("%Y%m%d")
+            next_num = SubmissionCounter.next_number(today)
+            self.submission_id = f"STU-{today.strftime('%Y%m%d')}-{next_num:04d}"
 
-            # Get the last submission number for today
-            last_submission = (
-                StudentIntakeSubmission.objects.filter(submission_id__startswith=f"STU-{date_str}-")
-                .order_by("-submission_id")
-                .first()
-            )
+        with transaction.atomic():
+            # Normalize CNIC before saving
+            if self.cnic_or_bform:
+                self.cnic_or_bform = normalize_cnic(self.cnic_or_bform)
 
-            if last_submission:
-                # Extract and increment the number
-                try:
-                    last_num = int(last_submission.submission_id.split("-")[-1])
-                    next_num = last_num + 1
-                except (ValueError, IndexError):
-                    next_num = 1
-            else:
-                next_num = 1
+            self.full_clean()
+            super().save(*args, **kwargs)
 
-            self.submission_id = f"STU-{date_str}-{next_num:04d}"
-
-        # Normalize CNIC before saving
-        if self.cnic_or_bform:
-            self.cnic_or_bform = normalize_cnic(self.cnic_or_bform)
+            from .duplicates import sync_submission_keys
 
-        self.full_clean()
-        super().save(*args, **kwargs)
+            sync_submission_keys(self)
 
     def check_duplicates(self):
         """Check for duplicate submissions based on CNIC, Mobile, Email, MDCAT Roll No.
 
         Returns:
             dict: Dictionary with keys 'cnic', 'mobile', 'email', 'mdcat' containing
-                  lists of duplicate submission IDs if found, empty lists otherwise.
+                  lists of duplicate submission IDs (and ``STUDENT-<id>`` for students)
+                  if found, empty lists otherwise.
+
+        Use ``apps.intake.duplicates.find_duplicates`` to check many submissions at once.
         """
-        duplicates = {
-            "cnic": [],
-            "mobile": [],
-            "email": [],
-            "mdcat": [],
-        }
-
-        if not self.cnic_or_bform:
-            return duplicates
-
-        # Check CNIC/B-Form
-        cnic_normalized = normalize_cnic(self.cnic_or_bform)
-        cnic_duplicates = StudentIntakeSubmission.objects.filter(cnic_or_bform=cnic_normalized).exclude(
-            pk=self.pk if self.pk else None
-        )
-        duplicates["cnic"] = [s.submission_id for s in cnic_duplicates]
-
-        # Check Mobile
-        if self.mobile:
-            mobile_duplicates = StudentIntakeSubmission.objects.filter(mobile=self.mobile).exclude(
-                pk=self.pk if self.pk else None
-            )
-            duplicates["mobile"] = [s.submission_id for s in mobile_duplicates]
+        from .duplicates import find_duplicates
 
-        # Check Email
-        if self.email:
-            email_duplicates = StudentIntakeSubmission.objects.filter(email=self.email).exclude(
-                pk=self.pk if self.pk else None
-            )
-            duplicates["email"] = [s.submission_id for s in email_duplicates]
+        return find_duplicates([self])[0]
+
+
+class IdentityKey(models.Model):
+    """Normalized identity value of a submission or student, indexed for duplicate detection."""
+
+    KIND_CNIC = "cnic"
+    KIND_MOBILE = "mobile"
+    KIND_EMAIL = "email"
+    KIND_MDCAT = "mdcat"
+    KIND_CHOICES = [
+        (KIND_CNIC, "CNIC/B-Form"),
+        (KIND_MOBILE, "Mobile"),
+        (KIND_EMAIL, "Email"),
+        (KIND_MDCAT, "MDCAT Roll Number"),
+    ]
 
-        # Check MDCAT Roll Number
-        if self.mdcat_roll_number:
-            mdcat_duplicates = StudentIntakeSubmission.objects.filter(mdcat_roll_number=self.mdcat_roll_number).exclude(
-                pk=self.pk if self.pk else None
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(max_length=254, help_text="Normalized value")
+    submission = models.ForeignKey(
+        StudentIntakeSubmission, on_delete=models.CASCADE, null=True, blank=True, related_name="identity_keys"
+    )
+    student = models.ForeignKey(
+        "students.Student", on_delete=models.CASCADE, null=True, blank=True, related_name="identity_keys"
+    )
+
+    class Meta:
+        db_table = "intake_identity_keys"
+        indexes = [models.Index(fields=["kind", "value"])]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(submission__isnull=False, student__isnull=True)
+                | Q(submission__isnull=True, student__isnull=False),
+                name="identity_key_single_owner",
             )
-            duplicates["mdcat"] = [s.submission_id for s in mdcat_duplicates]
-
-        # Also check against Student model if it exists
-        try:
-            from sims_backend.students.models import Student
-
-            # Check CNIC in Student model
-            student_cnic = Student.objects.filter(cnic_or_bform=cnic_normalized).first()
-            if student_cnic:
-                duplicates["cnic"].append(f"STUDENT-{student_cnic.id}")
-
-            # Check Mobile in Student model
-            if self.mobile:
-                student_mobile = Student.objects.filter(mobile=self.mobile).first()
-                if student_mobile:
-                    duplicates["mobile"].append(f"STUDENT-{student_mobile.id}")
-
-            # Check Email in Student model
-            if self.email:
-                student_email = Student.objects.filter(email=self.email).first()
-                if student_email:
-                    duplicates["email"].append(f"STUDENT-{student_email.id}")
-
-            # Check MDCAT Roll Number in Student model
-            if self.mdcat_roll_number:
-                student_mdcat = Student.objects.filter(mdcat_roll_number=self.mdcat_roll_number).first()
-                if student_mdcat:
-                    duplicates["mdcat"].append(f"STUDENT-{student_mdcat.id}")
-        except ImportError:
-            # Student model doesn't exist yet, skip
-            pass
-
-        return duplicates
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.value}"
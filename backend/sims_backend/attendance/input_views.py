@@ -2,13 +2,12 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import json
+import time
+from datetime import date, datetime
 
 from django.http import HttpResponse
 from django.utils import timezone
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
@@ -22,13 +21,25 @@ from sims_backend.attendance.models import (
     BiometricPunch,
 )
 from sims_backend.attendance.services import (
+    SyncError,
+    apply_attendance_deltas,
     build_roster_for_session,
+    build_sync_snapshot,
     bulk_upsert_attendance_for_session,
+    collect_week_tick_sheets,
     compute_file_fingerprint,
     parse_csv_payload,
     parse_status_value,
+    week_bounds,
 )
-from sims_backend.common_permissions import in_group
+from sims_backend.attendance.tick_sheets import (
+    TickSheet,
+    build_zip,
+    render_combined,
+    render_many,
+    render_tick_sheet,
+)
+from sims_backend.common_permissions import IsAdminOrCoordinator, in_group
 from sims_backend.students.models import Student
 from sims_backend.timetable.models import Session
 
@@ -142,6 +153,43 @@ class LiveSubmitAPIView(APIView):
         return Response(result, status=status.HTTP_200_OK)
 
 
+class SyncDownloadAPIView(APIView):
+    """Download upcoming sessions, rosters and marks as one offline payload."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        try:
+            start = date.fromisoformat(params["start"]) if params.get("start") else None
+            days = int(params.get("days", 7))
+            group_id = int(params["group"]) if params.get("group") else None
+        except ValueError:
+            return _json_error("start must be an ISO date; days and group must be integers")
+
+        snapshot = build_sync_snapshot(
+            user=request.user,
+            start=start,
+            days=days,
+            since_token=params.get("since"),
+            group_id=group_id,
+        )
+        return Response(snapshot)
+
+
+class SyncUploadAPIView(APIView):
+    """Apply batched offline attendance deltas (last-writer-wins on marked_at)."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        try:
+            result = apply_attendance_deltas(user=request.user, deltas=request.data.get("deltas"))
+        except SyncError as exc:
+            return _json_error(str(exc))
+        return Response(result, status=status.HTTP_200_OK)
+
+
 class CSVDryRunAPIView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser]
@@ -177,7 +225,7 @@ class CSVDryRunAPIView(APIView):
             input_type=AttendanceInputJob.TYPE_CSV,
             status=AttendanceInputJob.STATUS_DRAFT,
             original_filename=upload.name,
-            file_fingerprint=compute_file_fingerprint(upload),
+            file_fingerprint=summary.fingerprint,
             summary={
                 "matched": summary.matched,
                 "unknown": summary.unknown,
@@ -261,43 +309,73 @@ class TickSheetTemplateAPIView(APIView):
         except PermissionError as exc:
             return _json_error(str(exc), status.HTTP_403_FORBIDDEN)
 
-        students = Student.objects.filter(group=session.group).order_by("reg_no")
-        response = HttpResponse(content_type="application/pdf")
+        students = Student.objects.filter(group=session.group).order_by("reg_no").values_list("reg_no", "name")
+        sheet = TickSheet(
+            session_id=session.id,
+            faculty_name=session.faculty.get_full_name() if session.faculty else "__________",
+            group_name=session.group.name,
+            students=tuple(students),
+        )
+        response = HttpResponse(render_tick_sheet(sheet), content_type="application/pdf")
         response["Content-Disposition"] = f'attachment; filename="attendance_sheet_{session.id}.pdf"'
+        return response
+
+
+class BulkTickSheetAPIView(APIView):
+    """Tick sheets for every session in a week, as a ZIP of PDFs or one combined PDF."""
+
+    permission_classes = [IsAuthenticated, IsAdminOrCoordinator]
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        try:
+            week = date.fromisoformat(params["week"]) if params.get("week") else timezone.localdate()
+            batch_id = int(params["batch"]) if params.get("batch") else None
+            department_id = int(params["department"]) if params.get("department") else None
+        except ValueError:
+            return _json_error("week must be YYYY-MM-DD; batch and department must be integers")
+        if batch_id is None and department_id is None:
+            return _json_error("batch or department is required")
+        output = params.get("output", "zip")
+        if output not in {"zip", "pdf"}:
+            return _json_error("output must be 'zip' or 'pdf'")
+
+        started = time.perf_counter()
+        sheets = collect_week_tick_sheets(week=week, batch_id=batch_id, department_id=department_id)
+        query_ms = (time.perf_counter() - started) * 1000
+        if not sheets:
+            return _json_error("No sessions found for that week", status.HTTP_404_NOT_FOUND)
+
+        started = time.perf_counter()
+        monday, _next_monday = week_bounds(week)
+        if output == "pdf":
+            # A single canvas is cheaper than rendering separately and merging
+            body = render_combined(sheets)
+            workers = 1
+        else:
+            pdfs, workers = render_many(sheets)
+        render_ms = (time.perf_counter() - started) * 1000
+
+        stats = {
+            "sessions": len(sheets),
+            "workers": workers,
+            "query_ms": round(query_ms, 1),
+            "render_ms": round(render_ms, 1),
+        }
+        if output == "zip":
+            manifest = {
+                "week": monday.isoformat(),
+                "batch": batch_id,
+                "department": department_id,
+                "stats": stats,
+                "files": [{"session_id": s.session_id, "file": s.filename} for s in sheets],
+            }
+            body = build_zip(sheets, pdfs, json.dumps(manifest, indent=2))
 
-        pdf = canvas.Canvas(response, pagesize=letter)
-        width, height = letter
-        y = height - inch
-        pdf.setFont("Helvetica-Bold", 14)
-        pdf.drawString(inch, y, f"Attendance Sheet - Session {session.id}")
-        y -= 0.3 * inch
-        pdf.setFont("Helvetica", 10)
-        faculty_name = session.faculty.get_full_name() if session.faculty else "__________"
-        pdf.drawString(inch, y, f"Date: ____________   Faculty: {faculty_name}")
-        y -= 0.2 * inch
-        pdf.drawString(inch, y, f"Group: {session.group.name}")
-        y -= 0.4 * inch
-
-        pdf.setFont("Helvetica-Bold", 10)
-        pdf.drawString(inch, y, "Reg No")
-        pdf.drawString(inch + 1.5 * inch, y, "Name")
-        pdf.drawString(inch + 4 * inch, y, "Present")
-        pdf.drawString(inch + 5 * inch, y, "Absent")
-        y -= 0.25 * inch
-        pdf.setFont("Helvetica", 10)
-
-        for student in students:
-            if y < inch:
-                pdf.showPage()
-                y = height - inch
-            pdf.drawString(inch, y, student.reg_no)
-            pdf.drawString(inch + 1.5 * inch, y, student.name[:28])
-            pdf.rect(inch + 4 * inch, y - 0.05 * inch, 0.3 * inch, 0.3 * inch)
-            pdf.rect(inch + 5 * inch, y - 0.05 * inch, 0.3 * inch, 0.3 * inch)
-            y -= 0.3 * inch
-
-        pdf.showPage()
-        pdf.save()
+        content_type = "application/pdf" if output == "pdf" else "application/zip"
+        response = HttpResponse(body, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="attendance_sheets_{monday:%Y%m%d}.{output}"'
+        response["X-Render-Stats"] = json.dumps(stats)
         return response
 
 
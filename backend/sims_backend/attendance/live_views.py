@@ -0,0 +1,96 @@
+"""Live attendance dashboard feed (server-sent events)."""
+
+from __future__ import annotations
+
+import time
+
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+
+from sims_backend.attendance.services.live import (
+    LIVE_CHANNEL,
+    get_live_connection,
+    live_snapshot,
+    sse_event,
+)
+from sims_backend.common_permissions import IsAdminOrCoordinator
+
+# Each response is a long-poll: it holds a (sync) worker for at most this long and
+# then closes, and EventSource reconnects after RECONNECT_DELAY_MS with a fresh
+# snapshot, so events published between polls are never lost.
+LONG_POLL_SECONDS = 5
+RECONNECT_DELAY_MS = 5000
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets content negotiation accept ``Accept: text/event-stream``."""
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+def _subscribe():
+    try:
+        pubsub = get_live_connection().pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(LIVE_CHANNEL)
+        return pubsub
+    except Exception:
+        # Without Redis the stream degrades to periodic snapshots
+        return None
+
+
+def live_event_stream(wait_seconds: float | None = None):
+    """Yield a snapshot, then progress events committed in the next ``wait_seconds``.
+
+    The channel is subscribed before the snapshot is read so nothing falls
+    between the two. Without Redis the response ends after the snapshot and
+    the client's reconnects become plain polling.
+    """
+    wait_seconds = LONG_POLL_SECONDS if wait_seconds is None else wait_seconds
+    pubsub = _subscribe()
+    try:
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+        yield sse_event("snapshot", live_snapshot())
+        if pubsub is None:
+            return
+
+        deadline = time.monotonic() + wait_seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                message = pubsub.get_message(timeout=remaining)
+            except Exception:
+                return
+            if message and message.get("type") == "message":
+                data = message["data"]
+                if isinstance(data, bytes):
+                    data = data.decode("utf-8")
+                yield f"event: progress\ndata: {data}\n\n"
+    finally:
+        if pubsub is not None:
+            pubsub.close()
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminOrCoordinator])
+def live_attendance_snapshot(request):
+    """Sessions starting now that are unmarked, plus progress of sessions being marked."""
+    return Response(live_snapshot())
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminOrCoordinator])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+def live_attendance_stream(request):
+    """Server-sent events long-poll of live attendance progress for coordinators."""
+    response = StreamingHttpResponse(live_event_stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Disable proxy buffering so events reach the client immediately
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,67 @@
+"""
+Management command to detach attendance partitions that belong to closed academic periods.
+
+Detached partitions become ordinary tables: dump them with pg_dump and drop them
+once archived. Prints the plan by default; pass --execute to detach.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sims_backend.attendance.partitioning import (
+    ATTENDANCE_TABLE,
+    PUNCH_TABLE,
+    PartitioningError,
+    archivable_attendance_partitions,
+    archivable_punch_partitions,
+    closed_period_cutoff,
+    detach_partition_sql,
+    execute_plan,
+    is_partitioned,
+    list_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = "Detach attendance and biometric punch partitions that only hold closed-period data"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            type=date.fromisoformat,
+            help="Detach punch months ending on or before this date (default: start of earliest open period)",
+        )
+        parser.add_argument("--execute", action="store_true", help="Detach instead of printing the plan")
+
+    def handle(self, *args, **options):
+        try:
+            plan = []
+            if is_partitioned(ATTENDANCE_TABLE):
+                plan += [
+                    (ATTENDANCE_TABLE, partition)
+                    for partition in archivable_attendance_partitions(list_partitions(ATTENDANCE_TABLE))
+                ]
+            if is_partitioned(PUNCH_TABLE):
+                cutoff = options["before"] or closed_period_cutoff()
+                plan += [
+                    (PUNCH_TABLE, partition)
+                    for partition in archivable_punch_partitions(list_partitions(PUNCH_TABLE), cutoff)
+                ]
+            if not plan:
+                self.stdout.write("No partitions are ready for archival.")
+                return
+
+            statements = [detach_partition_sql(table, partition) for table, partition in plan]
+            for statement in statements:
+                self.stdout.write(f"{statement};")
+            if not options["execute"]:
+                self.stdout.write(self.style.WARNING("Dry run: re-run with --execute to detach"))
+                return
+            execute_plan(statements)
+        except PartitioningError as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(self.style.SUCCESS(f"Detached {len(statements)} partitions. Archive them with:"))
+        for _table, partition in plan:
+            self.stdout.write(f"  pg_dump --table={partition.name} --format=custom > {partition.name}.dump")
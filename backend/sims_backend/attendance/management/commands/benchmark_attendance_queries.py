@@ -0,0 +1,87 @@
+"""
+Management command to time the attendance dashboard queries.
+
+Run it before and after partitioning/BRIN changes: save the first run with
+--json and pass it as --baseline to the second to see the difference.
+"""
+
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from sims_backend.attendance.models import Attendance, BiometricPunch
+from sims_backend.timetable.models import Session
+
+
+def dashboard_queries(days: int) -> dict:
+    """The range queries the admin and coordinator dashboards run, as querysets."""
+    now = timezone.now()
+    since = now - timedelta(days=days)
+    recent = Attendance.objects.filter(marked_at__gte=since)
+    return {
+        "attendance_by_status": recent.values("status").annotate(total=Count("id")).order_by(),
+        "attendance_latest_page": recent.order_by("-marked_at").values_list("id", flat=True)[:50],
+        "sessions_missing_attendance": Session.objects.filter(created_at__gte=since)
+        .exclude(id__in=recent.values("session_id"))
+        .values_list("id", flat=True),
+        "punches_last_day": BiometricPunch.objects.filter(punched_at__gte=now - timedelta(days=1))
+        .values("student_id")
+        .annotate(total=Count("id"))
+        .order_by(),
+    }
+
+
+class Command(BaseCommand):
+    help = "Time the attendance dashboard queries (median and p95 over several runs)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Runs per query")
+        parser.add_argument("--days", type=int, default=7, help="Dashboard window in days")
+        parser.add_argument("--json", dest="json_path", help="Write results to this file")
+        parser.add_argument("--baseline", help="Compare against results saved with --json")
+        parser.add_argument("--explain", action="store_true", help="Print each query plan")
+
+    def handle(self, *args, **options):
+        repeat = max(1, options["repeat"])
+        baseline = {}
+        if options["baseline"]:
+            with open(options["baseline"]) as fh:
+                baseline = json.load(fh)["queries"]
+
+        results = {}
+        for name, queryset in dashboard_queries(options["days"]).items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            results[name] = {
+                "median_ms": round(statistics.median(timings), 3),
+                "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+                "rows": len(list(queryset.all())),
+            }
+
+            line = f"{name:<30} median {results[name]['median_ms']:>9.3f} ms   p95 {results[name]['p95_ms']:>9.3f} ms"
+            if name in baseline and results[name]["median_ms"]:
+                line += f"   {baseline[name]['median_ms'] / results[name]['median_ms']:.2f}x vs baseline"
+            self.stdout.write(line)
+            if options["explain"]:
+                self.stdout.write(queryset.explain())
+
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "attendance_rows": Attendance.objects.count(),
+            "punch_rows": BiometricPunch.objects.count(),
+            "repeat": repeat,
+            "queries": results,
+        }
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Saved results to {options['json_path']}"))
@@ -0,0 +1,80 @@
+"""
+Management command to move attendance storage onto PostgreSQL declarative partitions.
+
+Prints the SQL plan by default; pass --execute to run it in one transaction.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sims_backend.attendance.partitioning import (
+    ATTENDANCE_TABLE,
+    PUNCH_TABLE,
+    PartitioningError,
+    attendance_conversion_plan,
+    attendance_seal_plan,
+    execute_plan,
+    is_partitioned,
+    list_partitions,
+    punch_conversion_plan,
+    punch_extension_plan,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Partition attendance storage: 'convert' existing tables, 'extend' monthly punch partitions, "
+        "'seal' the open attendance partition when a period closes, or show 'status'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["status", "convert", "extend", "seal"])
+        parser.add_argument(
+            "--table",
+            choices=["attendance", "punches", "all"],
+            default="all",
+            help="Table to convert (convert only)",
+        )
+        parser.add_argument("--months-ahead", type=int, default=3, help="Monthly punch partitions to pre-create")
+        parser.add_argument("--execute", action="store_true", help="Run the plan instead of printing it")
+
+    def handle(self, *args, **options):
+        try:
+            if options["action"] == "status":
+                self._status()
+                return
+            statements = self._plan(options)
+            if not statements:
+                self.stdout.write("Nothing to do.")
+                return
+            for statement in statements:
+                self.stdout.write(f"{statement};")
+            if options["execute"]:
+                execute_plan(statements)
+                self.stdout.write(self.style.SUCCESS(f"Executed {len(statements)} statements"))
+            else:
+                self.stdout.write(self.style.WARNING("Dry run: re-run with --execute to apply"))
+        except PartitioningError as exc:
+            raise CommandError(str(exc)) from exc
+
+    def _plan(self, options) -> list[str]:
+        action = options["action"]
+        if action == "seal":
+            return attendance_seal_plan()
+        if action == "extend":
+            return punch_extension_plan(options["months_ahead"])
+
+        statements = []
+        if options["table"] in ("attendance", "all") and not is_partitioned(ATTENDANCE_TABLE):
+            statements += attendance_conversion_plan()
+        if options["table"] in ("punches", "all") and not is_partitioned(PUNCH_TABLE):
+            statements += punch_conversion_plan(options["months_ahead"])
+        return statements
+
+    def _status(self):
+        for table in (ATTENDANCE_TABLE, PUNCH_TABLE):
+            if not is_partitioned(table):
+                self.stdout.write(f"{table}: not partitioned")
+                continue
+            self.stdout.write(f"{table}:")
+            for partition in list_partitions(table):
+                self.stdout.write(f"  {partition.name}  {partition.bound_sql()}")
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-19 09:00
+
+from django.db import migrations
+
+# BRIN indexes are PostgreSQL-only. They stay tiny (a few pages per million rows) and
+# suit append-mostly time columns, which is what dashboard range filters hit.
+BRIN_INDEXES = [
+    ("attendance_marked_at_brin", "attendance_attendance", "marked_at"),
+    ("attendance_punched_at_brin", "attendance_biometricpunch", "punched_at"),
+]
+
+
+def create_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, table, column in BRIN_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING brin ({column}) WITH (pages_per_range = 32)"
+        )
+
+
+def drop_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _table, _column in BRIN_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("attendance", "0002_biometricdevice_attendanceinputjob_biometricpunch"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+    ]
@@ -0,0 +1,329 @@
+"""PostgreSQL declarative partitioning for attendance storage.
+
+``attendance_attendance`` is range-partitioned on ``session_id``. The
+(session, student) unique key must contain the partition key, and session ids
+grow with the calendar, so each partition holds the marks for one stretch of
+sessions. The open-ended tail partition is sealed when an academic period
+closes, and sealed partitions are detached once every session in them belongs
+to a closed period.
+
+``attendance_biometricpunch`` is append-only and is partitioned by month on
+``punched_at``, with a default partition catching anything out of range.
+
+Planning functions return SQL statements so management commands can print a
+plan before running it. Anything that reads the catalog requires PostgreSQL.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from sims_backend.academics.models import AcademicPeriod
+from sims_backend.attendance.models import Attendance, BiometricPunch
+from sims_backend.timetable.models import Session
+
+ATTENDANCE_TABLE = Attendance._meta.db_table
+PUNCH_TABLE = BiometricPunch._meta.db_table
+PARTITION_KEYS = {
+    ATTENDANCE_TABLE: "session_id",
+    PUNCH_TABLE: "punched_at",
+}
+
+_BOUND_RE = re.compile(r"FROM \((?P<lower>[^)]+)\) TO \((?P<upper>[^)]+)\)")
+_MONTH_RE = re.compile(r"_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+
+class PartitioningError(Exception):
+    """Raised when a partitioning operation cannot be planned."""
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    lower: str | None = None  # SQL literal; None means MINVALUE
+    upper: str | None = None  # SQL literal; None means MAXVALUE
+    is_default: bool = False
+
+    def bound_sql(self) -> str:
+        if self.is_default:
+            return "DEFAULT"
+        lower = "MINVALUE" if self.lower is None else self.lower
+        upper = "MAXVALUE" if self.upper is None else self.upper
+        return f"FOR VALUES FROM ({lower}) TO ({upper})"
+
+
+def parse_bound(name: str, expression: str) -> Partition:
+    """Build a Partition from ``pg_get_expr(relpartbound)`` output."""
+    if expression.strip() == "DEFAULT":
+        return Partition(name, is_default=True)
+    match = _BOUND_RE.search(expression)
+    if match is None:
+        raise PartitioningError(f"Unrecognised bound for {name}: {expression}")
+    lower, upper = match.group("lower"), match.group("upper")
+    return Partition(
+        name,
+        lower=None if lower == "MINVALUE" else lower,
+        upper=None if upper == "MAXVALUE" else upper,
+    )
+
+
+def int_bound(literal: str | None) -> int | None:
+    return None if literal is None else int(literal.strip("'"))
+
+
+def create_partition_sql(table: str, partition: Partition) -> str:
+    return f"CREATE TABLE {partition.name} PARTITION OF {table} {partition.bound_sql()}"
+
+
+def detach_partition_sql(table: str, partition: Partition) -> str:
+    return f"ALTER TABLE {table} DETACH PARTITION {partition.name}"
+
+
+# Monthly punch partitions
+
+
+def add_months(month: date, count: int) -> date:
+    years, index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def _timestamp_literal(day: date) -> str:
+    return f"'{timezone.make_aware(datetime.combine(day, time.min)).isoformat(sep=' ')}'"
+
+
+def punch_partition(month: date) -> Partition:
+    month = month.replace(day=1)
+    return Partition(
+        f"{PUNCH_TABLE}_p{month:%Y_%m}",
+        lower=_timestamp_literal(month),
+        upper=_timestamp_literal(add_months(month, 1)),
+    )
+
+
+def punch_partition_month(partition: Partition) -> date | None:
+    match = _MONTH_RE.search(partition.name)
+    if match is None:
+        return None
+    return date(int(match.group("year")), int(match.group("month")), 1)
+
+
+def monthly_punch_partitions(first: date, last: date) -> list[Partition]:
+    """Monthly partitions covering ``first`` through ``last`` inclusive."""
+    month, last = first.replace(day=1), last.replace(day=1)
+    partitions = []
+    while month <= last:
+        partitions.append(punch_partition(month))
+        month = add_months(month, 1)
+    return partitions
+
+
+# Catalog access
+
+
+def require_postgres() -> None:
+    if connection.vendor != "postgresql":
+        raise PartitioningError(f"Partitioning requires PostgreSQL (current backend: {connection.vendor})")
+
+
+def is_partitioned(table: str) -> bool:
+    require_postgres()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def list_partitions(table: str) -> list[Partition]:
+    require_postgres()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            ORDER BY c.relname
+            """,
+            [table],
+        )
+        return [parse_bound(name, expression) for name, expression in cursor.fetchall()]
+
+
+def _table_definition(table: str) -> tuple[list[tuple[str, str, str]], list[str]]:
+    """Return (constraints, standalone index definitions) so they can be replayed."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT conname, contype, pg_get_constraintdef(oid)
+            FROM pg_constraint WHERE conrelid = %s::regclass
+            ORDER BY contype, conname
+            """,
+            [table],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            WHERE i.indrelid = %s::regclass
+              AND NOT EXISTS (
+                SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid AND c.conrelid = i.indrelid
+              )
+            ORDER BY i.indexrelid
+            """,
+            [table],
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+    return constraints, indexes
+
+
+# Plans
+
+
+def conversion_plan(table: str, partitions: list[Partition]) -> list[str]:
+    """SQL converting a regular table into a range-partitioned one, keeping its data.
+
+    Constraints and indexes are read from the catalog and replayed by name, so
+    Django's introspection keeps matching them. The primary key becomes
+    ``(id, <key>)`` because PostgreSQL requires the partition key in it.
+    """
+    require_postgres()
+    if is_partitioned(table):
+        raise PartitioningError(f"{table} is already partitioned")
+    key = PARTITION_KEYS[table]
+    constraints, indexes = _table_definition(table)
+    for name, contype, definition in constraints:
+        if contype in ("u", "x") and key not in definition:
+            raise PartitioningError(f"Constraint {name} ({definition}) does not include partition key {key}")
+
+    legacy = f"{table}_legacy"
+    sequence = f"{table}_id_seq"
+    statements = [
+        f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE",
+        f"ALTER TABLE {table} RENAME TO {legacy}",
+        f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING STORAGE) PARTITION BY RANGE ({key})",
+        *[create_partition_sql(table, partition) for partition in partitions],
+        f"INSERT INTO {table} SELECT * FROM {legacy}",
+        # Dropping the legacy table frees its constraint, index and sequence names
+        f"DROP TABLE {legacy}",
+        # Identity columns on partitioned tables need PostgreSQL 17; a sequence default works everywhere
+        f"CREATE SEQUENCE {sequence} OWNED BY {table}.id",
+        f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')",
+        f"SELECT setval('{sequence}', COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)",
+        f"ALTER TABLE {table} ADD PRIMARY KEY (id, {key})",
+    ]
+    statements += [
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+        for name, contype, definition in constraints
+        if contype != "p"
+    ]
+    statements += indexes
+    statements.append(f"ANALYZE {table}")
+    return statements
+
+
+def attendance_conversion_plan() -> list[str]:
+    # A single open partition; it is sealed into a bounded one when a period closes
+    return conversion_plan(ATTENDANCE_TABLE, [Partition(f"{ATTENDANCE_TABLE}_s0")])
+
+
+def punch_conversion_plan(months_ahead: int = 3) -> list[str]:
+    today = timezone.localdate()
+    first = BiometricPunch.objects.order_by("punched_at").values_list("punched_at", flat=True).first()
+    first_month = timezone.localdate(first) if first else today
+    partitions = monthly_punch_partitions(first_month, add_months(today.replace(day=1), months_ahead))
+    partitions.append(Partition(f"{PUNCH_TABLE}_default", is_default=True))
+    return conversion_plan(PUNCH_TABLE, partitions)
+
+
+def punch_extension_plan(months_ahead: int = 3) -> list[str]:
+    """Create any missing monthly punch partitions from this month to ``months_ahead``."""
+    existing = {partition.name for partition in list_partitions(PUNCH_TABLE)}
+    today = timezone.localdate()
+    return [
+        create_partition_sql(PUNCH_TABLE, partition)
+        for partition in monthly_punch_partitions(today, add_months(today.replace(day=1), months_ahead))
+        if partition.name not in existing
+    ]
+
+
+def attendance_seal_plan() -> list[str]:
+    """Bound the open attendance partition at the current highest session id.
+
+    The partition is detached, given a CHECK constraint matching its new bounds
+    (so re-attaching it skips a validation scan), re-attached, and a new open
+    partition is created for sessions created afterwards.
+    """
+    tail = next(
+        (p for p in list_partitions(ATTENDANCE_TABLE) if p.upper is None and not p.is_default),
+        None,
+    )
+    if tail is None:
+        raise PartitioningError(f"{ATTENDANCE_TABLE} has no open-ended partition to seal")
+    upper = (Session.objects.order_by("-id").values_list("id", flat=True).first() or 0) + 1
+    lower = int_bound(tail.lower)
+    if lower is not None and lower >= upper:
+        raise PartitioningError("No sessions were created since the last seal")
+
+    key = PARTITION_KEYS[ATTENDANCE_TABLE]
+    check = f"{tail.name}_bounds"
+    condition = f"{key} < {upper}" if lower is None else f"{key} >= {lower} AND {key} < {upper}"
+    sealed = Partition(tail.name, lower=tail.lower, upper=str(upper))
+    return [
+        f"LOCK TABLE {ATTENDANCE_TABLE} IN ACCESS EXCLUSIVE MODE",
+        detach_partition_sql(ATTENDANCE_TABLE, tail),
+        f"ALTER TABLE {tail.name} ADD CONSTRAINT {check} CHECK ({condition})",
+        f"ALTER TABLE {ATTENDANCE_TABLE} ATTACH PARTITION {tail.name} {sealed.bound_sql()}",
+        f"ALTER TABLE {tail.name} DROP CONSTRAINT {check}",
+        create_partition_sql(ATTENDANCE_TABLE, Partition(f"{ATTENDANCE_TABLE}_s{upper}", lower=str(upper))),
+    ]
+
+
+# Archival
+
+
+def closed_period_cutoff() -> date:
+    """Start of the earliest period that is still open (or this month if all are closed)."""
+    earliest_open = (
+        AcademicPeriod.objects.exclude(status=AcademicPeriod.STATUS_CLOSED)
+        .exclude(start_date__isnull=True)
+        .order_by("start_date")
+        .values_list("start_date", flat=True)
+        .first()
+    )
+    return earliest_open or timezone.localdate().replace(day=1)
+
+
+def archivable_attendance_partitions(partitions: list[Partition]) -> list[Partition]:
+    """Sealed partitions whose sessions all belong to closed academic periods."""
+    archivable = []
+    for partition in partitions:
+        if partition.is_default or partition.upper is None:
+            continue
+        sessions = Session.objects.filter(id__lt=int_bound(partition.upper))
+        if partition.lower is not None:
+            sessions = sessions.filter(id__gte=int_bound(partition.lower))
+        if not sessions.exclude(academic_period__status=AcademicPeriod.STATUS_CLOSED).exists():
+            archivable.append(partition)
+    return archivable
+
+
+def archivable_punch_partitions(partitions: list[Partition], cutoff: date) -> list[Partition]:
+    """Monthly partitions that end on or before ``cutoff``."""
+    archivable = []
+    for partition in partitions:
+        month = punch_partition_month(partition)
+        if month is not None and add_months(month, 1) <= cutoff:
+            archivable.append(partition)
+    return archivable
+
+
+def execute_plan(statements: list[str]) -> None:
+    require_postgres()
+    with transaction.atomic(), connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
@@ -1,5 +1,6 @@
 """Attendance input services."""
 
+from .bulk_sheets import collect_week_tick_sheets, week_bounds
 from .input_methods import (
     AttendanceInputJobSummary,
     build_roster_for_session,
@@ -8,12 +9,18 @@ from .input_methods import (
     parse_csv_payload,
     parse_status_value,
 )
+from .sync import SyncError, apply_attendance_deltas, build_sync_snapshot
 
 __all__ = [
     "AttendanceInputJobSummary",
+    "SyncError",
+    "apply_attendance_deltas",
     "build_roster_for_session",
+    "build_sync_snapshot",
     "bulk_upsert_attendance_for_session",
+    "collect_week_tick_sheets",
     "compute_file_fingerprint",
     "parse_csv_payload",
     "parse_status_value",
+    "week_bounds",
 ]
@@ -0,0 +1,58 @@
+"""Collect a week's tick sheets for bulk printing."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from django.utils import timezone
+
+from sims_backend.attendance.tick_sheets import TickSheet
+from sims_backend.students.models import Student
+from sims_backend.timetable.models import Session
+
+
+def week_bounds(day: date) -> tuple[date, date]:
+    """Return (Monday, next Monday) for the week containing ``day``."""
+    monday = day - timedelta(days=day.weekday())
+    return monday, monday + timedelta(days=7)
+
+
+def collect_week_tick_sheets(
+    *, week: date, batch_id: int | None = None, department_id: int | None = None
+) -> list[TickSheet]:
+    """Build tick sheets for every session in ``week``, filtered by batch and/or department.
+
+    Uses two queries: the week's sessions, and every roster for those sessions
+    grouped by ``group_id`` in Python.
+    """
+    monday, next_monday = week_bounds(week)
+    start = timezone.make_aware(datetime.combine(monday, datetime.min.time()))
+    end = timezone.make_aware(datetime.combine(next_monday, datetime.min.time()))
+
+    sessions_qs = Session.objects.filter(starts_at__gte=start, starts_at__lt=end).select_related("group", "faculty")
+    if batch_id:
+        sessions_qs = sessions_qs.filter(group__batch_id=batch_id)
+    if department_id:
+        sessions_qs = sessions_qs.filter(department_id=department_id)
+    sessions = list(sessions_qs.order_by("starts_at", "group__name"))
+
+    rosters: dict[int, list[tuple[str, str]]] = defaultdict(list)
+    for group_id, reg_no, name in (
+        Student.objects.filter(group_id__in={s.group_id for s in sessions})
+        .order_by("reg_no")
+        .values_list("group_id", "reg_no", "name")
+    ):
+        rosters[group_id].append((reg_no, name))
+
+    return [
+        TickSheet(
+            session_id=session.id,
+            faculty_name=session.faculty.get_full_name() if session.faculty else "__________",
+            group_name=session.group.name,
+            students=tuple(rosters[session.group_id]),
+            date_label=timezone.localtime(session.starts_at).strftime("%a %d %b %Y %H:%M"),
+            filename_hint=f"{timezone.localtime(session.starts_at):%Y%m%d_%H%M}_{session.group.name}".replace(" ", "_"),
+        )
+        for session in sessions
+    ]
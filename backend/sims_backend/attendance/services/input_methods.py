@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import csv
 import hashlib
 from collections.abc import Iterable, Mapping, MutableMapping
 from dataclasses import dataclass
@@ -12,7 +11,9 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 
 from sims_backend.attendance.models import Attendance
+from sims_backend.attendance.services.live import publish_on_commit
 from sims_backend.common_permissions import in_group
+from sims_backend.students.imports.ingest import UploadReader
 from sims_backend.students.models import Student
 from sims_backend.timetable.models import Session
 
@@ -27,6 +28,7 @@ class AttendanceInputJobSummary:
     errors: list[Mapping[str, object]]
     duplicates: list[str]
     records: list[Mapping[str, object]]
+    fingerprint: str = ""
 
 
 def _has_admin_override(user: User) -> bool:
@@ -179,6 +181,7 @@ def bulk_upsert_attendance_for_session(
 
     created = len(to_create)
     updated = len(to_update)
+    publish_on_commit([session.id])
 
     return {"created": created, "updated": updated, "total": len(statuses), "absent": absent}
 
@@ -196,14 +199,8 @@ def parse_csv_payload(
     session: Session,
     default_status: str = STATUS_PRESENT,
 ) -> AttendanceInputJobSummary:
-    """Parse a CSV upload into normalized records using streaming for memory efficiency."""
-    import codecs
-
-    file_obj.seek(0)
-    # Use codecs.iterdecode for memory-efficient streaming
-    # This avoids loading the entire file into memory at once
-    text_stream = codecs.iterdecode(file_obj, "utf-8", errors="replace")
-    reader = csv.DictReader(text_stream)
+    """Parse a CSV or XLSX upload into normalized records, fingerprinting it in the same streaming pass."""
+    reader = UploadReader(file_obj)
 
     students = Student.objects.filter(group=session.group)
     students_by_reg = {s.reg_no: s for s in students}
@@ -239,6 +236,7 @@ def parse_csv_payload(
         errors=errors,
         duplicates=duplicates,
         records=records,
+        fingerprint=reader.hexdigest()[:16],
     )
 
 
@@ -0,0 +1,123 @@
+"""Live attendance progress published over Redis pub/sub.
+
+Every committed attendance write publishes the session's marking progress on
+``LIVE_CHANNEL``. The coordinator dashboard subscribes through a server-sent
+events stream instead of polling the 7-day aggregates.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterable
+from datetime import timedelta
+
+import django_rq
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from sims_backend.attendance.models import Attendance
+from sims_backend.students.models import Student
+from sims_backend.timetable.models import Session
+
+logger = logging.getLogger(__name__)
+
+LIVE_CHANNEL = "attendance:live"
+# Sessions starting within this window count as "starting now"
+LIVE_LOOKAHEAD = timedelta(minutes=15)
+
+
+def _progress_counts():
+    return {
+        "marked": Count("attendance_records"),
+        "absent": Count("attendance_records", filter=Q(attendance_records__status=Attendance.STATUS_ABSENT)),
+        "late": Count("attendance_records", filter=Q(attendance_records__status=Attendance.STATUS_LATE)),
+        "leave": Count("attendance_records", filter=Q(attendance_records__status=Attendance.STATUS_LEAVE)),
+    }
+
+
+def _serialize(session: Session, roster_sizes: dict[int, int]) -> dict:
+    return {
+        "session_id": session.id,
+        "group": session.group_id,
+        "department": session.department.name,
+        "faculty": session.faculty.get_full_name() or session.faculty.username,
+        "starts_at": session.starts_at.isoformat(),
+        "ends_at": session.ends_at.isoformat(),
+        "roster": roster_sizes.get(session.group_id, 0),
+        "marked": session.marked,
+        "absent": session.absent,
+        "late": session.late,
+        "leave": session.leave,
+    }
+
+
+def _roster_sizes(group_ids: Iterable[int]) -> dict[int, int]:
+    return dict(
+        Student.objects.filter(group_id__in=set(group_ids))
+        .order_by()
+        .values("group_id")
+        .annotate(total=Count("id"))
+        .values_list("group_id", "total")
+    )
+
+
+def session_progress(session_ids: Iterable[int]) -> list[dict]:
+    """Return marking progress for the given sessions (two queries in total)."""
+    sessions = list(
+        Session.objects.filter(id__in=set(session_ids))
+        .select_related("department", "faculty")
+        .annotate(**_progress_counts())
+    )
+    roster_sizes = _roster_sizes(s.group_id for s in sessions)
+    return [_serialize(session, roster_sizes) for session in sessions]
+
+
+def live_snapshot(now=None) -> dict:
+    """Sessions in progress or starting within ``LIVE_LOOKAHEAD`` with their progress.
+
+    ``unmarked`` comes from the same annotated query rather than a separate
+    ``exclude(id__in=...)`` pass over recent attendance.
+    """
+    now = now or timezone.now()
+    sessions = list(
+        Session.objects.filter(starts_at__lte=now + LIVE_LOOKAHEAD, ends_at__gte=now)
+        .select_related("department", "faculty")
+        .annotate(**_progress_counts())
+        .order_by("starts_at")
+    )
+    roster_sizes = _roster_sizes(s.group_id for s in sessions)
+    progress = [_serialize(session, roster_sizes) for session in sessions]
+    return {
+        "generated_at": now.isoformat(),
+        "unmarked": [item for item in progress if item["marked"] == 0],
+        "in_progress": [item for item in progress if item["marked"] > 0],
+    }
+
+
+def get_live_connection():
+    return django_rq.get_connection("default")
+
+
+def publish_session_progress(session_ids: Iterable[int]) -> None:
+    """Publish progress events for ``session_ids``; never raises (Redis is optional)."""
+    session_ids = list(session_ids)
+    if not session_ids:
+        return
+    try:
+        connection = get_live_connection()
+        for item in session_progress(session_ids):
+            connection.publish(LIVE_CHANNEL, json.dumps({"type": "progress", **item}))
+    except Exception as exc:
+        logger.warning("Live attendance publish failed: %s", exc)
+
+
+def publish_on_commit(session_ids: Iterable[int]) -> None:
+    """Schedule a progress publish once the surrounding transaction commits."""
+    session_ids = list(session_ids)
+    transaction.on_commit(lambda: publish_session_progress(session_ids))
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
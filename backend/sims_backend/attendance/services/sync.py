@@ -0,0 +1,276 @@
+"""Offline-first delta sync for attendance marking.
+
+Faculty download a compact snapshot of their upcoming sessions and rosters
+once, mark attendance offline, and upload batched deltas later. Conflicts
+are resolved last-writer-wins on ``marked_at``.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.core import signing
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from sims_backend.attendance.models import Attendance
+from sims_backend.attendance.services.input_methods import _has_admin_override, parse_status_value
+from sims_backend.attendance.services.live import publish_on_commit
+from sims_backend.common_permissions import in_group
+from sims_backend.students.models import Student
+from sims_backend.timetable.models import Session
+
+SYNC_TOKEN_SALT = "attendance.sync"
+# Tokens older than this are ignored for delta downloads (a full snapshot is sent instead)
+SYNC_TOKEN_MAX_AGE = 14 * 24 * 60 * 60
+DEFAULT_WINDOW_DAYS = 7
+MAX_WINDOW_DAYS = 14
+MAX_DELTAS_PER_UPLOAD = 20000
+# ``updated_at`` is stamped before commit, so a token reaches back this far to
+# catch marks whose transaction was still open while the snapshot was read
+SYNC_TOKEN_OVERLAP = timedelta(seconds=5)
+
+VALID_STATUSES = {code for code, _label in Attendance.STATUS_CHOICES}
+
+
+class SyncError(ValueError):
+    """Raised when a sync request is malformed."""
+
+
+def issue_sync_token(user: User, generated_at: datetime) -> str:
+    """Return a signed token recording who synced and when."""
+    return signing.dumps({"u": user.id, "t": generated_at.isoformat()}, salt=SYNC_TOKEN_SALT)
+
+
+def read_sync_token(token: str, user: User) -> datetime | None:
+    """Return the generation time of a token issued to ``user``, or None if unusable."""
+    try:
+        payload = signing.loads(token, salt=SYNC_TOKEN_SALT, max_age=SYNC_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if payload.get("u") != user.id:
+        return None
+    return parse_datetime(payload.get("t", ""))
+
+
+def _sessions_visible_to(user: User):
+    queryset = Session.objects.all()
+    if _has_admin_override(user):
+        return queryset
+    return queryset.filter(faculty=user)
+
+
+def build_sync_snapshot(
+    *,
+    user: User,
+    start: date | None = None,
+    days: int = DEFAULT_WINDOW_DAYS,
+    since_token: str | None = None,
+    group_id: int | None = None,
+) -> dict:
+    """Build the offline payload for ``user``'s sessions in ``[start, start + days)``.
+
+    Sessions, rosters and existing marks are each loaded with a single query.
+    Rosters are keyed by group so students shared by several sessions are
+    only sent once. When ``since_token`` is valid, only marks changed after it
+    was issued are included. The token time is taken before any query, less
+    ``SYNC_TOKEN_OVERLAP``, so the next delta may repeat a few marks but never
+    misses one.
+    """
+    generated_at = timezone.now() - SYNC_TOKEN_OVERLAP
+    days = max(1, min(int(days), MAX_WINDOW_DAYS))
+    start = start or timezone.localdate()
+    window_start = timezone.make_aware(datetime.combine(start, datetime.min.time()))
+    window_end = window_start + timedelta(days=days)
+
+    sessions_qs = (
+        _sessions_visible_to(user)
+        .filter(starts_at__gte=window_start, starts_at__lt=window_end)
+        .select_related("department")
+        .order_by("starts_at")
+    )
+    if group_id:
+        sessions_qs = sessions_qs.filter(group_id=group_id)
+    sessions = list(sessions_qs)
+
+    session_ids = [s.id for s in sessions]
+    group_ids = {s.group_id for s in sessions}
+
+    rosters: dict[str, list[list]] = defaultdict(list)
+    for student_id, reg_no, name, gid in (
+        Student.objects.filter(group_id__in=group_ids)
+        .order_by("reg_no")
+        .values_list("id", "reg_no", "name", "group_id")
+    ):
+        rosters[str(gid)].append([student_id, reg_no, name])
+
+    since = read_sync_token(since_token, user) if since_token else None
+    marks_qs = Attendance.objects.filter(session_id__in=session_ids)
+    if since is not None:
+        marks_qs = marks_qs.filter(updated_at__gt=since)
+    marks: dict[str, list[list]] = defaultdict(list)
+    for session_id, student_id, status_val, marked_at in marks_qs.values_list(
+        "session_id", "student_id", "status", "marked_at"
+    ):
+        marks[str(session_id)].append([student_id, status_val, marked_at.isoformat()])
+
+    return {
+        "sync_token": issue_sync_token(user, generated_at),
+        "generated_at": generated_at.isoformat(),
+        "delta": since is not None,
+        "window": {"start": start.isoformat(), "end": (start + timedelta(days=days)).isoformat()},
+        "sessions": [
+            {
+                "id": s.id,
+                "group": s.group_id,
+                "department": s.department.name,
+                "starts_at": s.starts_at.isoformat(),
+                "ends_at": s.ends_at.isoformat(),
+            }
+            for s in sessions
+        ],
+        "rosters": dict(rosters),
+        "marks": dict(marks),
+    }
+
+
+def _normalize_status(value: object) -> str | None:
+    token = str(value or "").strip().upper()
+    if token in VALID_STATUSES:
+        return token
+    return parse_status_value(value, default="") or None
+
+
+def _parse_marked_at(value: object, now: datetime) -> datetime | None:
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = parse_datetime(str(value or ""))
+    if parsed is None:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    # A device clock running ahead must not win every future conflict
+    return min(parsed, now)
+
+
+def apply_attendance_deltas(*, user: User, deltas: Iterable[Mapping[str, object]]) -> dict:
+    """Apply offline attendance deltas for many sessions in one bulk upsert.
+
+    Each delta is ``{session_id, student_id, status, marked_at}``. The newest
+    ``marked_at`` wins: deltas older than the stored row are reported as
+    conflicts and left unapplied. Faculty deltas must be marked on the
+    session's day (the offline counterpart of the live past-date rule);
+    admins and coordinators may back-fill.
+    """
+    if not isinstance(deltas, list):
+        raise SyncError("deltas must be a list")
+    if len(deltas) > MAX_DELTAS_PER_UPLOAD:
+        raise SyncError(f"At most {MAX_DELTAS_PER_UPLOAD} deltas can be uploaded at once")
+
+    now = timezone.now()
+    rejected: list[dict] = []
+    parsed: list[tuple[int, int, int, str, datetime]] = []
+    for index, delta in enumerate(deltas):
+        if not isinstance(delta, Mapping):
+            rejected.append({"index": index, "reason": "Delta must be an object"})
+            continue
+        try:
+            session_id = int(delta.get("session_id"))
+            student_id = int(delta.get("student_id"))
+        except (TypeError, ValueError):
+            rejected.append({"index": index, "reason": "session_id and student_id must be integers"})
+            continue
+        status_val = _normalize_status(delta.get("status"))
+        if status_val is None:
+            rejected.append({"index": index, "reason": "Unknown status"})
+            continue
+        marked_at = _parse_marked_at(delta.get("marked_at"), now)
+        if marked_at is None:
+            rejected.append({"index": index, "reason": "marked_at must be an ISO datetime"})
+            continue
+        parsed.append((index, session_id, student_id, status_val, marked_at))
+
+    session_ids = {p[1] for p in parsed}
+    sessions = {s.id: s for s in Session.objects.filter(id__in=session_ids)}
+    is_override = _has_admin_override(user)
+    is_faculty = is_override or in_group(user, "FACULTY")
+    members = set(
+        Student.objects.filter(group_id__in={s.group_id for s in sessions.values()}).values_list("id", "group_id")
+    )
+
+    # Collapse duplicates inside the batch: the newest mark per (session, student) wins
+    latest: dict[tuple[int, int], tuple[int, str, datetime]] = {}
+    for index, session_id, student_id, status_val, marked_at in parsed:
+        session = sessions.get(session_id)
+        if session is None:
+            rejected.append({"index": index, "reason": "Session not found"})
+            continue
+        if not is_override and not (is_faculty and session.faculty_id == user.id):
+            rejected.append({"index": index, "reason": "You do not have access to this session."})
+            continue
+        if (student_id, session.group_id) not in members:
+            rejected.append({"index": index, "reason": "Student is not in the session's group"})
+            continue
+        if not is_override and timezone.localdate(marked_at) != timezone.localdate(session.starts_at):
+            rejected.append({"index": index, "reason": "Attendance must be marked on the session day."})
+            continue
+        key = (session_id, student_id)
+        current = latest.get(key)
+        if current is None or marked_at >= current[2]:
+            latest[key] = (index, status_val, marked_at)
+
+    conflicts: list[dict] = []
+    created = 0
+    with transaction.atomic():
+        existing = {
+            (att.session_id, att.student_id): att
+            for att in Attendance.objects.select_for_update().filter(
+                session_id__in={k[0] for k in latest}, student_id__in={k[1] for k in latest}
+            )
+        }
+        to_write: list[Attendance] = []
+        for (session_id, student_id), (_index, status_val, marked_at) in latest.items():
+            current = existing.get((session_id, student_id))
+            if current is not None and current.marked_at > marked_at:
+                conflicts.append(
+                    {
+                        "session_id": session_id,
+                        "student_id": student_id,
+                        "server_status": current.status,
+                        "server_marked_at": current.marked_at.isoformat(),
+                    }
+                )
+                continue
+            if current is None:
+                created += 1
+            to_write.append(
+                Attendance(
+                    session_id=session_id,
+                    student_id=student_id,
+                    status=status_val,
+                    marked_by=user,
+                    marked_at=marked_at,
+                )
+            )
+        if to_write:
+            Attendance.objects.bulk_create(
+                to_write,
+                update_conflicts=True,
+                unique_fields=["session", "student"],
+                update_fields=["status", "marked_by", "marked_at", "updated_at"],
+            )
+            publish_on_commit({att.session_id for att in to_write})
+
+    return {
+        "applied": len(to_write),
+        "created": created,
+        "updated": len(to_write) - created,
+        "conflicts": conflicts,
+        "rejected": sorted(rejected, key=lambda r: r["index"]),
+        "sync_token": issue_sync_token(user, now),
+    }
@@ -0,0 +1,101 @@
+"""Tick-sheet PDF rendering.
+
+Rendering only works on plain ``TickSheet`` data (no ORM access), so sheets
+can be rendered in worker processes.
+"""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+
+from sims_backend.common.archives import pdf_archive
+from sims_backend.common.parallel import parallel_map, worker_count
+
+
+@dataclass(frozen=True)
+class TickSheet:
+    session_id: int
+    faculty_name: str
+    group_name: str
+    students: tuple[tuple[str, str], ...]
+    date_label: str = "____________"
+    filename_hint: str = ""
+
+    @property
+    def filename(self) -> str:
+        return f"{self.filename_hint or 'attendance_sheet'}_{self.session_id}.pdf"
+
+
+def draw_tick_sheet(pdf: canvas.Canvas, sheet: TickSheet) -> None:
+    """Draw one session's sheet onto ``pdf``, ending with a page break."""
+    width, height = letter
+    y = height - inch
+    pdf.setFont("Helvetica-Bold", 14)
+    pdf.drawString(inch, y, f"Attendance Sheet - Session {sheet.session_id}")
+    y -= 0.3 * inch
+    pdf.setFont("Helvetica", 10)
+    pdf.drawString(inch, y, f"Date: {sheet.date_label}   Faculty: {sheet.faculty_name}")
+    y -= 0.2 * inch
+    pdf.drawString(inch, y, f"Group: {sheet.group_name}")
+    y -= 0.4 * inch
+
+    pdf.setFont("Helvetica-Bold", 10)
+    pdf.drawString(inch, y, "Reg No")
+    pdf.drawString(inch + 1.5 * inch, y, "Name")
+    pdf.drawString(inch + 4 * inch, y, "Present")
+    pdf.drawString(inch + 5 * inch, y, "Absent")
+    y -= 0.25 * inch
+    pdf.setFont("Helvetica", 10)
+
+    for reg_no, name in sheet.students:
+        if y < inch:
+            pdf.showPage()
+            y = height - inch
+        pdf.drawString(inch, y, reg_no)
+        pdf.drawString(inch + 1.5 * inch, y, name[:28])
+        pdf.rect(inch + 4 * inch, y - 0.05 * inch, 0.3 * inch, 0.3 * inch)
+        pdf.rect(inch + 5 * inch, y - 0.05 * inch, 0.3 * inch, 0.3 * inch)
+        y -= 0.3 * inch
+
+    pdf.showPage()
+
+
+def render_tick_sheet(sheet: TickSheet) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    draw_tick_sheet(pdf, sheet)
+    pdf.save()
+    return buffer.getvalue()
+
+
+def render_combined(sheets: list[TickSheet]) -> bytes:
+    """Render all sheets into a single print-ready PDF."""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for sheet in sheets:
+        draw_tick_sheet(pdf, sheet)
+    pdf.save()
+    return buffer.getvalue()
+
+
+def render_many(sheets: list[TickSheet], max_workers: int | None = None) -> tuple[list[bytes], int]:
+    """Render each sheet to its own PDF, in worker processes for large batches.
+
+    Returns the PDFs (in input order) and the number of workers used.
+    """
+    workers = worker_count(len(sheets), max_workers)
+    return list(parallel_map(render_tick_sheet, sheets, max_workers=workers)), workers
+
+
+def build_zip(sheets: list[TickSheet], pdfs: list[bytes], manifest: str) -> bytes:
+    buffer = io.BytesIO()
+    with pdf_archive(buffer) as archive:
+        for sheet, pdf_bytes in zip(sheets, pdfs, strict=True):
+            archive.writestr(sheet.filename, pdf_bytes)
+        archive.writestr("manifest.json", manifest)
+    return buffer.getvalue()
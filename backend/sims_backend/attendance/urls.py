@@ -3,14 +3,18 @@ from rest_framework.routers import DefaultRouter
 
 from sims_backend.attendance.input_views import (
     BiometricPunchAPIView,
+    BulkTickSheetAPIView,
     CSVCommitAPIView,
     CSVDryRunAPIView,
     LiveRosterAPIView,
     LiveSubmitAPIView,
+    SyncDownloadAPIView,
+    SyncUploadAPIView,
     TickSheetCommitAPIView,
     TickSheetDryRunAPIView,
     TickSheetTemplateAPIView,
 )
+from sims_backend.attendance.live_views import live_attendance_snapshot, live_attendance_stream
 
 from .views import AttendanceViewSet
 
@@ -21,11 +25,16 @@ urlpatterns = [
     path("api/", include(router.urls)),
     path("api/attendance-input/live/roster/", LiveRosterAPIView.as_view(), name="attendance_live_roster"),
     path("api/attendance-input/live/submit/", LiveSubmitAPIView.as_view(), name="attendance_live_submit"),
+    path("api/attendance-input/sync/", SyncDownloadAPIView.as_view(), name="attendance_sync_download"),
+    path("api/attendance-input/sync/upload/", SyncUploadAPIView.as_view(), name="attendance_sync_upload"),
     path("api/attendance-input/csv/dry-run/", CSVDryRunAPIView.as_view(), name="attendance_csv_dry_run"),
     path("api/attendance-input/csv/commit/", CSVCommitAPIView.as_view(), name="attendance_csv_commit"),
     path("api/attendance-input/sheet/template/", TickSheetTemplateAPIView.as_view(), name="attendance_sheet_template"),
+    path("api/attendance-input/sheet/bulk/", BulkTickSheetAPIView.as_view(), name="attendance_sheet_bulk"),
     path("api/attendance-input/sheet/dry-run/", TickSheetDryRunAPIView.as_view(), name="attendance_sheet_dry_run"),
     path("api/attendance-input/sheet/commit/", TickSheetCommitAPIView.as_view(), name="attendance_sheet_commit"),
+    path("api/attendance-live/snapshot/", live_attendance_snapshot, name="attendance_live_snapshot"),
+    path("api/attendance-live/stream/", live_attendance_stream, name="attendance_live_stream"),
     path(
         "api/attendance-input/biometric/punches/", BiometricPunchAPIView.as_view(), name="attendance_biometric_punches"
     ),
@@ -11,6 +11,7 @@ from rest_framework.response import Response
 from core.permissions import has_permission_task
 from sims_backend.attendance.models import Attendance
 from sims_backend.attendance.serializers import AttendanceSerializer
+from sims_backend.attendance.services.live import publish_on_commit
 from sims_backend.attendance.utils import check_eligibility
 from sims_backend.timetable.models import Session
 
@@ -121,6 +122,8 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             else:
                 updated_count += 1
 
+        publish_on_commit([session.id])
+
         return Response(
             {"created": created_count, "updated": updated_count, "total": len(attendance_data)},
             status=status.HTTP_200_OK,
@@ -0,0 +1,11 @@
+"""ZIP archives of generated PDFs."""
+
+import zipfile
+
+
+def pdf_archive(file) -> zipfile.ZipFile:
+    """Open ``file`` for writing a ZIP of PDFs.
+
+    PDFs are already compressed, so entries are stored rather than deflated.
+    """
+    return zipfile.ZipFile(file, "w", compression=zipfile.ZIP_STORED)
@@ -0,0 +1,32 @@
+"""Order-preserving map across worker processes for CPU-bound batch work.
+
+Used for PDF rendering (tick sheets, transcripts) and password hashing in
+imports. ``fn`` and its arguments must be picklable, so callers pass plain
+data rather than model instances.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many items, process start-up costs more than it saves
+PARALLEL_THRESHOLD = 8
+
+
+def worker_count(items: int, max_workers: int | None = None) -> int:
+    """Worker processes worth starting for ``items`` tasks; 1 means run in this process."""
+    workers = min(max_workers or os.cpu_count() or 1, items)
+    return workers if items >= PARALLEL_THRESHOLD and workers > 1 else 1
+
+
+def parallel_map(fn: Callable, *sequences: Sequence, max_workers: int | None = None) -> Iterator:
+    """Yield ``fn(*args)`` for each item of ``sequences`` in input order, across processes for larger inputs."""
+    items = len(sequences[0])
+    workers = worker_count(items, max_workers)
+    if workers == 1:
+        yield from map(fn, *sequences)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(fn, *sequences, chunksize=max(1, items // (workers * 4)))
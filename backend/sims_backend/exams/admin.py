@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from sims_backend.exams.models import Exam, ExamComponent
+from sims_backend.exams.models import Exam, ExamComponent, ResultRecomputeJob
 
 
 class ExamComponentInline(admin.TabularInline):
@@ -24,3 +24,23 @@ class ExamComponentAdmin(admin.ModelAdmin):
     list_filter = ["exam", "is_mandatory_to_pass"]
     search_fields = ["name", "exam__title"]
     ordering = ["exam", "sequence"]
+
+
+@admin.register(ResultRecomputeJob)
+class ResultRecomputeJobAdmin(admin.ModelAdmin):
+    list_display = ["exam", "status", "processed", "total", "updated_results", "created_at", "finished_at"]
+    list_filter = ["status"]
+    search_fields = ["exam__title"]
+    ordering = ["-created_at"]
+    readonly_fields = [
+        "exam",
+        "status",
+        "changed_fields",
+        "total",
+        "processed",
+        "updated_results",
+        "updated_components",
+        "started_at",
+        "finished_at",
+        "error_message",
+    ]
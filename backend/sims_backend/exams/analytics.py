@@ -0,0 +1,173 @@
+"""Exam-level analytics: score distributions, pass rates and component statistics."""
+
+from __future__ import annotations
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count, FloatField, Max
+from django.db.models.functions import Cast
+
+from sims_backend.exams.models import Exam
+from sims_backend.results.models import ResultComponentEntry, ResultHeader
+
+ANALYTICS_CACHE_TIMEOUT = 60 * 60
+PERCENTILES = [10, 25, 50, 75, 90]
+# Ten 10%-wide bins over 0-100%
+HISTOGRAM_EDGES = np.linspace(0, 100, 11)
+
+
+def _round(value, digits: int = 2):
+    if value is None or not np.isfinite(value):
+        return None
+    return round(float(value), digits)
+
+
+def _describe(values: np.ndarray) -> dict:
+    if values.size == 0:
+        return {"count": 0, "mean": None, "median": None, "std": None, "min": None, "max": None}
+    return {
+        "count": int(values.size),
+        "mean": _round(values.mean()),
+        "median": _round(np.median(values)),
+        "std": _round(values.std()),
+        "min": _round(values.min()),
+        "max": _round(values.max()),
+    }
+
+
+def _histogram(percent: np.ndarray) -> list[dict]:
+    counts, edges = np.histogram(np.clip(percent, 0, 100), bins=HISTOGRAM_EDGES)
+    return [
+        {"from": int(low), "to": int(high), "count": int(count)}
+        for low, high, count in zip(edges[:-1], edges[1:], counts, strict=True)
+    ]
+
+
+def _pass_rate(outcomes: np.ndarray) -> float | None:
+    decided = np.count_nonzero((outcomes == "PASS") | (outcomes == "FAIL"))
+    if not decided:
+        return None
+    return _round(np.count_nonzero(outcomes == "PASS") / decided * 100)
+
+
+def marks_fingerprint(exam: Exam) -> str:
+    """Cheap signature that changes whenever the exam's results, marks or components change."""
+    results = ResultHeader.objects.filter(exam=exam).aggregate(
+        headers=Count("id", distinct=True),
+        headers_updated=Max("updated_at"),
+        entries=Count("component_entries"),
+        entries_updated=Max("component_entries__updated_at"),
+    )
+    components = exam.components.aggregate(count=Count("id"), updated=Max("updated_at"))
+    parts = [
+        results["headers"],
+        results["headers_updated"],
+        results["entries"],
+        results["entries_updated"],
+        components["count"],
+        components["updated"],
+        exam.updated_at,
+    ]
+    return ":".join(part.isoformat() if hasattr(part, "isoformat") else str(part) for part in parts)
+
+
+def compute_exam_analytics(exam: Exam) -> dict:
+    """
+    Compute distributions and component statistics for an exam with NumPy.
+
+    Results and component entries are each fetched with a single values_list
+    query (marks cast to float in SQL) and arranged into a results x
+    components matrix; missing entries are NaN.
+    """
+    components = list(exam.components.order_by("sequence", "id").values_list("id", "name", "max_marks"))
+    column = {component_id: index for index, (component_id, _name, _max) in enumerate(components)}
+
+    header_rows = list(
+        ResultHeader.objects.filter(exam=exam)
+        .order_by("id")
+        .annotate(obtained=Cast("total_obtained", FloatField()), maximum=Cast("total_max", FloatField()))
+        .values_list("id", "obtained", "maximum", "final_outcome")
+    )
+    row = {header_id: index for index, (header_id, *_rest) in enumerate(header_rows)}
+    obtained = np.array([r[1] for r in header_rows], dtype=float)
+    maximum = np.array([r[2] for r in header_rows], dtype=float)
+    outcomes = np.array([r[3] for r in header_rows], dtype=object)
+
+    entries = list(
+        ResultComponentEntry.objects.filter(result_header__exam=exam)
+        .annotate(marks=Cast("marks_obtained", FloatField()))
+        .values_list("result_header_id", "exam_component_id", "marks", "component_outcome")
+    )
+    marks = np.full((len(header_rows), len(components)), np.nan)
+    component_outcomes = np.full((len(header_rows), len(components)), "NA", dtype=object)
+    if entries:
+        known = [e for e in entries if e[1] in column]
+        rows = np.fromiter((row[e[0]] for e in known), dtype=np.intp, count=len(known))
+        cols = np.fromiter((column[e[1]] for e in known), dtype=np.intp, count=len(known))
+        marks[rows, cols] = np.fromiter((e[2] for e in known), dtype=float, count=len(known))
+        component_outcomes[rows, cols] = [e[3] for e in known]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = np.where(maximum > 0, obtained / maximum * 100, np.nan)
+    scored = percent[~np.isnan(percent)]
+
+    component_stats = []
+    for index, (component_id, name, max_marks) in enumerate(components):
+        values = marks[:, index]
+        present = ~np.isnan(values)
+        column_marks = values[present]
+        max_value = float(max_marks)
+        component_percent = column_marks / max_value * 100 if max_value > 0 else np.zeros_like(column_marks)
+        component_stats.append(
+            {
+                "component_id": component_id,
+                "name": name,
+                "max_marks": _round(max_value),
+                "marks": _describe(column_marks),
+                "mean_percent": _round(component_percent.mean()) if column_marks.size else None,
+                "pass_rate": _pass_rate(component_outcomes[present, index]),
+                "histogram": _histogram(component_percent),
+            }
+        )
+
+    # Correlation uses results that have every component entered
+    complete = marks[~np.isnan(marks).any(axis=1)]
+    correlation = None
+    if len(components) > 1 and len(complete) > 1:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            matrix = np.corrcoef(complete, rowvar=False)
+        correlation = {
+            "component_ids": [c[0] for c in components],
+            "results_used": int(len(complete)),
+            "matrix": [[_round(value, 4) for value in matrix_row] for matrix_row in matrix],
+        }
+
+    return {
+        "exam_id": exam.id,
+        "results": len(header_rows),
+        "outcomes": {
+            outcome: int(np.count_nonzero(outcomes == outcome))
+            for outcome in (ResultHeader.OUTCOME_PASS, ResultHeader.OUTCOME_FAIL, ResultHeader.OUTCOME_PENDING)
+        },
+        "pass_rate": _pass_rate(outcomes),
+        "total_percent": _describe(scored),
+        "percentiles": {
+            f"p{p}": _round(value)
+            for p, value in zip(
+                PERCENTILES, np.percentile(scored, PERCENTILES) if scored.size else [None] * 5, strict=True
+            )
+        },
+        "histogram": _histogram(scored),
+        "components": component_stats,
+        "correlation": correlation,
+    }
+
+
+def get_exam_analytics(exam: Exam) -> dict:
+    """Return cached analytics for an exam, recomputing when its marks have changed."""
+    key = f"exam-analytics:{exam.id}:{marks_fingerprint(exam)}"
+    data = cache.get(key)
+    if data is None:
+        data = compute_exam_analytics(exam)
+        cache.set(key, data, ANALYTICS_CACHE_TIMEOUT)
+    return data
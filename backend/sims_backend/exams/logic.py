@@ -2,6 +2,8 @@
 
 from decimal import Decimal
 
+import numpy as np
+
 from sims_backend.exams.models import Exam, ExamComponent
 
 
@@ -21,6 +23,7 @@ def compute_passing_status(exam: Exam, total_obtained: Decimal, total_max: Decim
             - component_outcomes: dict mapping exam_component_id to 'PASS', 'FAIL', or 'NA'
     """
     component_outcomes = {}
+    components = {component.id: component for component in exam.components.all()}
 
     # First, compute component-level outcomes
     for entry in component_entries:
@@ -29,9 +32,8 @@ def compute_passing_status(exam: Exam, total_obtained: Decimal, total_max: Decim
         max_marks = Decimal(str(entry["max_marks"]))
 
         # Find the component to get passing criteria
-        try:
-            component = exam.components.get(id=component_id)
-        except ExamComponent.DoesNotExist:
+        component = components.get(component_id)
+        if component is None:
             component_outcomes[component_id] = "NA"
             continue
 
@@ -72,14 +74,11 @@ def compute_passing_status(exam: Exam, total_obtained: Decimal, total_max: Decim
         all_mandatory_pass = True
         for entry in component_entries:
             component_id = entry["exam_component_id"]
-            try:
-                component = exam.components.get(id=component_id)
-                if component.is_mandatory_to_pass:
-                    if component_outcomes.get(component_id) != "PASS":
-                        all_mandatory_pass = False
-                        break
-            except ExamComponent.DoesNotExist:
-                continue
+            component = components.get(component_id)
+            if component is not None and component.is_mandatory_to_pass:
+                if component_outcomes.get(component_id) != "PASS":
+                    all_mandatory_pass = False
+                    break
 
         if exam.fail_if_any_component_fail:
             # Fail if any component fails (not just mandatory)
@@ -106,14 +105,11 @@ def compute_passing_status(exam: Exam, total_obtained: Decimal, total_max: Decim
         all_mandatory_pass = True
         for entry in component_entries:
             component_id = entry["exam_component_id"]
-            try:
-                component = exam.components.get(id=component_id)
-                if component.is_mandatory_to_pass:
-                    if component_outcomes.get(component_id) != "PASS":
-                        all_mandatory_pass = False
-                        break
-            except ExamComponent.DoesNotExist:
-                continue
+            component = components.get(component_id)
+            if component is not None and component.is_mandatory_to_pass:
+                if component_outcomes.get(component_id) != "PASS":
+                    all_mandatory_pass = False
+                    break
 
         if exam.fail_if_any_component_fail:
             any_fails = any(outcome == "FAIL" for outcome in component_outcomes.values())
@@ -128,3 +124,89 @@ def compute_passing_status(exam: Exam, total_obtained: Decimal, total_max: Decim
         "final_outcome": final_outcome,
         "component_outcomes": component_outcomes,
     }
+
+
+def to_hundredths(value) -> int:
+    """Convert a 2-decimal-place amount to an exact integer number of hundredths."""
+    return int((Decimal(str(value or 0)) * 100).to_integral_value())
+
+
+def _meets_threshold(obtained, maximum, pass_marks, pass_percent, has_marks, has_percent):
+    """Element-wise pass check on hundredths.
+
+    ``obtained / maximum * 100 >= percent`` is evaluated as
+    ``obtained * 10000 >= percent * maximum`` so it stays exact in integers.
+    """
+    by_marks = obtained >= pass_marks
+    by_percent = (maximum > 0) & (obtained * 10000 >= pass_percent * maximum)
+    return np.where(has_marks, by_marks, np.where(has_percent, by_percent, obtained > 0))
+
+
+def compute_exam_outcomes(
+    exam: Exam,
+    components: list[ExamComponent],
+    totals: np.ndarray,
+    marks: np.ndarray,
+    present: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized compute_passing_status for every result of an exam at once.
+
+    Args:
+        exam: Exam instance
+        components: The exam's components, in the column order of ``marks``
+        totals: int64 array (n, 2) of total_obtained and total_max in hundredths
+        marks: int64 array (n, len(components)) of marks obtained in hundredths
+        present: bool array shaped like ``marks``; True where the result has an entry
+
+    Returns:
+        (final_outcomes, component_outcomes): string arrays shaped (n,) and
+        (n, len(components)). Component outcomes are 'NA' where no entry exists.
+    """
+
+    pass_marks = np.array([to_hundredths(c.pass_marks) for c in components], dtype=np.int64)
+    pass_percent = np.array([to_hundredths(c.pass_percent) for c in components], dtype=np.int64)
+    has_marks = np.array([c.pass_marks is not None for c in components], dtype=bool)
+    has_percent = np.array([c.pass_percent is not None for c in components], dtype=bool)
+    max_marks = np.array([to_hundredths(c.max_marks) for c in components], dtype=np.int64)
+    mandatory = np.array([c.is_mandatory_to_pass for c in components], dtype=bool)
+
+    passes = _meets_threshold(marks, max_marks, pass_marks, pass_percent, has_marks, has_percent)
+    component_outcomes = np.where(present, np.where(passes, "PASS", "FAIL"), "NA")
+
+    failed = present & ~passes
+    if exam.fail_if_any_component_fail:
+        components_pass = ~failed.any(axis=1)
+    else:
+        components_pass = ~(failed & mandatory).any(axis=1)
+
+    has_total_marks = exam.pass_total_marks is not None
+    has_total_percent = exam.pass_total_percent is not None
+    if has_total_marks or has_total_percent:
+        total_passes = _meets_threshold(
+            totals[:, 0],
+            totals[:, 1],
+            to_hundredths(exam.pass_total_marks),
+            to_hundredths(exam.pass_total_percent),
+            has_total_marks,
+            has_total_percent,
+        )
+    else:
+        total_passes = None
+
+    n = len(totals)
+    if exam.passing_mode == Exam.PASSING_MODE_TOTAL_ONLY:
+        if total_passes is None:
+            final = np.full(n, "PENDING")
+        else:
+            final = np.where(total_passes, "PASS", "FAIL")
+    elif exam.passing_mode == Exam.PASSING_MODE_COMPONENT_WISE:
+        final = np.where(components_pass, "PASS", "FAIL")
+    elif exam.passing_mode == Exam.PASSING_MODE_HYBRID:
+        # Without total criteria the total check fails, as in compute_passing_status
+        total_ok = total_passes if total_passes is not None else False
+        final = np.where(total_ok & components_pass, "PASS", "FAIL")
+    else:
+        final = np.full(n, "PENDING")
+
+    return final, component_outcomes
@@ -0,0 +1,81 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("exams", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResultRecomputeJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, help_text="The timestamp when the record was created."),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, help_text="The timestamp when the record was last updated."),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("QUEUED", "Queued"),
+                            ("RUNNING", "Running"),
+                            ("COMPLETED", "Completed"),
+                            ("FAILED", "Failed"),
+                        ],
+                        default="QUEUED",
+                        help_text="Current status of the job",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "changed_fields",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Rule fields whose change triggered this job (e.g. 'exam.passing_mode')",
+                    ),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(default=0, help_text="Number of draft/verified results to recompute"),
+                ),
+                ("processed", models.PositiveIntegerField(default=0, help_text="Number of results recomputed so far")),
+                (
+                    "updated_results",
+                    models.PositiveIntegerField(default=0, help_text="Results whose final outcome changed"),
+                ),
+                (
+                    "updated_components",
+                    models.PositiveIntegerField(default=0, help_text="Component entries whose outcome changed"),
+                ),
+                ("started_at", models.DateTimeField(blank=True, help_text="When the job started running", null=True)),
+                (
+                    "finished_at",
+                    models.DateTimeField(blank=True, help_text="When the job completed or failed", null=True),
+                ),
+                ("error_message", models.TextField(blank=True, help_text="Error details if the job failed")),
+                (
+                    "exam",
+                    models.ForeignKey(
+                        help_text="Exam whose results are recomputed",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recompute_jobs",
+                        to="exams.exam",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [models.Index(fields=["exam", "status"], name="exams_resul_exam_id_78ba22_idx")],
+            },
+        ),
+    ]
@@ -4,7 +4,41 @@ from django.db import models
 from core.models import TimeStampedModel
 
 
-class Exam(TimeStampedModel):
+class PassRuleTrackingMixin:
+    """
+    Remember pass-rule fields as loaded from the database so save() can tell
+    when they changed and schedule a background recompute of the exam's results.
+    """
+
+    RULE_FIELDS: tuple[str, ...] = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_rules = instance._rule_values()
+        return instance
+
+    def _rule_values(self) -> dict:
+        # Deferred fields are not in __dict__ and cannot be compared
+        return {name: self.__dict__[name] for name in self.RULE_FIELDS if name in self.__dict__}
+
+    def changed_rule_fields(self) -> list[str]:
+        loaded = getattr(self, "_loaded_rules", None)
+        if loaded is None:
+            return []
+        return [name for name, value in loaded.items() if getattr(self, name) != value]
+
+    def save(self, *args, **kwargs):
+        changed = self.changed_rule_fields()
+        super().save(*args, **kwargs)
+        self._loaded_rules = self._rule_values()
+        if changed:
+            from sims_backend.exams.recompute import schedule_exam_recompute
+
+            schedule_exam_recompute(self.rule_exam_id, [f"{self._meta.model_name}.{name}" for name in changed])
+
+
+class Exam(PassRuleTrackingMixin, TimeStampedModel):
     """Exam with component-based structure and passing logic"""
 
     PASSING_MODE_TOTAL_ONLY = "TOTAL_ONLY"
@@ -80,6 +114,8 @@ class Exam(TimeStampedModel):
         help_text="If True, student fails if any mandatory component fails",
     )
 
+    RULE_FIELDS = ("passing_mode", "pass_total_marks", "pass_total_percent", "fail_if_any_component_fail")
+
     class Meta:
         ordering = ["-scheduled_at", "title"]
         indexes = [
@@ -92,8 +128,12 @@ class Exam(TimeStampedModel):
         dept_str = f" - {self.department.name}" if self.department else ""
         return f"{self.title}{dept_str} ({self.academic_period.name})"
 
+    @property
+    def rule_exam_id(self):
+        return self.pk
 
-class ExamComponent(TimeStampedModel):
+
+class ExamComponent(PassRuleTrackingMixin, TimeStampedModel):
     """Component of an exam with individual passing criteria"""
 
     exam = models.ForeignKey(
@@ -145,6 +185,8 @@ class ExamComponent(TimeStampedModel):
         help_text="Whether this component must be passed for overall pass",
     )
 
+    RULE_FIELDS = ("max_marks", "pass_marks", "pass_percent", "is_mandatory_to_pass")
+
     class Meta:
         ordering = ["exam", "sequence", "name"]
         unique_together = [("exam", "sequence")]
@@ -154,3 +196,107 @@ class ExamComponent(TimeStampedModel):
 
     def __str__(self):
         return f"{self.exam.title} - {self.name} ({self.sequence})"
+
+    @property
+    def rule_exam_id(self):
+        return self.exam_id
+
+    def _schedule_if_results(self, change: str) -> None:
+        # Adding or removing a component changes the exam's total and its rules,
+        # but only matters once results exist
+        from sims_backend.exams.recompute import schedule_exam_recompute
+        from sims_backend.exams.services import RECOMPUTABLE_STATUSES
+        from sims_backend.results.models import ResultHeader
+
+        if ResultHeader.objects.filter(exam_id=self.exam_id, status__in=RECOMPUTABLE_STATUSES).exists():
+            schedule_exam_recompute(self.exam_id, [f"examcomponent.{change}"])
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            self._schedule_if_results("added")
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._schedule_if_results("deleted")
+        return result
+
+
+class ResultRecomputeJob(TimeStampedModel):
+    """Background recompute of an exam's result outcomes after its pass rules changed"""
+
+    STATUS_QUEUED = "QUEUED"
+    STATUS_RUNNING = "RUNNING"
+    STATUS_COMPLETED = "COMPLETED"
+    STATUS_FAILED = "FAILED"
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    exam = models.ForeignKey(
+        Exam,
+        on_delete=models.CASCADE,
+        related_name="recompute_jobs",
+        help_text="Exam whose results are recomputed",
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_QUEUED,
+        help_text="Current status of the job",
+    )
+    changed_fields = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Rule fields whose change triggered this job (e.g. 'exam.passing_mode')",
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of draft/verified results to recompute",
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of results recomputed so far",
+    )
+    updated_results = models.PositiveIntegerField(
+        default=0,
+        help_text="Results whose final outcome changed",
+    )
+    updated_components = models.PositiveIntegerField(
+        default=0,
+        help_text="Component entries whose outcome changed",
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the job started running",
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the job completed or failed",
+    )
+    error_message = models.TextField(
+        blank=True,
+        help_text="Error details if the job failed",
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["exam", "status"]),
+        ]
+
+    def __str__(self):
+        return f"Recompute {self.exam_id} ({self.status})"
+
+    @property
+    def progress_percent(self) -> float:
+        if not self.total:
+            return 100.0 if self.status == self.STATUS_COMPLETED else 0.0
+        return round(self.processed / self.total * 100, 1)
@@ -0,0 +1,125 @@
+"""Background recompute of result outcomes after an exam's pass rules change.
+
+Saving a changed pass rule on an Exam or ExamComponent (see
+PassRuleTrackingMixin) records a ResultRecomputeJob and, once the transaction
+commits, enqueues it on the RQ "default" queue. The worker walks the exam's
+draft/verified results in id-ordered chunks with the batch evaluator and
+records progress on the job after every chunk.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+import django_rq
+from django.db import transaction
+from django.utils import timezone
+
+from sims_backend.exams.models import Exam, ResultRecomputeJob
+from sims_backend.exams.services import RECOMPUTABLE_STATUSES, recompute_exam_results_chunk
+from sims_backend.results.models import ResultHeader
+
+logger = logging.getLogger(__name__)
+
+RECOMPUTE_CHUNK_SIZE = 500
+RECOMPUTE_JOB_TIMEOUT = 30 * 60
+# Only these changes move a result's total_max; other rule edits keep manually adjusted totals
+TOTAL_MAX_CHANGES = {"examcomponent.max_marks", "examcomponent.added", "examcomponent.deleted"}
+
+
+def abandoned_before():
+    """QUEUED jobs created before this were never picked up; their RQ job was lost."""
+    return timezone.now() - timedelta(seconds=RECOMPUTE_JOB_TIMEOUT)
+
+
+def schedule_exam_recompute(exam_id: int, changed_fields: list[str]) -> ResultRecomputeJob:
+    """
+    Record a recompute job for an exam and enqueue it after commit.
+
+    A job that is still queued reads the current rules when it runs, so
+    further edits are folded into it instead of queueing another job. Queued
+    jobs older than abandoned_before() are marked failed rather than folded
+    into, so an edit never waits on a job no worker will run.
+    """
+    with transaction.atomic():
+        ResultRecomputeJob.objects.filter(
+            exam_id=exam_id, status=ResultRecomputeJob.STATUS_QUEUED, created_at__lt=abandoned_before()
+        ).update(
+            status=ResultRecomputeJob.STATUS_FAILED,
+            error_message="Never picked up by a worker; superseded by a new job",
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        job = (
+            ResultRecomputeJob.objects.select_for_update()
+            .filter(exam_id=exam_id, status=ResultRecomputeJob.STATUS_QUEUED)
+            .first()
+        )
+        if job is not None:
+            job.changed_fields = sorted(set(job.changed_fields) | set(changed_fields))
+            job.save(update_fields=["changed_fields", "updated_at"])
+            return job
+        job = ResultRecomputeJob.objects.create(exam_id=exam_id, changed_fields=sorted(set(changed_fields)))
+    job_id = job.id
+    transaction.on_commit(lambda: enqueue_recompute_job(job_id))
+    return job
+
+
+def enqueue_recompute_job(job_id: int) -> None:
+    """Enqueue a job on RQ; without Redis, run it inline so outcomes never stay stale."""
+    try:
+        django_rq.get_queue("default").enqueue(run_exam_recompute_job, job_id, job_timeout=RECOMPUTE_JOB_TIMEOUT)
+    except Exception as exc:
+        logger.warning("Could not enqueue result recompute job %s (%s); running inline", job_id, exc)
+        run_exam_recompute_job(job_id)
+
+
+def run_exam_recompute_job(job_id: int, chunk_size: int = RECOMPUTE_CHUNK_SIZE) -> dict:
+    """
+    Recompute all draft/verified results of the job's exam chunk by chunk.
+
+    Result totals are reset from the components only when the job covers a
+    component maximum change, addition or deletion.
+    """
+    claimed = ResultRecomputeJob.objects.filter(id=job_id, status=ResultRecomputeJob.STATUS_QUEUED).update(
+        status=ResultRecomputeJob.STATUS_RUNNING, started_at=timezone.now(), updated_at=timezone.now()
+    )
+    job = ResultRecomputeJob.objects.get(id=job_id)
+    if not claimed:
+        # Already picked up by another worker (or finished)
+        return {"job_id": job.id, "status": job.status}
+
+    progress = {"processed": 0, "updated_results": 0, "updated_components": 0}
+    try:
+        exam = Exam.objects.get(id=job.exam_id)
+        total = ResultHeader.objects.filter(exam=exam, status__in=RECOMPUTABLE_STATUSES).count()
+        ResultRecomputeJob.objects.filter(id=job_id).update(total=total)
+        refresh_totals = not TOTAL_MAX_CHANGES.isdisjoint(job.changed_fields)
+
+        last_id = 0
+        while True:
+            chunk = recompute_exam_results_chunk(
+                exam, after_id=last_id, limit=chunk_size, refresh_totals=refresh_totals
+            )
+            if chunk["last_id"] is None:
+                break
+            last_id = chunk["last_id"]
+            progress["processed"] += chunk["results"]
+            progress["updated_results"] += chunk["updated_results"]
+            progress["updated_components"] += chunk["updated_components"]
+            ResultRecomputeJob.objects.filter(id=job_id).update(**progress, updated_at=timezone.now())
+    except Exception as exc:
+        logger.exception("Result recompute job %s failed", job_id)
+        ResultRecomputeJob.objects.filter(id=job_id).update(
+            status=ResultRecomputeJob.STATUS_FAILED,
+            error_message=str(exc),
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        return {"job_id": job_id, "status": ResultRecomputeJob.STATUS_FAILED, **progress}
+
+    ResultRecomputeJob.objects.filter(id=job_id).update(
+        status=ResultRecomputeJob.STATUS_COMPLETED, finished_at=timezone.now(), updated_at=timezone.now()
+    )
+    return {"job_id": job_id, "status": ResultRecomputeJob.STATUS_COMPLETED, **progress}
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 
 from sims_backend.common_permissions import in_group
-from sims_backend.exams.models import Exam, ExamComponent
+from sims_backend.exams.models import Exam, ExamComponent, ResultRecomputeJob
 
 
 class ExamComponentSerializer(serializers.ModelSerializer):
@@ -89,3 +89,27 @@ class ExamSerializer(serializers.ModelSerializer):
                         raise serializers.ValidationError(f"Cannot modify {field} (academic policy field)")
 
         return data
+
+
+class ResultRecomputeJobSerializer(serializers.ModelSerializer):
+    progress_percent = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ResultRecomputeJob
+        fields = [
+            "id",
+            "exam",
+            "status",
+            "changed_fields",
+            "total",
+            "processed",
+            "progress_percent",
+            "updated_results",
+            "updated_components",
+            "started_at",
+            "finished_at",
+            "error_message",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
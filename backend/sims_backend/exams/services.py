@@ -1,7 +1,84 @@
 """Services for exam result computation."""
 
-from sims_backend.exams.logic import compute_passing_status
-from sims_backend.results.models import ResultHeader
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from sims_backend.exams.logic import compute_exam_outcomes, to_hundredths
+from sims_backend.exams.models import Exam
+from sims_backend.results.models import ResultComponentEntry, ResultHeader
+
+# Published and frozen results are never recomputed in bulk; corrections go through Requests
+RECOMPUTABLE_STATUSES = [ResultHeader.STATUS_DRAFT, ResultHeader.STATUS_VERIFIED]
+HEADER_FIELDS = ("id", "exam_id", "total_obtained", "total_max", "final_outcome", "updated_at")
+ENTRY_FIELDS = ("id", "result_header_id", "exam_component_id", "marks_obtained", "component_outcome")
+
+
+def _apply_exam_outcomes(
+    exam: Exam, headers: list[ResultHeader], entries: list[ResultComponentEntry], refresh_totals: bool = False
+) -> dict:
+    """
+    Evaluate ``headers`` together and write back only the outcomes that changed.
+
+    With ``refresh_totals``, each header's ``total_max`` is first reset to the
+    sum of the exam's component maximums, so percentage rules see the current
+    components rather than the ones the result was entered against.
+    """
+    components = list(exam.components.order_by("sequence", "id"))
+    column = {component.id: index for index, component in enumerate(components)}
+    row = {header.id: index for index, header in enumerate(headers)}
+
+    stale_totals = set()
+    if refresh_totals and components:
+        total_max = sum((component.max_marks for component in components), Decimal("0"))
+        for header in headers:
+            if header.total_max != total_max:
+                header.total_max = total_max
+                stale_totals.add(header.id)
+
+    totals = np.array(
+        [(to_hundredths(h.total_obtained), to_hundredths(h.total_max)) for h in headers], dtype=np.int64
+    ).reshape(len(headers), 2)
+    marks = np.zeros((len(headers), len(components)), dtype=np.int64)
+    present = np.zeros((len(headers), len(components)), dtype=bool)
+    for entry in entries:
+        col = column.get(entry.exam_component_id)
+        if col is not None:
+            marks[row[entry.result_header_id], col] = to_hundredths(entry.marks_obtained)
+            present[row[entry.result_header_id], col] = True
+
+    final_outcomes, component_outcomes = compute_exam_outcomes(exam, components, totals, marks, present)
+
+    # bulk_update bypasses auto_now, so stamp updated_at explicitly
+    now = timezone.now()
+    changed_headers = []
+    for header, outcome in zip(headers, final_outcomes.tolist(), strict=True):
+        if header.final_outcome != outcome or header.id in stale_totals:
+            header.final_outcome = outcome
+            header.updated_at = now
+            changed_headers.append(header)
+
+    changed_entries = []
+    for entry in entries:
+        col = column.get(entry.exam_component_id)
+        # Entries for components outside the exam are not applicable
+        outcome = component_outcomes[row[entry.result_header_id], col] if col is not None else "NA"
+        if entry.component_outcome != outcome:
+            entry.component_outcome = str(outcome)
+            entry.updated_at = now
+            changed_entries.append(entry)
+
+    with transaction.atomic():
+        ResultHeader.objects.bulk_update(changed_headers, ["final_outcome", "total_max", "updated_at"], batch_size=500)
+        ResultComponentEntry.objects.bulk_update(changed_entries, ["component_outcome", "updated_at"], batch_size=500)
+
+    return {
+        "results": len(headers),
+        "updated_results": len(changed_headers),
+        "updated_components": len(changed_entries),
+    }
 
 
 def compute_result_passing_status(result_header: ResultHeader) -> None:
@@ -16,36 +93,51 @@ def compute_result_passing_status(result_header: ResultHeader) -> None:
     Args:
         result_header: ResultHeader instance to compute status for
     """
-    exam = result_header.exam
-
-    # Gather component entries
-    component_entries_data = []
-    component_entries_objects = result_header.component_entries.select_related("exam_component").all()
-
-    for entry in component_entries_objects:
-        component_entries_data.append(
-            {
-                "exam_component_id": entry.exam_component.id,
-                "marks_obtained": entry.marks_obtained,
-                "max_marks": entry.exam_component.max_marks,
-            }
-        )
-
-    # Compute passing status
-    result = compute_passing_status(
-        exam=exam,
-        total_obtained=result_header.total_obtained,
-        total_max=result_header.total_max,
-        component_entries=component_entries_data,
+    entries = list(ResultComponentEntry.objects.filter(result_header=result_header).only(*ENTRY_FIELDS))
+    _apply_exam_outcomes(result_header.exam, [result_header], entries)
+
+
+def recompute_exam_results(exam: Exam, refresh_totals: bool = False) -> dict:
+    """
+    Recompute passing status for every draft or verified result of an exam at once.
+
+    Components, result headers and component entries are each loaded with one
+    query, outcomes are evaluated as arrays, and only changed rows are written
+    back with bulk_update. ``refresh_totals`` is passed to _apply_exam_outcomes.
+
+    Returns:
+        dict with counts: results, updated_results, updated_components, skipped
+    """
+    headers = list(
+        ResultHeader.objects.filter(exam=exam, status__in=RECOMPUTABLE_STATUSES).only(*HEADER_FIELDS).order_by("id")
     )
+    entries = list(
+        ResultComponentEntry.objects.filter(
+            result_header__exam=exam, result_header__status__in=RECOMPUTABLE_STATUSES
+        ).only(*ENTRY_FIELDS)
+    )
+    summary = _apply_exam_outcomes(exam, headers, entries, refresh_totals=refresh_totals)
+    summary["skipped"] = ResultHeader.objects.filter(exam=exam).exclude(status__in=RECOMPUTABLE_STATUSES).count()
+    return summary
+
 
-    # Update result header
-    result_header.final_outcome = result["final_outcome"]
-    result_header.save(update_fields=["final_outcome", "updated_at"])
+def recompute_exam_results_chunk(exam: Exam, after_id: int = 0, limit: int = 500, refresh_totals: bool = False) -> dict:
+    """
+    Recompute the next ``limit`` draft/verified results of an exam (by id) after ``after_id``.
 
-    # Update component entries
-    for entry in component_entries_objects:
-        component_id = entry.exam_component.id
-        if component_id in result["component_outcomes"]:
-            entry.component_outcome = result["component_outcomes"][component_id]
-            entry.save(update_fields=["component_outcome", "updated_at"])
+    Returns the same counts as recompute_exam_results plus ``last_id`` to
+    resume from (None once there are no results left).
+    """
+    headers = list(
+        ResultHeader.objects.filter(exam=exam, status__in=RECOMPUTABLE_STATUSES, id__gt=after_id)
+        .only(*HEADER_FIELDS)
+        .order_by("id")[:limit]
+    )
+    if not headers:
+        return {"results": 0, "updated_results": 0, "updated_components": 0, "last_id": None}
+    entries = list(
+        ResultComponentEntry.objects.filter(result_header_id__in=[h.id for h in headers]).only(*ENTRY_FIELDS)
+    )
+    summary = _apply_exam_outcomes(exam, headers, entries, refresh_totals=refresh_totals)
+    summary["last_id"] = headers[-1].id
+    return summary
@@ -5,9 +5,12 @@ from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.permissions import PermissionTaskRequired
 from sims_backend.common_permissions import IsAdminOrCoordinator
+from sims_backend.exams.analytics import get_exam_analytics
 from sims_backend.exams.models import Exam, ExamComponent
-from sims_backend.exams.serializers import ExamComponentSerializer, ExamSerializer
+from sims_backend.exams.serializers import ExamComponentSerializer, ExamSerializer, ResultRecomputeJobSerializer
+from sims_backend.exams.services import recompute_exam_results
 
 
 class ExamViewSet(viewsets.ModelViewSet):
@@ -21,8 +24,11 @@ class ExamViewSet(viewsets.ModelViewSet):
     ordering = ["-scheduled_at", "title"]
 
     def get_permissions(self):
-        if self.action == "publish":
+        if self.action in ["publish", "recompute", "recompute_jobs"]:
             return [IsAuthenticated(), IsAdminOrCoordinator()]  # Only Admin/Coordinator can publish
+        if self.action == "analytics":
+            self.required_tasks = ["results.result_headers.view"]
+            return [IsAuthenticated(), PermissionTaskRequired()]
         # OfficeAssistant, Admin, Coordinator can CRUD
         return [IsAuthenticated()]
 
@@ -35,6 +41,25 @@ class ExamViewSet(viewsets.ModelViewSet):
         exam.save()
         return Response(ExamSerializer(exam).data, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=["post"], url_path="recompute")
+    def recompute(self, request, pk=None):
+        """Recompute outcomes for all draft/verified results of this exam - Admin/Coordinator only"""
+        exam = self.get_object()
+        return Response(recompute_exam_results(exam, refresh_totals=True), status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"], url_path="recompute-jobs")
+    def recompute_jobs(self, request, pk=None):
+        """Recent background recomputes triggered by pass-rule changes, newest first"""
+        exam = self.get_object()
+        jobs = exam.recompute_jobs.order_by("-created_at", "-id")[:20]
+        return Response(ResultRecomputeJobSerializer(jobs, many=True).data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"], url_path="analytics")
+    def analytics(self, request, pk=None):
+        """Score distribution, pass rates and per-component statistics for this exam"""
+        exam = self.get_object()
+        return Response(get_exam_analytics(exam), status=status.HTTP_200_OK)
+
 
 class ExamComponentViewSet(viewsets.ModelViewSet):
     queryset = ExamComponent.objects.select_related("exam", "department").all()
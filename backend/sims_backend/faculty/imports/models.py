@@ -12,13 +12,19 @@ class FacultyImportJob(TimeStampedModel):
 
     STATUS_PENDING = "PENDING"
     STATUS_PREVIEWED = "PREVIEWED"
+    STATUS_QUEUED = "QUEUED"
+    STATUS_RUNNING = "RUNNING"
     STATUS_COMMITTED = "COMMITTED"
+    STATUS_CANCELLED = "CANCELLED"
     STATUS_FAILED = "FAILED"
 
     STATUS_CHOICES = [
         (STATUS_PENDING, "Pending"),
         (STATUS_PREVIEWED, "Previewed"),
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
         (STATUS_COMMITTED, "Committed"),
+        (STATUS_CANCELLED, "Cancelled"),
         (STATUS_FAILED, "Failed"),
     ]
 
@@ -90,6 +96,14 @@ class FacultyImportJob(TimeStampedModel):
         default=0,
         help_text="Number of rows that failed during commit",
     )
+    processed_rows = models.PositiveIntegerField(
+        default=0,
+        help_text="Rows handled by committed chunks so far (the resume point)",
+    )
+    cancel_requested = models.BooleanField(
+        default=False,
+        help_text="Stop the commit after the current chunk",
+    )
     error_report_file = models.FileField(
         upload_to="imports/faculty/errors/%Y/%m/%d/",
         null=True,
@@ -8,7 +8,7 @@ from sims_backend.faculty.imports.models import FacultyImportJob
 class PreviewRequestSerializer(serializers.Serializer):
     """Serializer for preview request"""
 
-    file = serializers.FileField(help_text="CSV file to import")
+    file = serializers.FileField(help_text="CSV or XLSX file to import")
     mode = serializers.ChoiceField(
         choices=FacultyImportJob.MODE_CHOICES,
         default=FacultyImportJob.MODE_CREATE_ONLY,
@@ -56,6 +56,8 @@ class CommitResponseSerializer(serializers.Serializer):
 
     import_job_id = serializers.UUIDField()
     status = serializers.CharField()
+    processed_rows = serializers.IntegerField()
+    total_rows = serializers.IntegerField()
     created_count = serializers.IntegerField()
     updated_count = serializers.IntegerField()
     failed_count = serializers.IntegerField()
@@ -85,6 +87,8 @@ class FacultyImportJobSerializer(serializers.ModelSerializer):
             "created_count",
             "updated_count",
             "failed_count",
+            "processed_rows",
+            "cancel_requested",
             "error_report_file",
             "summary",
         ]
@@ -100,6 +104,8 @@ class FacultyImportJobSerializer(serializers.ModelSerializer):
             "created_count",
             "updated_count",
             "failed_count",
+            "processed_rows",
+            "cancel_requested",
             "error_report_file",
             "summary",
         ]
@@ -1,23 +1,29 @@
 """Faculty CSV import service - core business logic"""
 
-import io
 import re
+from collections.abc import Iterable
 from typing import Any
 
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Group
 from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.utils import timezone
 
 from core.models import FacultyProfile
 from sims_backend.academics.models import Department
 from sims_backend.faculty.imports.models import FacultyImportJob
 from sims_backend.faculty.imports.templates import get_expected_columns
-from sims_backend.faculty.imports.utils import (
-    normalize_row,
-    parse_csv_file,
-    safe_csv_export,
+from sims_backend.faculty.imports.utils import normalize_row
+from sims_backend.students.imports.ingest import UploadReader
+from sims_backend.students.imports.jobs import (
+    IMPORT_CHUNK_SIZE,
+    append_error_rows,
+    queue_import_job,
+    record_chunk,
+    run_import_job,
 )
+from sims_backend.students.imports.provisioning import add_users_to_group, hash_passwords
 from sims_backend.students.imports.validators import (
     validate_email_format,
     validate_field_lengths,
@@ -141,74 +147,61 @@ class FacultyImportService:
         return "faculty123"
 
     @staticmethod
-    def _create_faculty_user(
-        name: str, email: str, department: Department | None = None, password: str | None = None
-    ) -> tuple[User, bool]:
-        """
-        Create a user account for a faculty member.
-
-        Args:
-            name: Full name of faculty
-            email: Email address
-            department: Department object (optional)
+    def _accounts_by_email(rows: list[dict[str, str]]) -> dict[str, User]:
+        """Existing users (with their faculty profile) for every email in ``rows``, in one query."""
+        emails = set()
+        for row in rows:
+            name = (row.get("name") or "").strip()
+            if name:
+                emails.add(((row.get("email") or "").strip() or FacultyImportService._generate_email(name)).lower())
+        users = (
+            User.objects.annotate(email_key=Lower("email"))
+            .filter(email_key__in=emails)
+            .select_related("faculty_profile")
+            .order_by("-id")
+        )
+        return {account.email_key: account for account in users}
 
-        Returns:
-            Tuple[User, bool]: (user_object, created_flag)
+    @staticmethod
+    def _plan_faculty_accounts(
+        pending: list[tuple[str, str, Department | None, str | None, User | None]], max_workers: int | None = None
+    ) -> tuple[list[tuple[User, Department | None]], list[User]]:
         """
-        # Extract name parts for username/email generation
-        first_name, last_name = FacultyImportService._extract_name_parts(name)
-
-        # Generate username: firstname.lastname
-        username = FacultyImportService._generate_username(name)
-
-        # Ensure username is unique
-        base_username = username
-        counter = 1
-        while User.objects.filter(username=username).exists():
-            username = f"{base_username}{counter}"
-            counter += 1
-
-        # Use provided password or generate one
-        if not password or not password.strip():
-            password = FacultyImportService._generate_password()
+        Work out the user account of each new faculty member and hash the new passwords, without writing anything.
 
-        # Check if user already exists by email
-        user = None
-        created = False
-        try:
-            user = User.objects.get(email__iexact=email)
-            # User exists, update username if different
-            if user.username != username:
-                # Check if new username is available
-                if not User.objects.filter(username=username).exists():
-                    user.username = username
-                    user.save(update_fields=["username"])
-        except User.DoesNotExist:
-            # Create new user
-            user = User.objects.create_user(
-                username=username,
-                email=email,
-                password=password,
-                first_name=first_name.capitalize(),
-                last_name=last_name.title(),
-            )
-            created = True
-
-        # Ensure user is in Faculty group
-        faculty_group, _ = Group.objects.get_or_create(name="FACULTY")
-        user.groups.add(faculty_group)
-
-        # Create or update FacultyProfile
-        faculty_profile, profile_created = FacultyProfile.objects.get_or_create(
-            user=user, defaults={"department": department}
-        )
-
-        # Update department if provided and different
-        if department and faculty_profile.department != department:
-            faculty_profile.department = department
-            faculty_profile.save(update_fields=["department"])
+        ``pending`` holds (name, email, department, custom password, existing user) tuples.
+        Usernames are made unique with a numeric suffix (``john.smith``, ``john.smith1``, ...)
+        against one query for every taken username with the same prefixes. Returns the
+        (user, department) pairs needing a faculty profile and the unsaved new users.
+        """
+        bases = {FacultyImportService._generate_username(name) for name, _, _, _, account in pending if account is None}
+        taken = set()
+        if bases:
+            prefixes = Q()
+            for base in bases:
+                prefixes |= Q(username__startswith=base)
+            taken = set(User.objects.filter(prefixes).values_list("username", flat=True))
+
+        links, new_users, new_passwords = [], [], []
+        for name, email, department, password, account in pending:
+            if account is None:
+                base_username = username = FacultyImportService._generate_username(name)
+                counter = 1
+                while username in taken:
+                    username = f"{base_username}{counter}"
+                    counter += 1
+                taken.add(username)
+                first_name, last_name = FacultyImportService._extract_name_parts(name)
+                account = User(
+                    username=username, email=email, first_name=first_name.capitalize(), last_name=last_name.title()
+                )
+                new_users.append(account)
+                new_passwords.append(password or FacultyImportService._generate_password())
+            links.append((account, department))
 
-        return user, created
+        for account, hashed in zip(new_users, hash_passwords(new_passwords, max_workers), strict=True):
+            account.password = hashed
+        return links, new_users
 
     @staticmethod
     def preview(file, user, mode: str = FacultyImportJob.MODE_CREATE_ONLY) -> dict[str, Any]:
@@ -224,8 +217,18 @@ class FacultyImportService:
             status=FacultyImportJob.STATUS_PENDING,
         )
 
-        # Compute file hash
-        file_hash = FacultyImportJob.compute_file_hash(file)
+        # Save file
+        import_job.file.save(file.name, file, save=True)
+
+        # Parse the CSV/XLSX and hash it in the same pass
+        reader = UploadReader(file)
+        try:
+            rows = list(reader)
+        except Exception as e:
+            import_job.status = FacultyImportJob.STATUS_FAILED
+            import_job.save()
+            raise ValueError(f"Failed to parse file: {str(e)}")
+        file_hash = reader.hexdigest()
         import_job.file_hash = file_hash
 
         # Check for duplicate file hash (warn but don't block)
@@ -235,17 +238,6 @@ class FacultyImportService:
             .first()
         )
 
-        # Save file
-        import_job.file.save(file.name, file, save=True)
-
-        # Parse CSV
-        try:
-            rows = parse_csv_file(import_job.file)
-        except Exception as e:
-            import_job.status = FacultyImportJob.STATUS_FAILED
-            import_job.save()
-            raise ValueError(f"Failed to parse CSV file: {str(e)}")
-
         # Validate rows
         preview_rows = []
         seen_emails = {}
@@ -330,7 +322,7 @@ class FacultyImportService:
                 preview_data["_generated_email"] = generated_email
 
                 # Generate password (use provided password if available, otherwise generate)
-                provided_password = normalized_row.get("password", "").strip()
+                provided_password = (normalized_row.get("password") or "").strip()
                 generated_password = (
                     provided_password if provided_password else FacultyImportService._generate_password()
                 )
@@ -370,33 +362,66 @@ class FacultyImportService:
         return response
 
     @staticmethod
-    @transaction.atomic
-    def commit(import_job_id: str, user) -> dict[str, Any]:
+    def queue_commit(import_job_id: str, enqueue: bool = True) -> FacultyImportJob:
+        """Phase 2: Queue a previewed job for a background, chunked commit (see ``students.imports.jobs``)."""
+        return queue_import_job(
+            FacultyImportJob,
+            import_job_id,
+            run_faculty_import_job,
+            [FacultyImportJob.STATUS_PREVIEWED],
+            enqueue=enqueue,
+        )
+
+    @staticmethod
+    def commit(
+        import_job_id: str, user, max_workers: int | None = None, chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> dict[str, Any]:
         """
-        Phase 2: Commit validated rows to database.
+        Phase 2, in process: queue the job and commit it right away, chunk by chunk.
         Only processes rows that were marked as valid in preview.
         """
-        try:
-            import_job = FacultyImportJob.objects.get(id=import_job_id)
-        except FacultyImportJob.DoesNotExist:
-            raise ValueError(f"FacultyImportJob {import_job_id} not found")
+        job = FacultyImportService.queue_commit(import_job_id, enqueue=False)
+        return run_faculty_import_job(job.id, chunk_size=chunk_size, max_workers=max_workers)
+
+    @staticmethod
+    def _row_email(normalized_row: dict[str, str]) -> str:
+        provided_email = normalized_row.get("email", "").strip()
+        return provided_email or FacultyImportService._generate_email(normalized_row.get("name", "").strip())
+
+    @staticmethod
+    def replay(job: FacultyImportJob, rows: Iterable[dict[str, str]]) -> dict[str, Any]:
+        """Rebuild the file-wide duplicate check from the rows committed before a resume."""
+        seen_emails = {}
+        for idx, row in enumerate(rows):
+            normalized_row = normalize_row(row)
+            if not validate_required_fields(normalized_row, idx + 2):
+                check_duplicate_in_file(FacultyImportService._row_email(normalized_row), idx, seen_emails)
+        return {"seen_emails": seen_emails}
 
-        # Ensure job is in PREVIEWED status
-        if import_job.status != FacultyImportJob.STATUS_PREVIEWED:
-            raise ValueError(f"FacultyImportJob must be in PREVIEWED status. Current status: {import_job.status}")
+    @staticmethod
+    def commit_chunk(
+        job: FacultyImportJob,
+        rows: list[dict[str, str]],
+        start: int,
+        state: dict[str, Any],
+        max_workers: int | None = None,
+    ) -> None:
+        """
+        Re-validate and commit one chunk of rows (file rows ``start`` onward) in one transaction.
 
-        # Re-parse and re-validate (for safety)
-        rows = parse_csv_file(import_job.file)
+        Passwords of new accounts are hashed (in parallel) before the transaction opens.
+        """
+        chunk = [normalize_row(row) for row in rows]
+        accounts_by_email = FacultyImportService._accounts_by_email(chunk)
 
         created_count = 0
         updated_count = 0
         failed_count = 0
         error_rows = []
-        seen_emails = {}
+        profiles_to_update, pending_accounts = [], []
 
-        for idx, row in enumerate(rows):
+        for idx, normalized_row in enumerate(chunk, start=start):
             row_num = idx + 2
-            normalized_row = normalize_row(row)
 
             # Quick validation (same as preview)
             errors = []
@@ -413,10 +438,9 @@ class FacultyImportService:
                 continue
 
             name = normalized_row.get("name", "").strip()
-            provided_email = normalized_row.get("email", "").strip()
-            email = provided_email if provided_email else FacultyImportService._generate_email(name)
+            email = FacultyImportService._row_email(normalized_row)
 
-            errors.extend(check_duplicate_in_file(email, idx, seen_emails))
+            errors.extend(check_duplicate_in_file(email, idx, state["seen_emails"]))
 
             # Resolve FKs
             department, department_errors = resolve_department(normalized_row.get("department_name"), row_num)
@@ -437,72 +461,52 @@ class FacultyImportService:
                 continue
 
             # Create or update Faculty
-            try:
-                exists, existing_faculty = check_existing_faculty(email, import_job.mode)
-
-                if exists and import_job.mode == FacultyImportJob.MODE_UPSERT:
-                    # Update existing
-                    if existing_faculty:
-                        if department:
-                            existing_faculty.department = department
-                            existing_faculty.save(update_fields=["department"])
-                    updated_count += 1
-                elif not exists:
-                    # Create new
-                    provided_password = normalized_row.get("password", "").strip()
-                    user_obj, user_created = FacultyImportService._create_faculty_user(
-                        name=name,
-                        email=email,
-                        department=department,
-                        password=provided_password if provided_password else None,
-                    )
-                    created_count += 1
-                else:
-                    # CREATE_ONLY mode but faculty exists
-                    failed_count += 1
-                    error_rows.append(
-                        {
-                            **normalized_row,
-                            "error_message": f"Faculty with email '{email}' already exists. Use UPSERT mode to update.",
-                        }
-                    )
-            except Exception as e:
+            account = accounts_by_email.get(email.lower())
+            existing_faculty = getattr(account, "faculty_profile", None) if account else None
+
+            if existing_faculty and job.mode == FacultyImportJob.MODE_UPSERT:
+                # Update existing
+                if department:
+                    existing_faculty.department = department
+                    profiles_to_update.append(existing_faculty)
+                updated_count += 1
+            elif not existing_faculty:
+                # Create new (an existing user with this email but no profile is reused)
+                provided_password = (normalized_row.get("password") or "").strip()
+                pending_accounts.append((name, email, department, provided_password or None, account))
+                created_count += 1
+            else:
+                # CREATE_ONLY mode but faculty exists
                 failed_count += 1
                 error_rows.append(
                     {
                         **normalized_row,
-                        "error_message": f"Database error: {str(e)}",
+                        "error_message": f"Faculty with email '{email}' already exists. Use UPSERT mode to update.",
                     }
                 )
 
-        # Generate error CSV if there are errors
-        error_report_file = None
-        if error_rows:
-            error_fieldnames = get_expected_columns() + ["error_message"]
-            error_csv_content = safe_csv_export(error_rows, error_fieldnames)
-            error_filename = f"errors_{import_job.id}.csv"
-            error_report_file = io.BytesIO(error_csv_content)
-            import_job.error_report_file.save(error_filename, error_report_file, save=False)
-
-        # Update FacultyImportJob
-        import_job.created_count = created_count
-        import_job.updated_count = updated_count
-        import_job.failed_count = failed_count
-        import_job.status = FacultyImportJob.STATUS_COMMITTED
-        import_job.finished_at = timezone.now()
-        import_job.summary = {
-            "created": created_count,
-            "updated": updated_count,
-            "failed": failed_count,
-            "total_processed": created_count + updated_count + failed_count,
-        }
-        import_job.save()
+        # Hash passwords before the transaction opens, then write everything in bulk
+        links, new_users = FacultyImportService._plan_faculty_accounts(pending_accounts, max_workers)
 
-        return {
-            "import_job_id": str(import_job.id),
-            "status": import_job.status,
-            "created_count": created_count,
-            "updated_count": updated_count,
-            "failed_count": failed_count,
-            "has_error_report": error_report_file is not None,
-        }
+        with transaction.atomic():
+            User.objects.bulk_create(new_users)
+            add_users_to_group([account for account, _ in links], "FACULTY")
+            FacultyProfile.objects.bulk_create(
+                [FacultyProfile(user=account, department=department) for account, department in links]
+            )
+            now = timezone.now()
+            for profile in profiles_to_update:
+                profile.updated_at = now
+            FacultyProfile.objects.bulk_update(profiles_to_update, ["department", "updated_at"])
+
+            append_error_rows(job, error_rows, get_expected_columns() + ["error_message"], start)
+            record_chunk(job, start + len(chunk), created_count, updated_count, failed_count)
+
+
+def run_faculty_import_job(
+    job_id: str, chunk_size: int = IMPORT_CHUNK_SIZE, max_workers: int | None = None
+) -> dict[str, Any]:
+    """RQ entry point: commit a queued faculty import job chunk by chunk."""
+    return run_import_job(
+        FacultyImportJob, FacultyImportService, job_id, chunk_size=chunk_size, max_workers=max_workers
+    )
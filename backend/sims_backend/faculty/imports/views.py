@@ -14,8 +14,9 @@ from sims_backend.faculty.imports.serializers import (
     PreviewRequestSerializer,
     PreviewResponseSerializer,
 )
-from sims_backend.faculty.imports.services import FacultyImportService
+from sims_backend.faculty.imports.services import FacultyImportService, run_faculty_import_job
 from sims_backend.faculty.imports.templates import generate_csv_template
+from sims_backend.students.imports.jobs import job_result, request_cancel, resume_import_job
 
 
 class FacultyImportViewSet(viewsets.ViewSet):
@@ -63,14 +64,46 @@ class FacultyImportViewSet(viewsets.ViewSet):
             return Response({"error": "confirm must be True to commit import"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            result = FacultyImportService.commit(str(import_job_id), request.user)
-            response_serializer = CommitResponseSerializer(result)
-            return Response(response_serializer.data, status=status.HTTP_200_OK)
+            job = FacultyImportService.queue_commit(str(import_job_id))
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({"error": f"Unexpected error: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+        # Without Redis the job has already run inline; report its current state either way
+        job.refresh_from_db()
+        response_serializer = CommitResponseSerializer(job_result(job))
+        return Response(response_serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["post"], url_path="cancel")
+    def cancel(self, request, pk=None):
+        """
+        Stop a queued or running commit after its current chunk.
+        Rows already committed stay committed; the job can be resumed later.
+        """
+        if not FacultyImportJob.objects.filter(id=pk, created_by=request.user).exists():
+            return Response({"error": "FacultyImportJob not found"}, status=status.HTTP_404_NOT_FOUND)
+        if not request_cancel(FacultyImportJob, pk):
+            return Response(
+                {"error": "Only queued or running imports can be cancelled"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        job = FacultyImportJob.objects.get(id=pk)
+        return Response(CommitResponseSerializer(job_result(job)).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["post"], url_path="resume")
+    def resume(self, request, pk=None):
+        """
+        Queue a cancelled, failed or stalled commit again; it continues after the last committed chunk.
+        """
+        if not FacultyImportJob.objects.filter(id=pk, created_by=request.user).exists():
+            return Response({"error": "FacultyImportJob not found"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            job = resume_import_job(FacultyImportJob, pk, run_faculty_import_job)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        job.refresh_from_db()
+        return Response(CommitResponseSerializer(job_result(job)).data, status=status.HTTP_202_ACCEPTED)
+
     @action(detail=False, methods=["get"], url_path="template")
     def template(self, request):
         """
@@ -0,0 +1,7 @@
+"""Faculty models.
+
+The import job model lives with the import code; importing it here registers
+it with the app so its table gets a migration.
+"""
+
+from sims_backend.faculty.imports.models import FacultyImportJob  # noqa: F401
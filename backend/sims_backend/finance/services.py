@@ -318,17 +318,13 @@ def reconcile_voucher_status(voucher: Voucher) -> Voucher:
     return voucher
 
 
-def finance_gate_checks(student: Student, term) -> dict:
-    balance = compute_student_balance(student, term)
-    policies = FinancePolicy.objects.filter(is_active=True)
+def _evaluate_gating(outstanding: Decimal, policies) -> dict:
     gating = {
         "can_view_transcript": True,
         "can_view_results": True,
         "can_enroll_next_term": True,
         "reasons": [],
     }
-
-    outstanding = balance["outstanding"]
     for policy in policies:
         if policy.rule_key.upper() == "BLOCK_TRANSCRIPT_IF_DUES":
             if outstanding > policy.threshold_amount:
@@ -342,10 +338,40 @@ def finance_gate_checks(student: Student, term) -> dict:
             if outstanding > policy.threshold_amount:
                 gating["can_enroll_next_term"] = False
                 gating["reasons"].append("Enrollment blocked until dues cleared.")
-    balance["gating"] = gating
+    return gating
+
+
+def finance_gate_checks(student: Student, term) -> dict:
+    balance = compute_student_balance(student, term)
+    policies = FinancePolicy.objects.filter(is_active=True)
+    balance["gating"] = _evaluate_gating(balance["outstanding"], policies)
     return balance
 
 
+def bulk_finance_gate_checks(student_ids: list[int], term=None) -> dict[int, dict]:
+    """
+    finance_gate_checks for many students at once.
+
+    Ledger totals are aggregated per student and entry type in one query and
+    active policies are loaded once. Returns {student_id: {"outstanding", "gating"}}.
+    """
+    qs = LedgerEntry.objects.filter(student_id__in=student_ids, voided_at__isnull=True)
+    if term:
+        qs = qs.filter(term=term)
+    outstanding = dict.fromkeys(student_ids, Decimal("0"))
+    for row in qs.values("student_id", "entry_type").annotate(total=Sum("amount")).order_by():
+        amount = row["total"] or Decimal("0")
+        if row["entry_type"] == LedgerEntry.ENTRY_DEBIT:
+            outstanding[row["student_id"]] += amount
+        elif row["entry_type"] == LedgerEntry.ENTRY_CREDIT:
+            outstanding[row["student_id"]] -= amount
+    policies = list(FinancePolicy.objects.filter(is_active=True))
+    return {
+        student_id: {"outstanding": balance, "gating": _evaluate_gating(balance, policies)}
+        for student_id, balance in outstanding.items()
+    }
+
+
 def defaulters(program: Program | None, term, min_outstanding: Decimal) -> list[dict]:
     students = Student.objects.all()
     if program:
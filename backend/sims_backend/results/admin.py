@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from sims_backend.results.models import ResultComponentEntry, ResultHeader
+from sims_backend.results.models import GradeBand, GradeScale, ResultComponentEntry, ResultHeader
 
 
 class ResultComponentEntryInline(admin.TabularInline):
@@ -12,12 +12,12 @@ class ResultComponentEntryInline(admin.TabularInline):
 
 @admin.register(ResultHeader)
 class ResultHeaderAdmin(admin.ModelAdmin):
-    list_display = ["student", "exam", "total_obtained", "total_max", "final_outcome", "status"]
+    list_display = ["student", "exam", "total_obtained", "total_max", "final_outcome", "grade", "rank", "status"]
     list_filter = ["status", "final_outcome", "exam"]
     search_fields = ["student__reg_no", "student__name", "exam__title"]
     ordering = ["exam", "student"]
     inlines = [ResultComponentEntryInline]
-    readonly_fields = ["final_outcome"]
+    readonly_fields = ["final_outcome", "grade", "rank", "percentile"]
 
 
 @admin.register(ResultComponentEntry)
@@ -27,3 +27,18 @@ class ResultComponentEntryAdmin(admin.ModelAdmin):
     search_fields = ["result_header__student__reg_no", "exam_component__name"]
     ordering = ["result_header", "exam_component__sequence"]
     readonly_fields = ["component_outcome"]
+
+
+class GradeBandInline(admin.TabularInline):
+    model = GradeBand
+    extra = 0
+    fields = ["grade", "min_percent", "grade_point"]
+
+
+@admin.register(GradeScale)
+class GradeScaleAdmin(admin.ModelAdmin):
+    list_display = ["name", "exam", "program", "is_active"]
+    list_filter = ["is_active", "program"]
+    search_fields = ["name", "exam__title", "program__name"]
+    ordering = ["name"]
+    inlines = [GradeBandInline]
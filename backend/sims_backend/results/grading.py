@@ -0,0 +1,185 @@
+"""Grade scales: single-score lookup and whole-exam grade, rank and percentile assignment."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from sims_backend.exams.logic import to_hundredths
+from sims_backend.exams.models import Exam
+from sims_backend.exams.services import RECOMPUTABLE_STATUSES
+from sims_backend.results.models import GradeScale, ResultHeader
+
+# Used when no active GradeScale applies
+DEFAULT_BANDS = [
+    ("A+", 90),
+    ("A", 85),
+    ("B+", 80),
+    ("B", 75),
+    ("C+", 70),
+    ("C", 65),
+    ("D", 60),
+    ("F", 0),
+]
+
+RANK_COMPETITION = "competition"  # 1, 2, 2, 4
+RANK_DENSE = "dense"  # 1, 2, 2, 3
+RANK_METHODS = [RANK_COMPETITION, RANK_DENSE]
+
+
+class GradeLookup:
+    """Grade bands sorted by minimum percentage, searched with bisect."""
+
+    def __init__(self, bands: Iterable[tuple[str, Decimal | int | str]], name: str = "Default"):
+        ordered = sorted((Decimal(str(min_percent)), grade) for grade, min_percent in bands)
+        self.name = name
+        self.thresholds = [min_percent for min_percent, _grade in ordered]
+        self.grades = [grade for _min_percent, grade in ordered]
+
+    @classmethod
+    def for_scale(cls, scale: GradeScale) -> GradeLookup:
+        """Build a lookup from a scale whose bands are already prefetched."""
+        return cls(((band.grade, band.min_percent) for band in scale.bands.all()), name=scale.name)
+
+    def grade_for(self, percent) -> str:
+        """Grade for a single percentage; empty if it is below every band."""
+        index = bisect_right(self.thresholds, Decimal(str(percent))) - 1
+        return self.grades[index] if index >= 0 else ""
+
+    def grades_for(self, obtained: np.ndarray, maximum: np.ndarray) -> np.ndarray:
+        """Grades for arrays of obtained/maximum hundredths.
+
+        Band thresholds are compared as ``obtained * 10000 >= percent * maximum``
+        in integers, so boundary scores land exactly like ``grade_for``.
+        Results without a maximum get an empty grade.
+        """
+        thresholds = np.array([to_hundredths(t) for t in self.thresholds], dtype=np.int64)
+        met = (obtained[:, None] * 10000 >= thresholds[None, :] * maximum[:, None]).sum(axis=1)
+        grades = np.array(["", *self.grades], dtype=object)
+        return np.where(maximum > 0, grades[met], "")
+
+
+DEFAULT_GRADE_LOOKUP = GradeLookup(DEFAULT_BANDS)
+
+
+def exam_grade_lookups(exam: Exam) -> tuple[GradeLookup | None, dict[int, GradeLookup], GradeLookup]:
+    """Active scales for an exam: (exam scale, program scales by program id, default scale).
+
+    Loads every candidate scale and its bands in two queries. When several
+    active scales share a scope, the most recently updated one wins.
+    """
+    scales = (
+        GradeScale.objects.filter(is_active=True)
+        .filter(Q(exam=exam) | Q(exam__isnull=True))
+        .order_by("-updated_at", "-id")
+        .prefetch_related("bands")
+    )
+    exam_lookup = None
+    program_lookups: dict[int, GradeLookup] = {}
+    default_lookup = None
+    for scale in scales:
+        if scale.exam_id is not None:
+            exam_lookup = exam_lookup or GradeLookup.for_scale(scale)
+        elif scale.program_id is not None:
+            program_lookups.setdefault(scale.program_id, GradeLookup.for_scale(scale))
+        elif default_lookup is None:
+            default_lookup = GradeLookup.for_scale(scale)
+    return exam_lookup, program_lookups, default_lookup or DEFAULT_GRADE_LOOKUP
+
+
+def rank_scores(scores: np.ndarray, method: str = RANK_COMPETITION) -> np.ndarray:
+    """1-based ranks, highest score first; ties share a rank."""
+    if method not in RANK_METHODS:
+        raise ValueError(f"Unknown rank method: {method}")
+    ordered = np.unique(scores) if method == RANK_DENSE else np.sort(scores)
+    return len(ordered) - np.searchsorted(ordered, scores, side="right") + 1
+
+
+def percentile_ranks(scores: np.ndarray) -> np.ndarray:
+    """Percentage of scores at or below each score."""
+    if not scores.size:
+        return np.zeros(0)
+    return np.searchsorted(np.sort(scores), scores, side="right") / scores.size * 100
+
+
+def assign_exam_grades(exam: Exam, rank_method: str = RANK_COMPETITION) -> dict:
+    """
+    Assign grade, rank and percentile to every result of an exam.
+
+    The whole cohort is ranked on total percentage (results without a
+    maximum are left unranked), but only draft/verified results are written,
+    with a single bulk_update of the rows that changed. Each result is graded
+    on the exam's scale, else its student's program scale, else the default.
+    """
+    if rank_method not in RANK_METHODS:
+        raise ValueError(f"Unknown rank method: {rank_method}")
+    exam_lookup, program_lookups, default_lookup = exam_grade_lookups(exam)
+    rows = list(
+        ResultHeader.objects.filter(exam=exam)
+        .order_by("id")
+        .values_list(
+            "id", "student__program_id", "total_obtained", "total_max", "status", "grade", "rank", "percentile"
+        )
+    )
+    obtained = np.array([to_hundredths(r[2]) for r in rows], dtype=np.int64)
+    maximum = np.array([to_hundredths(r[3]) for r in rows], dtype=np.int64)
+    programs = np.array([r[1] for r in rows], dtype=np.int64)
+
+    grades = np.full(len(rows), "", dtype=object)
+    scales_used = set()
+    if exam_lookup is not None:
+        grades = exam_lookup.grades_for(obtained, maximum)
+        scales_used.add(exam_lookup.name)
+    else:
+        fallback = np.ones(len(rows), dtype=bool)
+        for program_id, lookup in program_lookups.items():
+            mask = programs == program_id
+            if mask.any():
+                grades[mask] = lookup.grades_for(obtained[mask], maximum[mask])
+                fallback &= ~mask
+                scales_used.add(lookup.name)
+        if fallback.any():
+            grades[fallback] = default_lookup.grades_for(obtained[fallback], maximum[fallback])
+            scales_used.add(default_lookup.name)
+
+    scored = maximum > 0
+    ranks = np.zeros(len(rows), dtype=np.int64)
+    percentiles = np.full(len(rows), np.nan)
+    scores = obtained[scored] / maximum[scored]
+    ranks[scored] = rank_scores(scores, rank_method)
+    percentiles[scored] = percentile_ranks(scores)
+
+    # bulk_update bypasses auto_now, so stamp updated_at explicitly
+    now = timezone.now()
+    changed = []
+    skipped = 0
+    for index, (header_id, _program, _obtained, _max, status, grade, rank, percentile) in enumerate(rows):
+        if status not in RECOMPUTABLE_STATUSES:
+            skipped += 1
+            continue
+        new_rank = int(ranks[index]) if scored[index] else None
+        new_percentile = Decimal(f"{percentiles[index]:.2f}") if scored[index] else None
+        if (grade, rank, percentile) != (grades[index], new_rank, new_percentile):
+            changed.append(
+                ResultHeader(
+                    id=header_id, grade=grades[index], rank=new_rank, percentile=new_percentile, updated_at=now
+                )
+            )
+
+    with transaction.atomic():
+        ResultHeader.objects.bulk_update(changed, ["grade", "rank", "percentile", "updated_at"], batch_size=1000)
+
+    return {
+        "results": len(rows),
+        "ranked": int(scored.sum()),
+        "updated": len(changed),
+        "skipped": skipped,
+        "rank_method": rank_method,
+        "scales": sorted(scales_used),
+    }
@@ -0,0 +1,256 @@
+"""Exam-level marks grid import (reg_no x component columns, CSV or XLSX)."""
+
+from __future__ import annotations
+
+import codecs
+import csv
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from sims_backend.exams.models import Exam, ExamComponent
+from sims_backend.exams.services import recompute_exam_results
+from sims_backend.results.models import ResultComponentEntry, ResultHeader
+from sims_backend.students.models import Student
+
+MAX_GRID_FILE_SIZE = 10 * 1024 * 1024
+# Only the first few changes are echoed back in the dry-run diff; counts cover everything
+MAX_DIFF_ROWS = 500
+XLSX_MAGIC = b"PK\x03\x04"
+
+
+class MarksImportError(ValueError):
+    """Raised when an uploaded grid cannot be read at all."""
+
+
+@dataclass
+class MarksImportPlan:
+    """Validated cells of a grid, plus the diff against stored marks."""
+
+    exam: Exam
+    # (student_id, component_id) -> marks, for cells that are new or changed
+    cells: dict[tuple[int, int], Decimal] = field(default_factory=dict)
+    students: dict[int, str] = field(default_factory=dict)  # student_id -> reg_no
+    errors: list[dict] = field(default_factory=list)
+    changes: list[dict] = field(default_factory=list)
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    new_results: int = 0
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+    def summary(self) -> dict:
+        return {
+            "students": len(self.students),
+            "cells": len(self.cells),
+            "new_results": self.new_results,
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "errors": self.errors,
+            "changes": self.changes[:MAX_DIFF_ROWS],
+        }
+
+
+def read_marks_grid(file_obj) -> list[list[str]]:
+    """Read an uploaded CSV or XLSX grid into rows of strings (header row first)."""
+    file_obj.seek(0)
+    is_xlsx = file_obj.read(4) == XLSX_MAGIC
+    file_obj.seek(0)
+    if is_xlsx:
+        from openpyxl import load_workbook
+
+        try:
+            workbook = load_workbook(file_obj, read_only=True, data_only=True)
+        except Exception as exc:
+            raise MarksImportError(f"Could not read workbook: {exc}") from exc
+        try:
+            sheet = workbook.worksheets[0]
+            return [
+                ["" if value is None else str(value).strip() for value in row]
+                for row in sheet.iter_rows(values_only=True)
+            ]
+        finally:
+            workbook.close()
+
+    text_stream = codecs.iterdecode(file_obj, "utf-8-sig", errors="replace")
+    return [[value.strip() for value in row] for row in csv.reader(text_stream)]
+
+
+def _resolve_columns(
+    header: list[str], components: list[ExamComponent], errors: list[dict]
+) -> dict[int, ExamComponent]:
+    by_name = {c.name.strip().lower(): c for c in components}
+    by_sequence = {str(c.sequence): c for c in components}
+    columns: dict[int, ExamComponent] = {}
+    seen: set[int] = set()
+    for index, title in enumerate(header[1:], start=1):
+        if not title:
+            continue
+        component = by_name.get(title.lower()) or by_sequence.get(title)
+        if component is None:
+            errors.append({"row": 1, "column": title, "message": "Unknown exam component"})
+        elif component.id in seen:
+            errors.append({"row": 1, "column": title, "message": "Duplicate component column"})
+        else:
+            seen.add(component.id)
+            columns[index] = component
+    return columns
+
+
+def _parse_marks(raw: str, component: ExamComponent) -> tuple[Decimal | None, str | None]:
+    try:
+        marks = Decimal(raw)
+    except InvalidOperation:
+        return None, "Marks must be a number"
+    if not marks.is_finite() or marks.as_tuple().exponent < -2:
+        return None, "Marks may have at most 2 decimal places"
+    if marks < 0 or marks > component.max_marks:
+        return None, f"Marks must be between 0 and {component.max_marks}"
+    return marks.quantize(Decimal("0.01")), None
+
+
+def plan_marks_import(exam: Exam, rows: list[list[str]]) -> MarksImportPlan:
+    """Validate a grid in memory and diff it against stored marks.
+
+    Students, the exam's components, its result headers and their entries are
+    each loaded with one query. Blank cells leave stored marks untouched.
+    """
+    plan = MarksImportPlan(exam=exam)
+    if not rows or not rows[0] or rows[0][0].strip().lower() not in ("reg_no", "roll_no"):
+        plan.errors.append({"row": 1, "message": "First column must be reg_no"})
+        return plan
+
+    components = list(exam.components.all())
+    columns = _resolve_columns(rows[0], components, plan.errors)
+    reg_nos = {row[0] for row in rows[1:] if row and row[0]}
+    students = dict(Student.objects.filter(reg_no__in=reg_nos).values_list("reg_no", "id"))
+    headers = {
+        student_id: (header_id, header_status)
+        for student_id, header_id, header_status in ResultHeader.objects.filter(
+            exam=exam, student_id__in=students.values()
+        ).values_list("student_id", "id", "status")
+    }
+    existing = {
+        (header_id, component_id): marks
+        for header_id, component_id, marks in ResultComponentEntry.objects.filter(
+            result_header__exam=exam, result_header__student_id__in=students.values()
+        ).values_list("result_header_id", "exam_component_id", "marks_obtained")
+    }
+
+    seen: set[str] = set()
+    for row_number, row in enumerate(rows[1:], start=2):
+        if not any(row):
+            continue
+        reg_no = row[0]
+        if not reg_no:
+            plan.errors.append({"row": row_number, "message": "Missing reg_no"})
+            continue
+        if reg_no in seen:
+            plan.errors.append({"row": row_number, "reg_no": reg_no, "message": "Duplicate reg_no"})
+            continue
+        seen.add(reg_no)
+        student_id = students.get(reg_no)
+        if student_id is None:
+            plan.errors.append({"row": row_number, "reg_no": reg_no, "message": "Unknown student"})
+            continue
+        header_id, header_status = headers.get(student_id, (None, None))
+        if header_status not in (None, ResultHeader.STATUS_DRAFT):
+            plan.errors.append(
+                {"row": row_number, "reg_no": reg_no, "message": f"Result is {header_status} and cannot be edited"}
+            )
+            continue
+
+        plan.students[student_id] = reg_no
+        if header_id is None:
+            plan.new_results += 1
+        for index, component in columns.items():
+            raw = row[index] if index < len(row) else ""
+            if not raw:
+                continue
+            marks, error = _parse_marks(raw, component)
+            if error:
+                plan.errors.append({"row": row_number, "reg_no": reg_no, "column": component.name, "message": error})
+                continue
+            old = existing.get((header_id, component.id)) if header_id else None
+            if old is None:
+                plan.created += 1
+            elif old != marks:
+                plan.updated += 1
+            else:
+                plan.unchanged += 1
+                continue
+            plan.cells[(student_id, component.id)] = marks
+            plan.changes.append(
+                {
+                    "reg_no": reg_no,
+                    "component": component.name,
+                    "old": None if old is None else str(old),
+                    "new": str(marks),
+                }
+            )
+    return plan
+
+
+def commit_marks_import(plan: MarksImportPlan) -> dict:
+    """Upsert every header and entry in the plan, then recompute totals and outcomes once."""
+    if not plan.is_valid:
+        raise MarksImportError("Cannot commit a grid with validation errors")
+    exam = plan.exam
+    now = timezone.now()
+    total_max = sum((c.max_marks for c in exam.components.all()), Decimal("0"))
+
+    with transaction.atomic():
+        ResultHeader.objects.bulk_create(
+            [ResultHeader(exam=exam, student_id=student_id) for student_id in plan.students],
+            update_conflicts=True,
+            unique_fields=["exam", "student"],
+            update_fields=["updated_at"],
+        )
+        header_ids = dict(
+            ResultHeader.objects.filter(exam=exam, student_id__in=plan.students).values_list("student_id", "id")
+        )
+        ResultComponentEntry.objects.bulk_create(
+            [
+                ResultComponentEntry(
+                    result_header_id=header_ids[student_id], exam_component_id=component_id, marks_obtained=marks
+                )
+                for (student_id, component_id), marks in plan.cells.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["result_header", "exam_component"],
+            update_fields=["marks_obtained", "updated_at"],
+            batch_size=1000,
+        )
+
+        entry_totals = (
+            ResultComponentEntry.objects.filter(result_header=OuterRef("pk"))
+            .order_by()
+            .values("result_header")
+            .annotate(total=Sum("marks_obtained"))
+            .values("total")
+        )
+        ResultHeader.objects.filter(id__in=header_ids.values()).update(
+            total_obtained=Coalesce(
+                Subquery(entry_totals), Value(Decimal("0")), output_field=DecimalField(max_digits=10, decimal_places=2)
+            ),
+            total_max=total_max,
+            updated_at=now,
+        )
+        outcomes = recompute_exam_results(exam)
+
+    return {
+        "results": len(header_ids),
+        "new_results": plan.new_results,
+        "created": plan.created,
+        "updated": plan.updated,
+        "unchanged": plan.unchanged,
+        "outcomes": outcomes,
+    }
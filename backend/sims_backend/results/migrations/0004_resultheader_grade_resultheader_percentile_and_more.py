@@ -0,0 +1,144 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:37
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academics", "0009_alter_batch_start_year"),
+        ("exams", "0001_initial"),
+        ("results", "0003_resultheader_frozen_at_resultheader_frozen_by_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resultheader",
+            name="grade",
+            field=models.CharField(
+                blank=True, help_text="Letter grade from the applicable grade scale (computed)", max_length=8
+            ),
+        ),
+        migrations.AddField(
+            model_name="resultheader",
+            name="percentile",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                help_text="Percentage of the exam cohort scoring at or below this result (computed)",
+                max_digits=5,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="resultheader",
+            name="rank",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Position within the exam cohort by total percentage (computed)", null=True
+            ),
+        ),
+        migrations.CreateModel(
+            name="GradeScale",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, help_text="The timestamp when the record was created."),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, help_text="The timestamp when the record was last updated."),
+                ),
+                ("name", models.CharField(help_text="Grade scale name", max_length=128)),
+                ("is_active", models.BooleanField(default=True, help_text="Inactive scales are ignored when grading")),
+                (
+                    "exam",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Exam this scale applies to (takes precedence over program scales)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grade_scales",
+                        to="exams.exam",
+                    ),
+                ),
+                (
+                    "program",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Program this scale applies to (leave exam and program empty for the default scale)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grade_scales",
+                        to="academics.program",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="GradeBand",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, help_text="The timestamp when the record was created."),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, help_text="The timestamp when the record was last updated."),
+                ),
+                ("grade", models.CharField(help_text="Letter grade (e.g., 'A+', 'B')", max_length=8)),
+                (
+                    "min_percent",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Minimum percentage (inclusive) for this grade",
+                        max_digits=5,
+                        validators=[
+                            django.core.validators.MinValueValidator(0),
+                            django.core.validators.MaxValueValidator(100),
+                        ],
+                    ),
+                ),
+                (
+                    "grade_point",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        help_text="Grade point for this band (optional)",
+                        max_digits=4,
+                        null=True,
+                        validators=[django.core.validators.MinValueValidator(0)],
+                    ),
+                ),
+                (
+                    "scale",
+                    models.ForeignKey(
+                        help_text="Grade scale this band belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bands",
+                        to="results.gradescale",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["scale", "-min_percent"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="gradescale",
+            index=models.Index(fields=["exam", "is_active"], name="results_gra_exam_id_d4f223_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="gradescale",
+            index=models.Index(fields=["program", "is_active"], name="results_gra_program_efe0e8_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="gradeband",
+            unique_together={("scale", "grade"), ("scale", "min_percent")},
+        ),
+    ]
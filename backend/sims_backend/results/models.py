@@ -1,5 +1,5 @@
 from django.conf import settings
-from django.core.validators import MinValueValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.utils import timezone
 
@@ -95,6 +95,23 @@ class ResultHeader(TimeStampedModel):
         related_name="frozen_results",
         help_text="User who froze the result",
     )
+    grade = models.CharField(
+        max_length=8,
+        blank=True,
+        help_text="Letter grade from the applicable grade scale (computed)",
+    )
+    rank = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Position within the exam cohort by total percentage (computed)",
+    )
+    percentile = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Percentage of the exam cohort scoring at or below this result (computed)",
+    )
 
     class Meta:
         unique_together = [("exam", "student")]
@@ -131,6 +148,7 @@ class ResultHeader(TimeStampedModel):
         self.published_at = timezone.now()
         self.published_by = user
         self.save()
+        self._invalidate_transcripts()
 
     def freeze(self, user) -> None:
         """Freeze the result (make immutable)."""
@@ -140,6 +158,13 @@ class ResultHeader(TimeStampedModel):
         self.frozen_at = timezone.now()
         self.frozen_by = user
         self.save()
+        self._invalidate_transcripts()
+
+    def _invalidate_transcripts(self) -> None:
+        """Released results changed, so the student's stored transcript is out of date."""
+        from sims_backend.transcripts.artifacts import invalidate_transcript_artifacts
+
+        invalidate_transcript_artifacts([self.student_id])
 
 
 class ResultError(Exception):
@@ -199,3 +224,78 @@ class ResultComponentEntry(TimeStampedModel):
 
     def __str__(self):
         return f"{self.result_header} - {self.exam_component.name} ({self.marks_obtained})"
+
+
+class GradeScale(TimeStampedModel):
+    """Percentage bands mapped to letter grades, scoped to an exam, a program or globally"""
+
+    name = models.CharField(
+        max_length=128,
+        help_text="Grade scale name",
+    )
+    exam = models.ForeignKey(
+        "exams.Exam",
+        on_delete=models.CASCADE,
+        related_name="grade_scales",
+        null=True,
+        blank=True,
+        help_text="Exam this scale applies to (takes precedence over program scales)",
+    )
+    program = models.ForeignKey(
+        "academics.Program",
+        on_delete=models.CASCADE,
+        related_name="grade_scales",
+        null=True,
+        blank=True,
+        help_text="Program this scale applies to (leave exam and program empty for the default scale)",
+    )
+    is_active = models.BooleanField(
+        default=True,
+        help_text="Inactive scales are ignored when grading",
+    )
+
+    class Meta:
+        ordering = ["name"]
+        indexes = [
+            models.Index(fields=["exam", "is_active"]),
+            models.Index(fields=["program", "is_active"]),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class GradeBand(TimeStampedModel):
+    """A grade awarded at or above a minimum percentage"""
+
+    scale = models.ForeignKey(
+        GradeScale,
+        on_delete=models.CASCADE,
+        related_name="bands",
+        help_text="Grade scale this band belongs to",
+    )
+    grade = models.CharField(
+        max_length=8,
+        help_text="Letter grade (e.g., 'A+', 'B')",
+    )
+    min_percent = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+        help_text="Minimum percentage (inclusive) for this grade",
+    )
+    grade_point = models.DecimalField(
+        max_digits=4,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0)],
+        help_text="Grade point for this band (optional)",
+    )
+
+    class Meta:
+        unique_together = [("scale", "grade"), ("scale", "min_percent")]
+        ordering = ["scale", "-min_percent"]
+
+    def __str__(self):
+        return f"{self.scale.name}: {self.grade} (>= {self.min_percent}%)"
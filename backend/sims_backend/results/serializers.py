@@ -45,12 +45,15 @@ class ResultHeaderSerializer(serializers.ModelSerializer):
             "total_obtained",
             "total_max",
             "final_outcome",
+            "grade",
+            "rank",
+            "percentile",
             "status",
             "component_entries",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["final_outcome", "created_at", "updated_at"]
+        read_only_fields = ["final_outcome", "grade", "rank", "percentile", "created_at", "updated_at"]
 
     def validate_status(self, value):
         user = self.context["request"].user
@@ -0,0 +1,73 @@
+"""Exam-scoped bulk workflow transitions for result headers."""
+
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from sims_backend.audit.models import AuditLog
+from sims_backend.exams.models import Exam
+from sims_backend.results.models import ResultHeader
+from sims_backend.students.models import Student
+from sims_backend.transcripts.artifacts import invalidate_transcript_artifacts
+
+# transition -> (target status, allowed source statuses); mirrors the per-result actions
+TRANSITIONS = {
+    "verify": (ResultHeader.STATUS_VERIFIED, [ResultHeader.STATUS_DRAFT]),
+    "publish": (ResultHeader.STATUS_PUBLISHED, [ResultHeader.STATUS_DRAFT, ResultHeader.STATUS_VERIFIED]),
+    "freeze": (ResultHeader.STATUS_FROZEN, [ResultHeader.STATUS_PUBLISHED]),
+}
+
+
+def bulk_transition_exam_results(*, exam: Exam, transition: str, user, path: str = "") -> dict:
+    """
+    Move every eligible result of an exam to the transition's target status.
+
+    Source states are counted with one query and the status change (plus
+    published_*/frozen_* stamps) is applied with a single UPDATE filtered on
+    the allowed source states, so rows changed concurrently are skipped rather
+    than overwritten. One AuditLog entry summarises the batch. Publishing or
+    freezing drops the stored transcripts of the exam's students.
+
+    Returns:
+        dict with transition, status, transitioned, skipped and skipped_by_status
+    """
+    target, sources = TRANSITIONS[transition]
+    now = timezone.now()
+    by_status = dict(
+        ResultHeader.objects.filter(exam=exam).order_by().values_list("status").annotate(total=Count("id"))
+    )
+
+    updates = {"status": target, "updated_at": now}
+    if target == ResultHeader.STATUS_PUBLISHED:
+        updates.update(published_at=now, published_by=user)
+    elif target == ResultHeader.STATUS_FROZEN:
+        updates.update(frozen_at=now, frozen_by=user)
+
+    with transaction.atomic():
+        transitioned = ResultHeader.objects.filter(exam=exam, status__in=sources).update(**updates)
+        skipped_by_status = {status: count for status, count in by_status.items() if status not in sources}
+        summary = {
+            "transition": transition,
+            "status": target,
+            "transitioned": transitioned,
+            "skipped": sum(by_status.values()) - transitioned,
+            "skipped_by_status": skipped_by_status,
+        }
+        if transitioned and target in (ResultHeader.STATUS_PUBLISHED, ResultHeader.STATUS_FROZEN):
+            invalidate_transcript_artifacts(Student.objects.filter(result_headers__exam=exam))
+        if transitioned:
+            AuditLog.objects.create(
+                actor=user,
+                method="POST",
+                path=path,
+                status_code=200,
+                entity="Exam",
+                entity_id=str(exam.id),
+                action=AuditLog.ACTION_STATE_TRANSITION,
+                summary=f"Bulk {transition} of results for {exam.title}: "
+                f"{transitioned} {target.lower()}, {summary['skipped']} skipped",
+                metadata={**summary, "from_statuses": sources},
+            )
+    return summary
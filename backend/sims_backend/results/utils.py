@@ -3,30 +3,20 @@
 
 def calculate_grade(percentage: float) -> str:
     """
-    Calculate letter grade based on percentage.
+    Calculate letter grade based on percentage using the default grade bands.
+
+    Configurable scales live in GradeScale; see results.grading.
 
     Args:
         percentage: Score percentage (0-100)
 
     Returns:
-        Letter grade (A+, A, B+, B, C+, C, D, F)
+        Letter grade (A+, A, B+, B, C+, C, D, F); anything below 60, including
+        negative percentages, is F
     """
-    if percentage >= 90:
-        return "A+"
-    elif percentage >= 85:
-        return "A"
-    elif percentage >= 80:
-        return "B+"
-    elif percentage >= 75:
-        return "B"
-    elif percentage >= 70:
-        return "C+"
-    elif percentage >= 65:
-        return "C"
-    elif percentage >= 60:
-        return "D"
-    else:
-        return "F"
+    from sims_backend.results.grading import DEFAULT_GRADE_LOOKUP
+
+    return DEFAULT_GRADE_LOOKUP.grade_for(max(percentage, 0))
 
 
 # Legacy calculate_final_grade function removed - use exams and results modules instead
@@ -1,17 +1,30 @@
+from django.http import FileResponse, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from core.permissions import PermissionTaskRequired, has_permission_task
 from sims_backend.common_permissions import in_group
+from sims_backend.exams.models import Exam
 from sims_backend.exams.services import compute_result_passing_status
 from sims_backend.finance.services import finance_gate_checks
+from sims_backend.results.gazette import build_gazette_xlsx, stream_gazette_csv
+from sims_backend.results.grading import RANK_COMPETITION, RANK_METHODS, assign_exam_grades
+from sims_backend.results.marks_import import (
+    MAX_GRID_FILE_SIZE,
+    MarksImportError,
+    commit_marks_import,
+    plan_marks_import,
+    read_marks_grid,
+)
 from sims_backend.results.models import ResultComponentEntry, ResultError, ResultHeader
 from sims_backend.results.serializers import ResultComponentEntrySerializer, ResultHeaderSerializer
+from sims_backend.results.transitions import bulk_transition_exam_results
 
 
 class ResultHeaderPermission(PermissionTaskRequired):
@@ -39,7 +52,7 @@ class ResultHeaderViewSet(viewsets.ModelViewSet):
     required_tasks = ["results.result_headers.view"]
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "gazette"]:
             self.required_tasks = ["results.result_headers.view"]
         elif self.action == "create":
             self.required_tasks = ["results.result_headers.create"]
@@ -47,12 +60,16 @@ class ResultHeaderViewSet(viewsets.ModelViewSet):
             self.required_tasks = ["results.result_headers.update"]
         elif self.action == "destroy":
             self.required_tasks = ["results.result_headers.delete"]
-        elif self.action == "verify":
+        elif self.action in ["verify", "verify_exam"]:
             self.required_tasks = ["results.result_headers.verify"]
-        elif self.action == "publish":
+        elif self.action in ["publish", "publish_exam"]:
             self.required_tasks = ["results.result_headers.publish"]
-        elif self.action == "freeze":
+        elif self.action in ["freeze", "freeze_exam"]:
             self.required_tasks = ["results.result_headers.freeze"]
+        elif self.action == "grade_exam":
+            self.required_tasks = ["results.result_headers.update"]
+        elif self.action in ["marks_dry_run", "marks_commit"]:
+            self.required_tasks = ["results.result_components.create", "results.result_components.update"]
         return super().get_permissions()
 
     def get_queryset(self):
@@ -113,6 +130,91 @@ class ResultHeaderViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(results, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"], url_path="exams/(?P<exam_id>[^/.]+)/gazette")
+    def gazette(self, request, exam_id=None):
+        """Stream the exam tabulation: one row per student, one column per component (?output=csv|xlsx)"""
+        exam = Exam.objects.filter(id=exam_id).first()
+        if exam is None:
+            return Response(
+                {"error": {"code": "NOT_FOUND", "message": "Exam not found"}}, status=status.HTTP_404_NOT_FOUND
+            )
+        output = request.query_params.get("output", "csv")
+        if output not in ("csv", "xlsx"):
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "message": "output must be csv or xlsx"}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        statuses = [s.upper() for s in request.query_params.getlist("status") if s]
+        filename = f"gazette_exam_{exam.id}.{output}"
+        if output == "xlsx":
+            return FileResponse(
+                build_gazette_xlsx(exam, statuses),
+                as_attachment=True,
+                filename=filename,
+                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+        response = StreamingHttpResponse(stream_gazette_csv(exam, statuses), content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def _plan_marks_upload(self, request, exam_id):
+        upload = request.FILES.get("file")
+        if not upload:
+            return None, Response(
+                {"error": {"code": "FILE_REQUIRED", "message": "file is required"}}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if upload.size > MAX_GRID_FILE_SIZE:
+            return None, Response(
+                {"error": {"code": "FILE_TOO_LARGE", "message": "File size exceeds 10MB limit"}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        exam = Exam.objects.filter(id=exam_id).first()
+        if exam is None:
+            return None, Response(
+                {"error": {"code": "NOT_FOUND", "message": "Exam not found"}}, status=status.HTTP_404_NOT_FOUND
+            )
+        try:
+            rows = read_marks_grid(upload)
+        except MarksImportError as e:
+            return None, Response(
+                {"error": {"code": "INVALID_FILE", "message": str(e)}}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return plan_marks_import(exam, rows), None
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="exams/(?P<exam_id>[^/.]+)/marks/dry-run",
+        parser_classes=[MultiPartParser],
+    )
+    def marks_dry_run(self, request, exam_id=None):
+        """Validate a marks grid (reg_no x components) and return the diff against stored marks"""
+        plan, error = self._plan_marks_upload(request, exam_id)
+        if error:
+            return error
+        return Response(plan.summary(), status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="exams/(?P<exam_id>[^/.]+)/marks/commit",
+        parser_classes=[MultiPartParser],
+    )
+    def marks_commit(self, request, exam_id=None):
+        """Upsert all marks in a grid, then recompute totals and outcomes for the exam once"""
+        plan, error = self._plan_marks_upload(request, exam_id)
+        if error:
+            return error
+        if not plan.is_valid:
+            return Response(
+                {
+                    "error": {"code": "INVALID_GRID", "message": "Fix the listed rows and upload again"},
+                    **plan.summary(),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(commit_marks_import(plan), status=status.HTTP_200_OK)
+
     @action(detail=True, methods=["post"], url_path="verify")
     def verify(self, request, pk=None):
         """Verify result (DRAFT → VERIFIED)"""
@@ -146,6 +248,51 @@ class ResultHeaderViewSet(viewsets.ModelViewSet):
         except ResultError as e:
             return Response({"error": {"code": e.code, "message": e.message}}, status=status.HTTP_400_BAD_REQUEST)
 
+    def _transition_exam(self, request, exam_id, transition):
+        exam = Exam.objects.filter(id=exam_id).first()
+        if exam is None:
+            return Response(
+                {"error": {"code": "NOT_FOUND", "message": "Exam not found"}}, status=status.HTTP_404_NOT_FOUND
+            )
+        result = bulk_transition_exam_results(exam=exam, transition=transition, user=request.user, path=request.path)
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"], url_path="exams/(?P<exam_id>[^/.]+)/verify")
+    def verify_exam(self, request, exam_id=None):
+        """Verify all DRAFT results of an exam"""
+        return self._transition_exam(request, exam_id, "verify")
+
+    @action(detail=False, methods=["post"], url_path="exams/(?P<exam_id>[^/.]+)/publish")
+    def publish_exam(self, request, exam_id=None):
+        """Publish all DRAFT/VERIFIED results of an exam"""
+        return self._transition_exam(request, exam_id, "publish")
+
+    @action(detail=False, methods=["post"], url_path="exams/(?P<exam_id>[^/.]+)/freeze")
+    def freeze_exam(self, request, exam_id=None):
+        """Freeze all PUBLISHED results of an exam"""
+        return self._transition_exam(request, exam_id, "freeze")
+
+    @action(detail=False, methods=["post"], url_path="exams/(?P<exam_id>[^/.]+)/grades")
+    def grade_exam(self, request, exam_id=None):
+        """Assign grades, ranks and percentiles to all results of an exam"""
+        exam = Exam.objects.filter(id=exam_id).first()
+        if exam is None:
+            return Response(
+                {"error": {"code": "NOT_FOUND", "message": "Exam not found"}}, status=status.HTTP_404_NOT_FOUND
+            )
+        rank_method = request.data.get("rank_method") or RANK_COMPETITION
+        if rank_method not in RANK_METHODS:
+            return Response(
+                {
+                    "error": {
+                        "code": "VALIDATION_ERROR",
+                        "message": f"rank_method must be one of: {', '.join(RANK_METHODS)}",
+                    }
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(assign_exam_grades(exam, rank_method=rank_method), status=status.HTTP_200_OK)
+
     @action(detail=False, methods=["get"], url_path="me")
     def me(self, request):
         """Student's own results (published only)"""
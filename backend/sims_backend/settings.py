@@ -96,6 +96,7 @@ INSTALLED_APPS = [
     "sims_backend.notifications",
     "sims_backend.exams",
     "sims_backend.results",
+    "sims_backend.transcripts",
     "sims_backend.finance",
     "sims_backend.audit",
     "sims_backend.syllabus",
@@ -224,6 +225,10 @@ SIMPLE_JWT = {
 # Impersonation Settings
 IMPERSONATION_TOKEN_LIFETIME_MINUTES = int(os.getenv("IMPERSONATION_TOKEN_LIFETIME_MINUTES", "10"))
 
+# Transcript Verification
+# Prefix for the verification URL encoded in transcript QR codes (e.g. https://sims.fmu.edu)
+TRANSCRIPT_VERIFY_BASE_URL = os.getenv("TRANSCRIPT_VERIFY_BASE_URL", "").rstrip("/")
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "SIMS API",
     "DESCRIPTION": "Student Information Management System API schema.",
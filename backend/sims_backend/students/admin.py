@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from apps.intake.duplicates import sync_student_keys
 from sims_backend.students.imports.models import ImportJob
 from sims_backend.students.models import Student
 
@@ -11,6 +12,10 @@ class StudentAdmin(admin.ModelAdmin):
     search_fields = ["reg_no", "name", "email", "phone"]
     ordering = ["reg_no"]
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        sync_student_keys([obj])
+
 
 @admin.register(ImportJob)
 class ImportJobAdmin(admin.ModelAdmin):
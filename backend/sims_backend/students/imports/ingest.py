@@ -0,0 +1,167 @@
+"""Streaming ingestion of CSV and XLSX uploads, shared by the import workflows.
+
+``UploadReader`` yields an upload's rows as dicts keyed by header, the same
+shape ``csv.DictReader`` produces. It hashes the bytes as they are read, so
+one pass gives both the rows and the SHA-256 duplicate-detection hash:
+
+- CSV is read ``file.chunks()`` at a time and decoded incrementally. A BOM
+  selects UTF-8 or UTF-16. Otherwise UTF-8 is assumed, and from the chunk
+  holding the first byte that is not valid UTF-8 the rest of the file is read
+  as Latin-1. Memory stays bounded by the chunk size plus the longest record.
+- XLSX (detected by its ZIP signature, not the file name) is read from the
+  first worksheet with openpyxl in read-only mode. The ZIP container needs
+  random access, so the hash is taken over the chunks before the workbook is
+  opened.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import hashlib
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, time
+from functools import partial
+
+READ_CHUNK_SIZE = 64 * 1024
+XLSX_MAGIC = b"PK\x03\x04"
+FALLBACK_ENCODING = "latin-1"
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _detect_encoding(head: bytes) -> str:
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    return "utf-8"
+
+
+def decode_chunks(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode byte chunks incrementally, falling back to Latin-1 from the first undecodable chunk."""
+    decoder = None
+    for chunk in chunks:
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(_detect_encoding(chunk))()
+        try:
+            yield decoder.decode(chunk)
+        except UnicodeDecodeError:
+            pending = decoder.getstate()[0]
+            decoder = codecs.getincrementaldecoder(FALLBACK_ENCODING)()
+            yield decoder.decode(pending + chunk)
+    if decoder is not None:
+        try:
+            yield decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            # Truncated multi-byte sequence at the very end
+            yield decoder.getstate()[0].decode(FALLBACK_ENCODING)
+
+
+def split_lines(texts: Iterable[str]) -> Iterator[str]:
+    """Re-split decoded text at ``\\n``, keeping line endings for ``csv`` (quoted newlines survive)."""
+    pending = ""
+    for text in texts:
+        pending += text
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def _cell_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == time() else value.isoformat(sep=" ")
+    if isinstance(value, date | time):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_xlsx_rows(file) -> Iterator[dict[str, str]]:
+    """Rows of the first worksheet keyed by its first non-empty row; blank rows are skipped."""
+    from openpyxl import load_workbook
+
+    file.seek(0)
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        header = None
+        for values in workbook.worksheets[0].iter_rows(values_only=True):
+            cells = [_cell_text(value) for value in values]
+            if not any(cells):
+                continue
+            if header is None:
+                header = cells
+                continue
+            cells += [""] * (len(header) - len(cells))
+            yield dict(zip(header, cells, strict=False))
+    finally:
+        workbook.close()
+
+
+def _prepend(head: bytes, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    if head:
+        yield head
+    yield from chunks
+
+
+class UploadReader:
+    """
+    Iterate the rows of a CSV or XLSX upload once, hashing it on the way.
+
+    ``file`` may be an uploaded file, a stored ``FieldFile`` (opened) or any
+    binary file object. ``hexdigest()`` is available once iteration finishes.
+    """
+
+    def __init__(self, file, chunk_size: int = READ_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.is_xlsx = False
+        self._hasher = hashlib.sha256()
+        self._done = False
+
+    def _chunks(self) -> Iterator[bytes]:
+        if hasattr(self.file, "chunks"):
+            chunks = self.file.chunks(self.chunk_size)
+        else:
+            self.file.seek(0)
+            chunks = iter(partial(self.file.read, self.chunk_size), b"")
+        for chunk in chunks:
+            self._hasher.update(chunk)
+            yield chunk
+
+    def __iter__(self) -> Iterator[dict[str, str | None]]:
+        chunks = self._chunks()
+        head = next(chunks, b"")
+        if head.startswith(XLSX_MAGIC):
+            self.is_xlsx = True
+            for _ in chunks:
+                pass
+            yield from iter_xlsx_rows(self.file)
+        else:
+            yield from csv.DictReader(split_lines(decode_chunks(_prepend(head, chunks))))
+        self._done = True
+
+    def hexdigest(self) -> str:
+        if not self._done:
+            raise RuntimeError("The upload has not been read to the end yet")
+        return self._hasher.hexdigest()
+
+
+def iter_chunks(rows: Iterable, size: int) -> Iterator[list]:
+    """Group ``rows`` into lists of at most ``size``."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,246 @@
+"""Background, chunked commits of student and faculty import jobs.
+
+Committing a previewed import queues the job on the RQ "default" queue. The
+worker streams the uploaded file (see ``imports.ingest``) and commits it
+``chunk_size`` rows per transaction, so only one chunk is held in memory.
+Each chunk's transaction also advances the job's counters, so
+``processed_rows`` is always the resume point. Each chunk writes its failed
+rows to a part file; the parts of committed chunks are joined into the job's
+error CSV when the worker stops.
+
+Between chunks the worker checks ``cancel_requested`` and stops with status
+CANCELLED. A cancelled or failed job can be queued again and continues after
+its last committed chunk. So can a RUNNING job that has not advanced for
+``IMPORT_JOB_TIMEOUT``: its work-horse was killed (timeout, OOM, deploy)
+before it could record a failure.
+
+The per-row work is done by the service's ``commit_chunk``. Duplicate checks
+that span the whole file are rebuilt by ``replay`` from the rows before the
+resume point.
+"""
+
+from __future__ import annotations
+
+import logging
+import shutil
+import tempfile
+from datetime import timedelta
+from itertools import islice
+
+import django_rq
+from django.core.files.base import ContentFile, File
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from sims_backend.students.imports.ingest import UploadReader, iter_chunks
+from sims_backend.students.imports.utils import safe_csv_export
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 200
+IMPORT_JOB_TIMEOUT = 60 * 60
+
+
+def enqueue_import_job(runner, job_id) -> None:
+    """Enqueue ``runner(job_id)`` on RQ; without Redis, run it inline."""
+    try:
+        django_rq.get_queue("default").enqueue(runner, str(job_id), job_timeout=IMPORT_JOB_TIMEOUT)
+    except Exception as exc:
+        logger.warning("Could not enqueue import job %s (%s); running inline", job_id, exc)
+        runner(str(job_id))
+
+
+def stalled_before():
+    """RUNNING jobs last updated before this have lost their worker; chunks update the job far more often."""
+    return timezone.now() - timedelta(seconds=IMPORT_JOB_TIMEOUT)
+
+
+def queue_import_job(
+    job_model, job_id, runner, allowed_statuses, enqueue: bool = True, resume_stalled: bool = False, **fields
+):
+    """
+    Mark a job QUEUED (from one of ``allowed_statuses``) and enqueue ``runner`` once that commits.
+
+    With ``resume_stalled`` a stalled RUNNING job is accepted too. ``fields``
+    are saved on the job as well (e.g. an ``auto_create`` override).
+    """
+    with transaction.atomic():
+        try:
+            job = job_model.objects.select_for_update().get(id=job_id)
+        except job_model.DoesNotExist:
+            raise ValueError(f"{job_model.__name__} {job_id} not found")
+        stalled = resume_stalled and job.status == job_model.STATUS_RUNNING and job.updated_at < stalled_before()
+        if job.status not in allowed_statuses and not stalled:
+            raise ValueError(
+                f"{job_model.__name__} must be in {' or '.join(allowed_statuses)} status. Current status: {job.status}"
+            )
+        for name, value in fields.items():
+            setattr(job, name, value)
+        job.status = job_model.STATUS_QUEUED
+        job.cancel_requested = False
+        job.finished_at = None
+        job.save(update_fields=["status", "cancel_requested", "finished_at", "updated_at", *fields])
+        if enqueue:
+            transaction.on_commit(lambda: enqueue_import_job(runner, job.id))
+    return job
+
+
+def resume_import_job(job_model, job_id, runner, enqueue: bool = True):
+    """Queue a cancelled, failed or stalled job again; it continues after its last committed chunk."""
+    return queue_import_job(
+        job_model,
+        job_id,
+        runner,
+        [job_model.STATUS_CANCELLED, job_model.STATUS_FAILED],
+        enqueue=enqueue,
+        resume_stalled=True,
+    )
+
+
+def request_cancel(job_model, job_id) -> int:
+    """
+    Ask a queued or running job to stop after its current chunk; returns the number of jobs flagged.
+
+    A stalled job has no worker left to notice the flag, so it is cancelled at once.
+    """
+    now = timezone.now()
+    stalled = job_model.objects.filter(
+        id=job_id, status=job_model.STATUS_RUNNING, updated_at__lt=stalled_before()
+    ).update(status=job_model.STATUS_CANCELLED, cancel_requested=True, finished_at=now, updated_at=now)
+    if stalled:
+        return stalled
+    return job_model.objects.filter(id=job_id, status__in=[job_model.STATUS_QUEUED, job_model.STATUS_RUNNING]).update(
+        cancel_requested=True, updated_at=now
+    )
+
+
+def error_parts_dir(job) -> str:
+    return f"imports/error_parts/{job._meta.model_name}/{job.id}"
+
+
+def append_error_rows(job, error_rows: list[dict], fieldnames: list[str], start: int) -> None:
+    """
+    Write a chunk's failed rows as one part of the job's error CSV (call inside the chunk's transaction).
+
+    Parts are named after the chunk's first row, so a chunk that rolled back
+    and runs again replaces its own part. join_error_report stitches them.
+    """
+    if not error_rows:
+        return
+    storage = job.error_report_file.storage
+    name = f"{error_parts_dir(job)}/{start:010d}.csv"
+    storage.delete(name)
+    storage.save(name, ContentFile(safe_csv_export(error_rows, fieldnames)))
+
+
+def join_error_report(job) -> None:
+    """
+    Append the parts of committed chunks to the job's error CSV, then drop every part.
+
+    Called whenever the worker stops. Parts at or past ``processed_rows``
+    belong to chunks that rolled back and are discarded. Each part is
+    streamed once, so the report is never rebuilt per chunk.
+    """
+    storage = job.error_report_file.storage
+    directory = error_parts_dir(job)
+    try:
+        _dirs, files = storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    parts = sorted(files)
+    committed = [f"{directory}/{part}" for part in parts if int(part.split(".", 1)[0]) < job.processed_rows]
+    if committed:
+        previous = job.error_report_file.name or None
+        with tempfile.TemporaryFile() as report:
+            if previous:
+                with job.error_report_file.open("rb") as fh:
+                    shutil.copyfileobj(fh, report)
+            for name in committed:
+                with storage.open(name, "rb") as fh:
+                    if report.tell():
+                        # Keep the header of the first part only
+                        fh.readline()
+                    shutil.copyfileobj(fh, report)
+            report.seek(0)
+            job.error_report_file.save(f"errors_{job.id}.csv", File(report), save=False)
+        type(job).objects.filter(id=job.id).update(error_report_file=job.error_report_file.name)
+        if previous:
+            storage.delete(previous)
+    for part in parts:
+        storage.delete(f"{directory}/{part}")
+
+
+def record_chunk(job, stop: int, created: int, updated: int, failed: int) -> None:
+    """Advance the job's counters to ``stop`` rows (call inside the chunk's transaction)."""
+    type(job).objects.filter(id=job.id).update(
+        processed_rows=stop,
+        created_count=F("created_count") + created,
+        updated_count=F("updated_count") + updated,
+        failed_count=F("failed_count") + failed,
+        updated_at=timezone.now(),
+    )
+
+
+def job_result(job) -> dict:
+    return {
+        "import_job_id": str(job.id),
+        "status": job.status,
+        "processed_rows": job.processed_rows,
+        "total_rows": job.total_rows,
+        "created_count": job.created_count,
+        "updated_count": job.updated_count,
+        "failed_count": job.failed_count,
+        "has_error_report": bool(job.error_report_file),
+    }
+
+
+def run_import_job(job_model, service, job_id, chunk_size: int = IMPORT_CHUNK_SIZE, max_workers: int | None = None):
+    """Commit a queued job's file chunk by chunk, from its resume point to the end, cancellation or failure."""
+    claimed = job_model.objects.filter(id=job_id, status=job_model.STATUS_QUEUED).update(
+        status=job_model.STATUS_RUNNING, updated_at=timezone.now()
+    )
+    job = job_model.objects.get(id=job_id)
+    if not claimed:
+        # Already picked up by another worker (or finished)
+        return job_result(job)
+
+    try:
+        with job.file.open("rb"):
+            rows = iter(UploadReader(job.file))
+            state = service.replay(job, islice(rows, job.processed_rows))
+            start = job.processed_rows
+            for chunk in iter_chunks(rows, chunk_size):
+                if job_model.objects.filter(id=job_id, cancel_requested=True).exists():
+                    job_model.objects.filter(id=job_id).update(
+                        status=job_model.STATUS_CANCELLED, finished_at=timezone.now(), updated_at=timezone.now()
+                    )
+                    job.refresh_from_db()
+                    join_error_report(job)
+                    return job_result(job)
+                service.commit_chunk(job, chunk, start, state, max_workers)
+                start += len(chunk)
+    except Exception as exc:
+        logger.exception("Import job %s failed", job_id)
+        job.refresh_from_db()
+        join_error_report(job)
+        job_model.objects.filter(id=job_id).update(
+            status=job_model.STATUS_FAILED,
+            summary={**(job.summary or {}), "error": str(exc), "resume_from_row": job.processed_rows + 2},
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        return job_result(job_model.objects.get(id=job_id))
+
+    job.refresh_from_db()
+    join_error_report(job)
+    job.status = job_model.STATUS_COMMITTED
+    job.finished_at = timezone.now()
+    job.summary = {
+        "created": job.created_count,
+        "updated": job.updated_count,
+        "failed": job.failed_count,
+        "total_processed": job.created_count + job.updated_count + job.failed_count,
+    }
+    job.save(update_fields=["status", "finished_at", "summary", "updated_at"])
+    return job_result(job)
@@ -8,7 +8,7 @@ from sims_backend.students.imports.models import ImportJob
 class PreviewRequestSerializer(serializers.Serializer):
     """Serializer for preview request"""
 
-    file = serializers.FileField(help_text="CSV file to import")
+    file = serializers.FileField(help_text="CSV or XLSX file to import")
     mode = serializers.ChoiceField(
         choices=ImportJob.MODE_CHOICES,
         default=ImportJob.MODE_CREATE_ONLY,
@@ -64,6 +64,8 @@ class CommitResponseSerializer(serializers.Serializer):
 
     import_job_id = serializers.UUIDField()
     status = serializers.CharField()
+    processed_rows = serializers.IntegerField()
+    total_rows = serializers.IntegerField()
     created_count = serializers.IntegerField()
     updated_count = serializers.IntegerField()
     failed_count = serializers.IntegerField()
@@ -94,6 +96,8 @@ class ImportJobSerializer(serializers.ModelSerializer):
             "created_count",
             "updated_count",
             "failed_count",
+            "processed_rows",
+            "cancel_requested",
             "error_report_file",
             "summary",
         ]
@@ -109,6 +113,8 @@ class ImportJobSerializer(serializers.ModelSerializer):
             "created_count",
             "updated_count",
             "failed_count",
+            "processed_rows",
+            "cancel_requested",
             "error_report_file",
             "summary",
         ]
@@ -1,24 +1,33 @@
 """Student CSV import service - core business logic"""
 
-import io
+import logging
 import re
+from collections.abc import Iterable
 from datetime import datetime
 from typing import Any
 
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Group
 from django.db import transaction
 from django.utils import timezone
 
+from apps.intake.duplicates import sync_student_keys
+from sims_backend.students.imports.ingest import UploadReader
+from sims_backend.students.imports.jobs import (
+    IMPORT_CHUNK_SIZE,
+    append_error_rows,
+    queue_import_job,
+    record_chunk,
+    run_import_job,
+)
 from sims_backend.students.imports.models import ImportJob
+from sims_backend.students.imports.provisioning import add_users_to_group, hash_passwords
 from sims_backend.students.imports.templates import get_expected_columns
 from sims_backend.students.imports.utils import (
     normalize_row,
-    parse_csv_file,
     parse_date_strict,
-    safe_csv_export,
 )
 from sims_backend.students.imports.validators import (
+    ImportLookups,
     check_duplicate_in_file,
     check_existing_in_db,
     normalize_status,
@@ -34,6 +43,20 @@ from sims_backend.students.imports.validators import (
 from sims_backend.students.models import Student
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
+
+STUDENT_UPDATE_FIELDS = [
+    "name",
+    "program",
+    "batch",
+    "group",
+    "status",
+    "email",
+    "phone",
+    "date_of_birth",
+    "user",
+    "updated_at",
+]
 
 
 class StudentImportService:
@@ -98,68 +121,54 @@ class StudentImportService:
         return "student123"
 
     @staticmethod
-    def _create_student_user(
-        student: Student, graduation_year: int | None = None, password: str | None = None
-    ) -> tuple[User, bool]:
+    def _plan_student_accounts(
+        pending: list[tuple[Student, int | None, str | None]], max_workers: int | None = None
+    ) -> tuple[list[tuple[Student, User, str]], list[User], list[User]]:
         """
-        Create a user account for a student.
-
-        Args:
-            student: Student record
-            graduation_year: Graduation year (from batch.start_year, which represents graduation year)
-            password: Optional custom password. If not provided, auto-generates password.
+        Work out the user account of each student and hash the new passwords, without writing anything.
 
-        Returns:
-            Tuple[User, bool]: (user_object, created_flag)
+        ``pending`` holds (student, graduation_year, custom password) tuples. Returns the
+        (student, user, email) links, the unsaved new users and the existing users whose
+        email changed. An existing user with the generated username is reused. A username that already belongs to another student is
+        skipped with a warning; the student can get an account later.
         """
-        # Extract name parts for username/email generation
-        first_name, last_name = StudentImportService._extract_name_parts(student.name)
-
-        # Generate username: firstname.b{year}
-        username = StudentImportService._generate_username(student.name, graduation_year)
-
-        # Generate email: firstname.lastname.b{year}@pmc.edu.pk
-        email = StudentImportService._generate_email(student.name, graduation_year, student.email)
-
-        # Use provided password or generate one: student{graduation_year}
-        if not password or not password.strip():
-            password = StudentImportService._generate_password(graduation_year)
-
-        # Check if user already exists
-        user, created = User.objects.get_or_create(
-            username=username,
-            defaults={
-                "email": email,
-                "first_name": first_name.capitalize(),
-                "last_name": last_name.title(),
-            },
-        )
-
-        # Set password if user was just created
-        if created:
-            user.set_password(password)
-            user.save()
-        else:
-            # Update email if it changed
-            if user.email != email:
-                user.email = email
-                user.save(update_fields=["email"])
-
-        # Ensure user is in Student group
-        student_group, _ = Group.objects.get_or_create(name="STUDENT")
-        user.groups.add(student_group)
-
-        # Link user to student if not already linked
-        if not student.user:
-            student.user = user
-            student.save(update_fields=["user"])
+        wanted = []
+        for student, graduation_year, password in pending:
+            username = StudentImportService._generate_username(student.name, graduation_year)
+            email = StudentImportService._generate_email(student.name, graduation_year, student.email or None)
+            wanted.append(
+                (student, username, email, password or StudentImportService._generate_password(graduation_year))
+            )
 
-        # Update student email if it was auto-generated
-        if not student.email or student.email.endswith("@sims.edu"):
-            student.email = email
-            student.save(update_fields=["email"])
+        usernames = {username for _, username, _, _ in wanted}
+        existing = {account.username: account for account in User.objects.filter(username__in=usernames)}
+        claimed = set(Student.objects.filter(user__username__in=usernames).values_list("user__username", flat=True))
 
-        return user, created
+        links, new_users, new_passwords, updated_users = [], [], [], []
+        for student, username, email, password in wanted:
+            if username in claimed:
+                logger.warning(
+                    f"Username '{username}' is already linked to a student; no account created for {student.reg_no}"
+                )
+                continue
+            claimed.add(username)
+            account = existing.get(username)
+            if account is None:
+                first_name, last_name = StudentImportService._extract_name_parts(student.name)
+                account = User(
+                    username=username, email=email, first_name=first_name.capitalize(), last_name=last_name.title()
+                )
+                new_users.append(account)
+                new_passwords.append(password)
+            elif account.email != email:
+                # Update email if it changed
+                account.email = email
+                updated_users.append(account)
+            links.append((student, account, email))
+
+        for account, hashed in zip(new_users, hash_passwords(new_passwords, max_workers), strict=True):
+            account.password = hashed
+        return links, new_users, updated_users
 
     @staticmethod
     def preview(file, user, mode: str = ImportJob.MODE_CREATE_ONLY, auto_create: bool = False) -> dict[str, Any]:
@@ -176,8 +185,18 @@ class StudentImportService:
             status=ImportJob.STATUS_PENDING,
         )
 
-        # Compute file hash
-        file_hash = ImportJob.compute_file_hash(file)
+        # Save file
+        import_job.file.save(file.name, file, save=True)
+
+        # Parse the CSV/XLSX and hash it in the same pass
+        reader = UploadReader(file)
+        try:
+            rows = list(reader)
+        except Exception as e:
+            import_job.status = ImportJob.STATUS_FAILED
+            import_job.save()
+            raise ValueError(f"Failed to parse file: {str(e)}")
+        file_hash = reader.hexdigest()
         import_job.file_hash = file_hash
 
         # Check for duplicate file hash (warn but don't block)
@@ -187,16 +206,8 @@ class StudentImportService:
             .first()
         )
 
-        # Save file
-        import_job.file.save(file.name, file, save=True)
-
-        # Parse CSV
-        try:
-            rows = parse_csv_file(import_job.file)
-        except Exception as e:
-            import_job.status = ImportJob.STATUS_FAILED
-            import_job.save()
-            raise ValueError(f"Failed to parse CSV file: {str(e)}")
+        # Resolve every program, batch, group and reg_no named in the file up front
+        lookups = ImportLookups([normalize_row(row) for row in rows])
 
         # Validate rows
         preview_rows = []
@@ -239,17 +250,17 @@ class StudentImportService:
 
             # Resolve FK relationships (with auto-create if enabled)
             program, program_errors = resolve_program(
-                normalized_row.get("program_name"), row_num, auto_create=auto_create
+                normalized_row.get("program_name"), row_num, auto_create=auto_create, lookups=lookups
             )
             errors.extend(program_errors)
 
             batch, batch_errors = resolve_batch(
-                normalized_row.get("batch_name"), program, row_num, auto_create=auto_create
+                normalized_row.get("batch_name"), program, row_num, auto_create=auto_create, lookups=lookups
             )
             errors.extend(batch_errors)
 
             group, group_errors = resolve_group(
-                normalized_row.get("group_name"), batch, row_num, auto_create=auto_create
+                normalized_row.get("group_name"), batch, row_num, auto_create=auto_create, lookups=lookups
             )
             errors.extend(group_errors)
 
@@ -264,7 +275,7 @@ class StudentImportService:
 
             # Check existing in DB (for create_only mode)
             if mode == ImportJob.MODE_CREATE_ONLY:
-                exists, existing_student = check_existing_in_db(reg_no, mode)
+                exists, existing_student = check_existing_in_db(reg_no, mode, lookups)
                 if exists:
                     errors.append(
                         {
@@ -280,7 +291,7 @@ class StudentImportService:
             else:
                 valid_count += 1
                 # Check if will be created or updated
-                exists, existing_student = check_existing_in_db(reg_no, mode)
+                exists, existing_student = check_existing_in_db(reg_no, mode, lookups)
                 if exists and mode == ImportJob.MODE_UPSERT:
                     action = "UPDATE"
                 else:
@@ -304,7 +315,7 @@ class StudentImportService:
                 preview_data["_generated_email"] = email
 
                 # Generate password (use provided password if available, otherwise generate)
-                provided_password = normalized_row.get("password", "").strip()
+                provided_password = (normalized_row.get("password") or "").strip()
                 password = (
                     provided_password if provided_password else StudentImportService._generate_password(graduation_year)
                 )
@@ -344,37 +355,67 @@ class StudentImportService:
         return response
 
     @staticmethod
-    @transaction.atomic
-    def commit(import_job_id: str, user, auto_create: bool = False) -> dict[str, Any]:
+    def queue_commit(import_job_id: str, auto_create: bool | None = False, enqueue: bool = True) -> ImportJob:
         """
-        Phase 2: Commit validated rows to database.
+        Phase 2: Queue a previewed job for a background, chunked commit (see ``imports.jobs``).
+
+        ``auto_create=None`` keeps the setting the job was previewed with.
+        """
+        fields = {} if auto_create is None else {"auto_create": auto_create}
+        return queue_import_job(
+            ImportJob, import_job_id, run_student_import_job, [ImportJob.STATUS_PREVIEWED], enqueue=enqueue, **fields
+        )
+
+    @staticmethod
+    def commit(
+        import_job_id: str,
+        user,
+        auto_create: bool | None = False,
+        max_workers: int | None = None,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ) -> dict[str, Any]:
+        """
+        Phase 2, in process: queue the job and commit it right away, chunk by chunk.
         Only processes rows that were marked as valid in preview.
         """
-        try:
-            import_job = ImportJob.objects.get(id=import_job_id)
-        except ImportJob.DoesNotExist:
-            raise ValueError(f"ImportJob {import_job_id} not found")
+        job = StudentImportService.queue_commit(import_job_id, auto_create, enqueue=False)
+        return run_student_import_job(job.id, chunk_size=chunk_size, max_workers=max_workers)
 
-        # Ensure job is in PREVIEWED status
-        if import_job.status != ImportJob.STATUS_PREVIEWED:
-            raise ValueError(f"ImportJob must be in PREVIEWED status. Current status: {import_job.status}")
+    @staticmethod
+    def replay(job: ImportJob, rows: Iterable[dict[str, str]]) -> dict[str, Any]:
+        """Rebuild the file-wide duplicate check from the rows committed before a resume."""
+        seen_reg_nos = {}
+        for idx, row in enumerate(rows):
+            normalized_row = normalize_row(row)
+            if not validate_required_fields(normalized_row, idx + 2):
+                check_duplicate_in_file(normalized_row["reg_no"].strip(), idx, seen_reg_nos)
+        return {"seen_reg_nos": seen_reg_nos}
 
-        # Use auto_create setting from import_job (or override if provided)
-        if auto_create is None:
-            auto_create = import_job.auto_create
+    @staticmethod
+    def commit_chunk(
+        job: ImportJob,
+        rows: list[dict[str, str]],
+        start: int,
+        state: dict[str, Any],
+        max_workers: int | None = None,
+    ) -> None:
+        """
+        Re-validate and commit one chunk of rows (file rows ``start`` onward) in one transaction.
 
-        # Re-parse and re-validate (for safety)
-        rows = parse_csv_file(import_job.file)
+        Passwords of new accounts are hashed (in parallel) before the transaction opens.
+        """
+        auto_create = job.auto_create
+        chunk = [normalize_row(row) for row in rows]
+        lookups = ImportLookups(chunk)
 
         created_count = 0
         updated_count = 0
         failed_count = 0
         error_rows = []
-        seen_reg_nos = {}
+        to_create, to_update, pending_accounts = [], [], []
 
-        for idx, row in enumerate(rows):
+        for idx, normalized_row in enumerate(chunk, start=start):
             row_num = idx + 2
-            normalized_row = normalize_row(row)
 
             # Quick validation (same as preview)
             errors = []
@@ -391,21 +432,21 @@ class StudentImportService:
                 continue
 
             reg_no = normalized_row.get("reg_no", "").strip()
-            errors.extend(check_duplicate_in_file(reg_no, idx, seen_reg_nos))
+            errors.extend(check_duplicate_in_file(reg_no, idx, state["seen_reg_nos"]))
 
             # Resolve FKs (with auto-create if enabled)
             program, program_errors = resolve_program(
-                normalized_row.get("program_name"), row_num, auto_create=auto_create
+                normalized_row.get("program_name"), row_num, auto_create=auto_create, lookups=lookups
             )
             errors.extend(program_errors)
 
             batch, batch_errors = resolve_batch(
-                normalized_row.get("batch_name"), program, row_num, auto_create=auto_create
+                normalized_row.get("batch_name"), program, row_num, auto_create=auto_create, lookups=lookups
             )
             errors.extend(batch_errors)
 
             group, group_errors = resolve_group(
-                normalized_row.get("group_name"), batch, row_num, auto_create=auto_create
+                normalized_row.get("group_name"), batch, row_num, auto_create=auto_create, lookups=lookups
             )
             errors.extend(group_errors)
 
@@ -439,125 +480,81 @@ class StudentImportService:
                 )
                 continue
 
-            # Create or update Student
-            try:
-                exists, existing_student = check_existing_in_db(reg_no, import_job.mode)
-
-                if exists and import_job.mode == ImportJob.MODE_UPSERT:
-                    # Update existing
-                    existing_student.name = normalized_row.get("name")
-                    existing_student.program = program
-                    existing_student.batch = batch
-                    existing_student.group = group
-                    existing_student.status = status
-                    if normalized_row.get("email"):
-                        existing_student.email = normalized_row.get("email")
-                    if normalized_row.get("phone"):
-                        existing_student.phone = normalized_row.get("phone")
-                    if date_of_birth:
-                        existing_student.date_of_birth = date_of_birth
-                    existing_student.save()
-
-                    # Create user account if it doesn't exist
-                    if not existing_student.user:
-                        try:
-                            # batch.start_year represents graduation year
-                            graduation_year = batch.start_year if hasattr(batch, "start_year") else None
-                            # Get password from CSV if provided
-                            custom_password = normalized_row.get("password", "").strip() or None
-                            StudentImportService._create_student_user(
-                                student=existing_student, graduation_year=graduation_year, password=custom_password
-                            )
-                        except Exception as user_error:
-                            import logging
-
-                            logger = logging.getLogger(__name__)
-                            logger.warning(
-                                f"Failed to create user account for existing student {reg_no}: {str(user_error)}"
-                            )
-
-                    updated_count += 1
-                elif not exists:
-                    # Create new
-                    # Use provided email or it will be auto-generated in _create_student_user
-                    student_email = normalized_row.get("email") or ""
-
-                    student = Student.objects.create(
-                        reg_no=reg_no,
-                        name=normalized_row.get("name"),
-                        program=program,
-                        batch=batch,
-                        group=group,
-                        status=status,
-                        email=student_email,
-                        phone=normalized_row.get("phone") or "",
-                        date_of_birth=date_of_birth,
-                    )
-
-                    # Create user account for the student
-                    try:
-                        # batch.start_year represents graduation year
-                        graduation_year = batch.start_year if hasattr(batch, "start_year") else None
-                        # Get password from CSV if provided
-                        custom_password = normalized_row.get("password", "").strip() or None
-                        user, user_created = StudentImportService._create_student_user(
-                            student=student, graduation_year=graduation_year, password=custom_password
-                        )
-                    except Exception as user_error:
-                        # Log error but don't fail the import
-                        # Student record is created, user can be created later
-                        import logging
-
-                        logger = logging.getLogger(__name__)
-                        logger.warning(f"Failed to create user account for student {reg_no}: {str(user_error)}")
-
-                    created_count += 1
-                else:
-                    # CREATE_ONLY mode but student exists
-                    failed_count += 1
-                    error_rows.append(
-                        {
-                            **normalized_row,
-                            "error_message": f"Student with reg_no '{reg_no}' already exists. Use UPSERT mode to update.",
-                        }
-                    )
-            except Exception as e:
+            custom_password = (normalized_row.get("password") or "").strip() or None
+            exists, existing_student = check_existing_in_db(reg_no, job.mode, lookups)
+
+            if exists and job.mode == ImportJob.MODE_UPSERT:
+                # Update existing
+                existing_student.name = normalized_row.get("name")
+                existing_student.program = program
+                existing_student.batch = batch
+                existing_student.group = group
+                existing_student.status = status
+                if normalized_row.get("email"):
+                    existing_student.email = normalized_row.get("email")
+                if normalized_row.get("phone"):
+                    existing_student.phone = normalized_row.get("phone")
+                if date_of_birth:
+                    existing_student.date_of_birth = date_of_birth
+                to_update.append(existing_student)
+
+                # Create user account if it doesn't exist (batch.start_year represents graduation year)
+                if not existing_student.user_id:
+                    pending_accounts.append((existing_student, batch.start_year, custom_password))
+
+                updated_count += 1
+            elif not exists:
+                # Create new
+                # Use provided email or it will be auto-generated with the user account
+                student = Student(
+                    reg_no=reg_no,
+                    name=normalized_row.get("name"),
+                    program=program,
+                    batch=batch,
+                    group=group,
+                    status=status,
+                    email=normalized_row.get("email") or "",
+                    phone=normalized_row.get("phone") or "",
+                    date_of_birth=date_of_birth,
+                )
+                to_create.append(student)
+                pending_accounts.append((student, batch.start_year, custom_password))
+                created_count += 1
+            else:
+                # CREATE_ONLY mode but student exists
                 failed_count += 1
                 error_rows.append(
                     {
                         **normalized_row,
-                        "error_message": f"Database error: {str(e)}",
+                        "error_message": f"Student with reg_no '{reg_no}' already exists. Use UPSERT mode to update.",
                     }
                 )
 
-        # Generate error CSV if there are errors
-        error_report_file = None
-        if error_rows:
-            error_fieldnames = get_expected_columns() + ["error_message"]
-            error_csv_content = safe_csv_export(error_rows, error_fieldnames)
-            error_filename = f"errors_{import_job.id}.csv"
-            error_report_file = io.BytesIO(error_csv_content)
-            import_job.error_report_file.save(error_filename, error_report_file, save=False)
-
-        # Update ImportJob
-        import_job.created_count = created_count
-        import_job.updated_count = updated_count
-        import_job.failed_count = failed_count
-        import_job.status = ImportJob.STATUS_COMMITTED
-        import_job.finished_at = timezone.now()
-        import_job.summary = {
-            "created": created_count,
-            "updated": updated_count,
-            "failed": failed_count,
-            "total_processed": created_count + updated_count + failed_count,
-        }
-        import_job.save()
-
-        return {
-            "import_job_id": str(import_job.id),
-            "status": import_job.status,
-            "created_count": created_count,
-            "updated_count": updated_count,
-            "failed_count": failed_count,
-            "has_error_report": error_report_file is not None,
-        }
+        # Hash passwords before the transaction opens, then write everything in bulk
+        links, new_users, updated_users = StudentImportService._plan_student_accounts(pending_accounts, max_workers)
+
+        with transaction.atomic():
+            User.objects.bulk_create(new_users)
+            User.objects.bulk_update(updated_users, ["email"])
+            add_users_to_group([account for _, account, _ in links], "STUDENT")
+            for student, account, email in links:
+                student.user = account
+                # Update student email if it was auto-generated
+                if not student.email or student.email.endswith("@sims.edu"):
+                    student.email = email
+            Student.objects.bulk_create(to_create)
+            now = timezone.now()
+            for student in to_update:
+                student.updated_at = now
+            Student.objects.bulk_update(to_update, STUDENT_UPDATE_FIELDS)
+            sync_student_keys([*to_create, *to_update])
+
+            append_error_rows(job, error_rows, get_expected_columns() + ["error_message"], start)
+            record_chunk(job, start + len(chunk), created_count, updated_count, failed_count)
+
+
+def run_student_import_job(
+    job_id: str, chunk_size: int = IMPORT_CHUNK_SIZE, max_workers: int | None = None
+) -> dict[str, Any]:
+    """RQ entry point: commit a queued student import job chunk by chunk."""
+    return run_import_job(ImportJob, StudentImportService, job_id, chunk_size=chunk_size, max_workers=max_workers)
@@ -4,31 +4,15 @@ import csv
 import io
 from typing import Any
 
+from sims_backend.students.imports.ingest import UploadReader
+
 
 def parse_csv_file(file) -> list[dict[str, str]]:
     """
-    Parse CSV file safely, handling UTF-8, BOM, and common issues.
-    Returns list of dictionaries with column names as keys.
+    Parse a CSV (or XLSX) upload into a list of dictionaries keyed by column name.
+    Handles BOMs and non-UTF-8 files; see ``imports.ingest`` to stream rows instead.
     """
-    # Handle BOM (Byte Order Mark) for UTF-8 files
-    content = file.read()
-    if content.startswith(b"\xef\xbb\xbf"):
-        content = content[3:]  # Remove BOM
-
-    # Decode as UTF-8
-    try:
-        text = content.decode("utf-8")
-    except UnicodeDecodeError:
-        # Fallback to latin-1 if UTF-8 fails
-        text = content.decode("latin-1", errors="replace")
-
-    # Parse CSV
-    reader = csv.DictReader(io.StringIO(text))
-    rows = []
-    for row in reader:
-        rows.append(row)
-
-    return rows
+    return list(UploadReader(file))
 
 
 def normalize_value(value: str | None) -> str | None:
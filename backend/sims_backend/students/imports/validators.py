@@ -2,6 +2,8 @@
 
 from typing import Optional
 
+from django.db.models.functions import Lower
+
 from sims_backend.academics.models import Batch, Group, Program
 from sims_backend.students.models import Student
 
@@ -12,6 +14,58 @@ class RowValidationError(Exception):
     pass
 
 
+class ImportLookups:
+    """
+    Programs, batches, groups and existing students named in an import file, resolved up front.
+
+    Each kind is loaded with one ``IN`` query into a dict keyed by the lower-cased
+    name (scoped to the parent program/batch), so validating a row costs no
+    queries. Objects auto-created while validating are added to the maps.
+    """
+
+    def __init__(self, rows: list[dict[str, str]]):
+        def names(column):
+            return {row[column].strip().lower() for row in rows if row.get(column) and row[column].strip()}
+
+        self.programs = {
+            program.name_key: program
+            for program in Program.objects.annotate(name_key=Lower("name"))
+            .filter(name_key__in=names("program_name"))
+            .order_by("-id")
+        }
+        self.batches = {
+            (batch.program_id, batch.name_key): batch
+            for batch in Batch.objects.annotate(name_key=Lower("name"))
+            .filter(program__in=self.programs.values(), name_key__in=names("batch_name"))
+            .order_by("-id")
+        }
+        self.groups = {
+            (group.batch_id, group.name_key): group
+            for group in Group.objects.annotate(name_key=Lower("name"))
+            .filter(batch__in=self.batches.values(), name_key__in=names("group_name"))
+            .order_by("-id")
+        }
+        reg_nos = {row["reg_no"].strip() for row in rows if row.get("reg_no") and row["reg_no"].strip()}
+        self.students = {student.reg_no: student for student in Student.objects.filter(reg_no__in=reg_nos)}
+
+    def program(self, name: str) -> Program | None:
+        return self.programs.get(name.lower())
+
+    def batch(self, name: str, program: Program) -> Batch | None:
+        return self.batches.get((program.id, name.lower()))
+
+    def group(self, name: str, batch: Batch) -> Group | None:
+        return self.groups.get((batch.id, name.lower()))
+
+    def add(self, obj: Program | Batch | Group) -> None:
+        if isinstance(obj, Program):
+            self.programs[obj.name.lower()] = obj
+        elif isinstance(obj, Batch):
+            self.batches[(obj.program_id, obj.name.lower())] = obj
+        else:
+            self.groups[(obj.batch_id, obj.name.lower())] = obj
+
+
 def validate_required_fields(row: dict[str, str], row_num: int) -> list[dict[str, str]]:
     """
     Validate that all required fields are present and non-empty.
@@ -64,11 +118,12 @@ def normalize_status(status: str | None) -> str | None:
 
 
 def resolve_program(
-    program_name: str | None, row_num: int, auto_create: bool = False
+    program_name: str | None, row_num: int, auto_create: bool = False, lookups: ImportLookups | None = None
 ) -> tuple[Program | None, list[dict[str, str]]]:
     """
     Resolve Program by name (case-insensitive).
     If auto_create=True and program doesn't exist, creates it automatically.
+    With ``lookups`` the name is looked up in memory instead of queried.
     Returns (Program instance or None, list of errors/warnings)
     """
     errors = []
@@ -76,7 +131,10 @@ def resolve_program(
         return None, errors
 
     program_name = program_name.strip()
-    program = Program.objects.filter(name__iexact=program_name).first()
+    if lookups is not None:
+        program = lookups.program(program_name)
+    else:
+        program = Program.objects.filter(name__iexact=program_name).first()
 
     if not program:
         if auto_create:
@@ -87,6 +145,8 @@ def resolve_program(
                     is_active=True,
                     structure_type=Program.STRUCTURE_TYPE_YEARLY,
                 )
+                if lookups is not None:
+                    lookups.add(program)
                 errors.append(
                     {"column": "program_name", "message": f"Program '{program_name}' was automatically created."}
                 )
@@ -178,11 +238,16 @@ def get_program_duration_years(program: Optional["Program"]) -> int:
 
 
 def resolve_batch(
-    batch_name: str | None, program: Program | None, row_num: int, auto_create: bool = False
+    batch_name: str | None,
+    program: Program | None,
+    row_num: int,
+    auto_create: bool = False,
+    lookups: ImportLookups | None = None,
 ) -> tuple[Batch | None, list[dict[str, str]]]:
     """
     Resolve Batch by name, scoped to Program (case-insensitive).
     If auto_create=True and batch doesn't exist, creates it automatically.
+    With ``lookups`` the name is looked up in memory instead of queried.
     Returns (Batch instance or None, list of errors/warnings)
     """
     errors = []
@@ -194,7 +259,10 @@ def resolve_batch(
         return None, errors
 
     batch_name = batch_name.strip()
-    batch = Batch.objects.filter(program=program, name__iexact=batch_name).first()
+    if lookups is not None:
+        batch = lookups.batch(batch_name, program)
+    else:
+        batch = Batch.objects.filter(program=program, name__iexact=batch_name).first()
 
     if not batch:
         if auto_create:
@@ -233,6 +301,8 @@ def resolve_batch(
                     start_year=graduation_year,
                     is_active=True,
                 )
+                if lookups is not None:
+                    lookups.add(batch)
                 errors.append(
                     {
                         "column": "batch_name",
@@ -255,11 +325,16 @@ def resolve_batch(
 
 
 def resolve_group(
-    group_name: str | None, batch: Batch | None, row_num: int, auto_create: bool = False
+    group_name: str | None,
+    batch: Batch | None,
+    row_num: int,
+    auto_create: bool = False,
+    lookups: ImportLookups | None = None,
 ) -> tuple[Group | None, list[dict[str, str]]]:
     """
     Resolve Group by name, scoped to Batch (case-insensitive).
     If auto_create=True and group doesn't exist, creates it automatically using get_or_create for idempotency.
+    With ``lookups`` the name is looked up in memory instead of queried.
     Returns (Group instance or None, list of errors/warnings)
     """
     errors = []
@@ -271,7 +346,10 @@ def resolve_group(
         return None, errors
 
     group_name = group_name.strip()
-    group = Group.objects.filter(batch=batch, name__iexact=group_name).first()
+    if lookups is not None:
+        group = lookups.group(group_name, batch)
+    else:
+        group = Group.objects.filter(batch=batch, name__iexact=group_name).first()
 
     if not group:
         if auto_create:
@@ -281,6 +359,8 @@ def resolve_group(
                     batch=batch,
                     name=group_name,  # Use exact name provided, not lowercased
                 )
+                if lookups is not None:
+                    lookups.add(group)
                 if created:
                     errors.append(
                         {"column": "group_name", "message": f"Group '{group_name}' was automatically created."}
@@ -362,12 +442,16 @@ def check_duplicate_in_file(reg_no: str, row_index: int, seen_reg_nos: dict[str,
     return errors
 
 
-def check_existing_in_db(reg_no: str, mode: str) -> tuple[bool, Student | None]:
+def check_existing_in_db(reg_no: str, mode: str, lookups: ImportLookups | None = None) -> tuple[bool, Student | None]:
     """
     Check if student with reg_no already exists in database.
+    With ``lookups`` the students loaded up front are used instead of a query.
     Returns (exists, Student instance or None)
     """
-    student = Student.objects.filter(reg_no=reg_no).first()
+    if lookups is not None:
+        student = lookups.students.get(reg_no)
+    else:
+        student = Student.objects.filter(reg_no=reg_no).first()
     exists = student is not None
 
     if mode == "CREATE_ONLY" and exists:
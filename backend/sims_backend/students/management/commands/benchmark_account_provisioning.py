@@ -0,0 +1,56 @@
+"""
+Management command to time password hashing for import account provisioning.
+
+Compares a serial loop (one ``make_password`` per row, as the imports used to
+hash) with ``hash_passwords``, which spreads the work over worker processes. Only hashing is timed; nothing is written.
+"""
+
+import json
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sims_backend.common.parallel import worker_count
+from sims_backend.students.imports.provisioning import hash_passwords
+
+
+class Command(BaseCommand):
+    help = "Time serial vs parallel password hashing for import account provisioning"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=300, help="Accounts to provision")
+        parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+        parser.add_argument("--json", dest="json_path", help="Write results to this file")
+
+    def handle(self, *args, **options):
+        passwords = [f"student{2025 + i % 6}" for i in range(max(1, options["count"]))]
+
+        started = time.perf_counter()
+        for password in passwords:
+            make_password(password)
+        serial = time.perf_counter() - started
+
+        started = time.perf_counter()
+        hash_passwords(passwords, max_workers=options["workers"])
+        parallel = time.perf_counter() - started
+
+        workers = worker_count(len(passwords), options["workers"])
+        self.stdout.write(f"hasher   {settings.PASSWORD_HASHERS[0].rsplit('.', 1)[-1]}")
+        self.stdout.write(f"serial   {serial * 1000:>10.1f} ms   ({len(passwords)} passwords)")
+        self.stdout.write(f"parallel {parallel * 1000:>10.1f} ms   ({workers} workers)")
+        self.stdout.write(f"speedup  {serial / parallel:>10.2f}x")
+
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "count": len(passwords),
+            "workers": workers,
+            "serial_ms": round(serial * 1000, 3),
+            "parallel_ms": round(parallel * 1000, 3),
+        }
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Saved results to {options['json_path']}"))
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.4 on 2026-10-19 05:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("students", "0006_importjob_auto_create"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="cancel_requested",
+            field=models.BooleanField(default=False, help_text="Stop the commit after the current chunk"),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="processed_rows",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Rows handled by committed chunks so far (the resume point)"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="importjob",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "Pending"),
+                    ("PREVIEWED", "Previewed"),
+                    ("QUEUED", "Queued"),
+                    ("RUNNING", "Running"),
+                    ("COMMITTED", "Committed"),
+                    ("CANCELLED", "Cancelled"),
+                    ("FAILED", "Failed"),
+                ],
+                default="PENDING",
+                help_text="Current status of the import job",
+                max_length=32,
+            ),
+        ),
+    ]
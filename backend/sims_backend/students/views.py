@@ -5,6 +5,7 @@ from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.intake.duplicates import sync_student_keys
 from core.permissions import PermissionTaskRequired, has_permission_task
 from sims_backend.students.models import LeavePeriod, Student
 from sims_backend.students.serializers import (
@@ -56,6 +57,13 @@ class StudentViewSet(viewsets.ModelViewSet):
             return qs.filter(id=user.student.id)
         return qs.none()
 
+    def perform_create(self, serializer):
+        # Keep intake duplicate checks aware of the student's email and phone
+        sync_student_keys([serializer.save()])
+
+    def perform_update(self, serializer):
+        sync_student_keys([serializer.save()])
+
     @action(detail=False, methods=["get"], url_path="me")
     def me(self, request):
         """Get current student's profile."""
@@ -1,5 +1,7 @@
 """Test settings - use SQLite in-memory database for tests."""
 
+import tempfile
+
 from sims_backend import settings as base_settings
 
 # Import all uppercase settings from the base module without using wildcard imports
@@ -20,6 +22,9 @@ PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
 ]
 
+# Keep uploaded and generated files out of the source tree
+MEDIA_ROOT = tempfile.mkdtemp(prefix="sims-test-media-")
+
 # Disable HTTPS redirects for tests
 SECURE_SSL_REDIRECT = False
 SESSION_COOKIE_SECURE = False
@@ -0,0 +1,149 @@
+"""Personal iCalendar (ICS) feeds of timetable sessions.
+
+Each user gets a signed, non-expiring feed URL. The feed lists the sessions
+of their student group and the sessions they teach. Calendar clients poll
+feeds, so a poll is kept cheap:
+
+- One aggregate query fingerprints the user's sessions (count plus latest
+  ``updated_at``). That fingerprint is the timetable version, and the
+  ETag/Last-Modified are derived from it. An unchanged feed is answered
+  with 304 without rendering.
+- A changed feed is rendered from one ``values()`` query by a streaming
+  writer. The body is cached under (user, version) for the next client.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from sims_backend.timetable.models import Session
+
+FEED_TOKEN_SALT = "timetable.ical"
+# Sessions that ended longer ago than this are left out of feeds
+FEED_PAST_DAYS = 180
+FEED_CACHE_SECONDS = 60 * 60
+PRODID = "-//FMU SIMS//Timetable//EN"
+
+SESSION_FIELDS = (
+    "id",
+    "starts_at",
+    "ends_at",
+    "updated_at",
+    "department__name",
+    "group__name",
+    "faculty__first_name",
+    "faculty__last_name",
+    "faculty__username",
+)
+
+
+def issue_feed_token(user: User) -> str:
+    return signing.dumps({"u": user.id}, salt=FEED_TOKEN_SALT)
+
+
+def read_feed_token(token: str) -> int | None:
+    """Return the user ID a feed token was issued to, or None if it is not valid."""
+    try:
+        payload = signing.loads(token, salt=FEED_TOKEN_SALT)
+    except signing.BadSignature:
+        return None
+    user_id = payload.get("u") if isinstance(payload, dict) else None
+    return user_id if isinstance(user_id, int) else None
+
+
+def feed_sessions(user: User):
+    """Sessions of the user's student group plus the sessions they teach, within the feed window."""
+    scope = Q(faculty=user)
+    student = getattr(user, "student", None)
+    if student is not None and student.group_id:
+        scope |= Q(group_id=student.group_id)
+    window_start = timezone.now() - timedelta(days=FEED_PAST_DAYS)
+    return Session.objects.filter(scope, ends_at__gte=window_start)
+
+
+def feed_version(user: User, sessions) -> tuple[str, datetime | None]:
+    """(version hash, last modified) of a user's feed with one aggregate query."""
+    stats = sessions.aggregate(count=Count("id"), last_modified=Max("updated_at"))
+    last_modified = stats["last_modified"]
+    stamp = last_modified.isoformat() if last_modified else ""
+    # A student moving group changes the feed even if no session changed
+    student = getattr(user, "student", None)
+    scope = f"{user.id}:{student.group_id if student else ''}"
+    version = hashlib.sha256(f"{scope}:{stats['count']}:{stamp}".encode()).hexdigest()[:16]
+    return version, last_modified
+
+
+def feed_cache_key(user_id: int, version: str) -> str:
+    return f"timetable-ical:{user_id}:{version}"
+
+
+def escape_text(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line at 75 octets as RFC 5545 requires, ending it with CRLF."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Never split a UTF-8 sequence
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start, limit = end, 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _utc(value: datetime) -> str:
+    return value.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _faculty_name(row: dict) -> str:
+    name = f"{row['faculty__first_name']} {row['faculty__last_name']}".strip()
+    return name or row["faculty__username"]
+
+
+def iter_feed(sessions, calendar_name: str) -> Iterator[str]:
+    """Yield the ICS document for ``sessions`` a few lines at a time."""
+    stamp = _utc(timezone.now())
+    yield (
+        fold_line("BEGIN:VCALENDAR")
+        + fold_line("VERSION:2.0")
+        + fold_line(f"PRODID:{PRODID}")
+        + fold_line("CALSCALE:GREGORIAN")
+        + fold_line(f"X-WR-CALNAME:{escape_text(calendar_name)}")
+    )
+    for row in sessions.order_by("starts_at", "id").values(*SESSION_FIELDS).iterator(chunk_size=500):
+        summary = f"{row['department__name']} ({row['group__name']})"
+        yield (
+            fold_line("BEGIN:VEVENT")
+            + fold_line(f"UID:session-{row['id']}@sims.fmu.edu")
+            + fold_line(f"DTSTAMP:{stamp}")
+            + fold_line(f"DTSTART:{_utc(row['starts_at'])}")
+            + fold_line(f"DTEND:{_utc(row['ends_at'])}")
+            + fold_line(f"LAST-MODIFIED:{_utc(row['updated_at'])}")
+            + fold_line(f"SUMMARY:{escape_text(summary)}")
+            + fold_line(f"DESCRIPTION:{escape_text('Faculty: ' + _faculty_name(row))}")
+            + fold_line("END:VEVENT")
+        )
+    yield fold_line("END:VCALENDAR")
+
+
+def iter_cached_feed(user_id: int, version: str, sessions, calendar_name: str) -> Iterator[str]:
+    """Stream a rendered feed, caching the full body once the last chunk is written."""
+    chunks = []
+    for chunk in iter_feed(sessions, calendar_name):
+        chunks.append(chunk)
+        yield chunk
+    cache.set(feed_cache_key(user_id, version), "".join(chunks), FEED_CACHE_SECONDS)
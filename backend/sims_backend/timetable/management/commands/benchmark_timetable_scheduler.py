@@ -0,0 +1,77 @@
+"""
+Management command to benchmark the timetable auto-scheduler on synthetic batches.
+
+Each size is a number of batches (grids) needing a full week (18 periods)
+from a shared faculty pool, with some slots blocked per faculty member. The
+solver runs in memory only; no rows are written. Save a run with --json and
+pass it as --baseline to a later run to compare.
+"""
+
+import json
+import statistics
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sims_backend.timetable.scheduler import solve, synthetic_problem, validate_solution
+
+
+class Command(BaseCommand):
+    help = "Benchmark the timetable auto-scheduler on synthetic batches of increasing size"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1,2,4,8,16", help="Comma-separated batch counts")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs (seeds) per size")
+        parser.add_argument("--budget", type=float, default=1.0, help="Time budget per run in seconds")
+        parser.add_argument("--busy-ratio", type=float, default=0.15, help="Share of slots each faculty is busy")
+        parser.add_argument("--json", dest="json_path", help="Write results to this file")
+        parser.add_argument("--baseline", help="Compare against results saved with --json")
+
+    def handle(self, *args, **options):
+        repeat = max(1, options["repeat"])
+        baseline = {}
+        if options["baseline"]:
+            with open(options["baseline"]) as fh:
+                baseline = json.load(fh)["sizes"]
+
+        results = {}
+        for size in (int(part) for part in options["sizes"].split(",") if part.strip()):
+            timings, scores, unplaced = [], [], []
+            for seed in range(repeat):
+                problem = synthetic_problem(size, seed=seed, busy_ratio=options["busy_ratio"])
+                solution = solve(problem, time_budget=options["budget"], seed=seed)
+                errors = validate_solution(problem, solution.assignment)
+                if errors:
+                    self.stderr.write(self.style.ERROR(f"{size} batches, seed {seed}: {errors[0]}"))
+                timings.append(solution.elapsed * 1000)
+                scores.append(solution.score)
+                unplaced.append(len(solution.unplaced))
+            timings.sort()
+            key = str(size)
+            results[key] = {
+                "units": len(problem.units),
+                "median_ms": round(statistics.median(timings), 3),
+                "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+                "median_score": statistics.median(scores),
+                "max_unplaced": max(unplaced),
+            }
+
+            line = (
+                f"{size:>4} batches {results[key]['units']:>5} sessions   "
+                f"median {results[key]['median_ms']:>9.3f} ms   p95 {results[key]['p95_ms']:>9.3f} ms   "
+                f"score {results[key]['median_score']:>7}   unplaced {results[key]['max_unplaced']}"
+            )
+            if key in baseline:
+                line += f"   baseline score {baseline[key]['median_score']}"
+            self.stdout.write(line)
+
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "repeat": repeat,
+            "budget": options["budget"],
+            "sizes": results,
+        }
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Saved results to {options['json_path']}"))
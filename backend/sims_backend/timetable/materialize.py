@@ -0,0 +1,236 @@
+"""Generate Session rows from published weekly timetable grids.
+
+Every filled cell (``line1`` set) of a published week becomes one session per
+group it is for:
+
+- ``time_slot`` ("09:00-10:00") plus ``day_of_week`` and ``week_start_date``
+  give the start and end.
+- The department is the longest department name or code that appears in the
+  cell text. ``line1`` is searched first.
+- The faculty is the line that is a user's full name ("Dr." and "Prof." are
+  ignored) or username. ``line3`` is tried first.
+- The groups are those of the week's batch named anywhere in the cell. When
+  no group is named, the cell is for the whole batch.
+
+Any number of weeks is handled in one pass. Cells, groups, departments,
+faculty and the sessions generated earlier are each loaded with one query.
+The result is diffed against the earlier sessions (keyed by cell and group),
+and applied with bulk_create, bulk_update and one delete. Cells that cannot be
+resolved are skipped and reported. Stale sessions that already have
+attendance are detached from their cell instead of deleted.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Concat, Lower
+from django.utils import timezone
+
+from sims_backend.academics.models import Department, Group
+from sims_backend.timetable.conflicts import period_conflicts
+from sims_backend.timetable.models import Session, TimetableCell, WeeklyTimetable
+
+SLOT_PATTERN = re.compile(r"^\s*(\d{1,3})[:.](\d{2})\s*[-–]\s*(\d{1,3})[:.](\d{2})\s*$")
+TITLE_PATTERN = re.compile(r"^(dr|prof|mr|ms|mrs)\.?\s+")
+SESSION_FIELDS = ["academic_period", "faculty", "department", "starts_at", "ends_at"]
+
+
+@lru_cache(maxsize=256)
+def parse_time_slot(time_slot: str) -> tuple[time, time] | None:
+    """``"09:00-10:00"`` -> ``(09:00, 10:00)``; None if the slot is not a valid, increasing range."""
+    match = SLOT_PATTERN.match(time_slot)
+    if not match:
+        return None
+    start_hour, start_minute, end_hour, end_minute = (int(part) for part in match.groups())
+    try:
+        start, end = time(start_hour, start_minute), time(end_hour, end_minute)
+    except ValueError:
+        return None
+    return (start, end) if start < end else None
+
+
+def _normalize(text: str) -> str:
+    return TITLE_PATTERN.sub("", " ".join(text.lower().split()))
+
+
+class CellResolver:
+    """Group, department and faculty lookups shared by every cell of one materialization pass."""
+
+    def __init__(self, batch_ids, cells):
+        self.groups_by_batch = defaultdict(dict)
+        for group in Group.objects.filter(batch_id__in=batch_ids).order_by("name"):
+            self.groups_by_batch[group.batch_id][_normalize(group.name)] = group
+        self.group_patterns = {batch_id: _alternation(groups) for batch_id, groups in self.groups_by_batch.items()}
+
+        self.departments = {}
+        for department in Department.objects.all():
+            for key in (department.name, department.code):
+                if key:
+                    self.departments.setdefault(_normalize(key), department)
+        self.department_pattern = _alternation(self.departments)
+
+        lines = {_normalize(line) for cell in cells for line in (cell.line1, cell.line2, cell.line3) if line}
+        self.faculty = {}
+        users = (
+            get_user_model()
+            .objects.annotate(full_name=Lower(Concat("first_name", Value(" "), "last_name")))
+            .filter(Q(full_name__in=lines) | Q(username__in=lines), is_active=True)
+            .order_by("id")
+        )
+        for user in users:
+            self.faculty.setdefault(user.full_name, user)
+            self.faculty.setdefault(user.username.lower(), user)
+
+    def groups(self, batch_id: int, texts: list[str]) -> list:
+        batch_groups = self.groups_by_batch.get(batch_id, {})
+        pattern = self.group_patterns.get(batch_id)
+        named = {match for text in texts for match in pattern.findall(text)} if pattern else set()
+        if named:
+            return [group for key, group in batch_groups.items() if key in named]
+        return list(batch_groups.values())
+
+    def department(self, texts: list[str]):
+        if self.department_pattern is None:
+            return None
+        for text in texts:
+            matches = self.department_pattern.findall(text)
+            if matches:
+                return self.departments[max(matches, key=len)]
+        return None
+
+    def faculty_for(self, texts: list[str]):
+        for text in texts:
+            user = self.faculty.get(text)
+            if user is not None:
+                return user
+        return None
+
+
+def _alternation(keys) -> re.Pattern | None:
+    """Whole-word regex matching any of ``keys``, longest first."""
+    if not keys:
+        return None
+    alternatives = "|".join(re.escape(key) for key in sorted(keys, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)")
+
+
+def materialize_sessions(timetables) -> dict:
+    """
+    Create, update and delete the sessions of published ``timetables`` in one transaction.
+
+    ``timetables`` is a WeeklyTimetable queryset or list; drafts are ignored.
+    """
+    timetables = [t for t in timetables if t.status == "published"]
+    by_id = {timetable.id: timetable for timetable in timetables}
+    summary = {
+        "timetables": len(timetables),
+        "created": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "deleted": 0,
+        "detached": 0,
+        "skipped": [],
+        "conflicts": [],
+    }
+    if not timetables:
+        return summary
+
+    cells = list(TimetableCell.objects.filter(weekly_timetable_id__in=by_id).exclude(line1="").order_by("id"))
+    resolver = CellResolver({t.batch_id for t in timetables}, cells)
+
+    desired = {}
+    for cell in cells:
+        timetable = by_id[cell.weekly_timetable_id]
+        texts = [_normalize(line) for line in (cell.line1, cell.line2, cell.line3) if line]
+        reason = None
+        slot = parse_time_slot(cell.time_slot)
+        department = resolver.department(texts)
+        faculty = resolver.faculty_for(texts[::-1])
+        groups = resolver.groups(timetable.batch_id, texts)
+        if slot is None:
+            reason = f"Unrecognized time slot '{cell.time_slot}'"
+        elif department is None:
+            reason = "No department named in cell"
+        elif faculty is None:
+            reason = "No faculty named in cell"
+        elif not groups:
+            reason = "Batch has no groups"
+        if reason:
+            summary["skipped"].append(
+                {
+                    "timetable": timetable.id,
+                    "cell": cell.id,
+                    "day_of_week": cell.day_of_week,
+                    "time_slot": cell.time_slot,
+                    "reason": reason,
+                }
+            )
+            continue
+
+        day = timetable.week_start_date + timedelta(days=cell.day_of_week)
+        starts_at = timezone.make_aware(datetime.combine(day, slot[0]))
+        ends_at = timezone.make_aware(datetime.combine(day, slot[1]))
+        for group in groups:
+            desired[(cell.id, group.id)] = {
+                "academic_period_id": timetable.academic_period_id,
+                "faculty_id": faculty.id,
+                "department_id": department.id,
+                "starts_at": starts_at,
+                "ends_at": ends_at,
+            }
+
+    with transaction.atomic():
+        existing = {
+            (session.timetable_cell_id, session.group_id): session
+            for session in Session.objects.filter(timetable_cell__weekly_timetable_id__in=by_id)
+        }
+        now = timezone.now()
+        to_create, to_update = [], []
+        for (cell_id, group_id), values in desired.items():
+            session = existing.pop((cell_id, group_id), None)
+            if session is None:
+                to_create.append(Session(timetable_cell_id=cell_id, group_id=group_id, **values))
+            elif any(getattr(session, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(session, field, value)
+                session.updated_at = now
+                to_update.append(session)
+            else:
+                summary["unchanged"] += 1
+
+        Session.objects.bulk_create(to_create)
+        Session.objects.bulk_update(to_update, [*SESSION_FIELDS, "updated_at"])
+
+        stale = [session.id for session in existing.values()]
+        attended = set(
+            Session.objects.filter(id__in=stale, attendance_records__isnull=False).values_list("id", flat=True)
+        )
+        if attended:
+            Session.objects.filter(id__in=attended).update(timetable_cell=None, updated_at=now)
+        Session.objects.filter(id__in=set(stale) - attended).delete()
+
+    summary.update(created=len(to_create), updated=len(to_update), deleted=len(stale) - len(attended))
+    summary["detached"] = len(attended)
+
+    weeks = [t.week_start_date for t in timetables]
+    window = Session.objects.filter(
+        academic_period_id__in={t.academic_period_id for t in timetables},
+        starts_at__gte=timezone.make_aware(datetime.combine(min(weeks), time.min)),
+        starts_at__lt=timezone.make_aware(datetime.combine(max(weeks) + timedelta(days=7), time.min)),
+    )
+    summary["conflicts"] = period_conflicts(window)
+    return summary
+
+
+def materialize_batch_sessions(batch_id: int, academic_period_id: int) -> dict:
+    """Materialize every published week of a batch in an academic period."""
+    return materialize_sessions(
+        WeeklyTimetable.objects.filter(batch_id=batch_id, academic_period_id=academic_period_id, status="published")
+    )
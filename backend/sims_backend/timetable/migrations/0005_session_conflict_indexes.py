@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academics", "0009_alter_batch_start_year"),
+        ("timetable", "0004_rename_timetable_t_weekly__jkl012_idx_timetable_t_weekly__fda2b3_idx_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="session",
+            name="timetable_s_faculty_a5b647_idx",
+        ),
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(fields=["faculty", "starts_at"], name="timetable_s_faculty_44ce33_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(fields=["group", "starts_at"], name="timetable_s_group_i_1eaedf_idx"),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("timetable", "0005_session_conflict_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="session",
+            name="timetable_cell",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Published weekly timetable cell this session was generated from (blank if created by hand)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="sessions",
+                to="timetable.timetablecell",
+            ),
+        ),
+    ]
@@ -34,12 +34,22 @@ class Session(TimeStampedModel):
     )
     starts_at = models.DateTimeField(help_text="Session start time")
     ends_at = models.DateTimeField(help_text="Session end time")
+    timetable_cell = models.ForeignKey(
+        "timetable.TimetableCell",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="sessions",
+        help_text="Published weekly timetable cell this session was generated from (blank if created by hand)",
+    )
 
     class Meta:
         ordering = ["starts_at"]
         indexes = [
             models.Index(fields=["academic_period", "group"]),
-            models.Index(fields=["faculty"]),
+            # Range lookups for double-booking checks (see timetable.conflicts)
+            models.Index(fields=["faculty", "starts_at"]),
+            models.Index(fields=["group", "starts_at"]),
             models.Index(fields=["starts_at"]),
         ]
 
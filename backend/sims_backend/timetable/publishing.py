@@ -0,0 +1,59 @@
+"""Week template generation and the publish rule for weekly timetables.
+
+A timetable can be published when every day Monday to Saturday has exactly
+PERIODS_PER_DAY filled periods (cells whose ``line1`` has non-blank text).
+The rule is checked for any number of timetables with one grouped query,
+which counts filled cells per day with a filtered ``Count``.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from django.db.models import Count, Q
+
+from sims_backend.timetable.models import WeeklyTimetable
+
+PERIODS_PER_DAY = 3
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+
+def week_start_dates(start_date: date, end_date: date) -> list[date]:
+    """Mondays of every week (Monday to Saturday) that overlaps ``start_date``..``end_date``."""
+    monday = start_date - timedelta(days=start_date.weekday())
+    weeks = []
+    while monday <= end_date:
+        if monday + timedelta(days=5) >= start_date:
+            weeks.append(monday)
+        monday += timedelta(days=7)
+    return weeks
+
+
+def period_count_errors(timetable_ids) -> dict[int, list[str]]:
+    """
+    Days breaking the periods-per-day rule, keyed by timetable ID (one query).
+
+    Timetables that satisfy the rule are left out, e.g. ``{7: ["Monday (2 periods)"]}``.
+    """
+    filled = Q(cells__line1__regex=r"\S")
+    counts = (
+        WeeklyTimetable.objects.filter(id__in=timetable_ids)
+        .annotate(
+            **{f"day_{day}": Count("cells", filter=filled & Q(cells__day_of_week=day)) for day in range(len(DAY_NAMES))}
+        )
+        .values("id", *(f"day_{day}" for day in range(len(DAY_NAMES))))
+    )
+    errors = {}
+    for row in counts:
+        wrong = [
+            f"{name} ({row[f'day_{day}']} periods)"
+            for day, name in enumerate(DAY_NAMES)
+            if row[f"day_{day}"] != PERIODS_PER_DAY
+        ]
+        if wrong:
+            errors[row["id"]] = wrong
+    return errors
+
+
+def period_count_message(days_with_wrong_count: list[str]) -> str:
+    return f"Each day must have exactly {PERIODS_PER_DAY} periods. Found: {', '.join(days_with_wrong_count)}"
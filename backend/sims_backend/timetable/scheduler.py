@@ -0,0 +1,574 @@
+"""Heuristic auto-scheduler for weekly timetable grids.
+
+The solver is independent of the database. A problem is one or more grids
+(batches) sharing one set of time slots and one pool of faculty. Each
+required session is a *unit* (grid, faculty, department) that needs one slot.
+A slot is a bit, ``day * slots_per_day + slot_index``. Occupancy is kept as
+Python int bitsets: one per grid, one per faculty, plus each faculty's fixed
+busy mask (unavailability and sessions they already teach elsewhere).
+
+Hard constraints:
+- one unit per grid slot;
+- at most ``periods_per_day`` units per grid and day (the publish rule);
+- no faculty in two places at once;
+- nobody scheduled while busy.
+
+Soft penalties:
+- the same department more than once a day in a grid;
+- a faculty member teaching more than FACULTY_DAILY_LIMIT periods a day.
+
+Solving runs in two phases:
+
+1. Construction with constraint propagation. The unit with the fewest
+   feasible slots left is placed next (minimum remaining values), in the slot
+   that adds the least penalty. A grid day that reaches ``periods_per_day``
+   leaves every domain at once, by masking the day's bits out.
+2. Local search until the time budget runs out. It uses random moves and
+   same-grid swaps, accepting sideways moves. Unplaced units are repaired by
+   ejecting at most one blocking unit and re-placing it elsewhere.
+
+The score is ``HARD_PENALTY * unplaced + soft penalty``, where 0 is a perfect
+grid.
+
+``auto_schedule_batch`` builds one problem per week of a batch and solves the
+weeks in order. Each week is warm-started from the week before it. Faculty
+are busy wherever they already teach another session in that week. The
+result is written as draft WeeklyTimetable cells that ``materialize`` can
+resolve: ``line1`` is the department name and ``line3`` is the faculty name.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from sims_backend.academics.models import Department
+from sims_backend.timetable.materialize import parse_time_slot
+from sims_backend.timetable.models import Session, TimetableCell, WeeklyTimetable
+from sims_backend.timetable.publishing import PERIODS_PER_DAY
+
+DAYS = 6  # Monday to Saturday
+HARD_PENALTY = 1000
+SAME_DEPARTMENT_PENALTY = 3
+FACULTY_OVERLOAD_PENALTY = 2
+FACULTY_DAILY_LIMIT = 2
+DEFAULT_TIME_SLOTS = (
+    "08:00-09:00",
+    "09:00-10:00",
+    "10:00-11:00",
+    "11:00-12:00",
+    "12:00-13:00",
+    "14:00-15:00",
+)
+# Scheduling runs inside the request, so the whole search is kept short
+MAX_TIME_BUDGET = 5.0
+# Local search stops early after this many non-improving iterations per unit
+STALE_ITERATIONS_PER_UNIT = 400
+
+
+@dataclass(frozen=True)
+class Unit:
+    """One required session: which grid it belongs to, who teaches it and which department it is"""
+
+    grid: int
+    faculty: int
+    department: int
+
+
+@dataclass
+class Problem:
+    grids: int
+    slots_per_day: int
+    periods_per_day: int
+    units: list[Unit]
+    # faculty -> bitset of slots they cannot teach in
+    faculty_busy: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def slot_count(self) -> int:
+        return DAYS * self.slots_per_day
+
+
+@dataclass
+class Solution:
+    assignment: list[int | None]
+    score: int
+    soft_penalty: int
+    unplaced: list[int]
+    iterations: int
+    elapsed: float
+
+    @property
+    def hard_violations(self) -> int:
+        return len(self.unplaced)
+
+
+class _State:
+    """Bitset occupancy plus the counters the penalties are computed from, updated incrementally."""
+
+    def __init__(self, problem: Problem):
+        self.problem = problem
+        self.slots_per_day = problem.slots_per_day
+        self.day_masks = [((1 << problem.slots_per_day) - 1) << (day * problem.slots_per_day) for day in range(DAYS)]
+        self.assignment: list[int | None] = [None] * len(problem.units)
+        self.grid_mask = [0] * problem.grids
+        # Days already holding periods_per_day units, per grid
+        self.grid_full_days = [0] * problem.grids
+        self.grid_day_count = [[0] * DAYS for _ in range(problem.grids)]
+        self.grid_slot_unit: list[dict[int, int]] = [{} for _ in range(problem.grids)]
+        self.faculty_mask: dict[int, int] = defaultdict(int)
+        self.faculty_slot_unit: dict[tuple[int, int], int] = {}
+        self.department_day: dict[tuple[int, int, int], int] = defaultdict(int)
+        self.faculty_day: dict[tuple[int, int], int] = defaultdict(int)
+        self.soft = 0
+        self.placed = 0
+
+    def free_slots(self, unit_index: int) -> int:
+        """Bitset of slots ``unit_index`` could take right now (ignoring its own current slot)."""
+        unit = self.problem.units[unit_index]
+        blocked = (
+            self.grid_mask[unit.grid]
+            | self.grid_full_days[unit.grid]
+            | self.faculty_mask[unit.faculty]
+            | self.problem.faculty_busy.get(unit.faculty, 0)
+        )
+        return ~blocked & ((1 << self.problem.slot_count) - 1)
+
+    def soft_delta(self, unit_index: int, bit: int) -> int:
+        """Penalty added by placing ``unit_index`` at ``bit``."""
+        unit = self.problem.units[unit_index]
+        day = bit // self.slots_per_day
+        delta = 0
+        if self.department_day[(unit.grid, unit.department, day)] >= 1:
+            delta += SAME_DEPARTMENT_PENALTY
+        if self.faculty_day[(unit.faculty, day)] >= FACULTY_DAILY_LIMIT:
+            delta += FACULTY_OVERLOAD_PENALTY
+        return delta
+
+    def place(self, unit_index: int, bit: int) -> None:
+        unit = self.problem.units[unit_index]
+        day = bit // self.slots_per_day
+        self.soft += self.soft_delta(unit_index, bit)
+        self.assignment[unit_index] = bit
+        self.grid_mask[unit.grid] |= 1 << bit
+        self.grid_slot_unit[unit.grid][bit] = unit_index
+        self.grid_day_count[unit.grid][day] += 1
+        if self.grid_day_count[unit.grid][day] >= self.problem.periods_per_day:
+            self.grid_full_days[unit.grid] |= self.day_masks[day]
+        self.faculty_mask[unit.faculty] |= 1 << bit
+        self.faculty_slot_unit[(unit.faculty, bit)] = unit_index
+        self.department_day[(unit.grid, unit.department, day)] += 1
+        self.faculty_day[(unit.faculty, day)] += 1
+        self.placed += 1
+
+    def remove(self, unit_index: int) -> int:
+        unit = self.problem.units[unit_index]
+        bit = self.assignment[unit_index]
+        day = bit // self.slots_per_day
+        self.assignment[unit_index] = None
+        self.grid_mask[unit.grid] &= ~(1 << bit)
+        del self.grid_slot_unit[unit.grid][bit]
+        self.grid_day_count[unit.grid][day] -= 1
+        self.grid_full_days[unit.grid] &= ~self.day_masks[day]
+        self.faculty_mask[unit.faculty] &= ~(1 << bit)
+        del self.faculty_slot_unit[(unit.faculty, bit)]
+        self.department_day[(unit.grid, unit.department, day)] -= 1
+        self.faculty_day[(unit.faculty, day)] -= 1
+        self.placed -= 1
+        # Penalties are recomputed as if placing into the remaining state
+        self.soft -= self.soft_delta(unit_index, bit)
+        return bit
+
+    def score(self) -> int:
+        return HARD_PENALTY * (len(self.assignment) - self.placed) + self.soft
+
+    def best_slot(self, unit_index: int, rng: random.Random) -> int | None:
+        candidates = self.free_slots(unit_index)
+        best, best_delta = None, None
+        while candidates:
+            low = candidates & -candidates
+            bit = low.bit_length() - 1
+            candidates ^= low
+            delta = self.soft_delta(unit_index, bit)
+            if best_delta is None or delta < best_delta or (delta == best_delta and rng.random() < 0.5):
+                best, best_delta = bit, delta
+                if delta == 0 and rng.random() < 0.5:
+                    break
+        return best
+
+
+def _bits(mask: int) -> list[int]:
+    bits = []
+    while mask:
+        low = mask & -mask
+        bits.append(low.bit_length() - 1)
+        mask ^= low
+    return bits
+
+
+def _construct(state: _State, rng: random.Random, initial: list[int | None] | None) -> None:
+    if initial:
+        # Warm start (e.g. the previous week's grid), keeping whatever is still feasible
+        for unit_index, bit in enumerate(initial[: len(state.assignment)]):
+            if bit is not None and state.free_slots(unit_index) >> bit & 1:
+                state.place(unit_index, bit)
+
+    pending = {index for index, bit in enumerate(state.assignment) if bit is None}
+    while pending:
+        unit_index = min(pending, key=lambda index: (state.free_slots(index).bit_count(), index))
+        pending.discard(unit_index)
+        bit = state.best_slot(unit_index, rng)
+        if bit is not None:
+            state.place(unit_index, bit)
+
+
+def _try_move(state: _State, unit_index: int, rng: random.Random) -> bool:
+    old_score = state.score()
+    old_bit = state.remove(unit_index)
+    options = _bits(state.free_slots(unit_index) & ~(1 << old_bit))
+    if options:
+        state.place(unit_index, rng.choice(options))
+        if state.score() <= old_score:
+            return True
+        state.remove(unit_index)
+    state.place(unit_index, old_bit)
+    return False
+
+
+def _try_swap(state: _State, first: int, second: int) -> bool:
+    old_score = state.score()
+    first_bit, second_bit = state.remove(first), state.remove(second)
+    if state.free_slots(first) >> second_bit & 1:
+        state.place(first, second_bit)
+        if state.free_slots(second) >> first_bit & 1:
+            state.place(second, first_bit)
+            if state.score() <= old_score:
+                return True
+            state.remove(second)
+        state.remove(first)
+    state.place(first, first_bit)
+    state.place(second, second_bit)
+    return False
+
+
+def _try_repair(state: _State, unit_index: int, rng: random.Random) -> bool:
+    """Place an unplaced unit by ejecting one blocker and re-placing it elsewhere."""
+    unit = state.problem.units[unit_index]
+    old_score = state.score()
+    usable = ~state.problem.faculty_busy.get(unit.faculty, 0) & ((1 << state.problem.slot_count) - 1)
+    candidates = _bits(usable)
+    rng.shuffle(candidates)
+    for bit in candidates:
+        blockers = {
+            state.grid_slot_unit[unit.grid].get(bit),
+            state.faculty_slot_unit.get((unit.faculty, bit)),
+        } - {None}
+        if len(blockers) != 1:
+            continue
+        (blocker,) = blockers
+        blocker_bit = state.remove(blocker)
+        if not state.free_slots(unit_index) >> bit & 1:
+            state.place(blocker, blocker_bit)
+            continue
+        state.place(unit_index, bit)
+        new_bit = state.best_slot(blocker, rng)
+        if new_bit is not None:
+            state.place(blocker, new_bit)
+        if state.score() < old_score:
+            return True
+        if new_bit is not None:
+            state.remove(blocker)
+        state.remove(unit_index)
+        state.place(blocker, blocker_bit)
+    return False
+
+
+def solve(
+    problem: Problem,
+    time_budget: float = 1.0,
+    seed: int | None = None,
+    initial: list[int | None] | None = None,
+) -> Solution:
+    """Construct a grid and improve it with local search for at most ``time_budget`` seconds."""
+    started = time.perf_counter()
+    deadline = started + time_budget
+    rng = random.Random(seed)
+    state = _State(problem)
+    _construct(state, rng, initial)
+
+    best_score = state.score()
+    best_assignment = list(state.assignment)
+    best_soft = state.soft
+    iterations = stale = 0
+    stale_limit = STALE_ITERATIONS_PER_UNIT * max(1, len(problem.units))
+    by_grid: dict[int, list[int]] = defaultdict(list)
+    for index, unit in enumerate(problem.units):
+        by_grid[unit.grid].append(index)
+
+    while best_score > 0 and stale < stale_limit and time.perf_counter() < deadline:
+        iterations += 1
+        unplaced = [index for index, bit in enumerate(state.assignment) if bit is None]
+        if unplaced and rng.random() < 0.5:
+            _try_repair(state, rng.choice(unplaced), rng)
+        else:
+            placed = [index for index, bit in enumerate(state.assignment) if bit is not None]
+            if not placed:
+                break
+            unit_index = rng.choice(placed)
+            peers = [index for index in by_grid[problem.units[unit_index].grid] if index != unit_index]
+            peer = rng.choice(peers) if peers else None
+            if peer is not None and state.assignment[peer] is not None and rng.random() < 0.5:
+                _try_swap(state, unit_index, peer)
+            else:
+                _try_move(state, unit_index, rng)
+
+        score = state.score()
+        if score < best_score:
+            best_score, best_soft, best_assignment = score, state.soft, list(state.assignment)
+            stale = 0
+        else:
+            stale += 1
+
+    return Solution(
+        assignment=best_assignment,
+        score=best_score,
+        soft_penalty=best_soft,
+        unplaced=[index for index, bit in enumerate(best_assignment) if bit is None],
+        iterations=iterations,
+        elapsed=time.perf_counter() - started,
+    )
+
+
+def validate_solution(problem: Problem, assignment: list[int | None]) -> list[str]:
+    """Hard-constraint violations of a complete or partial assignment (empty when it is valid)."""
+    errors = []
+    grid_slots, faculty_slots = set(), set()
+    per_day: dict[tuple[int, int], int] = defaultdict(int)
+    for index, bit in enumerate(assignment):
+        if bit is None:
+            continue
+        unit = problem.units[index]
+        day = bit // problem.slots_per_day
+        if (unit.grid, bit) in grid_slots:
+            errors.append(f"grid {unit.grid} slot {bit} used twice")
+        if (unit.faculty, bit) in faculty_slots:
+            errors.append(f"faculty {unit.faculty} double-booked at slot {bit}")
+        if problem.faculty_busy.get(unit.faculty, 0) >> bit & 1:
+            errors.append(f"faculty {unit.faculty} busy at slot {bit}")
+        grid_slots.add((unit.grid, bit))
+        faculty_slots.add((unit.faculty, bit))
+        per_day[(unit.grid, day)] += 1
+        if per_day[(unit.grid, day)] > problem.periods_per_day:
+            errors.append(f"grid {unit.grid} has more than {problem.periods_per_day} periods on day {day}")
+    return errors
+
+
+def synthetic_problem(
+    grids: int, seed: int = 0, slots_per_day: int = 6, periods_per_day: int = 3, busy_ratio: float = 0.15
+) -> Problem:
+    """A random, full-load problem: every grid needs DAYS * periods_per_day sessions from a shared faculty pool."""
+    rng = random.Random(seed)
+    faculty_count = max(2, grids * 3)
+    slot_count = DAYS * slots_per_day
+    units = []
+    for grid in range(grids):
+        teachers = rng.sample(range(faculty_count), k=min(faculty_count, 6))
+        for period in range(DAYS * periods_per_day):
+            teacher = teachers[period % len(teachers)]
+            units.append(Unit(grid=grid, faculty=teacher, department=teacher % 8))
+    faculty_busy = {}
+    for faculty in range(faculty_count):
+        mask = 0
+        for bit in range(slot_count):
+            if rng.random() < busy_ratio:
+                mask |= 1 << bit
+        faculty_busy[faculty] = mask
+    return Problem(
+        grids=grids,
+        slots_per_day=slots_per_day,
+        periods_per_day=periods_per_day,
+        units=units,
+        faculty_busy=faculty_busy,
+    )
+
+
+class SchedulerError(ValueError):
+    """Raised when an auto-schedule request cannot be turned into a problem."""
+
+
+@dataclass(frozen=True)
+class Requirement:
+    department: int
+    faculty: int
+    sessions_per_week: int
+
+
+def _faculty_label(user) -> str:
+    return user.get_full_name() or user.username
+
+
+def _busy_masks(faculty_ids, weeks: list[date], slots) -> dict[date, dict[int, int]]:
+    """Per week, the slots each faculty member already teaches in (one query)."""
+    masks: dict[date, dict[int, int]] = {week: defaultdict(int) for week in weeks}
+    if not weeks:
+        return masks
+    sessions = Session.objects.filter(
+        faculty_id__in=faculty_ids,
+        starts_at__lt=timezone.make_aware(datetime.combine(max(weeks) + timedelta(days=DAYS), datetime.min.time())),
+        ends_at__gt=timezone.make_aware(datetime.combine(min(weeks), datetime.min.time())),
+    ).values_list("faculty_id", "starts_at", "ends_at")
+    for faculty_id, starts_at, ends_at in sessions:
+        starts_at, ends_at = timezone.localtime(starts_at), timezone.localtime(ends_at)
+        day_date = starts_at.date()
+        while day_date <= ends_at.date():
+            week = day_date - timedelta(days=day_date.weekday())
+            if week in masks and day_date.weekday() < DAYS:
+                for index, (slot_start, slot_end) in enumerate(slots):
+                    start = timezone.make_aware(datetime.combine(day_date, slot_start))
+                    end = timezone.make_aware(datetime.combine(day_date, slot_end))
+                    if starts_at < end and ends_at > start:
+                        masks[week][faculty_id] |= 1 << (day_date.weekday() * len(slots) + index)
+            day_date += timedelta(days=1)
+    return masks
+
+
+def auto_schedule_batch(
+    batch,
+    academic_period,
+    weeks: list[date],
+    requirements: list[Requirement],
+    user,
+    unavailable: dict[int, list[tuple[int, int]]] | None = None,
+    time_slots=DEFAULT_TIME_SLOTS,
+    time_budget: float = 2.0,
+    seed: int | None = None,
+    apply: bool = True,
+) -> dict:
+    """
+    Draft conflict-free weekly grids for ``batch`` in the given weeks.
+
+    ``unavailable`` maps a faculty ID to ``(day_of_week, slot index)`` pairs
+    they cannot teach in, every week. Published weeks are left alone. With
+    ``apply`` the draft weeks are created or their cells replaced; without it
+    nothing is written and the proposed grids are only returned.
+    """
+    slots = [parse_time_slot(slot) for slot in time_slots]
+    if len(slots) < PERIODS_PER_DAY or None in slots or len(set(time_slots)) != len(time_slots):
+        raise SchedulerError(f"time_slots must be at least {PERIODS_PER_DAY} distinct 'HH:MM-HH:MM' ranges")
+    if not requirements:
+        raise SchedulerError("At least one requirement is needed")
+    if any(requirement.sessions_per_week < 1 for requirement in requirements):
+        raise SchedulerError("sessions_per_week must be at least 1")
+
+    departments = Department.objects.in_bulk({requirement.department for requirement in requirements})
+    faculty = get_user_model().objects.in_bulk({requirement.faculty for requirement in requirements})
+    missing = [r for r in requirements if r.department not in departments or r.faculty not in faculty]
+    if missing:
+        raise SchedulerError(f"Unknown department or faculty in requirement {missing[0]}")
+
+    fixed = defaultdict(int)
+    for faculty_id, pairs in (unavailable or {}).items():
+        for day, index in pairs:
+            if not (0 <= day < DAYS and 0 <= index < len(slots)):
+                raise SchedulerError(f"Unavailable slot ({day}, {index}) is outside the grid")
+            fixed[faculty_id] |= 1 << (day * len(slots) + index)
+
+    existing = {
+        timetable.week_start_date: timetable
+        for timetable in WeeklyTimetable.objects.filter(
+            batch=batch, academic_period=academic_period, week_start_date__in=weeks
+        )
+    }
+    published = sorted(week for week, timetable in existing.items() if timetable.status == "published")
+    targets = sorted(set(weeks) - set(published))
+    busy = _busy_masks(list(faculty), targets, slots)
+
+    units = [
+        Unit(grid=0, faculty=requirement.faculty, department=requirement.department)
+        for requirement in requirements
+        for _ in range(requirement.sessions_per_week)
+    ]
+    budget = min(time_budget, MAX_TIME_BUDGET) / max(1, len(targets))
+    results, previous = [], None
+    for week in targets:
+        week_busy = {
+            faculty_id: fixed[faculty_id] | busy[week][faculty_id] for faculty_id in set(fixed) | set(busy[week])
+        }
+        problem = Problem(
+            grids=1, slots_per_day=len(slots), periods_per_day=PERIODS_PER_DAY, units=units, faculty_busy=week_busy
+        )
+        solution = solve(problem, time_budget=budget, seed=seed, initial=previous)
+        previous = solution.assignment
+        per_day = [0] * DAYS
+        cells = []
+        for unit, bit in zip(units, solution.assignment, strict=True):
+            if bit is None:
+                continue
+            day, index = divmod(bit, len(slots))
+            per_day[day] += 1
+            cells.append(
+                {
+                    "day_of_week": day,
+                    "time_slot": time_slots[index],
+                    "department": unit.department,
+                    "faculty": unit.faculty,
+                }
+            )
+        cells.sort(key=lambda cell: (cell["day_of_week"], cell["time_slot"]))
+        results.append(
+            {
+                "week_start_date": week,
+                "timetable": existing[week].id if week in existing else None,
+                "score": solution.score,
+                "soft_penalty": solution.soft_penalty,
+                "unplaced": [
+                    {"department": units[index].department, "faculty": units[index].faculty}
+                    for index in solution.unplaced
+                ],
+                "publishable": all(count == PERIODS_PER_DAY for count in per_day),
+                "iterations": solution.iterations,
+                "cells": cells,
+            }
+        )
+
+    if apply and results:
+        with transaction.atomic():
+            missing_weeks = [week for week in targets if week not in existing]
+            WeeklyTimetable.objects.bulk_create(
+                [
+                    WeeklyTimetable(batch=batch, academic_period=academic_period, week_start_date=week, created_by=user)
+                    for week in missing_weeks
+                ]
+            )
+            timetables = {
+                timetable.week_start_date: timetable.id
+                for timetable in WeeklyTimetable.objects.filter(
+                    batch=batch, academic_period=academic_period, week_start_date__in=targets, status="draft"
+                )
+            }
+            TimetableCell.objects.filter(weekly_timetable_id__in=timetables.values()).delete()
+            TimetableCell.objects.bulk_create(
+                [
+                    TimetableCell(
+                        weekly_timetable_id=timetables[result["week_start_date"]],
+                        day_of_week=cell["day_of_week"],
+                        time_slot=cell["time_slot"],
+                        line1=departments[cell["department"]].name,
+                        line3=_faculty_label(faculty[cell["faculty"]]),
+                    )
+                    for result in results
+                    if result["week_start_date"] in timetables
+                    for cell in result["cells"]
+                ]
+            )
+            for result in results:
+                result["timetable"] = timetables.get(result["week_start_date"])
+
+    return {"applied": apply, "weeks": results, "skipped_published": published}
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 
+from sims_backend.timetable.conflicts import session_conflicts
 from sims_backend.timetable.models import Session, TimetableCell, WeeklyTimetable
+from sims_backend.timetable.scheduler import DEFAULT_TIME_SLOTS
 
 
 class SessionSerializer(serializers.ModelSerializer):
@@ -28,6 +30,33 @@ class SessionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_at", "updated_at"]
 
+    def validate(self, data):
+        """Reject sessions that end before they start or double-book their faculty or group"""
+        instance = self.instance
+        starts_at = data.get("starts_at", getattr(instance, "starts_at", None))
+        ends_at = data.get("ends_at", getattr(instance, "ends_at", None))
+        faculty = data.get("faculty", getattr(instance, "faculty", None))
+        group = data.get("group", getattr(instance, "group", None))
+
+        if starts_at and ends_at and ends_at <= starts_at:
+            raise serializers.ValidationError({"ends_at": "Session must end after it starts"})
+
+        conflicts = session_conflicts(
+            faculty.id, group.id, starts_at, ends_at, exclude_id=instance.id if instance else None
+        )
+        if conflicts:
+            raise serializers.ValidationError(
+                {
+                    "non_field_errors": ["Session overlaps an existing session for the same faculty or group"],
+                    "conflicts": [
+                        f"{conflict['kind'].capitalize()} is already booked in session {conflict['session']} "
+                        f"from {conflict['overlap'][0].isoformat()} to {conflict['overlap'][1].isoformat()}"
+                        for conflict in conflicts
+                    ],
+                }
+            )
+        return data
+
 
 class TimetableCellSerializer(serializers.ModelSerializer):
     day_of_week_display = serializers.CharField(source="get_day_of_week_display", read_only=True)
@@ -128,3 +157,33 @@ class WeeklyTimetableListSerializer(serializers.ModelSerializer):
     def get_cell_count(self, obj):
         """Get count of cells in this timetable"""
         return obj.cells.count()
+
+
+class AutoScheduleRequirementSerializer(serializers.Serializer):
+    department = serializers.IntegerField()
+    faculty = serializers.IntegerField()
+    sessions_per_week = serializers.IntegerField()
+
+
+class AutoScheduleOptionsSerializer(serializers.Serializer):
+    """Body of an auto-schedule request other than the batch, period and week range"""
+
+    requirements = AutoScheduleRequirementSerializer(many=True, required=False, default=list)
+    # {"<faculty id>": [[day_of_week, slot_index], ...]}
+    unavailable = serializers.DictField(
+        child=serializers.ListField(
+            child=serializers.ListField(child=serializers.IntegerField(), min_length=2, max_length=2)
+        ),
+        required=False,
+        default=dict,
+    )
+    time_slots = serializers.ListField(child=serializers.CharField(), required=False, default=DEFAULT_TIME_SLOTS)
+    time_budget = serializers.FloatField(default=2.0, min_value=0)
+    seed = serializers.IntegerField(required=False, allow_null=True, default=None)
+    apply = serializers.BooleanField(default=True)
+
+    def validate_unavailable(self, value):
+        try:
+            return {int(faculty_id): [tuple(pair) for pair in pairs] for faculty_id, pairs in value.items()}
+        except ValueError:
+            raise serializers.ValidationError("Keys must be faculty IDs") from None
@@ -1,11 +1,14 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import SessionViewSet, TimetableCellViewSet, WeeklyTimetableViewSet
+from .views import SessionViewSet, TimetableCellViewSet, WeeklyTimetableViewSet, calendar_feed
 
 router = DefaultRouter()
 router.register(r"sessions", SessionViewSet, basename="session")
 router.register(r"weekly-timetables", WeeklyTimetableViewSet, basename="weekly-timetable")
 router.register(r"timetable-cells", TimetableCellViewSet, basename="timetable-cell")
 
-urlpatterns = [path("api/timetable/", include(router.urls))]
+urlpatterns = [
+    path("api/timetable/calendar/<str:token>.ics", calendar_feed, name="timetable-calendar-feed"),
+    path("api/timetable/", include(router.urls)),
+]
@@ -1,6 +1,13 @@
-from datetime import timedelta
-
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Q
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -9,8 +16,21 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from sims_backend.common_permissions import in_group
+from sims_backend.timetable.conflicts import period_conflicts
+from sims_backend.timetable.ical import (
+    feed_cache_key,
+    feed_sessions,
+    feed_version,
+    issue_feed_token,
+    iter_cached_feed,
+    read_feed_token,
+)
+from sims_backend.timetable.materialize import materialize_batch_sessions, materialize_sessions
 from sims_backend.timetable.models import Session, TimetableCell, WeeklyTimetable
+from sims_backend.timetable.publishing import period_count_errors, period_count_message, week_start_dates
+from sims_backend.timetable.scheduler import Requirement, SchedulerError, auto_schedule_batch
 from sims_backend.timetable.serializers import (
+    AutoScheduleOptionsSerializer,
     SessionSerializer,
     TimetableCellSerializer,
     WeeklyTimetableListSerializer,
@@ -45,6 +65,76 @@ class SessionViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @action(detail=False, methods=["get"])
+    def calendar_feed(self, request):
+        """Personal iCalendar feed URL for the current user (their group's and their own sessions)"""
+        token = issue_feed_token(request.user)
+        path = reverse("timetable-calendar-feed", kwargs={"token": token})
+        return Response({"url": request.build_absolute_uri(path), "token": token})
+
+    @action(detail=False, methods=["get"])
+    def conflicts(self, request):
+        """Faculty and group double-bookings across an academic period (?academic_period=<id>)"""
+        academic_period_id = request.query_params.get("academic_period")
+        if not academic_period_id:
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "message": "academic_period is required"}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            sessions = self.get_queryset().filter(academic_period_id=int(academic_period_id))
+        except ValueError:
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "message": "academic_period must be an integer"}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        conflicts = period_conflicts(sessions)
+        return Response(
+            {
+                "academic_period": int(academic_period_id),
+                "conflict_count": len(conflicts),
+                "conflicts": conflicts,
+            }
+        )
+
+
+def calendar_feed(request, token: str):
+    """
+    Serve a personal iCalendar feed; the signed token in the URL is the credential.
+
+    Clients revalidate with If-None-Match / If-Modified-Since and get 304 until
+    one of the feed's sessions changes.
+    """
+    user_id = read_feed_token(token)
+    user = User.objects.select_related("student").filter(id=user_id, is_active=True).first() if user_id else None
+    if user is None:
+        raise Http404("Calendar feed not found")
+
+    sessions = feed_sessions(user)
+    version, last_modified = feed_version(user, sessions)
+    etag = f'"{version}"'
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if response is None:
+        body = cache.get(feed_cache_key(user.id, version))
+        if body is not None:
+            response = HttpResponse(body, content_type="text/calendar; charset=utf-8")
+        else:
+            calendar_name = f"FMU Timetable - {user.get_full_name() or user.username}"
+            response = StreamingHttpResponse(
+                iter_cached_feed(user.id, version, sessions, calendar_name),
+                content_type="text/calendar; charset=utf-8",
+            )
+        response["Content-Disposition"] = 'inline; filename="timetable.ics"'
+
+    response["ETag"] = etag
+    if last_modified_ts is not None:
+        response["Last-Modified"] = http_date(last_modified_ts)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
 
 class WeeklyTimetableViewSet(viewsets.ModelViewSet):
     queryset = (
@@ -80,7 +170,7 @@ class WeeklyTimetableViewSet(viewsets.ModelViewSet):
 
     def get_permissions(self):
         """Restrict create/update/delete to Faculty/Admin/Coordinator"""
-        if self.action in ["create", "update", "partial_update", "destroy", "publish"]:
+        if self.action in ["create", "update", "partial_update", "destroy", "publish", "publish_weeks"]:
             # Only Faculty, Admin, Coordinator can modify
             return [IsAuthenticated()]
         # Anyone authenticated can view (subject to queryset filtering)
@@ -103,44 +193,113 @@ class WeeklyTimetableViewSet(viewsets.ModelViewSet):
                     {"detail": "You can only publish your own timetables"}, status=status.HTTP_403_FORBIDDEN
                 )
 
-        # NEW VALIDATION: Check that we have exactly 3 filled periods per day
-        cells = list(timetable.cells.all())
-
-        # Group cells by day and count periods with content
-        day_period_counts = {}
-        for day in range(6):  # Monday to Saturday (0-5)
-            filled_periods = 0
-            for cell in cells:
-                if cell.day_of_week == day:
-                    # A period is "filled" if line1 has content
-                    if cell.line1 and cell.line1.strip():
-                        filled_periods += 1
-            day_period_counts[day] = filled_periods
-
-        # Check that each day has exactly 3 periods
-        days_with_wrong_count = []
-        for day, count in day_period_counts.items():
-            if count != 3:
-                day_name = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"][day]
-                days_with_wrong_count.append(f"{day_name} ({count} periods)")
-
+        # Each day must have exactly 3 filled periods
+        days_with_wrong_count = period_count_errors([timetable.id]).get(timetable.id)
         if days_with_wrong_count:
             return Response(
                 {
                     "error": {
                         "code": "INVALID_PERIOD_COUNT",
-                        "message": f"Each day must have exactly 3 periods. Found: {', '.join(days_with_wrong_count)}",
+                        "message": period_count_message(days_with_wrong_count),
                         "days_with_wrong_count": days_with_wrong_count,
                     }
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        timetable.status = "published"
-        timetable.save()
+        with transaction.atomic():
+            timetable.status = "published"
+            timetable.save()
+            # Attendance works on Session rows, so generate them from the grid as part of publishing
+            summary = materialize_sessions([timetable])
 
-        serializer = self.get_serializer(timetable)
-        return Response(serializer.data)
+        data = self.get_serializer(timetable).data
+        data["sessions"] = summary
+        return Response(data)
+
+    @action(detail=False, methods=["post"])
+    def publish_weeks(self, request):
+        """
+        Publish every draft week of a batch in an academic period, optionally within a date range.
+
+        Request body:
+            {
+                "batch": int,
+                "academic_period": int,
+                "week_start_from": "YYYY-MM-DD",  # optional
+                "week_start_to": "YYYY-MM-DD"     # optional
+            }
+
+        Weeks that break the 3-periods-per-day rule are reported under "failed";
+        the others are published and their sessions generated in one transaction.
+        """
+        batch_id = request.data.get("batch")
+        academic_period_id = request.data.get("academic_period")
+        if not batch_id or not academic_period_id:
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "message": "batch and academic_period are required"}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            batch_id, academic_period_id = int(batch_id), int(academic_period_id)
+        except (TypeError, ValueError):
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "message": "batch and academic_period must be integers"}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        weeks = (
+            self.get_queryset()
+            .prefetch_related(None)
+            .filter(batch_id=batch_id, academic_period_id=academic_period_id, status="draft")
+        )
+        for param, lookup in (("week_start_from", "week_start_date__gte"), ("week_start_to", "week_start_date__lte")):
+            value = request.data.get(param)
+            if value:
+                parsed = parse_date(str(value))
+                if parsed is None:
+                    return Response(
+                        {"error": {"code": "VALIDATION_ERROR", "message": f"{param} must be a date (YYYY-MM-DD)"}},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                weeks = weeks.filter(**{lookup: parsed})
+        weeks = list(weeks.order_by("week_start_date"))
+
+        user = request.user
+        own_only = in_group(user, "FACULTY") and not (in_group(user, "ADMIN") or in_group(user, "COORDINATOR"))
+        errors = period_count_errors([week.id for week in weeks])
+        publishable, failed = [], []
+        for week in weeks:
+            entry = {"id": week.id, "week_start_date": week.week_start_date}
+            if own_only and week.created_by_id != user.id:
+                failed.append({**entry, "code": "FORBIDDEN", "message": "You can only publish your own timetables"})
+            elif week.id in errors:
+                failed.append(
+                    {
+                        **entry,
+                        "code": "INVALID_PERIOD_COUNT",
+                        "message": period_count_message(errors[week.id]),
+                        "days_with_wrong_count": errors[week.id],
+                    }
+                )
+            else:
+                publishable.append(week)
+
+        with transaction.atomic():
+            WeeklyTimetable.objects.filter(id__in=[week.id for week in publishable]).update(
+                status="published", updated_at=timezone.now()
+            )
+            for week in publishable:
+                week.status = "published"
+            summary = materialize_sessions(publishable)
+
+        return Response(
+            {
+                "published": [{"id": week.id, "week_start_date": week.week_start_date} for week in publishable],
+                "failed": failed,
+                "sessions": summary,
+            }
+        )
 
     @action(detail=True, methods=["post"])
     def unpublish(self, request, pk=None):
@@ -163,6 +322,96 @@ class WeeklyTimetableViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(timetable)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["post"])
+    def generate_sessions(self, request):
+        """Regenerate the sessions of every published week of a batch in an academic period"""
+        user = request.user
+        if not (user.is_superuser or in_group(user, "ADMIN") or in_group(user, "COORDINATOR")):
+            return Response({"detail": "Only administrators can regenerate sessions"}, status=status.HTTP_403_FORBIDDEN)
+
+        batch_id = request.data.get("batch")
+        academic_period_id = request.data.get("academic_period")
+        if not batch_id or not academic_period_id:
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "message": "batch and academic_period are required"}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            batch_id, academic_period_id = int(batch_id), int(academic_period_id)
+        except (TypeError, ValueError):
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "message": "batch and academic_period must be integers"}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(materialize_batch_sessions(batch_id, academic_period_id))
+
+    @action(detail=False, methods=["post"])
+    def auto_schedule(self, request):
+        """
+        Draft conflict-free weekly grids for a batch from per-department session requirements.
+
+        Request body:
+            {
+                "batch": int,
+                "academic_period": int,
+                "requirements": [{"department": int, "faculty": int, "sessions_per_week": int}],
+                "unavailable": {"<faculty id>": [[day_of_week, slot_index], ...]},  # optional
+                "time_slots": ["08:00-09:00", ...],  # optional
+                "week_start_from": "YYYY-MM-DD",     # optional
+                "week_start_to": "YYYY-MM-DD",       # optional
+                "time_budget": float,                # optional, seconds for all weeks (at most 5)
+                "seed": int,                         # optional
+                "apply": bool                        # optional, false for a dry run
+            }
+
+        Published weeks are skipped. Each week reports its score (0 is perfect),
+        the sessions that could not be placed and whether it can be published.
+        """
+        user = request.user
+        if not (user.is_superuser or in_group(user, "ADMIN") or in_group(user, "COORDINATOR")):
+            return Response(
+                {"detail": "Only administrators can auto-schedule timetables"}, status=status.HTTP_403_FORBIDDEN
+            )
+
+        from sims_backend.academics.models import AcademicPeriod, Batch
+
+        try:
+            batch = Batch.objects.get(pk=request.data.get("batch"))
+            academic_period = AcademicPeriod.objects.get(pk=request.data.get("academic_period"))
+        except (Batch.DoesNotExist, AcademicPeriod.DoesNotExist, ValueError, TypeError):
+            return Response({"detail": "Invalid batch or academic_period"}, status=status.HTTP_404_NOT_FOUND)
+        if not academic_period.start_date or not academic_period.end_date:
+            return Response(
+                {"detail": "Academic period must have start_date and end_date to auto-schedule"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        options = AutoScheduleOptionsSerializer(data=request.data)
+        options.is_valid(raise_exception=True)
+
+        weeks = week_start_dates(academic_period.start_date, academic_period.end_date)
+        for param, keep in (
+            ("week_start_from", lambda week, bound: week >= bound),
+            ("week_start_to", lambda week, bound: week <= bound),
+        ):
+            value = request.data.get(param)
+            if value:
+                parsed = parse_date(str(value))
+                if parsed is None:
+                    return Response(
+                        {"detail": f"{param} must be a date (YYYY-MM-DD)"}, status=status.HTTP_400_BAD_REQUEST
+                    )
+                weeks = [week for week in weeks if keep(week, parsed)]
+
+        params = dict(options.validated_data)
+        requirements = [Requirement(**item) for item in params.pop("requirements")]
+        try:
+            result = auto_schedule_batch(batch, academic_period, weeks, requirements, user, **params)
+        except SchedulerError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
+
     @action(detail=False, methods=["post"])
     def generate_weekly_templates(self, request):
         """Generate weekly timetable templates for all weeks in an academic period for a batch"""
@@ -187,48 +436,31 @@ class WeeklyTimetableViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Calculate all Mondays (week starts) between start_date and end_date
-        start_date = academic_period.start_date
-        end_date = academic_period.end_date
-
-        # Find the first Monday on or before the start date
-        days_until_monday = (start_date.weekday()) % 7
-        if days_until_monday != 0:  # If not already Monday
-            first_monday = start_date - timedelta(days=days_until_monday)
-        else:
-            first_monday = start_date
-
-        # Generate templates for all weeks
-        week_dates = []
-        current_monday = first_monday
-
-        while current_monday <= end_date:
-            # Only create template if the week overlaps with the period
-            week_end = current_monday + timedelta(days=5)  # Saturday
-            if week_end >= start_date:  # Week overlaps with period
-                week_dates.append(current_monday)
-            current_monday += timedelta(days=7)
-
-        # Create templates (only if they don't already exist)
-        created_count = 0
-        existing_count = 0
-        created_timetables = []
-
-        for week_start in week_dates:
-            timetable, created = WeeklyTimetable.objects.get_or_create(
-                batch=batch,
-                academic_period=academic_period,
-                week_start_date=week_start,
-                defaults={
-                    "status": "draft",
-                    "created_by": request.user,
-                },
-            )
-            if created:
-                created_count += 1
-                created_timetables.append(timetable.id)
-            else:
-                existing_count += 1
+        week_dates = week_start_dates(academic_period.start_date, academic_period.end_date)
+        weeks = WeeklyTimetable.objects.filter(batch=batch, academic_period=academic_period)
+        existing = set(weeks.filter(week_start_date__in=week_dates).values_list("week_start_date", flat=True))
+        missing = [week for week in week_dates if week not in existing]
+        # Weeks created concurrently are skipped by ignore_conflicts and reported as existing
+        WeeklyTimetable.objects.bulk_create(
+            [
+                WeeklyTimetable(
+                    batch=batch,
+                    academic_period=academic_period,
+                    week_start_date=week,
+                    status="draft",
+                    created_by=request.user,
+                )
+                for week in missing
+            ],
+            ignore_conflicts=True,
+        )
+        created_timetables = list(
+            weeks.filter(week_start_date__in=missing, created_by=request.user, status="draft")
+            .order_by("week_start_date")
+            .values_list("id", flat=True)
+        )
+        created_count = len(created_timetables)
+        existing_count = len(week_dates) - created_count
 
         return Response(
             {
@@ -323,4 +555,6 @@ class TimetableCellViewSet(viewsets.ModelViewSet):
 
                 raise PermissionDenied("You can only modify your own timetables")
 
+        # Sessions generated from this cell go with it unless attendance was already taken
+        instance.sessions.filter(attendance_records__isnull=True).delete()
         instance.delete()
@@ -0,0 +1,41 @@
+from django.contrib import admin
+
+from sims_backend.transcripts.models import TranscriptArtifact, TranscriptBatchJob, TranscriptIssue
+
+
+@admin.register(TranscriptArtifact)
+class TranscriptArtifactAdmin(admin.ModelAdmin):
+    list_display = ["student", "results_hash", "created_at"]
+    search_fields = ["student__reg_no", "student__name", "results_hash"]
+    ordering = ["-created_at"]
+    readonly_fields = ["student", "results_hash", "pdf", "snapshot"]
+
+
+@admin.register(TranscriptIssue)
+class TranscriptIssueAdmin(admin.ModelAdmin):
+    list_display = ["id", "student", "document_hash", "issued_at"]
+    search_fields = ["student__reg_no", "student__name", "document_hash"]
+    ordering = ["-issued_at"]
+    readonly_fields = ["student", "document_hash", "issued_at", "qr_image"]
+
+
+@admin.register(TranscriptBatchJob)
+class TranscriptBatchJobAdmin(admin.ModelAdmin):
+    list_display = ["id", "batch", "program", "status", "processed", "total", "generated", "blocked", "created_at"]
+    list_filter = ["status"]
+    ordering = ["-created_at"]
+    readonly_fields = [
+        "created_by",
+        "batch",
+        "program",
+        "status",
+        "total",
+        "processed",
+        "generated",
+        "blocked",
+        "archive",
+        "manifest",
+        "started_at",
+        "finished_at",
+        "error_message",
+    ]
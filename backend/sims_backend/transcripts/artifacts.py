@@ -0,0 +1,152 @@
+"""Stored transcript artifacts keyed by (student, results hash).
+
+A transcript is rendered once per version of a student's released results:
+the content (student details plus published/frozen results) is read with one
+query and hashed. A matching artifact is served as is. Otherwise the
+document is issued (see transcripts.issues), the PDF is rendered with the
+issue's QR code, saved to media storage and stored with a JSON snapshot of
+its contents.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from sims_backend.results.models import ResultHeader
+from sims_backend.students.models import Student
+from sims_backend.transcripts.issues import issue_token, issue_transcript, read_qr_png, verification_url
+from sims_backend.transcripts.models import TranscriptArtifact, TranscriptIssue
+from sims_backend.transcripts.pdf import render_transcript_pdf
+
+RELEASED_STATUSES = [ResultHeader.STATUS_PUBLISHED, ResultHeader.STATUS_FROZEN]
+
+_OUTCOME_LABELS = dict(ResultHeader.OUTCOME_CHOICES)
+
+
+RESULT_FIELDS = (
+    "id",
+    "student_id",
+    "exam__title",
+    "exam__academic_period__name",
+    "total_obtained",
+    "total_max",
+    "final_outcome",
+    "grade",
+    "status",
+    "updated_at",
+)
+
+
+def student_entry(student: Student) -> dict:
+    return {
+        "id": student.id,
+        "name": student.name,
+        "reg_no": student.reg_no,
+        "program": str(student.program),
+        "status": student.status,
+    }
+
+
+def result_entry(row: dict) -> dict:
+    """Transcript line for a ResultHeader row fetched with RESULT_FIELDS."""
+    return {
+        "result_id": row["id"],
+        "exam": row["exam__title"],
+        "term": row["exam__academic_period__name"] or "",
+        "total_obtained": str(row["total_obtained"]),
+        "total_max": str(row["total_max"]),
+        "outcome": _OUTCOME_LABELS.get(row["final_outcome"], row["final_outcome"]),
+        "grade": row["grade"],
+        "status": row["status"],
+        "updated_at": row["updated_at"].isoformat(),
+    }
+
+
+def released_results():
+    """Published and frozen results in transcript order."""
+    return ResultHeader.objects.filter(status__in=RELEASED_STATUSES).order_by("student_id", "exam", "id")
+
+
+def transcript_content(student: Student) -> dict:
+    """Student details and released results shown on the transcript (one results query)."""
+    rows = released_results().filter(student=student).values(*RESULT_FIELDS)
+    return {"student": student_entry(student), "results": [result_entry(row) for row in rows]}
+
+
+def content_hash(content: dict) -> str:
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def get_transcript_artifact(student: Student) -> TranscriptArtifact:
+    """Return the stored artifact for the student's current results, rendering it if needed."""
+    content = transcript_content(student)
+    results_hash = content_hash(content)
+    artifact = TranscriptArtifact.objects.filter(student=student, results_hash=results_hash).first()
+    if artifact is not None and artifact.pdf and artifact.pdf.storage.exists(artifact.pdf.name):
+        return artifact
+
+    # Older versions are replaced. A concurrent render of this version is left
+    # alone and settled by the unique constraint below; only a row whose file
+    # has gone missing is dropped.
+    invalidate_transcript_artifacts([student.id], keep_hash=results_hash)
+    if artifact is not None:
+        TranscriptArtifact.objects.filter(pk=artifact.pk).delete()
+    issue = issue_transcript(student.id, results_hash)
+    snapshot = build_snapshot(content, results_hash, issue)
+    artifact = TranscriptArtifact(student=student, results_hash=results_hash, snapshot=snapshot)
+    pdf_bytes = render_transcript_pdf(snapshot, read_qr_png(issue))
+    artifact.pdf.save(artifact_filename(student.reg_no, results_hash), ContentFile(pdf_bytes), save=False)
+    try:
+        with transaction.atomic():
+            artifact.save()
+    except IntegrityError:
+        # Rendered concurrently by another request; keep theirs
+        artifact.pdf.delete(save=False)
+        artifact = TranscriptArtifact.objects.get(student=student, results_hash=results_hash)
+    return artifact
+
+
+def build_snapshot(content: dict, results_hash: str, issue: TranscriptIssue) -> dict:
+    """Content plus the issue and render-time fields printed on the PDF."""
+    token = issue_token(issue)
+    return {
+        **content,
+        "results_hash": results_hash,
+        "issue_id": issue.id,
+        "token": token,
+        "verify_url": verification_url(token),
+        "issued_at": issue.issued_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "generated_at": timezone.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def artifact_filename(reg_no: str, results_hash: str) -> str:
+    return f"transcript_{reg_no}_{results_hash[:12]}.pdf"
+
+
+def invalidate_transcript_artifacts(students, keep_hash: str | None = None) -> int:
+    """
+    Drop stored transcripts for ``students`` (ids or a Student queryset).
+
+    Artifacts of the ``keep_hash`` results version are kept. Rows are deleted immediately; their files are removed once the
+    surrounding transaction commits.
+    """
+    artifacts = TranscriptArtifact.objects.filter(student__in=students)
+    if keep_hash is not None:
+        artifacts = artifacts.exclude(results_hash=keep_hash)
+    names = [name for name in artifacts.values_list("pdf", flat=True) if name]
+    deleted, _ = artifacts.delete()
+    if names:
+        storage = TranscriptArtifact._meta.get_field("pdf").storage
+        transaction.on_commit(lambda: _delete_files(storage, names))
+    return deleted
+
+
+def _delete_files(storage, names: list[str]) -> None:
+    for name in names:
+        storage.delete(name)
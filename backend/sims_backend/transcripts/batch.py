@@ -0,0 +1,205 @@
+"""Transcripts for a whole batch or program in one background job.
+
+The cohort's released results are loaded with one query and grouped by
+student, finance gating is evaluated in bulk, stored artifacts that are still
+current are reused, and the remaining PDFs are rendered across a process
+pool. Everything is written into one ZIP with a manifest.json listing the
+generated and the blocked students.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import tempfile
+from collections import defaultdict
+
+import django_rq
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from sims_backend.common.archives import pdf_archive
+from sims_backend.common.parallel import parallel_map
+from sims_backend.finance.services import bulk_finance_gate_checks
+from sims_backend.students.models import Student
+from sims_backend.transcripts.artifacts import (
+    RESULT_FIELDS,
+    artifact_filename,
+    build_snapshot,
+    content_hash,
+    invalidate_transcript_artifacts,
+    released_results,
+    result_entry,
+    student_entry,
+)
+from sims_backend.transcripts.issues import issue_transcripts, read_qr_png
+from sims_backend.transcripts.models import TranscriptArtifact, TranscriptBatchJob
+from sims_backend.transcripts.pdf import render_transcript_pdf
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_EVERY = 25
+BATCH_JOB_TIMEOUT = 60 * 60
+
+
+def cohort_students(job: TranscriptBatchJob):
+    students = Student.objects.select_related("program").order_by("reg_no")
+    if job.batch_id:
+        return students.filter(batch_id=job.batch_id)
+    return students.filter(program_id=job.program_id)
+
+
+def enqueue_transcript_batch_job(job_id: int) -> None:
+    """Enqueue a batch job on RQ; without Redis, run it inline."""
+    try:
+        django_rq.get_queue("default").enqueue(run_transcript_batch_job, job_id, job_timeout=BATCH_JOB_TIMEOUT)
+    except Exception as exc:
+        logger.warning("Could not enqueue transcript batch job %s (%s); running inline", job_id, exc)
+        run_transcript_batch_job(job_id)
+
+
+def run_transcript_batch_job(job_id: int, max_workers: int | None = None) -> dict:
+    claimed = TranscriptBatchJob.objects.filter(id=job_id, status=TranscriptBatchJob.STATUS_QUEUED).update(
+        status=TranscriptBatchJob.STATUS_RUNNING, started_at=timezone.now(), updated_at=timezone.now()
+    )
+    job = TranscriptBatchJob.objects.get(id=job_id)
+    if not claimed:
+        return {"job_id": job.id, "status": job.status}
+
+    try:
+        manifest = _build_archive(job, max_workers)
+    except Exception as exc:
+        logger.exception("Transcript batch job %s failed", job_id)
+        TranscriptBatchJob.objects.filter(id=job_id).update(
+            status=TranscriptBatchJob.STATUS_FAILED,
+            error_message=str(exc),
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        return {"job_id": job_id, "status": TranscriptBatchJob.STATUS_FAILED}
+
+    return {
+        "job_id": job_id,
+        "status": TranscriptBatchJob.STATUS_COMPLETED,
+        "generated": len(manifest["generated"]),
+        "blocked": len(manifest["blocked"]),
+    }
+
+
+def _progress(job: TranscriptBatchJob, **fields) -> None:
+    TranscriptBatchJob.objects.filter(id=job.id).update(**fields, updated_at=timezone.now())
+
+
+def _build_archive(job: TranscriptBatchJob, max_workers: int | None) -> dict:
+    students = list(cohort_students(job))
+    gates = bulk_finance_gate_checks([s.id for s in students])
+    allowed, blocked = [], []
+    for student in students:
+        gate = gates[student.id]
+        if gate["gating"]["can_view_transcript"]:
+            allowed.append(student)
+        else:
+            blocked.append(
+                {
+                    "reg_no": student.reg_no,
+                    "name": student.name,
+                    "outstanding": str(gate["outstanding"]),
+                    "reasons": gate["gating"]["reasons"],
+                }
+            )
+    _progress(job, total=len(students), processed=len(blocked), blocked=len(blocked))
+
+    results = defaultdict(list)
+    for row in released_results().filter(student_id__in=[s.id for s in allowed]).values(*RESULT_FIELDS):
+        results[row["student_id"]].append(result_entry(row))
+    hashes = {s.id: content_hash({"student": student_entry(s), "results": results[s.id]}) for s in allowed}
+    current = {
+        artifact.student_id: artifact
+        for artifact in TranscriptArtifact.objects.filter(student_id__in=hashes)
+        if hashes[artifact.student_id] == artifact.results_hash
+    }
+    to_render = [s for s in allowed if s.id not in current]
+    invalidate_transcript_artifacts([s.id for s in to_render])
+
+    generated = []
+    processed = len(blocked)
+    with tempfile.TemporaryFile() as output:
+        with pdf_archive(output) as archive:
+            for student in allowed:
+                if student.id in current:
+                    with current[student.id].pdf.open("rb") as pdf:
+                        archive.writestr(f"transcript_{student.reg_no}.pdf", pdf.read())
+                    generated.append(_manifest_entry(student, hashes[student.id], reused=True))
+            processed += len(current)
+            _progress(job, processed=processed)
+
+            issues = issue_transcripts({s.id: hashes[s.id] for s in to_render})
+            snapshots = [
+                build_snapshot({"student": student_entry(s), "results": results[s.id]}, hashes[s.id], issues[s.id])
+                for s in to_render
+            ]
+            qr_pngs = [read_qr_png(issues[s.id]) for s in to_render]
+            new_artifacts = []
+            for student, snapshot, pdf_bytes in zip(
+                to_render,
+                snapshots,
+                parallel_map(render_transcript_pdf, snapshots, qr_pngs, max_workers=max_workers),
+                strict=True,
+            ):
+                archive.writestr(f"transcript_{student.reg_no}.pdf", pdf_bytes)
+                artifact = TranscriptArtifact(student=student, results_hash=hashes[student.id], snapshot=snapshot)
+                artifact.pdf.save(
+                    artifact_filename(student.reg_no, hashes[student.id]), ContentFile(pdf_bytes), save=False
+                )
+                new_artifacts.append(artifact)
+                generated.append(_manifest_entry(student, hashes[student.id], reused=False))
+                processed += 1
+                if processed % PROGRESS_EVERY == 0:
+                    _progress(job, processed=processed)
+            TranscriptArtifact.objects.bulk_create(new_artifacts, ignore_conflicts=True)
+            # Rows skipped because a request stored the same transcript meanwhile keep theirs
+            stored = set(
+                TranscriptArtifact.objects.filter(student_id__in=[s.id for s in to_render]).values_list(
+                    "pdf", flat=True
+                )
+            )
+            for artifact in new_artifacts:
+                if artifact.pdf.name not in stored:
+                    artifact.pdf.delete(save=False)
+
+            manifest = {
+                "job_id": job.id,
+                "batch_id": job.batch_id,
+                "program_id": job.program_id,
+                "generated_at": timezone.now().isoformat(),
+                "total": len(students),
+                "generated": sorted(generated, key=lambda entry: entry["reg_no"]),
+                "blocked": blocked,
+            }
+            archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+
+        output.seek(0)
+        with transaction.atomic():
+            job.archive.save(f"transcripts_batch_{job.id}.zip", File(output), save=False)
+            TranscriptBatchJob.objects.filter(id=job.id).update(
+                status=TranscriptBatchJob.STATUS_COMPLETED,
+                archive=job.archive.name,
+                manifest=manifest,
+                processed=processed,
+                generated=len(generated),
+                finished_at=timezone.now(),
+                updated_at=timezone.now(),
+            )
+    return manifest
+
+
+def _manifest_entry(student: Student, results_hash: str, reused: bool) -> dict:
+    return {
+        "reg_no": student.reg_no,
+        "name": student.name,
+        "file": f"transcript_{student.reg_no}.pdf",
+        "results_hash": results_hash,
+        "reused": reused,
+    }
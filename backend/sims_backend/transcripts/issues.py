@@ -0,0 +1,121 @@
+"""Issued transcript records, their verification tokens and QR codes.
+
+Each distinct document (student plus results hash) is issued once. Rendering
+the same results again reuses the issue, so the token and QR code printed on
+the PDF stay the same across re-renders and re-downloads.
+"""
+
+from __future__ import annotations
+
+import io
+
+import qrcode
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+
+from sims_backend.transcripts.models import TranscriptIssue
+from sims_backend.transcripts.tokens import generate_issue_token, read_issue_token
+
+# Issue records never change, so verification answers can be cached for a day
+VERIFY_CACHE_SECONDS = 24 * 60 * 60
+# Invalid and legacy answers may change (legacy tokens expire), cache them briefly
+UNVERIFIED_CACHE_SECONDS = 5 * 60
+
+
+def issue_transcript(student_id: int, document_hash: str) -> TranscriptIssue:
+    """Return the issue for this document version, recording it on first issue."""
+    issue = TranscriptIssue.objects.filter(student_id=student_id, document_hash=document_hash).first()
+    if issue is None:
+        try:
+            with transaction.atomic():
+                issue = TranscriptIssue.objects.create(student_id=student_id, document_hash=document_hash)
+        except IntegrityError:
+            # Issued concurrently by another request
+            issue = TranscriptIssue.objects.get(student_id=student_id, document_hash=document_hash)
+    ensure_qr_images([issue])
+    return issue
+
+
+def issue_transcripts(documents: dict[int, str]) -> dict[int, TranscriptIssue]:
+    """Bulk issue_transcript for ``{student_id: document_hash}``, keyed by student ID."""
+    issues = {
+        issue.student_id: issue
+        for issue in TranscriptIssue.objects.filter(student_id__in=documents, document_hash__in=set(documents.values()))
+        if documents[issue.student_id] == issue.document_hash
+    }
+    missing = [
+        TranscriptIssue(student_id=student_id, document_hash=document_hash)
+        for student_id, document_hash in documents.items()
+        if student_id not in issues
+    ]
+    if missing:
+        TranscriptIssue.objects.bulk_create(missing, ignore_conflicts=True)
+        # ignore_conflicts leaves primary keys unset, so read the rows back
+        for issue in TranscriptIssue.objects.filter(
+            student_id__in=[i.student_id for i in missing], document_hash__in={i.document_hash for i in missing}
+        ):
+            if documents[issue.student_id] == issue.document_hash:
+                issues[issue.student_id] = issue
+    ensure_qr_images(list(issues.values()))
+    return issues
+
+
+def issue_token(issue: TranscriptIssue) -> str:
+    return generate_issue_token(issue.id)
+
+
+def verification_url(token: str) -> str:
+    return f"{settings.TRANSCRIPT_VERIFY_BASE_URL}/api/transcripts/verify/{token}/"
+
+
+def render_qr_png(data: str) -> bytes:
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=4, border=2)
+    qr.add_data(data)
+    qr.make(fit=True)
+    buffer = io.BytesIO()
+    qr.make_image().save(buffer)
+    return buffer.getvalue()
+
+
+def ensure_qr_images(issues: list[TranscriptIssue]) -> None:
+    """Generate and store the QR code of every issue that does not have one yet."""
+    pending = [issue for issue in issues if not issue.qr_image]
+    for issue in pending:
+        png = render_qr_png(verification_url(issue_token(issue)))
+        issue.qr_image.save(f"transcript_issue_{issue.id}.png", ContentFile(png), save=False)
+    if pending:
+        TranscriptIssue.objects.bulk_update(pending, ["qr_image"])
+
+
+def read_qr_png(issue: TranscriptIssue) -> bytes:
+    with issue.qr_image.open("rb") as image:
+        return image.read()
+
+
+def verify_issue_token(token: str) -> dict | None:
+    """
+    Verify an issue token with one primary-key lookup.
+
+    Returns None when ``token`` is not an issue token, so the caller can try
+    the legacy student token format.
+    """
+    issue_id = read_issue_token(token)
+    if issue_id is None:
+        return None
+    issue = (
+        TranscriptIssue.objects.filter(id=issue_id)
+        .values("id", "student_id", "student__reg_no", "document_hash", "issued_at")
+        .first()
+    )
+    if issue is None:
+        return {"valid": False, "reason": "Transcript issue not found"}
+    return {
+        "valid": True,
+        "issue_id": issue["id"],
+        "student_id": issue["student_id"],
+        "reg_no": issue["student__reg_no"],
+        "document_hash": issue["document_hash"],
+        "issued_at": issue["issued_at"],
+        "reason": "Token is valid",
+    }
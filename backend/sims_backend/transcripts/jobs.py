@@ -3,11 +3,11 @@
 import logging
 from typing import Any
 
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 
 from sims_backend.students.models import Student
 
-from .views import generate_transcript_pdf
+from .artifacts import get_transcript_artifact
 
 logger = logging.getLogger(__name__)
 
@@ -28,28 +28,28 @@ def generate_and_email_transcript(student_id: int, recipient_email: str | None =
         student = Student.objects.get(id=student_id)
         logger.info(f"Starting transcript generation for student {student.reg_no}")
 
-        # Generate PDF
-        generate_transcript_pdf(student)
+        # Render (or reuse) the stored transcript artifact
+        artifact = get_transcript_artifact(student)
         logger.info(f"PDF generated successfully for student {student.reg_no}")
 
-        # Save to media (if needed for future reference)
-        # For now, just generate - in production you might want to save this
-
         # Send email if recipient provided
         if recipient_email:
             try:
-                send_mail(
+                email = EmailMessage(
                     subject=f"Transcript for {student.name}",
-                    message=f"Please find attached your academic transcript.\n\nStudent: {student.name}\nRegistration No: {student.reg_no}",
+                    body=f"Please find attached your academic transcript.\n\nStudent: {student.name}\nRegistration No: {student.reg_no}",
                     from_email="noreply@fmu.edu",
-                    recipient_list=[recipient_email],
-                    fail_silently=False,
+                    to=[recipient_email],
                 )
+                with artifact.pdf.open("rb") as pdf:
+                    email.attach(f"transcript_{student.reg_no}.pdf", pdf.read(), "application/pdf")
+                email.send(fail_silently=False)
                 logger.info(f"Transcript email sent to {recipient_email}")
                 return {
                     "status": "success",
                     "message": f"Transcript generated and emailed to {recipient_email}",
                     "student_reg_no": student.reg_no,
+                    "artifact_id": artifact.id,
                 }
             except Exception as e:
                 logger.error(f"Email sending failed: {e}")
@@ -57,12 +57,14 @@ def generate_and_email_transcript(student_id: int, recipient_email: str | None =
                     "status": "partial_success",
                     "message": f"Transcript generated but email failed: {str(e)}",
                     "student_reg_no": student.reg_no,
+                    "artifact_id": artifact.id,
                 }
         else:
             return {
                 "status": "success",
                 "message": "Transcript generated successfully",
                 "student_reg_no": student.reg_no,
+                "artifact_id": artifact.id,
             }
 
     except Student.DoesNotExist:
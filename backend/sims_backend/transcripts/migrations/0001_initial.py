@@ -0,0 +1,56 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("students", "0006_importjob_auto_create"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranscriptArtifact",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, help_text="The timestamp when the record was created."),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, help_text="The timestamp when the record was last updated."),
+                ),
+                (
+                    "results_hash",
+                    models.CharField(
+                        help_text="SHA256 of the student details and released results the transcript was rendered from",
+                        max_length=64,
+                    ),
+                ),
+                ("pdf", models.FileField(help_text="Rendered transcript PDF", upload_to="transcripts/%Y/%m/%d/")),
+                (
+                    "snapshot",
+                    models.JSONField(
+                        default=dict, help_text="Contents of the transcript at render time (student, results, token)"
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        help_text="Student this transcript belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transcript_artifacts",
+                        to="students.student",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "unique_together": {("student", "results_hash")},
+            },
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academics", "0009_alter_batch_start_year"),
+        ("transcripts", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranscriptBatchJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, help_text="The timestamp when the record was created."),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, help_text="The timestamp when the record was last updated."),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("QUEUED", "Queued"),
+                            ("RUNNING", "Running"),
+                            ("COMPLETED", "Completed"),
+                            ("FAILED", "Failed"),
+                        ],
+                        default="QUEUED",
+                        help_text="Current status of the job",
+                        max_length=16,
+                    ),
+                ),
+                ("total", models.PositiveIntegerField(default=0, help_text="Number of students in the cohort")),
+                (
+                    "processed",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Students handled so far (rendered, reused or blocked)"
+                    ),
+                ),
+                ("generated", models.PositiveIntegerField(default=0, help_text="Transcripts included in the archive")),
+                ("blocked", models.PositiveIntegerField(default=0, help_text="Students skipped by finance gating")),
+                (
+                    "archive",
+                    models.FileField(
+                        blank=True,
+                        help_text="ZIP of transcript PDFs plus manifest.json",
+                        null=True,
+                        upload_to="transcripts/batches/%Y/%m/%d/",
+                    ),
+                ),
+                (
+                    "manifest",
+                    models.JSONField(blank=True, default=dict, help_text="Summary of generated and blocked students"),
+                ),
+                ("started_at", models.DateTimeField(blank=True, help_text="When the job started running", null=True)),
+                (
+                    "finished_at",
+                    models.DateTimeField(blank=True, help_text="When the job completed or failed", null=True),
+                ),
+                ("error_message", models.TextField(blank=True, help_text="Error details if the job failed")),
+                (
+                    "batch",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Batch whose students get transcripts",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transcript_batch_jobs",
+                        to="academics.batch",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="User who requested the batch",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="transcript_batch_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "program",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Program whose students get transcripts (when no batch is given)",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transcript_batch_jobs",
+                        to="academics.program",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [models.Index(fields=["status"], name="transcripts_status_ebe461_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("students", "0006_importjob_auto_create"),
+        ("transcripts", "0002_transcriptbatchjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranscriptIssue",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "document_hash",
+                    models.CharField(
+                        help_text="Results hash of the issued document (see TranscriptArtifact.results_hash)",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "issued_at",
+                    models.DateTimeField(auto_now_add=True, help_text="When this document version was first issued"),
+                ),
+                (
+                    "qr_image",
+                    models.FileField(
+                        blank=True,
+                        help_text="Verification QR code PNG, generated once per issue",
+                        upload_to="transcripts/qr/",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        help_text="Student the transcript was issued to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transcript_issues",
+                        to="students.student",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-issued_at"],
+                "unique_together": {("student", "document_hash")},
+            },
+        ),
+    ]
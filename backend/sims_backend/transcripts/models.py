@@ -0,0 +1,168 @@
+from django.conf import settings
+from django.db import models
+
+from core.models import TimeStampedModel
+
+
+class TranscriptArtifact(TimeStampedModel):
+    """Rendered transcript PDF plus a JSON snapshot of what it shows, keyed by a hash of the released results"""
+
+    student = models.ForeignKey(
+        "students.Student",
+        on_delete=models.CASCADE,
+        related_name="transcript_artifacts",
+        help_text="Student this transcript belongs to",
+    )
+    results_hash = models.CharField(
+        max_length=64,
+        help_text="SHA256 of the student details and released results the transcript was rendered from",
+    )
+    pdf = models.FileField(
+        upload_to="transcripts/%Y/%m/%d/",
+        help_text="Rendered transcript PDF",
+    )
+    snapshot = models.JSONField(
+        default=dict,
+        help_text="Contents of the transcript at render time (student, results, token)",
+    )
+
+    class Meta:
+        unique_together = [("student", "results_hash")]
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Transcript {self.student_id} ({self.results_hash[:12]})"
+
+
+class TranscriptIssue(models.Model):
+    """A transcript document as issued; verification tokens and QR codes reference its ID"""
+
+    student = models.ForeignKey(
+        "students.Student",
+        on_delete=models.CASCADE,
+        related_name="transcript_issues",
+        help_text="Student the transcript was issued to",
+    )
+    document_hash = models.CharField(
+        max_length=64,
+        help_text="Results hash of the issued document (see TranscriptArtifact.results_hash)",
+    )
+    issued_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When this document version was first issued",
+    )
+    qr_image = models.FileField(
+        upload_to="transcripts/qr/",
+        blank=True,
+        help_text="Verification QR code PNG, generated once per issue",
+    )
+
+    class Meta:
+        unique_together = [("student", "document_hash")]
+        ordering = ["-issued_at"]
+
+    def __str__(self):
+        return f"Transcript issue {self.id} ({self.document_hash[:12]})"
+
+
+class TranscriptBatchJob(TimeStampedModel):
+    """Transcripts for a whole batch or program, rendered in the background into one ZIP"""
+
+    STATUS_QUEUED = "QUEUED"
+    STATUS_RUNNING = "RUNNING"
+    STATUS_COMPLETED = "COMPLETED"
+    STATUS_FAILED = "FAILED"
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="transcript_batch_jobs",
+        help_text="User who requested the batch",
+    )
+    batch = models.ForeignKey(
+        "academics.Batch",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="transcript_batch_jobs",
+        help_text="Batch whose students get transcripts",
+    )
+    program = models.ForeignKey(
+        "academics.Program",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="transcript_batch_jobs",
+        help_text="Program whose students get transcripts (when no batch is given)",
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_QUEUED,
+        help_text="Current status of the job",
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of students in the cohort",
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+        help_text="Students handled so far (rendered, reused or blocked)",
+    )
+    generated = models.PositiveIntegerField(
+        default=0,
+        help_text="Transcripts included in the archive",
+    )
+    blocked = models.PositiveIntegerField(
+        default=0,
+        help_text="Students skipped by finance gating",
+    )
+    archive = models.FileField(
+        upload_to="transcripts/batches/%Y/%m/%d/",
+        null=True,
+        blank=True,
+        help_text="ZIP of transcript PDFs plus manifest.json",
+    )
+    manifest = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Summary of generated and blocked students",
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the job started running",
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the job completed or failed",
+    )
+    error_message = models.TextField(
+        blank=True,
+        help_text="Error details if the job failed",
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status"]),
+        ]
+
+    def __str__(self):
+        return f"Transcript batch {self.id} ({self.status})"
+
+    @property
+    def progress_percent(self) -> float:
+        if not self.total:
+            return 100.0 if self.status == self.STATUS_COMPLETED else 0.0
+        return round(self.processed / self.total * 100, 1)
@@ -0,0 +1,105 @@
+"""Transcript PDF rendering from a transcript snapshot."""
+
+import io
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+
+def render_transcript_pdf(snapshot: dict, qr_png: bytes | None = None) -> bytes:
+    """Render a transcript PDF from a snapshot built by transcripts.artifacts, with the issue's QR code PNG"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    story = []
+    styles = getSampleStyleSheet()
+
+    # Title
+    title = Paragraph("<b>ACADEMIC TRANSCRIPT</b>", styles["Title"])
+    story.append(title)
+    story.append(Spacer(1, 0.25 * inch))
+
+    # Student information
+    student = snapshot["student"]
+    student_info = [
+        ["Student Name:", student["name"]],
+        ["Registration No:", student["reg_no"]],
+        ["Program:", student["program"]],
+        ["Status:", student["status"]],
+    ]
+
+    info_table = Table(student_info, colWidths=[2 * inch, 4 * inch])
+    info_table.setStyle(
+        TableStyle(
+            [
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+            ]
+        )
+    )
+    story.append(info_table)
+    story.append(Spacer(1, 0.25 * inch))
+
+    # Results
+    results = snapshot["results"]
+    if results:
+        story.append(Paragraph("<b>Exam Results</b>", styles["Heading2"]))
+        story.append(Spacer(1, 0.1 * inch))
+
+        result_data = [["Exam", "Term", "Total", "Outcome"]]
+        for result in results:
+            result_data.append(
+                [
+                    result["exam"],
+                    result["term"],
+                    f"{result['total_obtained']} / {result['total_max']}",
+                    result["outcome"],
+                ]
+            )
+
+        result_table = Table(result_data, colWidths=[2.5 * inch, 2 * inch, 1 * inch, 1 * inch])
+        result_table.setStyle(
+            TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ("FONTSIZE", (0, 0), (-1, -1), 9),
+                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                ]
+            )
+        )
+        story.append(result_table)
+    else:
+        story.append(Paragraph("No published results available.", styles["Normal"]))
+
+    story.append(Spacer(1, 0.5 * inch))
+
+    # Verification
+    qr_info = Paragraph(
+        f"<b>Document No:</b> {snapshot['issue_id']}<br/>"
+        f"<b>Document Hash:</b> {snapshot['results_hash']}<br/>"
+        f"<i>Issued on {snapshot['issued_at']}. Scan the QR code or visit {snapshot['verify_url']} to verify.</i>",
+        styles["Normal"],
+    )
+    if qr_png:
+        qr_image = Image(io.BytesIO(qr_png), width=1.25 * inch, height=1.25 * inch)
+        qr_table = Table([[qr_image, qr_info]], colWidths=[1.5 * inch, 5 * inch])
+        qr_table.setStyle(TableStyle([("VALIGN", (0, 0), (-1, -1), "MIDDLE")]))
+        story.append(qr_table)
+    else:
+        story.append(qr_info)
+
+    # Footer
+    story.append(Spacer(1, 0.25 * inch))
+    footer = Paragraph(f"<i>Generated on: {snapshot['generated_at']}</i>", styles["Normal"])
+    story.append(footer)
+
+    doc.build(story)
+    return buffer.getvalue()
@@ -0,0 +1,51 @@
+"""Signed verification tokens printed on transcripts.
+
+Current transcripts carry an issue token: the signed ID of a TranscriptIssue.
+It does not expire, since the issue it names never changes, so verifying it
+is a signature check plus one primary-key lookup. Student tokens
+(``transcript_<id>`` with a 48 hour timestamp) are still accepted for PDFs
+printed before issues were recorded.
+"""
+
+from django.core.signing import BadSignature, SignatureExpired, Signer, TimestampSigner
+
+# Token expires after 48 hours
+TOKEN_MAX_AGE = 48 * 60 * 60
+signer = TimestampSigner()
+issue_signer = Signer(salt="transcripts.issue")
+
+
+def generate_qr_token(student_id: int) -> str:
+    """Generate a signed token for QR code"""
+    return signer.sign(f"transcript_{student_id}")
+
+
+def generate_issue_token(issue_id: int) -> str:
+    """Signed token naming a TranscriptIssue"""
+    return issue_signer.sign(str(issue_id))
+
+
+def read_issue_token(token: str) -> int | None:
+    """Return the issue ID of an issue token, or None if it is not a valid one"""
+    try:
+        return int(issue_signer.unsign(token))
+    except (BadSignature, ValueError):
+        return None
+
+
+def verify_qr_token(token: str) -> dict:
+    """Verify a QR token and return student_id if valid"""
+    try:
+        value = signer.unsign(token, max_age=TOKEN_MAX_AGE)
+        # Extract student_id from the value
+        if value.startswith("transcript_"):
+            student_id = int(value.split("_")[1])
+            return {"valid": True, "student_id": student_id, "reason": "Token is valid"}
+        else:
+            return {"valid": False, "reason": "Invalid token format"}
+    except SignatureExpired:
+        return {"valid": False, "reason": "Token has expired (> 48 hours)"}
+    except BadSignature:
+        return {"valid": False, "reason": "Token signature is invalid (tampered)"}
+    except (ValueError, IndexError):
+        return {"valid": False, "reason": "Invalid token format"}
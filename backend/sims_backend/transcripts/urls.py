@@ -1,6 +1,13 @@
 from django.urls import path
 
-from .views import enqueue_transcript_generation, get_transcript, verify_transcript
+from .views import (
+    download_transcript_batch,
+    enqueue_transcript_batch,
+    enqueue_transcript_generation,
+    get_transcript,
+    transcript_batch_status,
+    verify_transcript,
+)
 
 urlpatterns = [
     path("api/transcripts/<int:student_id>/", get_transcript, name="get-transcript"),
@@ -14,4 +21,11 @@ urlpatterns = [
         enqueue_transcript_generation,
         name="enqueue-transcript",
     ),
+    path("api/transcripts/batch/", enqueue_transcript_batch, name="transcript-batch"),
+    path("api/transcripts/batch/<int:job_id>/", transcript_batch_status, name="transcript-batch-status"),
+    path(
+        "api/transcripts/batch/<int:job_id>/download/",
+        download_transcript_batch,
+        name="transcript-batch-download",
+    ),
 ]
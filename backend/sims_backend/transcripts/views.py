@@ -1,147 +1,42 @@
 import io
 
 import django_rq
-from django.core.signing import BadSignature, SignatureExpired, TimestampSigner
+from django.db import transaction
 from django.http import FileResponse
-from django.utils import timezone
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from django.utils.cache import patch_cache_control
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from sims_backend.academics.models import Batch, Program
 from sims_backend.common_permissions import in_group
 from sims_backend.finance.services import finance_gate_checks
-from sims_backend.results.models import ResultHeader
 from sims_backend.students.models import Student
 
-# Token expires after 48 hours
-TOKEN_MAX_AGE = 48 * 60 * 60
-signer = TimestampSigner()
+from .artifacts import get_transcript_artifact
+from .batch import enqueue_transcript_batch_job
+from .issues import UNVERIFIED_CACHE_SECONDS, VERIFY_CACHE_SECONDS, verify_issue_token
+from .models import TranscriptBatchJob
+from .tokens import generate_qr_token, verify_qr_token
 
-
-def generate_qr_token(student_id: int) -> str:
-    """Generate a signed token for QR code"""
-    return signer.sign(f"transcript_{student_id}")
-
-
-def verify_qr_token(token: str) -> dict:
-    """Verify a QR token and return student_id if valid"""
-    try:
-        value = signer.unsign(token, max_age=TOKEN_MAX_AGE)
-        # Extract student_id from the value
-        if value.startswith("transcript_"):
-            student_id = int(value.split("_")[1])
-            return {"valid": True, "student_id": student_id, "reason": "Token is valid"}
-        else:
-            return {"valid": False, "reason": "Invalid token format"}
-    except SignatureExpired:
-        return {"valid": False, "reason": "Token has expired (> 48 hours)"}
-    except BadSignature:
-        return {"valid": False, "reason": "Token signature is invalid (tampered)"}
-    except (ValueError, IndexError):
-        return {"valid": False, "reason": "Invalid token format"}
+__all__ = ["generate_qr_token", "generate_transcript_pdf", "verify_qr_token"]
 
 
 def generate_transcript_pdf(student: Student) -> io.BytesIO:
-    """Generate a PDF transcript for a student"""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    story = []
-    styles = getSampleStyleSheet()
-
-    # Title
-    title = Paragraph("<b>ACADEMIC TRANSCRIPT</b>", styles["Title"])
-    story.append(title)
-    story.append(Spacer(1, 0.25 * inch))
-
-    # Student information
-    student_info = [
-        ["Student Name:", student.name],
-        ["Registration No:", student.reg_no],
-        ["Program:", student.program],
-        ["Status:", student.status],
-    ]
-
-    info_table = Table(student_info, colWidths=[2 * inch, 4 * inch])
-    info_table.setStyle(
-        TableStyle(
-            [
-                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, -1), 10),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-            ]
-        )
-    )
-    story.append(info_table)
-    story.append(Spacer(1, 0.25 * inch))
-
-    # Results
-    results = ResultHeader.objects.filter(student=student, status=ResultHeader.STATUS_PUBLISHED).select_related(
-        "exam__academic_period"
-    )
-
-    if results.exists():
-        story.append(Paragraph("<b>Exam Results</b>", styles["Heading2"]))
-        story.append(Spacer(1, 0.1 * inch))
-
-        result_data = [["Exam", "Term", "Total", "Outcome"]]
-
-        for result in results:
-            result_data.append(
-                [
-                    result.exam.title,
-                    getattr(result.exam.academic_period, "name", ""),
-                    f"{result.total_obtained} / {result.total_max}",
-                    result.get_final_outcome_display(),
-                ]
-            )
-
-        result_table = Table(result_data, colWidths=[2.5 * inch, 2 * inch, 1 * inch, 1 * inch])
-        result_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 9),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
-        story.append(result_table)
-    else:
-        story.append(Paragraph("No published results available.", styles["Normal"]))
-
-    story.append(Spacer(1, 0.5 * inch))
+    """Return the student's transcript PDF, rendered or served from the stored artifact"""
+    artifact = get_transcript_artifact(student)
+    with artifact.pdf.open("rb") as pdf:
+        return io.BytesIO(pdf.read())
 
-    # QR token
-    token = generate_qr_token(student.id)
-    qr_info = Paragraph(
-        f"<b>Verification Token:</b> {token}<br/>"
-        f"<i>This transcript can be verified at /api/transcripts/verify/{token}</i><br/>"
-        f"<i>Token valid for 48 hours from generation.</i>",
-        styles["Normal"],
-    )
-    story.append(qr_info)
 
-    # Footer
-    story.append(Spacer(1, 0.25 * inch))
-    footer = Paragraph(
-        f"<i>Generated on: {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}</i>",
-        styles["Normal"],
+def has_transcript_admin_access(user) -> bool:
+    return (
+        in_group(user, "FINANCE")
+        or in_group(user, "ADMIN")
+        or in_group(user, "REGISTRAR")
+        or in_group(user, "Registrar")
+        or user.is_superuser
     )
-    story.append(footer)
-
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
 
 
 @api_view(["GET"])
@@ -157,13 +52,7 @@ def get_transcript(request, student_id: int):
     # Admin/Registrar/Finance users can view any student's transcript for administrative purposes.
     user = request.user
     is_student = in_group(user, "STUDENT")
-    has_admin_access = (
-        in_group(user, "FINANCE")
-        or in_group(user, "ADMIN")
-        or in_group(user, "REGISTRAR")
-        or in_group(user, "Registrar")
-        or user.is_superuser
-    )
+    has_admin_access = has_transcript_admin_access(user)
 
     if is_student:
         if getattr(user, "student", None) != student:
@@ -193,12 +82,10 @@ def get_transcript(request, student_id: int):
             status=403,
         )
 
-    # Generate PDF
-    pdf_buffer = generate_transcript_pdf(student)
-
-    # Return PDF as download
+    # Served from the stored artifact; rendered only when the released results changed
+    artifact = get_transcript_artifact(student)
     return FileResponse(
-        pdf_buffer,
+        artifact.pdf.open("rb"),
         as_attachment=True,
         filename=f"transcript_{student.reg_no}.pdf",
         content_type="application/pdf",
@@ -209,8 +96,18 @@ def get_transcript(request, student_id: int):
 @permission_classes([AllowAny])
 def verify_transcript(request, token: str):
     """Verify a transcript QR token"""
-    result = verify_qr_token(token)
-    return Response(result)
+    result = verify_issue_token(token)
+    if result is None:
+        # Student token printed before transcript issues were recorded
+        result = verify_qr_token(token)
+    response = Response(result)
+    if result["valid"] and "issue_id" in result:
+        # An issue never changes, so the answer is safe to cache publicly
+        patch_cache_control(response, public=True, max_age=VERIFY_CACHE_SECONDS)
+        response["ETag"] = f'"{result["document_hash"]}"'
+    else:
+        patch_cache_control(response, public=True, max_age=UNVERIFIED_CACHE_SECONDS)
+    return response
 
 
 @api_view(["POST"])
@@ -272,3 +169,96 @@ def enqueue_transcript_generation(request):
         },
         status=202,
     )
+
+
+def _batch_job_payload(job: TranscriptBatchJob) -> dict:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "batch_id": job.batch_id,
+        "program_id": job.program_id,
+        "total": job.total,
+        "processed": job.processed,
+        "progress_percent": job.progress_percent,
+        "generated": job.generated,
+        "blocked": job.blocked,
+        "blocked_students": job.manifest.get("blocked", []),
+        "error_message": job.error_message,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def _forbidden_batch_response():
+    return Response(
+        {"error": {"code": "FORBIDDEN", "message": "You do not have permission to generate batch transcripts"}},
+        status=403,
+    )
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def enqueue_transcript_batch(request):
+    """
+    Enqueue transcripts for every student of a batch (or program) as one ZIP.
+
+    Request body:
+        {
+            "batch_id": int,      # or
+            "program_id": int
+        }
+    """
+    if not has_transcript_admin_access(request.user):
+        return _forbidden_batch_response()
+
+    batch_id = request.data.get("batch_id")
+    program_id = request.data.get("program_id")
+    if not batch_id and not program_id:
+        return Response({"error": {"code": 400, "message": "batch_id or program_id is required"}}, status=400)
+    if batch_id and not Batch.objects.filter(id=batch_id).exists():
+        return Response({"error": {"code": 404, "message": "Batch not found"}}, status=404)
+    if not batch_id and not Program.objects.filter(id=program_id).exists():
+        return Response({"error": {"code": 404, "message": "Program not found"}}, status=404)
+
+    job = TranscriptBatchJob.objects.create(
+        created_by=request.user,
+        batch_id=batch_id or None,
+        program_id=None if batch_id else program_id,
+    )
+    transaction.on_commit(lambda: enqueue_transcript_batch_job(job.id))
+    return Response({"message": "Transcript batch job enqueued", **_batch_job_payload(job)}, status=202)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def transcript_batch_status(request, job_id: int):
+    """Progress of a batch transcript job, including blocked students once finished"""
+    if not has_transcript_admin_access(request.user):
+        return _forbidden_batch_response()
+    job = TranscriptBatchJob.objects.filter(id=job_id).first()
+    if job is None:
+        return Response({"error": {"code": 404, "message": "Job not found"}}, status=404)
+    return Response(_batch_job_payload(job))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def download_transcript_batch(request, job_id: int):
+    """Download the ZIP of a completed batch transcript job"""
+    if not has_transcript_admin_access(request.user):
+        return _forbidden_batch_response()
+    job = TranscriptBatchJob.objects.filter(id=job_id).first()
+    if job is None:
+        return Response({"error": {"code": 404, "message": "Job not found"}}, status=404)
+    if job.status != TranscriptBatchJob.STATUS_COMPLETED or not job.archive:
+        return Response(
+            {"error": {"code": "NOT_READY", "message": f"Batch job is {job.status.lower()}"}},
+            status=409,
+        )
+    return FileResponse(
+        job.archive.open("rb"),
+        as_attachment=True,
+        filename=f"transcripts_batch_{job.id}.zip",
+        content_type="application/zip",
+    )
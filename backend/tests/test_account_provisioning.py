@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from sims_backend.academics.models import Batch, Group, Program
+from sims_backend.faculty.imports.services import FacultyImportService
+from sims_backend.students.imports.provisioning import hash_passwords
+from sims_backend.students.imports.services import StudentImportService
+from sims_backend.students.models import Student
+
+User = get_user_model()
+HEADER = "reg_no,name,program_name,batch_name,group_name,status,password\n"
+
+
+def test_hash_passwords_in_worker_processes():
+    passwords = [f"secret-{i}" for i in range(10)]
+    hashes = hash_passwords(passwords, max_workers=2)
+
+    assert len(set(hashes)) == len(hashes)
+    assert all(check_password(password, hashed) for password, hashed in zip(passwords, hashes, strict=True))
+
+
+def commit_queries(admin_user, count, first=0):
+    rows = "".join(f"REG-{i:04d},Ann{i} Lee,MBBS,2029 Batch,Group A,active,\n" for i in range(first, first + count))
+    file = SimpleUploadedFile("students.csv", (HEADER + rows).encode(), content_type="text/csv")
+    job_id = StudentImportService.preview(file, admin_user)["import_job_id"]
+    with CaptureQueriesContext(connection) as queries:
+        result = StudentImportService.commit(job_id, admin_user)
+    return result, len(queries)
+
+
+def test_student_commit_provisions_accounts_in_bulk(db, admin_user):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2029 Batch", start_year=2029)
+    Group.objects.create(batch=batch, name="Group A")
+
+    small, small_queries = commit_queries(admin_user, 3)
+    large, large_queries = commit_queries(admin_user, 30, first=100)
+
+    assert (small["created_count"], large["created_count"]) == (3, 30)
+    assert small_queries == large_queries
+    student = Student.objects.select_related("user").get(reg_no="REG-0105")
+    assert student.user.username == "ann105.b29"
+    assert student.email == student.user.email == "ann105.lee.b29@pmc.edu.pk"
+    assert student.user.check_password("student2029")
+    assert student.user.groups.filter(name="STUDENT").exists()
+    assert User.objects.filter(groups__name="STUDENT").count() == 33
+
+
+def test_student_commit_skips_usernames_owned_by_other_students(db, admin_user):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2029 Batch", start_year=2029)
+    group = Group.objects.create(batch=batch, name="Group A")
+    owner = User.objects.create_user(username="ann1.b29", password="pass")
+    Student.objects.create(reg_no="OLD-1", name="Ann Old", program=program, batch=batch, group=group, user=owner)
+
+    result, _ = commit_queries(admin_user, 3)
+
+    assert result["created_count"] == 3
+    assert Student.objects.get(reg_no="REG-0001").user is None
+    assert Student.objects.get(reg_no="REG-0002").user.username == "ann2.b29"
+
+
+def test_faculty_usernames_are_made_unique_with_one_query(db, django_assert_num_queries):
+    User.objects.create_user(username="john.smith", password="pass")
+    User.objects.create_user(username="john.smith1", password="pass")
+    pending = [
+        ("John Smith", "john@pmc.edu.pk", None, None, None),
+        ("John Smith", "john2@pmc.edu.pk", None, "chosen", None),
+        ("Mary Jones", "mary@pmc.edu.pk", None, None, None),
+    ]
+
+    with django_assert_num_queries(1):
+        links, new_users = FacultyImportService._plan_faculty_accounts(pending)
+
+    assert [user.username for user in new_users] == ["john.smith2", "john.smith3", "mary.jones"]
+    assert new_users[1].check_password("chosen")
+    assert [user for user, _ in links] == new_users
@@ -0,0 +1,127 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Department, Group, Program
+from sims_backend.attendance.models import Attendance
+from sims_backend.attendance.services import bulk_upsert_attendance_for_session, live
+from sims_backend.students.models import Student
+from sims_backend.timetable.models import Session
+
+
+class FakeConnection:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+
+@pytest.fixture()
+def live_session(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    department = Department.objects.create(name="Anatomy", code="ANAT")
+    period = AcademicPeriod.objects.create(period_type="YEAR", name="Year 1")
+    faculty = User.objects.create_user(username="live_faculty", password="pass")
+    now = timezone.now()
+    session = Session.objects.create(
+        academic_period=period,
+        group=group,
+        faculty=faculty,
+        department=department,
+        starts_at=now - timedelta(minutes=5),
+        ends_at=now + timedelta(minutes=55),
+    )
+    students = [
+        Student.objects.create(reg_no=f"LIV-{i}", name=f"Student {i}", program=program, batch=batch, group=group)
+        for i in range(3)
+    ]
+    return session, students
+
+
+def test_snapshot_lists_unmarked_then_progress(admin_client, admin_user, live_session):
+    session, students = live_session
+
+    data = admin_client.get("/api/attendance-live/snapshot/").json()
+    assert [item["session_id"] for item in data["unmarked"]] == [session.id]
+    assert data["unmarked"][0]["roster"] == 3
+
+    Attendance.objects.create(session=session, student=students[0], status=Attendance.STATUS_ABSENT)
+    data = admin_client.get("/api/attendance-live/snapshot/").json()
+    assert data["unmarked"] == []
+    assert data["in_progress"][0]["marked"] == 1
+    assert data["in_progress"][0]["absent"] == 1
+
+
+def test_snapshot_requires_coordinator(faculty_client):
+    assert faculty_client.get("/api/attendance-live/snapshot/").status_code == 403
+
+
+def test_bulk_upsert_publishes_progress_on_commit(
+    monkeypatch, admin_user, live_session, django_capture_on_commit_callbacks
+):
+    session, students = live_session
+    connection = FakeConnection()
+    monkeypatch.setattr(live, "get_live_connection", lambda: connection)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bulk_upsert_attendance_for_session(
+            session=session,
+            records=[{"student_id": students[1].id, "status": "A"}],
+            default_status=Attendance.STATUS_PRESENT,
+            actor=admin_user,
+        )
+
+    assert len(connection.published) == 1
+    channel, event = connection.published[0]
+    assert channel == live.LIVE_CHANNEL
+    assert event["session_id"] == session.id
+    assert event["marked"] == 3
+    assert event["absent"] == 1
+
+
+def test_stream_starts_with_snapshot(monkeypatch, admin_client, live_session):
+    from sims_backend.attendance import live_views
+
+    monkeypatch.setattr(live_views, "_subscribe", lambda: None)
+    response = admin_client.get("/api/attendance-live/stream/", HTTP_ACCEPT="text/event-stream")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/event-stream"
+    chunks = iter(response.streaming_content)
+    assert next(chunks).startswith(b"retry:")
+    snapshot = next(chunks).decode()
+    assert snapshot.startswith("event: snapshot")
+    assert str(live_session[0].id) in snapshot
+    response.close()
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.closed = False
+
+    def get_message(self, timeout=0.0):
+        return self.messages.pop(0) if self.messages else None
+
+    def close(self):
+        self.closed = True
+
+
+def test_stream_is_a_bounded_long_poll(monkeypatch, admin_client, live_session):
+    from sims_backend.attendance import live_views
+
+    pubsub = FakePubSub([{"type": "message", "data": b'{"type": "progress", "session_id": 1}'}])
+    monkeypatch.setattr(live_views, "_subscribe", lambda: pubsub)
+    monkeypatch.setattr(live_views, "LONG_POLL_SECONDS", 0.05)
+    response = admin_client.get("/api/attendance-live/stream/", HTTP_ACCEPT="text/event-stream")
+
+    chunks = [chunk.decode() for chunk in response.streaming_content]
+    assert chunks[1].startswith("event: snapshot")
+    assert chunks[2:] == ['event: progress\ndata: {"type": "progress", "session_id": 1}\n\n']
+    assert pubsub.closed
@@ -0,0 +1,101 @@
+import json
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Department, Group, Program
+from sims_backend.attendance import partitioning
+from sims_backend.attendance.partitioning import Partition
+from sims_backend.timetable.models import Session
+
+
+def test_monthly_punch_partitions_span_year_end():
+    partitions = partitioning.monthly_punch_partitions(date(2025, 11, 20), date(2026, 1, 3))
+
+    assert [p.name for p in partitions] == [
+        "attendance_biometricpunch_p2025_11",
+        "attendance_biometricpunch_p2025_12",
+        "attendance_biometricpunch_p2026_01",
+    ]
+    assert partitions[1].bound_sql().startswith("FOR VALUES FROM ('2025-12-01 00:00:00")
+    assert "'2026-01-01 00:00:00" in partitions[1].bound_sql()
+
+
+def test_parse_bound_round_trips_catalog_expressions():
+    assert partitioning.parse_bound("t_s0", "FOR VALUES FROM (MINVALUE) TO ('125')") == Partition(
+        "t_s0", lower=None, upper="'125'"
+    )
+    assert partitioning.parse_bound("t_s125", "FOR VALUES FROM (125) TO (MAXVALUE)").upper is None
+    assert partitioning.parse_bound("t_default", "DEFAULT").is_default
+    assert partitioning.int_bound("'125'") == 125
+
+
+def test_archivable_punch_partitions_respect_cutoff():
+    partitions = partitioning.monthly_punch_partitions(date(2025, 1, 1), date(2025, 4, 1))
+    partitions.append(Partition("attendance_biometricpunch_default", is_default=True))
+
+    archivable = partitioning.archivable_punch_partitions(partitions, cutoff=date(2025, 3, 1))
+
+    assert [p.name for p in archivable] == ["attendance_biometricpunch_p2025_01", "attendance_biometricpunch_p2025_02"]
+
+
+@pytest.mark.django_db
+def test_only_fully_closed_attendance_partitions_are_archivable():
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    department = Department.objects.create(name="Anatomy", code="ANAT")
+    closed = AcademicPeriod.objects.create(period_type="YEAR", name="Year 1", status=AcademicPeriod.STATUS_CLOSED)
+    open_period = AcademicPeriod.objects.create(period_type="YEAR", name="Year 2")
+    faculty = User.objects.create_user(username="part_faculty", password="pass")
+    now = timezone.now()
+
+    def make(period):
+        return Session.objects.create(
+            academic_period=period,
+            group=group,
+            faculty=faculty,
+            department=department,
+            starts_at=now,
+            ends_at=now + timedelta(hours=1),
+        ).id
+
+    first, second, third = make(closed), make(closed), make(open_period)
+    partitions = [
+        Partition("t_s0", lower=None, upper=f"'{second + 1}'"),
+        Partition(f"t_s{second + 1}", lower=f"'{second + 1}'", upper=f"'{third + 1}'"),
+        Partition(f"t_s{third + 1}", lower=f"'{third + 1}'"),
+    ]
+
+    assert first < second < third
+    assert [p.name for p in partitioning.archivable_attendance_partitions(partitions)] == ["t_s0"]
+
+
+@pytest.mark.django_db
+def test_partition_commands_require_postgres():
+    with pytest.raises(CommandError, match="PostgreSQL"):
+        call_command("partition_attendance_storage", "convert")
+    with pytest.raises(CommandError, match="PostgreSQL"):
+        call_command("archive_attendance_partitions")
+
+
+@pytest.mark.django_db
+def test_benchmark_writes_and_compares_results(tmp_path):
+    baseline = tmp_path / "before.json"
+    call_command("benchmark_attendance_queries", "--repeat=2", f"--json={baseline}")
+    report = json.loads(baseline.read_text())
+    assert set(report["queries"]) == {
+        "attendance_by_status",
+        "attendance_latest_page",
+        "sessions_missing_attendance",
+        "punches_last_day",
+    }
+
+    out = StringIO()
+    call_command("benchmark_attendance_queries", "--repeat=2", f"--baseline={baseline}", stdout=out)
+    assert "attendance_by_status" in out.getvalue()
@@ -0,0 +1,161 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import Group as AuthGroup
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Department, Group, Program
+from sims_backend.attendance.models import Attendance
+from sims_backend.attendance.services import sync
+from sims_backend.students.models import Student
+from sims_backend.timetable.models import Session
+
+
+@pytest.fixture()
+def sync_setup(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    department = Department.objects.create(name="Anatomy", code="ANAT")
+    period = AcademicPeriod.objects.create(period_type="YEAR", name="Year 1")
+    faculty = User.objects.create_user(username="sync_faculty", password="pass")
+    faculty.groups.add(AuthGroup.objects.get(name="FACULTY"))
+
+    now = timezone.now()
+    sessions = [
+        Session.objects.create(
+            academic_period=period,
+            group=group,
+            faculty=faculty,
+            department=department,
+            starts_at=now + timedelta(days=offset, minutes=5),
+            ends_at=now + timedelta(days=offset, hours=1),
+        )
+        for offset in (0, 1)
+    ]
+    students = [
+        Student.objects.create(reg_no=f"SYN-{i}", name=f"Student {i}", program=program, batch=batch, group=group)
+        for i in range(3)
+    ]
+    return faculty, sessions, students
+
+
+def test_download_returns_compact_snapshot(api_client, sync_setup):
+    faculty, sessions, students = sync_setup
+    api_client.force_authenticate(user=faculty)
+
+    response = api_client.get("/api/attendance-input/sync/")
+    assert response.status_code == 200
+    payload = response.json()
+    assert [s["id"] for s in payload["sessions"]] == [s.id for s in sessions]
+    roster = payload["rosters"][str(sessions[0].group_id)]
+    assert [row[1] for row in roster] == [s.reg_no for s in students]
+    assert payload["sync_token"]
+    assert payload["delta"] is False
+
+
+def test_upload_applies_deltas_across_sessions(api_client, sync_setup):
+    faculty, sessions, students = sync_setup
+    api_client.force_authenticate(user=faculty)
+    marked_at = sessions[0].starts_at.isoformat()
+
+    deltas = [
+        {"session_id": sessions[0].id, "student_id": s.id, "status": "P", "marked_at": marked_at} for s in students
+    ]
+    deltas[1]["status"] = "A"
+    response = api_client.post("/api/attendance-input/sync/upload/", {"deltas": deltas}, format="json")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["applied"] == 3
+    assert data["created"] == 3
+    assert data["rejected"] == []
+    assert Attendance.objects.get(session=sessions[0], student=students[1]).status == Attendance.STATUS_ABSENT
+
+
+def test_upload_last_writer_wins(api_client, sync_setup):
+    faculty, sessions, students = sync_setup
+    api_client.force_authenticate(user=faculty)
+    session = sessions[0]
+    newer = session.starts_at + timedelta(minutes=2)
+    Attendance.objects.create(
+        session=session, student=students[0], status=Attendance.STATUS_LATE, marked_by=faculty, marked_at=newer
+    )
+
+    deltas = [
+        {
+            "session_id": session.id,
+            "student_id": students[0].id,
+            "status": "A",
+            "marked_at": session.starts_at.isoformat(),
+        },
+        {
+            "session_id": session.id,
+            "student_id": students[1].id,
+            "status": "A",
+            "marked_at": session.starts_at.isoformat(),
+        },
+        {"session_id": session.id, "student_id": students[1].id, "status": "P", "marked_at": newer.isoformat()},
+    ]
+    data = api_client.post("/api/attendance-input/sync/upload/", {"deltas": deltas}, format="json").json()
+
+    assert len(data["conflicts"]) == 1
+    assert data["conflicts"][0]["server_status"] == Attendance.STATUS_LATE
+    assert Attendance.objects.get(session=session, student=students[0]).status == Attendance.STATUS_LATE
+    assert Attendance.objects.get(session=session, student=students[1]).status == Attendance.STATUS_PRESENT
+
+
+def test_upload_rejects_foreign_sessions_and_off_day_marks(api_client, sync_setup):
+    faculty, sessions, students = sync_setup
+    other = User.objects.create_user(username="other_faculty", password="pass")
+    other.groups.add(AuthGroup.objects.get(name="FACULTY"))
+    api_client.force_authenticate(user=other)
+    delta = {
+        "session_id": sessions[0].id,
+        "student_id": students[0].id,
+        "status": "P",
+        "marked_at": timezone.now().isoformat(),
+    }
+    data = api_client.post("/api/attendance-input/sync/upload/", {"deltas": [delta]}, format="json").json()
+    assert data["applied"] == 0
+    assert data["rejected"][0]["reason"] == "You do not have access to this session."
+
+    api_client.force_authenticate(user=faculty)
+    delta["marked_at"] = (sessions[0].starts_at - timedelta(days=2)).isoformat()
+    data = api_client.post("/api/attendance-input/sync/upload/", {"deltas": [delta]}, format="json").json()
+    assert data["rejected"][0]["reason"] == "Attendance must be marked on the session day."
+
+
+def test_download_since_token_returns_only_changed_marks(api_client, sync_setup):
+    faculty, sessions, students = sync_setup
+    api_client.force_authenticate(user=faculty)
+    old = Attendance.objects.create(session=sessions[0], student=students[0], marked_by=faculty)
+    Attendance.objects.filter(pk=old.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+    token = api_client.get("/api/attendance-input/sync/").json()["sync_token"]
+
+    Attendance.objects.create(session=sessions[0], student=students[1], marked_by=faculty)
+    payload = api_client.get("/api/attendance-input/sync/", {"since": token}).json()
+
+    assert payload["delta"] is True
+    assert [row[0] for row in payload["marks"][str(sessions[0].id)]] == [students[1].id]
+
+
+def test_mark_written_while_snapshot_builds_is_in_next_delta(api_client, sync_setup, monkeypatch):
+    faculty, sessions, students = sync_setup
+    api_client.force_authenticate(user=faculty)
+    issue = sync.issue_sync_token
+
+    def mark_then_issue(user, generated_at):
+        # Commits after the marks query, but its updated_at was stamped a moment earlier
+        mark = Attendance.objects.create(session=sessions[0], student=students[2], marked_by=faculty)
+        Attendance.objects.filter(pk=mark.pk).update(updated_at=timezone.now() - timedelta(seconds=1))
+        return issue(user, generated_at)
+
+    monkeypatch.setattr(sync, "issue_sync_token", mark_then_issue)
+    first = api_client.get("/api/attendance-input/sync/").json()
+    monkeypatch.setattr(sync, "issue_sync_token", issue)
+    assert first["marks"] == {}
+
+    payload = api_client.get("/api/attendance-input/sync/", {"since": first["sync_token"]}).json()
+    assert [row[0] for row in payload["marks"][str(sessions[0].id)]] == [students[2].id]
@@ -0,0 +1,102 @@
+import io
+import json
+import re
+import zipfile
+from datetime import date, datetime, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Department, Group, Program
+from sims_backend.attendance import tick_sheets
+from sims_backend.attendance.services import collect_week_tick_sheets
+from sims_backend.common.parallel import PARALLEL_THRESHOLD
+from sims_backend.students.models import Student
+from sims_backend.timetable.models import Session
+
+WEEK = date(2025, 3, 10)  # a Monday
+
+
+@pytest.fixture()
+def week_sessions(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    other_batch = Batch.objects.create(program=program, name="2023", start_year=2023)
+    group_a = Group.objects.create(batch=batch, name="Group A")
+    group_b = Group.objects.create(batch=batch, name="Group B")
+    other_group = Group.objects.create(batch=other_batch, name="Group C")
+    department = Department.objects.create(name="Anatomy", code="ANAT")
+    period = AcademicPeriod.objects.create(period_type="YEAR", name="Year 1")
+    faculty = User.objects.create_user(username="sheet_faculty", password="pass", first_name="Ada", last_name="Lee")
+
+    for i in range(3):
+        Student.objects.create(reg_no=f"A-{i}", name=f"Alpha {i}", program=program, batch=batch, group=group_a)
+        Student.objects.create(reg_no=f"B-{i}", name=f"Beta {i}", program=program, batch=batch, group=group_b)
+
+    def make(group, day_offset, hour=9):
+        starts = timezone.make_aware(datetime.combine(WEEK + timedelta(days=day_offset), datetime.min.time()))
+        starts += timedelta(hours=hour)
+        return Session.objects.create(
+            academic_period=period,
+            group=group,
+            faculty=faculty,
+            department=department,
+            starts_at=starts,
+            ends_at=starts + timedelta(hours=1),
+        )
+
+    in_week = [make(group_a, 0), make(group_b, 0, hour=10), make(group_a, 4)]
+    make(group_a, 7)  # next week
+    make(other_group, 1)  # other batch
+    return batch, in_week
+
+
+def test_collect_week_uses_two_queries(django_assert_num_queries, week_sessions):
+    batch, sessions = week_sessions
+    with django_assert_num_queries(2):
+        sheets = collect_week_tick_sheets(week=WEEK + timedelta(days=2), batch_id=batch.id)
+
+    assert [s.session_id for s in sheets] == [s.id for s in sessions]
+    assert sheets[0].faculty_name == "Ada Lee"
+    assert [reg for reg, _name in sheets[1].students] == ["B-0", "B-1", "B-2"]
+
+
+def test_bulk_zip_contains_sheet_per_session(admin_client, week_sessions):
+    batch, sessions = week_sessions
+    response = admin_client.get(f"/api/attendance-input/sheet/bulk/?week={WEEK}&batch={batch.id}")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/zip"
+    assert json.loads(response["X-Render-Stats"])["sessions"] == 3
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    manifest = json.loads(archive.read("manifest.json"))
+    assert [f["session_id"] for f in manifest["files"]] == [s.id for s in sessions]
+    for entry in manifest["files"]:
+        assert archive.read(entry["file"]).startswith(b"%PDF")
+
+
+def test_bulk_combined_pdf(admin_client, week_sessions):
+    batch, _sessions = week_sessions
+    response = admin_client.get(f"/api/attendance-input/sheet/bulk/?week={WEEK}&batch={batch.id}&output=pdf")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/pdf"
+    assert len(re.findall(rb"/Type /Page\b(?!s)", response.content)) == 3
+
+
+def test_bulk_requires_filter_and_coordinator(admin_client, faculty_client, week_sessions):
+    assert admin_client.get(f"/api/attendance-input/sheet/bulk/?week={WEEK}").status_code == 400
+    assert faculty_client.get(f"/api/attendance-input/sheet/bulk/?week={WEEK}&batch=1").status_code == 403
+
+
+def test_render_many_uses_worker_processes():
+    sheets = [
+        tick_sheets.TickSheet(session_id=i, faculty_name="F", group_name="G", students=(("R-1", "Name"),))
+        for i in range(PARALLEL_THRESHOLD)
+    ]
+    pdfs, workers = tick_sheets.render_many(sheets, max_workers=2)
+
+    assert workers == 2
+    assert len(pdfs) == len(sheets)
+    assert all(pdf.startswith(b"%PDF") for pdf in pdfs)
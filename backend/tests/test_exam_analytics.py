@@ -0,0 +1,91 @@
+import time
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from django.core.cache import cache
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Group, Program
+from sims_backend.exams.analytics import compute_exam_analytics, get_exam_analytics
+from sims_backend.exams.models import Exam, ExamComponent
+from sims_backend.exams.services import recompute_exam_results
+from sims_backend.results.models import ResultComponentEntry, ResultHeader
+from sims_backend.students.models import Student
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def scored_exam(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    period = AcademicPeriod.objects.create(name="Stats Period", period_type="YEAR")
+    exam = Exam.objects.create(title="Stats Exam", academic_period=period, pass_total_percent=50)
+    theory = ExamComponent.objects.create(exam=exam, name="Theory", sequence=1, max_marks=100)
+    practical = ExamComponent.objects.create(exam=exam, name="Practical", sequence=2, max_marks=50)
+    marks = [(90, 45), (70, 30), (40, 20), (20, None)]
+    for i, (theory_marks, practical_marks) in enumerate(marks):
+        student = Student.objects.create(
+            reg_no=f"STA-{i}", name=f"Student {i}", program=program, batch=batch, group=group
+        )
+        header = ResultHeader.objects.create(
+            exam=exam, student=student, total_max=150, total_obtained=theory_marks + (practical_marks or 0)
+        )
+        ResultComponentEntry.objects.create(result_header=header, exam_component=theory, marks_obtained=theory_marks)
+        if practical_marks is not None:
+            ResultComponentEntry.objects.create(
+                result_header=header, exam_component=practical, marks_obtained=practical_marks
+            )
+    recompute_exam_results(exam)
+    return exam
+
+
+def test_analytics_statistics(scored_exam):
+    data = compute_exam_analytics(scored_exam)
+
+    assert data["results"] == 4
+    assert data["outcomes"] == {"PASS": 2, "FAIL": 2, "PENDING": 0}
+    assert data["pass_rate"] == 50.0
+    assert data["total_percent"]["max"] == 90.0
+    assert data["total_percent"]["min"] == pytest.approx(13.33)
+    assert sum(bucket["count"] for bucket in data["histogram"]) == 4
+    assert data["histogram"][-1] == {"from": 90, "to": 100, "count": 1}
+
+    theory, practical = data["components"]
+    assert theory["marks"]["mean"] == 55.0
+    assert theory["mean_percent"] == 55.0
+    assert practical["marks"]["count"] == 3
+    assert practical["mean_percent"] == pytest.approx(63.33)
+    assert data["correlation"]["results_used"] == 3
+    assert data["correlation"]["matrix"][0][1] == pytest.approx(np.corrcoef([90, 70, 40], [45, 30, 20])[0, 1], abs=1e-4)
+
+
+def test_analytics_cache_is_invalidated_by_marks_change(scored_exam, django_assert_max_num_queries):
+    first = get_exam_analytics(scored_exam)
+
+    # A cache hit only runs the fingerprint queries
+    with django_assert_max_num_queries(2):
+        assert get_exam_analytics(scored_exam) == first
+
+    time.sleep(0.01)
+    entry = ResultComponentEntry.objects.get(result_header__student__reg_no="STA-3")
+    entry.marks_obtained = Decimal("100")
+    entry.save()
+
+    assert get_exam_analytics(scored_exam)["components"][0]["marks"]["max"] == 100.0
+
+
+def test_analytics_endpoint_permissions(scored_exam, admin_client, faculty_client, student_client):
+    url = f"/api/exams/{scored_exam.id}/analytics/"
+
+    assert student_client.get(url).status_code == 403
+    assert faculty_client.get(url).status_code == 200
+    response = admin_client.get(url)
+    assert response.status_code == 200
+    assert response.json()["results"] == 4
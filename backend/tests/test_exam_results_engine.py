@@ -0,0 +1,118 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Group, Program
+from sims_backend.exams.logic import compute_passing_status
+from sims_backend.exams.models import Exam, ExamComponent
+from sims_backend.exams.services import recompute_exam_results
+from sims_backend.results.models import ResultComponentEntry, ResultHeader
+from sims_backend.students.models import Student
+
+
+@pytest.fixture
+def exam_with_results(db):
+    rng = random.Random(7)
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    period = AcademicPeriod.objects.create(name="Engine Period", period_type="YEAR")
+    exam = Exam.objects.create(title="Engine Exam", academic_period=period, pass_total_percent=50)
+    components = [
+        ExamComponent.objects.create(
+            exam=exam, name="Theory", sequence=1, max_marks=100, pass_marks=50, is_mandatory_to_pass=True
+        ),
+        ExamComponent.objects.create(exam=exam, name="Practical", sequence=2, max_marks=60, pass_percent=Decimal("55")),
+        ExamComponent.objects.create(exam=exam, name="Viva", sequence=3, max_marks=40),
+    ]
+    for i in range(25):
+        student = Student.objects.create(
+            reg_no=f"ENG-{i:03d}", name=f"Student {i}", program=program, batch=batch, group=group
+        )
+        header = ResultHeader.objects.create(exam=exam, student=student, total_max=200)
+        total = Decimal("0")
+        for component in components:
+            # Leave some entries out so missing components are exercised
+            if i % 7 == 3 and component.sequence == 3:
+                continue
+            marks = Decimal(rng.randint(0, int(component.max_marks) * 100)) / 100
+            if i % 5 == 0 and component.sequence == 2:
+                marks = Decimal("33.00")  # exactly 55% of 60
+            ResultComponentEntry.objects.create(result_header=header, exam_component=component, marks_obtained=marks)
+            total += marks
+        header.total_obtained = total
+        header.save()
+    return exam
+
+
+def _expected(exam):
+    expected = {}
+    for header in ResultHeader.objects.filter(exam=exam).prefetch_related("component_entries__exam_component"):
+        entries = [
+            {
+                "exam_component_id": entry.exam_component_id,
+                "marks_obtained": entry.marks_obtained,
+                "max_marks": entry.exam_component.max_marks,
+            }
+            for entry in header.component_entries.all()
+        ]
+        expected[header.id] = compute_passing_status(exam, header.total_obtained, header.total_max, entries)
+    return expected
+
+
+@pytest.mark.parametrize(
+    ("mode", "fail_any"),
+    [
+        (Exam.PASSING_MODE_TOTAL_ONLY, False),
+        (Exam.PASSING_MODE_COMPONENT_WISE, False),
+        (Exam.PASSING_MODE_COMPONENT_WISE, True),
+        (Exam.PASSING_MODE_HYBRID, False),
+    ],
+)
+def test_recompute_matches_per_result_logic(exam_with_results, mode, fail_any):
+    exam = exam_with_results
+    exam.passing_mode = mode
+    exam.fail_if_any_component_fail = fail_any
+    exam.save()
+
+    summary = recompute_exam_results(exam)
+
+    assert summary["results"] == 25
+    expected = _expected(exam)
+    for header in ResultHeader.objects.filter(exam=exam).prefetch_related("component_entries"):
+        assert header.final_outcome == expected[header.id]["final_outcome"]
+        for entry in header.component_entries.all():
+            assert entry.component_outcome == expected[header.id]["component_outcomes"][entry.exam_component_id]
+
+
+def test_recompute_query_count_is_independent_of_size(exam_with_results, django_assert_max_num_queries):
+    exam_with_results.passing_mode = Exam.PASSING_MODE_HYBRID
+    exam_with_results.save()
+
+    with django_assert_max_num_queries(12):
+        summary = recompute_exam_results(exam_with_results)
+    assert summary["updated_results"] == 25
+
+    # Nothing changed, so nothing is written the second time
+    assert recompute_exam_results(exam_with_results)["updated_components"] == 0
+
+
+def test_recompute_skips_published_results(exam_with_results):
+    published = ResultHeader.objects.filter(exam=exam_with_results).first()
+    ResultHeader.objects.filter(id=published.id).update(status=ResultHeader.STATUS_PUBLISHED)
+
+    summary = recompute_exam_results(exam_with_results)
+
+    assert summary["results"] == 24
+    assert summary["skipped"] == 1
+    assert ResultHeader.objects.get(id=published.id).final_outcome == ResultHeader.OUTCOME_PENDING
+
+
+def test_recompute_action_permissions(exam_with_results, admin_client, faculty_client):
+    url = f"/api/exams/{exam_with_results.id}/recompute/"
+
+    assert faculty_client.post(url).status_code == 403
+    response = admin_client.post(url)
+    assert response.status_code == 200
+    assert response.json()["results"] == 25
@@ -0,0 +1,180 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Group, Program
+from sims_backend.exams.models import Exam, ExamComponent, ResultRecomputeJob
+from sims_backend.exams.recompute import run_exam_recompute_job
+from sims_backend.exams.services import recompute_exam_results
+from sims_backend.results.models import ResultComponentEntry, ResultHeader
+from sims_backend.students.models import Student
+
+
+class FakeQueue:
+    def __init__(self):
+        self.enqueued = []
+
+    def enqueue(self, func, *args, **kwargs):
+        self.enqueued.append((func, args))
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    fake = FakeQueue()
+    monkeypatch.setattr("sims_backend.exams.recompute.django_rq.get_queue", lambda name: fake)
+    return fake
+
+
+@pytest.fixture
+def rule_exam(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    period = AcademicPeriod.objects.create(name="Rule Period", period_type="YEAR")
+    exam = Exam.objects.create(title="Rule Exam", academic_period=period, pass_total_percent=50)
+    theory = ExamComponent.objects.create(exam=exam, name="Theory", sequence=1, max_marks=100)
+    for i in range(5):
+        student = Student.objects.create(
+            reg_no=f"RUL-{i}", name=f"Student {i}", program=program, batch=batch, group=group
+        )
+        marks = 40 + i * 5  # 40, 45, 50, 55, 60
+        header = ResultHeader.objects.create(exam=exam, student=student, total_obtained=marks, total_max=100)
+        ResultComponentEntry.objects.create(result_header=header, exam_component=theory, marks_obtained=marks)
+    recompute_exam_results(exam)
+    return exam
+
+
+def test_rule_change_enqueues_chunked_recompute(rule_exam, queue, django_capture_on_commit_callbacks):
+    assert ResultHeader.objects.filter(exam=rule_exam, final_outcome="PASS").count() == 3
+
+    exam = Exam.objects.get(id=rule_exam.id)
+    with django_capture_on_commit_callbacks(execute=True):
+        exam.pass_total_percent = 55
+        exam.save()
+
+    job = ResultRecomputeJob.objects.get(exam=rule_exam)
+    assert job.changed_fields == ["exam.pass_total_percent"]
+    assert queue.enqueued == [(run_exam_recompute_job, (job.id,))]
+    # Nothing is recomputed in the request itself
+    assert ResultHeader.objects.filter(exam=rule_exam, final_outcome="PASS").count() == 3
+
+    summary = run_exam_recompute_job(job.id, chunk_size=2)
+
+    job.refresh_from_db()
+    assert summary["status"] == job.status == ResultRecomputeJob.STATUS_COMPLETED
+    assert (job.total, job.processed, job.updated_results) == (5, 5, 1)
+    assert job.progress_percent == 100.0
+    assert ResultHeader.objects.filter(exam=rule_exam, final_outcome="PASS").count() == 2
+
+
+def test_only_rule_changes_schedule_jobs(rule_exam, queue, django_capture_on_commit_callbacks):
+    exam = Exam.objects.get(id=rule_exam.id)
+    component = ExamComponent.objects.get(exam=rule_exam)
+    with django_capture_on_commit_callbacks(execute=True):
+        exam.title = "Renamed"
+        exam.save()
+        component.name = "Written"
+        component.save()
+    assert not ResultRecomputeJob.objects.exists()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        component.pass_marks = 45
+        component.is_mandatory_to_pass = True
+        component.save()
+        exam.passing_mode = Exam.PASSING_MODE_HYBRID
+        exam.save()
+
+    # Edits made while a job is still queued are folded into it
+    job = ResultRecomputeJob.objects.get()
+    assert job.changed_fields == [
+        "exam.passing_mode",
+        "examcomponent.is_mandatory_to_pass",
+        "examcomponent.pass_marks",
+    ]
+    assert len(queue.enqueued) == 1
+
+
+def test_recompute_runs_inline_without_redis(rule_exam, monkeypatch, django_capture_on_commit_callbacks):
+    def unavailable(name):
+        raise ConnectionError("Redis is down")
+
+    monkeypatch.setattr("sims_backend.exams.recompute.django_rq.get_queue", unavailable)
+    with django_capture_on_commit_callbacks(execute=True):
+        ExamComponent.objects.filter(exam=rule_exam).update(pass_marks=None)
+        exam = Exam.objects.get(id=rule_exam.id)
+        exam.pass_total_percent = 45
+        exam.save()
+
+    assert ResultRecomputeJob.objects.get().status == ResultRecomputeJob.STATUS_COMPLETED
+    assert ResultHeader.objects.filter(exam=rule_exam, final_outcome="PASS").count() == 4
+
+
+def test_rule_change_via_api_reports_progress(rule_exam, queue, admin_client, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.patch(f"/api/exams/{rule_exam.id}/", {"pass_total_percent": "60"}, format="json")
+    assert response.status_code == 200
+    run_exam_recompute_job(ResultRecomputeJob.objects.get().id)
+
+    jobs = admin_client.get(f"/api/exams/{rule_exam.id}/recompute-jobs/").json()
+    assert jobs[0]["status"] == "COMPLETED"
+    assert jobs[0]["progress_percent"] == 100.0
+    assert jobs[0]["updated_results"] == 2
+
+
+def test_component_changes_refresh_total_max(rule_exam, queue, django_capture_on_commit_callbacks):
+    theory = ExamComponent.objects.get(exam=rule_exam)
+    with django_capture_on_commit_callbacks(execute=True):
+        theory.max_marks = 80
+        theory.save()
+        viva = ExamComponent.objects.create(exam=rule_exam, name="Viva", sequence=2, max_marks=20)
+
+    job = ResultRecomputeJob.objects.get()
+    assert job.changed_fields == ["examcomponent.added", "examcomponent.max_marks"]
+    run_exam_recompute_job(job.id)
+    # 100 max again, so the 50% rule passes the same three students
+    assert set(ResultHeader.objects.filter(exam=rule_exam).values_list("total_max", flat=True)) == {100}
+    assert ResultHeader.objects.filter(exam=rule_exam, final_outcome="PASS").count() == 3
+
+    with django_capture_on_commit_callbacks(execute=True):
+        viva.delete()
+    job = ResultRecomputeJob.objects.get(status=ResultRecomputeJob.STATUS_QUEUED)
+    assert job.changed_fields == ["examcomponent.deleted"]
+    run_exam_recompute_job(job.id)
+    # Out of 80, every student now reaches 50%
+    assert ResultHeader.objects.filter(exam=rule_exam, final_outcome="PASS").count() == 5
+    assert set(ResultHeader.objects.filter(exam=rule_exam).values_list("total_max", flat=True)) == {80}
+
+
+def test_pass_rule_jobs_keep_manually_adjusted_totals(rule_exam, queue, django_capture_on_commit_callbacks):
+    adjusted = ResultHeader.objects.filter(exam=rule_exam).order_by("id").first()
+    ResultHeader.objects.filter(id=adjusted.id).update(total_max=80)
+
+    exam = Exam.objects.get(id=rule_exam.id)
+    with django_capture_on_commit_callbacks(execute=True):
+        exam.pass_total_percent = 45
+        exam.save()
+    run_exam_recompute_job(ResultRecomputeJob.objects.get().id)
+
+    adjusted.refresh_from_db()
+    # 40 out of the adjusted 80 clears the 45% rule
+    assert (adjusted.total_max, adjusted.final_outcome) == (80, "PASS")
+
+
+def test_edits_do_not_fold_into_abandoned_queued_jobs(rule_exam, queue, django_capture_on_commit_callbacks):
+    exam = Exam.objects.get(id=rule_exam.id)
+    with django_capture_on_commit_callbacks(execute=True):
+        exam.pass_total_percent = 55
+        exam.save()
+    lost = ResultRecomputeJob.objects.get()
+    ResultRecomputeJob.objects.filter(id=lost.id).update(created_at=timezone.now() - timedelta(hours=1))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        exam.pass_total_percent = 60
+        exam.save()
+
+    lost.refresh_from_db()
+    assert lost.status == ResultRecomputeJob.STATUS_FAILED
+    job = ResultRecomputeJob.objects.get(status=ResultRecomputeJob.STATUS_QUEUED)
+    assert job.changed_fields == ["exam.pass_total_percent"]
+    assert queue.enqueued[-1] == (run_exam_recompute_job, (job.id,))
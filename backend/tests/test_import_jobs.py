@@ -0,0 +1,210 @@
+import csv
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from sims_backend.academics.models import Batch, Department, Group, Program
+from sims_backend.faculty.imports.models import FacultyImportJob
+from sims_backend.faculty.imports.services import FacultyImportService, run_faculty_import_job
+from sims_backend.students.imports.jobs import (
+    IMPORT_JOB_TIMEOUT,
+    error_parts_dir,
+    queue_import_job,
+    record_chunk,
+    request_cancel,
+)
+from sims_backend.students.imports.models import ImportJob
+from sims_backend.students.imports.services import StudentImportService, run_student_import_job
+from sims_backend.students.models import Student
+
+HEADER = "reg_no,name,program_name,batch_name,group_name,status\n"
+
+
+class FakeQueue:
+    def __init__(self):
+        self.enqueued = []
+
+    def enqueue(self, func, *args, **kwargs):
+        self.enqueued.append((func, args))
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    fake = FakeQueue()
+    monkeypatch.setattr("sims_backend.students.imports.jobs.django_rq.get_queue", lambda name: fake)
+    return fake
+
+
+@pytest.fixture
+def group(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2029 Batch", start_year=2029)
+    return Group.objects.create(batch=batch, name="Group A")
+
+
+def student_csv(rows):
+    body = "".join(f"{reg_no},Ann{i} Lee,MBBS,2029 Batch,{group},active\n" for i, (reg_no, group) in enumerate(rows))
+    return SimpleUploadedFile("students.csv", (HEADER + body).encode(), content_type="text/csv")
+
+
+def previewed_job(admin_user, rows):
+    result = StudentImportService.preview(student_csv(rows), admin_user)
+    return ImportJob.objects.get(id=result["import_job_id"])
+
+
+def error_report(job):
+    with job.error_report_file.open("rb") as fh:
+        return list(csv.DictReader(io.StringIO(fh.read().decode())))
+
+
+def test_commit_endpoint_queues_job(admin_client, admin_user, group, queue, django_capture_on_commit_callbacks):
+    job = previewed_job(admin_user, [(f"REG-{i}", "Group A") for i in range(3)])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.post(
+            "/api/admin/students/import/commit/", {"import_job_id": str(job.id), "confirm": True}, format="json"
+        )
+
+    assert response.status_code == 202
+    assert response.json()["status"] == ImportJob.STATUS_QUEUED
+    assert queue.enqueued == [(run_student_import_job, (str(job.id),))]
+    assert not Student.objects.exists()
+
+    run_student_import_job(str(job.id))
+    job.refresh_from_db()
+    assert (job.status, job.processed_rows, job.created_count) == (ImportJob.STATUS_COMMITTED, 3, 3)
+
+
+def test_chunked_run_accumulates_progress_and_errors(admin_user, group):
+    rows = [
+        ("REG-0", "Group A"),
+        ("REG-1", "Group Z"),
+        ("REG-2", "Group A"),
+        ("REG-3", "Group Z"),
+        ("REG-4", "Group A"),
+    ]
+    job = previewed_job(admin_user, rows)
+
+    result = StudentImportService.commit(str(job.id), admin_user, chunk_size=2)
+
+    assert result["status"] == ImportJob.STATUS_COMMITTED
+    assert (result["processed_rows"], result["created_count"], result["failed_count"]) == (5, 3, 2)
+    job.refresh_from_db()
+    # Failures from the first and second chunks share one report
+    assert [row["reg_no"] for row in error_report(job)] == ["REG-1", "REG-3"]
+
+
+def test_rolled_back_chunk_leaves_no_error_rows_behind(admin_user, group, monkeypatch):
+    rows = [("REG-0", "Group A"), ("REG-1", "Group Z"), ("REG-2", "Group A"), ("REG-3", "Group Z")]
+    job = previewed_job(admin_user, rows)
+    StudentImportService.queue_commit(str(job.id), enqueue=False)
+
+    def fail_after_writing_errors(job, stop, *args):
+        if stop > 2:
+            raise RuntimeError("worker lost")
+        record_chunk(job, stop, *args)
+
+    monkeypatch.setattr("sims_backend.students.imports.services.record_chunk", fail_after_writing_errors)
+    result = run_student_import_job(str(job.id), chunk_size=2)
+    monkeypatch.undo()
+
+    job.refresh_from_db()
+    assert (result["status"], result["processed_rows"]) == (ImportJob.STATUS_FAILED, 2)
+    assert [row["reg_no"] for row in error_report(job)] == ["REG-1"]
+    storage = job.error_report_file.storage
+    assert not storage.exists(error_parts_dir(job)) or storage.listdir(error_parts_dir(job))[1] == []
+
+    queue_import_job(ImportJob, job.id, run_student_import_job, [ImportJob.STATUS_FAILED], enqueue=False)
+    run_student_import_job(str(job.id), chunk_size=2)
+    job.refresh_from_db()
+    assert job.status == ImportJob.STATUS_COMMITTED
+    assert [row["reg_no"] for row in error_report(job)] == ["REG-1", "REG-3"]
+
+
+def test_cancel_then_resume_continues_from_last_chunk(admin_client, admin_user, group, queue, monkeypatch):
+    job = previewed_job(admin_user, [(f"REG-{i}", "Group A") for i in range(5)])
+    StudentImportService.queue_commit(str(job.id), enqueue=False)
+
+    # Cancel while the first chunk is being written
+    commit_chunk = StudentImportService.commit_chunk
+
+    def cancel_during_chunk(*args, **kwargs):
+        commit_chunk(*args, **kwargs)
+        request_cancel(ImportJob, job.id)
+
+    monkeypatch.setattr(StudentImportService, "commit_chunk", cancel_during_chunk)
+    result = run_student_import_job(str(job.id), chunk_size=2)
+    monkeypatch.undo()
+
+    assert (result["status"], result["processed_rows"]) == (ImportJob.STATUS_CANCELLED, 2)
+    assert Student.objects.count() == 2
+
+    response = admin_client.post(f"/api/admin/students/import/{job.id}/resume/")
+    assert response.status_code == 202
+    assert admin_client.post(f"/api/admin/students/import/{job.id}/resume/").status_code == 400
+
+    run_student_import_job(str(job.id), chunk_size=2)
+    job.refresh_from_db()
+    assert (job.status, job.processed_rows, job.created_count) == (ImportJob.STATUS_COMMITTED, 5, 5)
+    assert Student.objects.count() == 5
+
+
+def test_failed_faculty_job_resumes_with_file_duplicates_intact(admin_user, monkeypatch):
+    Department.objects.create(name="Anatomy", code="ANAT")
+    body = (
+        "name,email,department_name\nAda Lee,ada@x.edu,Anatomy\nBo Kim,bo@x.edu,Anatomy\nAda Again,ada@x.edu,Anatomy\n"
+    )
+    preview = FacultyImportService.preview(
+        SimpleUploadedFile("faculty.csv", body.encode(), content_type="text/csv"), admin_user
+    )
+    job_id = preview["import_job_id"]
+    FacultyImportService.queue_commit(job_id, enqueue=False)
+
+    commit_chunk = FacultyImportService.commit_chunk
+
+    def fail_second_chunk(job, rows, start, state, max_workers=None):
+        if start:
+            raise RuntimeError("worker lost")
+        commit_chunk(job, rows, start, state, max_workers)
+
+    monkeypatch.setattr(FacultyImportService, "commit_chunk", fail_second_chunk)
+    result = run_faculty_import_job(job_id, chunk_size=1)
+    monkeypatch.undo()
+    job = FacultyImportJob.objects.get(id=job_id)
+    assert (result["status"], result["processed_rows"]) == (FacultyImportJob.STATUS_FAILED, 1)
+    assert job.summary["resume_from_row"] == 3
+
+    queue_import_job(FacultyImportJob, job_id, run_faculty_import_job, [FacultyImportJob.STATUS_FAILED], enqueue=False)
+    result = run_faculty_import_job(job_id, chunk_size=1)
+
+    # The third row repeats the first row's email even though that row was committed before the failure
+    assert (result["status"], result["created_count"], result["failed_count"]) == (
+        FacultyImportJob.STATUS_COMMITTED,
+        2,
+        1,
+    )
+
+
+def test_stalled_running_job_can_be_resumed_or_cancelled(admin_client, admin_user, group, queue):
+    job = previewed_job(admin_user, [(f"REG-{i}", "Group A") for i in range(3)])
+    # A work-horse killed mid-run leaves the job RUNNING
+    ImportJob.objects.filter(id=job.id).update(status=ImportJob.STATUS_RUNNING)
+    resume_url = f"/api/admin/students/import/{job.id}/resume/"
+    assert admin_client.post(resume_url).status_code == 400
+
+    ImportJob.objects.filter(id=job.id).update(updated_at=timezone.now() - timedelta(seconds=IMPORT_JOB_TIMEOUT + 1))
+    response = admin_client.post(resume_url)
+    assert response.status_code == 202
+    run_student_import_job(str(job.id))
+    job.refresh_from_db()
+    assert (job.status, job.created_count) == (ImportJob.STATUS_COMMITTED, 3)
+
+    ImportJob.objects.filter(id=job.id).update(
+        status=ImportJob.STATUS_RUNNING, updated_at=timezone.now() - timedelta(seconds=IMPORT_JOB_TIMEOUT + 1)
+    )
+    assert admin_client.post(f"/api/admin/students/import/{job.id}/cancel/").status_code == 202
+    job.refresh_from_db()
+    assert job.status == ImportJob.STATUS_CANCELLED
@@ -0,0 +1,217 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.intake.duplicates import find_duplicates, sync_student_keys
+from apps.intake.models import IdentityKey, StudentIntakeSubmission, SubmissionCounter
+from sims_backend.academics.models import Batch, Group, Program
+from sims_backend.students.imports.models import ImportJob
+from sims_backend.students.imports.services import StudentImportService
+from sims_backend.students.models import Student
+
+
+def submission_fields(i):
+    return {
+        "full_name": f"Applicant {i}",
+        "father_name": "Father",
+        "gender": "F",
+        "date_of_birth": date(2004, 1, 1),
+        "cnic_or_bform": f"35202-{i:07d}-1",
+        "mobile": f"0300{i:07d}",
+        "email": f"applicant{i}@example.com",
+        "address": "Address",
+        "guardian_name": "Guardian",
+        "guardian_relation": "FATHER",
+        "guardian_phone_whatsapp": "03009999999",
+        "mdcat_roll_number": f"MD-{i}",
+        "merit_number": i + 1,
+        "merit_percentage": "80.00",
+        "last_qualification": "FSC",
+        "institute_name": "College",
+        "board_or_university": "Board",
+        "passing_year": 2022,
+        "total_marks_or_grade": "1100",
+        "obtained_marks_or_grade": "900",
+        "subjects": "Biology",
+        "passport_size_photo": SimpleUploadedFile("photo.jpg", b"jpg", content_type="image/jpeg"),
+    }
+
+
+def make_submission(i, **overrides):
+    return StudentIntakeSubmission.objects.create(**{**submission_fields(i), **overrides})
+
+
+@pytest.fixture
+def group(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2029 Batch", start_year=2029)
+    return Group.objects.create(batch=batch, name="Group A")
+
+
+def test_duplicates_are_matched_on_normalized_values(group):
+    first = make_submission(1)
+    # Same CNIC without dashes and same email in another case; the student's phone has a space
+    second = make_submission(2, cnic_or_bform="3520200000011", email="APPLICANT1@example.com")
+    student = Student.objects.create(
+        reg_no="R-1", name="Enrolled", program=group.batch.program, batch=group.batch, group=group, phone="0300 0000002"
+    )
+    sync_student_keys([student])
+
+    first_report, second_report = find_duplicates([first, second])
+
+    assert first_report == {"cnic": [second.submission_id], "mobile": [], "email": [second.submission_id], "mdcat": []}
+    assert second_report["cnic"] == second_report["email"] == [first.submission_id]
+    assert second_report["mobile"] == [f"STUDENT-{student.id}"]
+    assert second.check_duplicates() == second_report
+
+    # Editing a submission re-indexes it
+    second.email = "someone.else@example.com"
+    second.save()
+    assert first.check_duplicates()["email"] == []
+
+
+def test_batch_check_is_one_query(db, django_assert_num_queries):
+    submissions = [make_submission(i) for i in range(20)]
+    make_submission(99, mdcat_roll_number="md-3")
+
+    with django_assert_num_queries(1):
+        reports = find_duplicates(submissions)
+
+    assert [i for i, report in enumerate(reports) if any(report.values())] == [3]
+
+
+def test_admin_changelist_queries_do_not_grow_with_rows(db, admin_user):
+    client = Client()
+    client.force_login(admin_user)
+    url = "/admin/intake/studentintakesubmission/"
+
+    def changelist_queries():
+        with CaptureQueriesContext(connection) as queries:
+            assert client.get(url).status_code == 200
+        return len(queries)
+
+    make_submission(0)
+    few = changelist_queries()
+    for i in range(1, 15):
+        make_submission(i)
+    assert changelist_queries() == few
+
+
+def test_rebuild_command_indexes_bulk_loaded_students(group):
+    Student.objects.bulk_create(
+        [Student(reg_no="R-9", name="Bulk", program=group.batch.program, batch=group.batch, group=group, email="a@b.c")]
+    )
+    assert not IdentityKey.objects.filter(student__isnull=False).exists()
+
+    call_command("rebuild_identity_keys", stdout=io.StringIO())
+
+    assert IdentityKey.objects.filter(kind=IdentityKey.KIND_EMAIL, value="a@b.c", student__reg_no="R-9").exists()
+
+
+def test_student_writes_are_indexed(group, admin_client, admin_user):
+    body = (
+        "reg_no,name,program_name,batch_name,group_name,status,email,phone\n"
+        "R-1,Ann Lee,MBBS,2029 Batch,Group A,active,ann@x.edu,0300-1111111\n"
+    )
+    preview = StudentImportService.preview(SimpleUploadedFile("students.csv", body.encode()), admin_user)
+    StudentImportService.commit(preview["import_job_id"], admin_user)
+    student = Student.objects.get(reg_no="R-1")
+    assert find_duplicates([make_submission(1, email="ANN@x.edu", mobile="03001111111")])[0]["email"] == [
+        f"STUDENT-{student.id}"
+    ]
+
+    # An upsert that changes the phone re-indexes the student
+    body = body.replace("0300-1111111", "0300-2222222")
+    preview = StudentImportService.preview(
+        SimpleUploadedFile("students.csv", body.encode()), admin_user, mode=ImportJob.MODE_UPSERT
+    )
+    StudentImportService.commit(preview["import_job_id"], admin_user)
+    assert set(IdentityKey.objects.filter(student=student).values_list("value", flat=True)) == {
+        "ann@x.edu",
+        "03002222222",
+    }
+
+    response = admin_client.patch(f"/api/students/{student.id}/", {"phone": "0300 3333333"}, format="json")
+    assert response.status_code == 200
+    assert IdentityKey.objects.filter(student=student, kind=IdentityKey.KIND_MOBILE, value="03003333333").exists()
+
+
+def test_submission_ids_continue_from_existing_numbers(db):
+    today = timezone.now().date()
+    make_submission(1, submission_id=f"STU-{today:%Y%m%d}-0041")
+
+    assert make_submission(2).submission_id == f"STU-{today:%Y%m%d}-0042"
+    assert make_submission(3).submission_id == f"STU-{today:%Y%m%d}-0043"
+    assert SubmissionCounter.objects.get(day=today).last_number == 43
+
+
+def test_failed_submission_keeps_its_number_for_a_retry(db):
+    today = timezone.now().date()
+    submission = StudentIntakeSubmission(**{**submission_fields(1), "mobile": "12"})
+
+    with pytest.raises(ValidationError):
+        submission.save()
+    assert submission.pk is None
+    assert submission.submission_id == f"STU-{today:%Y%m%d}-0001"
+
+    submission.mobile = "03001234567"
+    submission.save()
+    assert submission.submission_id == f"STU-{today:%Y%m%d}-0001"
+    assert make_submission(2).submission_id == f"STU-{today:%Y%m%d}-0002"
+
+
+@pytest.fixture
+def writer_database(tmp_path):
+    """
+    A database that concurrent threads can write to.
+
+    PostgreSQL uses the test database as is. The in-memory SQLite test
+    database cannot wait for locks, so new connections are pointed at a file
+    database that takes the write lock when a transaction begins and waits
+    up to 20 seconds for it.
+    """
+    if connection.vendor != "sqlite":
+        yield
+        return
+    db_settings = connection.settings_dict
+    saved = {key: db_settings[key] for key in ("NAME", "OPTIONS")}
+    db_settings["NAME"] = str(tmp_path / "writers.sqlite3")
+    db_settings["OPTIONS"] = {"timeout": 20, "transaction_mode": "IMMEDIATE"}
+
+    def create_tables():
+        try:
+            call_command("migrate", run_syncdb=True, verbosity=0)
+        finally:
+            connection.close()
+
+    # A fresh thread opens a fresh connection, leaving this thread's one alone
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(create_tables).result()
+    try:
+        yield
+    finally:
+        db_settings.update(saved)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_submissions_get_distinct_ids(writer_database):
+    def submit(i):
+        try:
+            return make_submission(i).submission_id
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ids = list(executor.map(submit, range(24)))
+
+    assert len(set(ids)) == 24
+    assert sorted(int(submission_id[-4:]) for submission_id in ids) == list(range(1, 25))
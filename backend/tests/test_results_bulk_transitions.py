@@ -0,0 +1,58 @@
+import pytest
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Group, Program
+from sims_backend.audit.models import AuditLog
+from sims_backend.exams.models import Exam
+from sims_backend.results.models import ResultHeader
+from sims_backend.results.transitions import bulk_transition_exam_results
+from sims_backend.students.models import Student
+
+
+@pytest.fixture
+def exam_results(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    period = AcademicPeriod.objects.create(name="Bulk Period", period_type="YEAR")
+    exam = Exam.objects.create(title="Bulk Exam", academic_period=period)
+    statuses = [ResultHeader.STATUS_DRAFT] * 3 + [ResultHeader.STATUS_VERIFIED, ResultHeader.STATUS_FROZEN]
+    for i, result_status in enumerate(statuses):
+        student = Student.objects.create(
+            reg_no=f"BLK-{i}", name=f"Student {i}", program=program, batch=batch, group=group
+        )
+        ResultHeader.objects.create(exam=exam, student=student, status=result_status)
+    return exam
+
+
+def test_bulk_publish_uses_single_update(exam_results, admin_user, django_assert_max_num_queries):
+    # Counts + UPDATE + audit entry, plus two for dropping stored transcripts
+    with django_assert_max_num_queries(7):
+        summary = bulk_transition_exam_results(exam=exam_results, transition="publish", user=admin_user)
+
+    assert summary["transitioned"] == 4
+    assert summary["skipped"] == 1
+    assert summary["skipped_by_status"] == {ResultHeader.STATUS_FROZEN: 1}
+    published = ResultHeader.objects.filter(exam=exam_results, status=ResultHeader.STATUS_PUBLISHED)
+    assert published.count() == 4
+    assert all(r.published_by_id == admin_user.id and r.published_at for r in published)
+
+
+def test_bulk_actions_walk_the_workflow(admin_client, exam_results):
+    base = f"/api/results/exams/{exam_results.id}"
+
+    assert admin_client.post(f"{base}/verify/").json()["transitioned"] == 3
+    assert admin_client.post(f"{base}/freeze/").json()["transitioned"] == 0
+    assert admin_client.post(f"{base}/publish/").json()["transitioned"] == 4
+    response = admin_client.post(f"{base}/freeze/")
+
+    assert response.status_code == 200
+    assert response.json()["transitioned"] == 4
+    assert ResultHeader.objects.filter(exam=exam_results, status=ResultHeader.STATUS_FROZEN).count() == 5
+    audits = AuditLog.objects.filter(entity="Exam", action=AuditLog.ACTION_STATE_TRANSITION)
+    assert audits.count() == 3
+    assert audits.order_by("-timestamp").first().metadata["transitioned"] == 4
+
+
+def test_bulk_transition_permissions(exam_results, faculty_client, examcell_client):
+    assert faculty_client.post(f"/api/results/exams/{exam_results.id}/publish/").status_code == 403
+    assert examcell_client.post(f"/api/results/exams/{exam_results.id}/publish/").status_code == 200
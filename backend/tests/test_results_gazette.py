@@ -0,0 +1,77 @@
+import csv
+import io
+
+import pytest
+from openpyxl import load_workbook
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Group, Program
+from sims_backend.exams.models import Exam, ExamComponent
+from sims_backend.results.gazette import stream_gazette_csv
+from sims_backend.results.models import ResultComponentEntry, ResultHeader
+from sims_backend.students.models import Student
+
+
+@pytest.fixture
+def gazette_exam(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    period = AcademicPeriod.objects.create(name="Gazette Period", period_type="YEAR")
+    exam = Exam.objects.create(title="Gazette Exam", academic_period=period)
+    practical = ExamComponent.objects.create(exam=exam, name="Practical", sequence=2, max_marks=50)
+    theory = ExamComponent.objects.create(exam=exam, name="Theory", sequence=1, max_marks=100)
+    for i, (theory_marks, practical_marks) in enumerate([(80, 40), (55, None), (None, None)]):
+        student = Student.objects.create(
+            reg_no=f"GAZ-{2 - i}", name=f"Student {i}", program=program, batch=batch, group=group
+        )
+        total = (theory_marks or 0) + (practical_marks or 0)
+        header = ResultHeader.objects.create(
+            exam=exam, student=student, total_obtained=total, total_max=150 if total else 0, grade="A" if i == 0 else ""
+        )
+        if theory_marks is not None:
+            ResultComponentEntry.objects.create(
+                result_header=header, exam_component=theory, marks_obtained=theory_marks
+            )
+        if practical_marks is not None:
+            ResultComponentEntry.objects.create(
+                result_header=header, exam_component=practical, marks_obtained=practical_marks
+            )
+    return exam
+
+
+def test_gazette_csv_pivots_components(admin_client, gazette_exam):
+    response = admin_client.get(f"/api/results/exams/{gazette_exam.id}/gazette/")
+
+    assert response.status_code == 200
+    assert response.streaming
+    rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+    assert rows[0][:4] == ["reg_no", "name", "Theory (100.00)", "Practical (50.00)"]
+    assert [row[0] for row in rows[1:]] == ["GAZ-0", "GAZ-1", "GAZ-2"]
+    assert rows[3][:7] == ["GAZ-2", "Student 0", "80.00", "40.00", "120.00", "150.00", "80.00"]
+    assert rows[3][8] == "A"
+    assert rows[2][2:4] == ["55.00", ""]
+    assert rows[1][2:7] == ["", "", "0.00", "0.00", ""]
+
+
+def test_gazette_is_built_from_one_result_query(gazette_exam, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        rows = list(stream_gazette_csv(gazette_exam))
+    assert len(rows) == 4
+
+
+def test_gazette_xlsx_and_status_filter(admin_client, gazette_exam):
+    ResultHeader.objects.filter(student__reg_no="GAZ-2").update(status=ResultHeader.STATUS_PUBLISHED)
+
+    response = admin_client.get(f"/api/results/exams/{gazette_exam.id}/gazette/?output=xlsx&status=published")
+
+    assert response.status_code == 200
+    assert 'filename="gazette_exam_' in response["Content-Disposition"]
+    sheet = load_workbook(io.BytesIO(b"".join(response.streaming_content))).active
+    values = list(sheet.iter_rows(values_only=True))
+    assert len(values) == 2
+    assert values[1][:4] == ("GAZ-2", "Student 0", 80, 40)
+
+
+def test_gazette_permissions(student_client, admin_client, gazette_exam):
+    assert student_client.get(f"/api/results/exams/{gazette_exam.id}/gazette/").status_code == 403
+    assert admin_client.get(f"/api/results/exams/{gazette_exam.id}/gazette/?output=pdf").status_code == 400
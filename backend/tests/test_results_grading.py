@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Group, Program
+from sims_backend.exams.models import Exam
+from sims_backend.results.grading import GradeLookup, assign_exam_grades, rank_scores
+from sims_backend.results.models import GradeBand, GradeScale, ResultHeader
+from sims_backend.results.utils import calculate_grade
+from sims_backend.students.models import Student
+
+
+@pytest.fixture
+def graded_exam(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    period = AcademicPeriod.objects.create(name="Grade Period", period_type="YEAR")
+    exam = Exam.objects.create(title="Grade Exam", academic_period=period)
+    totals = [180, 150, 150, 119.99, 60, None]
+    for i, total in enumerate(totals):
+        student = Student.objects.create(
+            reg_no=f"GRA-{i}", name=f"Student {i}", program=program, batch=batch, group=group
+        )
+        ResultHeader.objects.create(
+            exam=exam, student=student, total_obtained=total or 0, total_max=200 if total is not None else 0
+        )
+    return exam
+
+
+def test_lookup_matches_default_bands():
+    lookup = GradeLookup([("Pass", 50), ("Merit", "75.5"), ("Fail", 0)])
+
+    assert lookup.grade_for(75.5) == "Merit"
+    assert lookup.grade_for(Decimal("75.49")) == "Pass"
+    assert lookup.grade_for(0) == "Fail"
+    assert lookup.grades_for(np.array([7550, 7549]), np.array([10000, 10000])).tolist() == ["Merit", "Pass"]
+    assert [calculate_grade(p) for p in (95, 90, 89.99, 60, 59, -5)] == ["A+", "A+", "A", "D", "F", "F"]
+
+
+def test_rank_methods():
+    scores = np.array([90, 80, 80, 70])
+
+    assert rank_scores(scores, "competition").tolist() == [1, 2, 2, 4]
+    assert rank_scores(scores, "dense").tolist() == [1, 2, 2, 3]
+
+
+def test_assign_exam_grades(graded_exam, django_assert_max_num_queries):
+    with django_assert_max_num_queries(6):
+        summary = assign_exam_grades(graded_exam)
+
+    assert summary["ranked"] == 5
+    # GRA-5 has no maximum, so it already holds the empty grade/rank
+    assert summary["updated"] == 5
+    results = {r.student.reg_no: r for r in ResultHeader.objects.filter(exam=graded_exam).select_related("student")}
+    assert [results[f"GRA-{i}"].grade for i in range(6)] == ["A+", "B", "B", "F", "F", ""]
+    assert [results[f"GRA-{i}"].rank for i in range(6)] == [1, 2, 2, 4, 5, None]
+    assert results["GRA-0"].percentile == Decimal("100.00")
+    assert results["GRA-1"].percentile == Decimal("80.00")
+    assert results["GRA-4"].percentile == Decimal("20.00")
+
+    # Unchanged results are not rewritten
+    assert assign_exam_grades(graded_exam)["updated"] == 0
+
+
+def test_exam_scale_overrides_program_scale(graded_exam):
+    program_scale = GradeScale.objects.create(name="Program", program=Program.objects.get())
+    GradeBand.objects.create(scale=program_scale, grade="P", min_percent=50)
+    exam_scale = GradeScale.objects.create(name="Exam", exam=graded_exam)
+    GradeBand.objects.create(scale=exam_scale, grade="H", min_percent=80)
+    GradeBand.objects.create(scale=exam_scale, grade="S", min_percent=0)
+
+    assert assign_exam_grades(graded_exam)["scales"] == ["Exam"]
+    assert ResultHeader.objects.get(student__reg_no="GRA-0").grade == "H"
+
+    exam_scale.is_active = False
+    exam_scale.save()
+    assign_exam_grades(graded_exam, rank_method="dense")
+    assert ResultHeader.objects.get(student__reg_no="GRA-1").grade == "P"
+    assert ResultHeader.objects.get(student__reg_no="GRA-4").grade == ""
+    assert ResultHeader.objects.get(student__reg_no="GRA-3").rank == 3
+
+
+def test_grade_exam_endpoint(admin_client, faculty_client, graded_exam):
+    url = f"/api/results/exams/{graded_exam.id}/grades/"
+    ResultHeader.objects.filter(student__reg_no="GRA-0").update(status=ResultHeader.STATUS_PUBLISHED)
+
+    assert faculty_client.post(url).status_code == 403
+    assert admin_client.post(url, {"rank_method": "bogus"}, format="json").status_code == 400
+    response = admin_client.post(url, {"rank_method": "dense"}, format="json")
+
+    assert response.status_code == 200
+    assert response.json()["skipped"] == 1
+    result = admin_client.get(f"/api/results/{ResultHeader.objects.get(student__reg_no='GRA-1').id}/").json()
+    assert (result["grade"], result["rank"], result["percentile"]) == ("B", 2, "80.00")
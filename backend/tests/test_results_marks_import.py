@@ -0,0 +1,130 @@
+import io
+from decimal import Decimal
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from openpyxl import Workbook
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Group, Program
+from sims_backend.exams.models import Exam, ExamComponent
+from sims_backend.results.marks_import import commit_marks_import, plan_marks_import
+from sims_backend.results.models import ResultComponentEntry, ResultHeader
+from sims_backend.students.models import Student
+
+
+@pytest.fixture
+def grid_exam(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    period = AcademicPeriod.objects.create(name="Grid Period", period_type="YEAR")
+    exam = Exam.objects.create(title="Grid Exam", academic_period=period, pass_total_percent=50)
+    ExamComponent.objects.create(exam=exam, name="Theory", sequence=1, max_marks=100)
+    ExamComponent.objects.create(exam=exam, name="Practical", sequence=2, max_marks=50)
+    for i in range(4):
+        Student.objects.create(reg_no=f"GRD-{i}", name=f"Student {i}", program=program, batch=batch, group=group)
+    return exam
+
+
+def _csv(text):
+    return SimpleUploadedFile("marks.csv", text.encode(), content_type="text/csv")
+
+
+def test_dry_run_reports_diff_and_errors(admin_client, grid_exam):
+    theory = grid_exam.components.get(sequence=1)
+    header = ResultHeader.objects.create(exam=grid_exam, student=Student.objects.get(reg_no="GRD-0"))
+    ResultComponentEntry.objects.create(result_header=header, exam_component=theory, marks_obtained=40)
+
+    grid = "reg_no,Theory,2\nGRD-0,45,20\nGRD-1,101,\nNOPE,10,10\nGRD-2,,30\n"
+    response = admin_client.post(
+        f"/api/results/exams/{grid_exam.id}/marks/dry-run/", {"file": _csv(grid)}, format="multipart"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["updated"] == 1
+    assert {"reg_no": "GRD-0", "component": "Theory", "old": "40.00", "new": "45.00"} in data["changes"]
+    assert sorted(error["reg_no"] for error in data["errors"]) == ["GRD-1", "NOPE"]
+    assert ResultComponentEntry.objects.count() == 1
+
+
+def test_commit_upserts_and_recomputes(admin_client, grid_exam):
+    grid = "reg_no,theory,practical\nGRD-0,60,30\nGRD-1,20,10\n"
+    response = admin_client.post(
+        f"/api/results/exams/{grid_exam.id}/marks/commit/", {"file": _csv(grid)}, format="multipart"
+    )
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 4
+    passing = ResultHeader.objects.get(student__reg_no="GRD-0")
+    assert passing.total_obtained == Decimal("90.00")
+    assert passing.total_max == Decimal("150.00")
+    assert passing.final_outcome == ResultHeader.OUTCOME_PASS
+    assert ResultHeader.objects.get(student__reg_no="GRD-1").final_outcome == ResultHeader.OUTCOME_FAIL
+
+    # Re-importing with one change only touches that cell
+    grid = "reg_no,theory,practical\nGRD-0,60,30\nGRD-1,70,10\n"
+    data = admin_client.post(
+        f"/api/results/exams/{grid_exam.id}/marks/commit/", {"file": _csv(grid)}, format="multipart"
+    ).json()
+    assert (data["created"], data["updated"], data["unchanged"]) == (0, 1, 3)
+    assert ResultHeader.objects.get(student__reg_no="GRD-1").final_outcome == ResultHeader.OUTCOME_PASS
+
+
+def test_commit_rejects_invalid_grid_and_frozen_results(admin_client, grid_exam):
+    ResultHeader.objects.create(
+        exam=grid_exam, student=Student.objects.get(reg_no="GRD-3"), status=ResultHeader.STATUS_FROZEN
+    )
+    grid = "reg_no,Theory\nGRD-0,50\nGRD-3,50\n"
+    response = admin_client.post(
+        f"/api/results/exams/{grid_exam.id}/marks/commit/", {"file": _csv(grid)}, format="multipart"
+    )
+
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "INVALID_GRID"
+    assert not ResultComponentEntry.objects.exists()
+
+
+def test_xlsx_grid_is_accepted(admin_client, grid_exam):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["reg_no", "Theory", "Practical"])
+    sheet.append(["GRD-0", 55.5, 25])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    upload = SimpleUploadedFile("marks.xlsx", buffer.getvalue())
+
+    response = admin_client.post(
+        f"/api/results/exams/{grid_exam.id}/marks/commit/", {"file": upload}, format="multipart"
+    )
+
+    assert response.status_code == 200
+    assert ResultHeader.objects.get(student__reg_no="GRD-0").total_obtained == Decimal("80.50")
+
+
+def test_commit_query_count_does_not_grow_with_rows(grid_exam, django_assert_max_num_queries):
+    program, batch, group = Program.objects.first(), Batch.objects.first(), Group.objects.first()
+    Student.objects.bulk_create(
+        [
+            Student(reg_no=f"BULK-{i:03d}", name=f"Bulk {i}", program=program, batch=batch, group=group)
+            for i in range(400)
+        ]
+    )
+    rows = [["reg_no", "Theory", "Practical"]] + [[f"BULK-{i:03d}", str(i % 100), str(i % 50)] for i in range(400)]
+    plan = plan_marks_import(grid_exam, rows)
+    assert plan.is_valid
+
+    # Batches only: SQLite's bound-parameter limit splits the 800 entries into a handful of INSERTs
+    with django_assert_max_num_queries(40):
+        summary = commit_marks_import(plan)
+
+    assert summary["results"] == 400
+    assert ResultComponentEntry.objects.count() == 800
+
+
+def test_marks_import_requires_permission(faculty_client, grid_exam):
+    response = faculty_client.post(
+        f"/api/results/exams/{grid_exam.id}/marks/dry-run/", {"file": _csv("reg_no\n")}, format="multipart"
+    )
+    assert response.status_code == 403
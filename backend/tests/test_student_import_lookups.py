@@ -0,0 +1,48 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from sims_backend.academics.models import Batch, Group, Program
+from sims_backend.students.imports.models import ImportJob
+from sims_backend.students.imports.services import StudentImportService
+from sims_backend.students.models import Student
+
+HEADER = "reg_no,name,program_name,batch_name,group_name,status\n"
+
+
+def csv_file(count, program="mbbs", batch="2029 batch", group="group a"):
+    rows = "".join(f"REG-{i:04d},Ann{i} Lee,{program},{batch},{group},active\n" for i in range(count))
+    return SimpleUploadedFile("students.csv", (HEADER + rows).encode(), content_type="text/csv")
+
+
+def preview_queries(admin_user, count, **kwargs):
+    with CaptureQueriesContext(connection) as queries:
+        result = StudentImportService.preview(csv_file(count), admin_user, **kwargs)
+    return result, len(queries)
+
+
+def test_preview_query_count_does_not_grow_with_rows(db, admin_user):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2029 Batch", start_year=2029)
+    group = Group.objects.create(batch=batch, name="Group A")
+    Student.objects.create(reg_no="REG-0003", name="Existing", program=program, batch=batch, group=group)
+
+    small, small_queries = preview_queries(admin_user, 5)
+    large, large_queries = preview_queries(admin_user, 200)
+
+    assert small_queries == large_queries
+    assert (large["valid_rows"], large["invalid_rows"]) == (199, 1)
+    (existing,) = [row for row in large["preview_rows"] if row["action"] == "SKIP"]
+    assert "already exists" in existing["errors"][0]["message"]
+
+
+def test_auto_create_resolves_each_name_once(db, admin_user):
+    result, _ = preview_queries(admin_user, 30, mode=ImportJob.MODE_CREATE_ONLY, auto_create=True)
+
+    assert Program.objects.count() == Batch.objects.count() == Group.objects.count() == 1
+    warnings = [error["message"] for row in result["preview_rows"] for error in row["errors"]]
+    assert len(warnings) == 3  # one "automatically created" note per program, batch and group
+
+    committed = StudentImportService.commit(result["import_job_id"], admin_user, auto_create=True)
+    assert (committed["created_count"], committed["failed_count"]) == (30, 0)
+    assert Student.objects.filter(group__name="group a").count() == 30
@@ -30,7 +30,7 @@ def test_generate_password():
     assert StudentImportService._generate_password(None) == "student123"
 
 @pytest.mark.django_db
-def test_create_student_user(db):
+def test_plan_student_account(db):
     from sims_backend.students.models import Student
     from sims_backend.academics.models import Program, Batch, Group as AcadGroup
     program = Program.objects.create(name="MBBS")
@@ -39,9 +39,10 @@ def test_create_student_user(db):
     
     student = Student.objects.create(reg_no="REG-123", name="John Doe", program=program, batch=batch, group=group)
     
-    user, created = StudentImportService._create_student_user(student, graduation_year=2031)
-    assert created is True
+    links, new_users, updated_users = StudentImportService._plan_student_accounts([(student, 2031, None)])
+    (linked_student, user, email), = links
+    assert new_users == [user] and updated_users == []
+    assert linked_student == student
     assert user.username == "john.b31"
-    assert user.email == "john.doe.b31@pmc.edu.pk"
-    assert user.groups.filter(name="STUDENT").exists()
-    assert student.user == user
+    assert user.email == email == "john.doe.b31@pmc.edu.pk"
+    assert user.check_password("student2031")
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Department, Group, Program
+from sims_backend.timetable.conflicts import period_conflicts, sweep_overlaps
+from sims_backend.timetable.models import Session
+
+MONDAY = timezone.make_aware(datetime(2025, 3, 10, 9, 0))
+
+
+def at(hours: float):
+    return MONDAY + timedelta(hours=hours)
+
+
+@pytest.fixture
+def timetable(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group_a = Group.objects.create(batch=batch, name="Group A")
+    group_b = Group.objects.create(batch=batch, name="Group B")
+    department = Department.objects.create(name="Anatomy", code="ANAT")
+    period = AcademicPeriod.objects.create(period_type="YEAR", name="Year 1")
+    ada = User.objects.create_user(username="ada", password="pass")
+    bob = User.objects.create_user(username="bob", password="pass")
+
+    def make(group, faculty, start, end, academic_period=period):
+        return Session.objects.create(
+            academic_period=academic_period,
+            group=group,
+            faculty=faculty,
+            department=department,
+            starts_at=at(start),
+            ends_at=at(end),
+        )
+
+    return {
+        "period": period,
+        "groups": (group_a, group_b),
+        "faculty": (ada, bob),
+        "department": department,
+        "make": make,
+    }
+
+
+def test_sweep_reports_each_overlapping_pair_once():
+    intervals = [(1, at(0), at(2)), (2, at(1), at(3)), (3, at(1.5), at(1.75)), (4, at(3), at(4))]
+
+    pairs = sweep_overlaps(intervals)
+
+    # 4 starts exactly when 2 ends, which is not an overlap
+    assert sorted((a, b) for a, b, _start, _end in pairs) == [(1, 2), (1, 3), (2, 3)]
+    assert (1, 2, at(1), at(2)) in pairs
+
+
+def test_period_report_finds_faculty_and_group_clashes(admin_client, timetable, django_assert_num_queries):
+    make = timetable["make"]
+    group_a, group_b = timetable["groups"]
+    ada, bob = timetable["faculty"]
+    first = make(group_a, ada, 0, 1)
+    faculty_clash = make(group_b, ada, 0.5, 1.5)
+    group_clash = make(group_a, bob, 0.75, 2)
+    make(group_b, bob, 2, 3)  # back to back with group_clash's faculty, no conflict
+    other_period = AcademicPeriod.objects.create(period_type="YEAR", name="Year 2")
+    make(group_a, ada, 0, 1, academic_period=other_period)
+
+    with django_assert_num_queries(1):
+        conflicts = period_conflicts(Session.objects.filter(academic_period=timetable["period"]))
+
+    assert [(c["kind"], c["resource_id"], c["sessions"]) for c in conflicts] == [
+        ("faculty", ada.id, [first.id, faculty_clash.id]),
+        ("group", group_a.id, [first.id, group_clash.id]),
+    ]
+
+    response = admin_client.get(f"/api/timetable/sessions/conflicts/?academic_period={timetable['period'].id}")
+    assert response.status_code == 200
+    assert response.json()["conflict_count"] == 2
+    assert response.json()["conflicts"][1]["overlap"][0].startswith("2025-03-10T09:45")
+    assert admin_client.get("/api/timetable/sessions/conflicts/").status_code == 400
+
+
+def test_session_create_and_update_reject_double_booking(admin_client, timetable):
+    make = timetable["make"]
+    group_a, group_b = timetable["groups"]
+    ada, bob = timetable["faculty"]
+    existing = make(group_a, ada, 0, 1)
+    payload = {
+        "academic_period": timetable["period"].id,
+        "group": group_b.id,
+        "faculty": ada.id,
+        "department": timetable["department"].id,
+        "starts_at": at(0.5).isoformat(),
+        "ends_at": at(1.5).isoformat(),
+    }
+
+    response = admin_client.post("/api/timetable/sessions/", payload, format="json")
+    assert response.status_code == 400
+    assert f"session {existing.id}" in response.json()["conflicts"][0]
+
+    payload.update(faculty=bob.id, starts_at=at(1).isoformat())
+    response = admin_client.post("/api/timetable/sessions/", payload, format="json")
+    assert response.status_code == 201
+
+    # Moving a session within its own slot does not conflict with itself
+    response = admin_client.patch(
+        f"/api/timetable/sessions/{existing.id}/", {"ends_at": at(0.9).isoformat()}, format="json"
+    )
+    assert response.status_code == 200
+    response = admin_client.patch(
+        f"/api/timetable/sessions/{existing.id}/", {"ends_at": at(0).isoformat()}, format="json"
+    )
+    assert response.status_code == 400
@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Department, Group, Program
+from sims_backend.students.models import Student
+from sims_backend.timetable.ical import fold_line
+from sims_backend.timetable.models import Session
+
+
+@pytest.fixture
+def schedule(db, student_user, faculty_user):
+    cache.clear()
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group_a = Group.objects.create(batch=batch, name="Group A")
+    group_b = Group.objects.create(batch=batch, name="Group B")
+    Student.objects.create(
+        user=student_user, reg_no="STU-0001", name="Student One", program=program, batch=batch, group=group_a
+    )
+    department = Department.objects.create(name="Anatomy, Gross", code="ANAT")
+    period = AcademicPeriod.objects.create(period_type="YEAR", name="Year 1")
+    faculty_user.first_name, faculty_user.last_name = "Ada", "Lee"
+    faculty_user.save()
+    start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+
+    def make(group, hours):
+        return Session.objects.create(
+            academic_period=period,
+            group=group,
+            faculty=faculty_user,
+            department=department,
+            starts_at=start + timedelta(hours=hours),
+            ends_at=start + timedelta(hours=hours + 1),
+        )
+
+    sessions = [make(group_a, 0), make(group_b, 2), make(group_a, 4)]
+    # Ended long ago, outside the feed window
+    Session.objects.create(
+        academic_period=period,
+        group=group_a,
+        faculty=faculty_user,
+        department=department,
+        starts_at=start - timedelta(days=400),
+        ends_at=start - timedelta(days=400) + timedelta(hours=1),
+    )
+    return sessions
+
+
+def feed_url(client):
+    response = client.get("/api/timetable/sessions/calendar_feed/")
+    assert response.status_code == 200
+    return response.json()["url"]
+
+
+def read(response):
+    return b"".join(response.streaming_content) if response.streaming else response.content
+
+
+def test_student_and_faculty_feeds(client, student_client, faculty_client, schedule):
+    student_feed = client.get(feed_url(student_client))
+    assert student_feed.status_code == 200
+    assert student_feed["Content-Type"].startswith("text/calendar")
+    body = read(student_feed).decode()
+    assert body.count("BEGIN:VEVENT") == 2
+    assert f"UID:session-{schedule[0].id}@sims.fmu.edu" in body
+    assert "SUMMARY:Anatomy\\, Gross (Group A)" in body
+    assert "DESCRIPTION:Faculty: Ada Lee" in body
+
+    faculty_body = read(client.get(feed_url(faculty_client))).decode()
+    assert faculty_body.count("BEGIN:VEVENT") == 3
+
+
+def test_feed_revalidates_without_rendering(client, student_client, schedule, django_assert_max_num_queries):
+    url = feed_url(student_client)
+    first = client.get(url)
+    body = read(first)
+    etag, last_modified = first["ETag"], first["Last-Modified"]
+    assert "no-cache" in first["Cache-Control"]
+
+    with django_assert_max_num_queries(2):
+        not_modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == 304
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+
+    # A fresh download of the same version comes from the cache
+    with django_assert_max_num_queries(2):
+        cached = client.get(url)
+    assert not cached.streaming
+    assert cached.content == body
+
+    schedule[0].ends_at += timedelta(minutes=30)
+    schedule[0].save()
+    changed = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+
+
+def test_invalid_feed_token_is_not_found(client, schedule):
+    assert client.get("/api/timetable/calendar/forged-token.ics").status_code == 404
+
+
+def test_fold_line_keeps_utf8_sequences_whole():
+    line = "SUMMARY:" + "é" * 60
+    folded = fold_line(line)
+    assert all(len(part.encode()) <= 75 for part in folded.split("\r\n"))
+    assert folded.replace("\r\n ", "").rstrip("\r\n") == line
@@ -0,0 +1,156 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Department, Group, Program
+from sims_backend.attendance.models import Attendance
+from sims_backend.students.models import Student
+from sims_backend.timetable.materialize import materialize_batch_sessions, parse_time_slot
+from sims_backend.timetable.models import Session, TimetableCell, WeeklyTimetable
+
+WEEK = date(2025, 3, 10)  # a Monday
+
+
+@pytest.fixture
+def grid(db, admin_user):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group_a = Group.objects.create(batch=batch, name="Group A")
+    group_b = Group.objects.create(batch=batch, name="Group B")
+    anatomy = Department.objects.create(name="Anatomy", code="ANAT")
+    physiology = Department.objects.create(name="Physiology", code="PHYSIO")
+    period = AcademicPeriod.objects.create(period_type="YEAR", name="Year 1")
+    ada = User.objects.create_user(username="ada", password="pass", first_name="Ada", last_name="Lee")
+    bob = User.objects.create_user(username="bob", password="pass")
+
+    weeks = []
+    for offset in range(2):
+        week = WeeklyTimetable.objects.create(
+            academic_period=period,
+            batch=batch,
+            week_start_date=WEEK + timedelta(weeks=offset),
+            status="published",
+            created_by=admin_user,
+        )
+        TimetableCell.objects.create(
+            weekly_timetable=week,
+            day_of_week=0,
+            time_slot="09:00-10:00",
+            line1="Anatomy Lecture",
+            line2="Group A",
+            line3="Dr. Ada Lee",
+        )
+        TimetableCell.objects.create(
+            weekly_timetable=week, day_of_week=1, time_slot="10:00 - 11:30", line1="PHYSIO practical", line3="bob"
+        )
+        TimetableCell.objects.create(
+            weekly_timetable=week, day_of_week=2, time_slot="11:00-12:00", line1="Library", line3="Ada Lee"
+        )
+        TimetableCell.objects.create(weekly_timetable=week, day_of_week=3, time_slot="TBA", line1="Anatomy")
+        weeks.append(week)
+    return {
+        "batch": batch,
+        "period": period,
+        "groups": (group_a, group_b),
+        "departments": (anatomy, physiology),
+        "faculty": (ada, bob),
+        "weeks": weeks,
+    }
+
+
+def test_parse_time_slot():
+    assert parse_time_slot("09:00-10:00") == (time(9), time(10))
+    assert parse_time_slot("8.30 – 9.15") == (time(8, 30), time(9, 15))
+    assert parse_time_slot("010:00-011:00") == (time(10), time(11))
+    assert parse_time_slot("10:00-09:00") is None
+    assert parse_time_slot("Morning") is None
+
+
+def test_semester_is_materialized_in_one_pass(grid, django_assert_max_num_queries):
+    group_a, group_b = grid["groups"]
+    anatomy, physiology = grid["departments"]
+    ada, bob = grid["faculty"]
+
+    with django_assert_max_num_queries(11):
+        summary = materialize_batch_sessions(grid["batch"].id, grid["period"].id)
+
+    # Per week: one Group A anatomy session and a physiology session for each group
+    assert (summary["timetables"], summary["created"], summary["deleted"]) == (2, 6, 0)
+    assert sorted(s["reason"] for s in summary["skipped"]) == [
+        "No department named in cell",
+        "No department named in cell",
+        "Unrecognized time slot 'TBA'",
+        "Unrecognized time slot 'TBA'",
+    ]
+    anatomy_session = Session.objects.get(department=anatomy, starts_at__date=WEEK)
+    assert (anatomy_session.group, anatomy_session.faculty) == (group_a, ada)
+    assert anatomy_session.starts_at == timezone.make_aware(datetime(2025, 3, 10, 9, 0))
+    physiology_sessions = Session.objects.filter(department=physiology, starts_at__date=WEEK + timedelta(days=1))
+    assert {s.group for s in physiology_sessions} == {group_a, group_b}
+    assert {s.faculty for s in physiology_sessions} == {bob}
+    assert physiology_sessions[0].ends_at - physiology_sessions[0].starts_at == timedelta(minutes=90)
+
+    again = materialize_batch_sessions(grid["batch"].id, grid["period"].id)
+    assert (again["created"], again["updated"], again["unchanged"]) == (0, 0, 6)
+
+
+def test_rematerializing_applies_the_diff(grid, admin_user):
+    group_a, group_b = grid["groups"]
+    materialize_batch_sessions(grid["batch"].id, grid["period"].id)
+    week = grid["weeks"][0]
+    anatomy_cell = week.cells.get(day_of_week=0)
+    physiology_cell = week.cells.get(day_of_week=1)
+    attended = Session.objects.get(timetable_cell=physiology_cell, group=group_b)
+    student = Student.objects.create(
+        reg_no="A-1", name="Alpha", program=grid["batch"].program, batch=grid["batch"], group=group_b
+    )
+    Attendance.objects.create(session=attended, student=student, status=Attendance.STATUS_PRESENT)
+
+    anatomy_cell.time_slot = "08:00-09:00"
+    anatomy_cell.save()
+    physiology_cell.line2 = "Group A only"
+    physiology_cell.save()
+    summary = materialize_batch_sessions(grid["batch"].id, grid["period"].id)
+
+    assert (summary["created"], summary["updated"], summary["deleted"], summary["detached"]) == (0, 1, 0, 1)
+    assert Session.objects.get(timetable_cell=anatomy_cell).starts_at.time() == time(8)
+    attended.refresh_from_db()
+    assert attended.timetable_cell is None
+    assert Session.objects.filter(timetable_cell=physiology_cell).get().group == group_a
+
+
+def test_publish_generates_sessions(admin_client, grid):
+    week = grid["weeks"][0]
+    week.status = "draft"
+    week.save()
+    # Publishing needs exactly three filled periods per day
+    for day in range(6):
+        for slot in range(3):
+            TimetableCell.objects.get_or_create(
+                weekly_timetable=week,
+                day_of_week=day,
+                time_slot=f"1{3 + slot}:00-1{4 + slot}:00",
+                defaults={"line1": "Anatomy" if day < 3 else "Free", "line3": "ada"},
+            )
+    TimetableCell.objects.filter(weekly_timetable=week, day_of_week__lt=4, time_slot__startswith="15").delete()
+
+    response = admin_client.post(f"/api/timetable/weekly-timetables/{week.id}/publish/")
+
+    assert response.status_code == 200, response.json()
+    sessions = response.json()["sessions"]
+    assert sessions["created"] == Session.objects.filter(timetable_cell__weekly_timetable=week).count() > 0
+
+
+def test_generate_sessions_validates_ids(admin_client, grid):
+    url = "/api/timetable/weekly-timetables/generate_sessions/"
+
+    response = admin_client.post(url, {"batch": "abc", "academic_period": grid["period"].id})
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+    assert admin_client.post(url, {"batch": grid["batch"].id}).status_code == 400
+
+    response = admin_client.post(url, {"batch": str(grid["batch"].id), "academic_period": str(grid["period"].id)})
+    assert response.status_code == 200
+    assert Session.objects.filter(timetable_cell__weekly_timetable__batch=grid["batch"]).exists()
@@ -0,0 +1,131 @@
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Department, Group, Program
+from sims_backend.timetable.models import Session, TimetableCell, WeeklyTimetable
+from sims_backend.timetable.publishing import period_count_errors, week_start_dates
+
+TERM_START = date(2025, 3, 12)  # a Wednesday
+
+
+@pytest.fixture
+def term(db, admin_user):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    Group.objects.create(batch=batch, name="Group A")
+    Department.objects.create(name="Anatomy", code="ANAT")
+    User.objects.create_user(username="ada", password="pass", first_name="Ada", last_name="Lee")
+    period = AcademicPeriod.objects.create(
+        period_type="YEAR", name="Spring", start_date=TERM_START, end_date=TERM_START + timedelta(weeks=12)
+    )
+    return batch, period
+
+
+def fill(week, periods_per_day=3, blank_day=None):
+    for day in range(6):
+        for slot in range(periods_per_day):
+            TimetableCell.objects.create(
+                weekly_timetable=week,
+                day_of_week=day,
+                time_slot=f"{9 + slot}:00-{10 + slot}:00",
+                line1="   " if day == blank_day and slot == 0 else "Anatomy",
+                line3="Ada Lee",
+            )
+
+
+def test_week_start_dates_cover_partial_weeks():
+    weeks = week_start_dates(TERM_START, TERM_START + timedelta(days=7))
+    assert weeks == [date(2025, 3, 10), date(2025, 3, 17)]
+
+
+def test_generate_templates_in_bulk(admin_client, admin_user, term, django_assert_max_num_queries):
+    batch, period = term
+    url = "/api/timetable/weekly-timetables/generate_weekly_templates/"
+    payload = {"batch": batch.id, "academic_period": period.id}
+    WeeklyTimetable.objects.create(
+        batch=batch, academic_period=period, week_start_date=date(2025, 3, 17), created_by=admin_user
+    )
+
+    with django_assert_max_num_queries(8):
+        response = admin_client.post(url, payload, format="json")
+
+    assert response.status_code == 201
+    data = response.json()
+    assert (data["total_weeks"], data["created_count"], data["existing_count"]) == (13, 12, 1)
+    assert len(data["created_ids"]) == 12
+    assert WeeklyTimetable.objects.filter(batch=batch).count() == 13
+    assert admin_client.post(url, payload, format="json").json()["created_count"] == 0
+
+
+def test_period_count_errors_uses_one_query(term, admin_user, django_assert_num_queries):
+    batch, period = term
+    good, short, blank, empty = (
+        WeeklyTimetable.objects.create(
+            batch=batch,
+            academic_period=period,
+            week_start_date=date(2025, 3, 10) + timedelta(weeks=i),
+            created_by=admin_user,
+        )
+        for i in range(4)
+    )
+    fill(good)
+    fill(short, periods_per_day=2)
+    fill(blank, blank_day=4)
+
+    with django_assert_num_queries(1):
+        errors = period_count_errors([good.id, short.id, blank.id, empty.id])
+
+    assert good.id not in errors
+    assert errors[short.id][0] == "Monday (2 periods)"
+    assert errors[blank.id] == ["Friday (2 periods)"]
+    assert len(errors[empty.id]) == 6
+
+
+def test_publish_weeks_reports_failures_per_week(admin_client, term, admin_user):
+    batch, period = term
+    weeks = [
+        WeeklyTimetable.objects.create(
+            batch=batch,
+            academic_period=period,
+            week_start_date=date(2025, 3, 10) + timedelta(weeks=i),
+            created_by=admin_user,
+        )
+        for i in range(4)
+    ]
+    fill(weeks[0])
+    fill(weeks[1], blank_day=0)
+    fill(weeks[2])
+    fill(weeks[3])
+
+    response = admin_client.post(
+        "/api/timetable/weekly-timetables/publish_weeks/",
+        {"batch": batch.id, "academic_period": period.id, "week_start_to": "2025-03-24"},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [w["id"] for w in data["published"]] == [weeks[0].id, weeks[2].id]
+    (failure,) = data["failed"]
+    assert (failure["id"], failure["code"]) == (weeks[1].id, "INVALID_PERIOD_COUNT")
+    assert failure["days_with_wrong_count"] == ["Monday (2 periods)"]
+    assert WeeklyTimetable.objects.get(id=weeks[3].id).status == "draft"
+    assert data["sessions"]["created"] == Session.objects.count() == 2 * 18
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {},
+        {"batch": "x", "academic_period": 1},
+        {"batch": 1, "academic_period": [1]},
+        {"batch": 1, "academic_period": 1, "week_start_from": "next monday"},
+    ],
+)
+def test_publish_weeks_rejects_malformed_requests(admin_client, body):
+    response = admin_client.post("/api/timetable/weekly-timetables/publish_weeks/", body, format="json")
+
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "VALIDATION_ERROR"
@@ -0,0 +1,140 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Department, Group, Program
+from sims_backend.timetable.models import Session, TimetableCell, WeeklyTimetable
+from sims_backend.timetable.scheduler import Problem, Unit, solve, synthetic_problem, validate_solution
+
+TERM_START = date(2025, 3, 10)  # a Monday
+URL = "/api/timetable/weekly-timetables/auto_schedule/"
+
+
+@pytest.fixture
+def term(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    other = Batch.objects.create(program=program, name="2023", start_year=2023)
+    Group.objects.create(batch=batch, name="Group A")
+    other_group = Group.objects.create(batch=other, name="Group A")
+    anatomy = Department.objects.create(name="Anatomy", code="ANAT")
+    physiology = Department.objects.create(name="Physiology", code="PHYS")
+    ada = User.objects.create_user(username="ada", password="pass", first_name="Ada", last_name="Lee")
+    bo = User.objects.create_user(username="bo", password="pass", first_name="Bo", last_name="Chan")
+    period = AcademicPeriod.objects.create(
+        period_type="YEAR", name="Spring", start_date=TERM_START, end_date=TERM_START + timedelta(days=12)
+    )
+    return {
+        "batch": batch,
+        "period": period,
+        "other_group": other_group,
+        "departments": (anatomy, physiology),
+        "faculty": (ada, bo),
+    }
+
+
+def payload(term, **extra):
+    anatomy, physiology = term["departments"]
+    ada, bo = term["faculty"]
+    return {
+        "batch": term["batch"].id,
+        "academic_period": term["period"].id,
+        "requirements": [
+            {"department": anatomy.id, "faculty": ada.id, "sessions_per_week": 9},
+            {"department": physiology.id, "faculty": bo.id, "sessions_per_week": 9},
+        ],
+        "seed": 7,
+        "time_budget": 1,
+        **extra,
+    }
+
+
+def test_solver_fills_shared_faculty_grids_without_conflicts():
+    problem = synthetic_problem(4, seed=3)
+    solution = solve(problem, time_budget=2, seed=3)
+
+    assert solution.unplaced == []
+    assert validate_solution(problem, solution.assignment) == []
+    assert solution.score == solution.soft_penalty
+
+
+def test_solver_reports_what_cannot_be_placed():
+    # The only faculty member is free in two slots, on the same day
+    busy = ((1 << 36) - 1) & ~0b11
+    problem = Problem(grids=1, slots_per_day=6, periods_per_day=3, units=[Unit(0, 1, 1)] * 4, faculty_busy={1: busy})
+    solution = solve(problem, time_budget=0.2, seed=1)
+
+    assert sorted(bit for bit in solution.assignment if bit is not None) == [0, 1]
+    assert len(solution.unplaced) == 2
+    assert solution.score >= 2000
+    assert validate_solution(problem, solution.assignment) == []
+
+
+def test_auto_schedule_writes_publishable_drafts(admin_client, admin_user, term):
+    ada = term["faculty"][0]
+    # Ada already teaches another batch on Monday 08:00 of the first week
+    taken = timezone.make_aware(datetime(2025, 3, 10, 8, 0))
+    Session.objects.create(
+        academic_period=term["period"],
+        group=term["other_group"],
+        faculty=ada,
+        department=term["departments"][0],
+        starts_at=taken,
+        ends_at=taken + timedelta(hours=1),
+    )
+    published = WeeklyTimetable.objects.create(
+        batch=term["batch"],
+        academic_period=term["period"],
+        week_start_date=TERM_START + timedelta(weeks=1),
+        status="published",
+        created_by=admin_user,
+    )
+
+    response = admin_client.post(URL, payload(term), format="json")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["skipped_published"] == [str(published.week_start_date)]
+    (week,) = data["weeks"]
+    assert (week["unplaced"], week["publishable"]) == ([], True)
+    # Nine sessions of one department over six days must double up on three days
+    assert week["score"] == week["soft_penalty"] == 2 * 3 * 3
+    timetable = WeeklyTimetable.objects.get(id=week["timetable"])
+    assert timetable.status == "draft"
+    assert not TimetableCell.objects.filter(
+        weekly_timetable=timetable, day_of_week=0, time_slot="08:00-09:00", line3="Ada Lee"
+    ).exists()
+    assert not published.cells.exists()
+
+    publish = admin_client.post(f"/api/timetable/weekly-timetables/{timetable.id}/publish/")
+    assert publish.status_code == 200
+    sessions = publish.json()["sessions"]
+    assert (sessions["created"], sessions["skipped"], sessions["conflicts"]) == (18, [], [])
+
+
+def test_auto_schedule_dry_run_and_permissions(admin_client, faculty_client, term):
+    dry_run = admin_client.post(URL, payload(term, apply=False), format="json")
+    assert dry_run.status_code == 200
+    assert len(dry_run.json()["weeks"][0]["cells"]) == 18
+    assert not WeeklyTimetable.objects.exists()
+    # String flags, as form-style clients send them, are parsed rather than truth-tested
+    assert admin_client.post(URL, payload(term, apply="false"), format="json").status_code == 200
+    assert not WeeklyTimetable.objects.exists()
+    assert admin_client.post(URL, payload(term, apply="perhaps"), format="json").status_code == 400
+
+    bad = payload(term, time_slots=["08:00-09:00", "nonsense"])
+    assert admin_client.post(URL, bad, format="json").status_code == 400
+    available = payload(term, apply=False, unavailable={str(term["faculty"][0].id): [[0, 0]]})
+    assert admin_client.post(URL, available, format="json").status_code == 200
+    # A single string is rejected rather than iterated character by character
+    assert admin_client.post(URL, payload(term, time_slots="08:00-09:00"), format="json").status_code == 400
+    for malformed in (
+        {"requirements": [{"department": term["departments"][0].id}]},
+        {"requirements": "anatomy"},
+        {"unavailable": {"ada": [[0, 1]]}},
+        {"unavailable": {str(term["faculty"][0].id): [[0]]}},
+    ):
+        assert admin_client.post(URL, payload(term, **malformed), format="json").status_code == 400
+    assert faculty_client.post(URL, payload(term), format="json").status_code == 403
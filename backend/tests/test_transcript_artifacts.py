@@ -0,0 +1,131 @@
+import pytest
+from django.core import mail
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Group, Program
+from sims_backend.exams.models import Exam
+from sims_backend.results.models import ResultHeader
+from sims_backend.results.transitions import bulk_transition_exam_results
+from sims_backend.students.models import Student
+from sims_backend.transcripts import artifacts
+from sims_backend.transcripts.artifacts import get_transcript_artifact
+from sims_backend.transcripts.jobs import generate_and_email_transcript
+from sims_backend.transcripts.models import TranscriptArtifact
+
+
+@pytest.fixture
+def released(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    period = AcademicPeriod.objects.create(name="Year 1", period_type="YEAR")
+    student = Student.objects.create(
+        reg_no="TRN-1", name="Transcript Student", program=program, batch=batch, group=group
+    )
+    published = ResultHeader.objects.create(
+        exam=Exam.objects.create(title="Anatomy", academic_period=period),
+        student=student,
+        status=ResultHeader.STATUS_PUBLISHED,
+        total_obtained=70,
+        total_max=100,
+        final_outcome=ResultHeader.OUTCOME_PASS,
+    )
+    draft = ResultHeader.objects.create(
+        exam=Exam.objects.create(title="Physiology", academic_period=period),
+        student=student,
+        total_obtained=40,
+        total_max=100,
+    )
+    return student, published, draft
+
+
+@pytest.fixture
+def render_count(monkeypatch):
+    calls = []
+    original = artifacts.render_transcript_pdf
+
+    def counting(snapshot, qr_png=None):
+        calls.append(snapshot)
+        return original(snapshot, qr_png)
+
+    monkeypatch.setattr(artifacts, "render_transcript_pdf", counting)
+    return calls
+
+
+def test_transcript_is_rendered_once_per_results_version(admin_client, released, render_count):
+    student, _published, _draft = released
+
+    first = admin_client.get(f"/api/transcripts/{student.id}/")
+    second = admin_client.get(f"/api/transcripts/{student.id}/")
+
+    assert first.status_code == second.status_code == 200
+    assert b"".join(first.streaming_content) == b"".join(second.streaming_content)
+    assert len(render_count) == 1
+    artifact = TranscriptArtifact.objects.get()
+    assert [r["exam"] for r in artifact.snapshot["results"]] == ["Anatomy"]
+    assert artifact.snapshot["results"][0]["outcome"] == "Pass"
+    assert artifact.snapshot["token"]
+
+
+def test_publish_and_freeze_invalidate_artifact(admin_user, released, render_count):
+    student, published, draft = released
+    first = get_transcript_artifact(student)
+
+    draft.publish(admin_user)
+    assert not TranscriptArtifact.objects.exists()
+    second = get_transcript_artifact(student)
+    assert second.results_hash != first.results_hash
+    assert [r["exam"] for r in second.snapshot["results"]] == ["Anatomy", "Physiology"]
+
+    bulk_transition_exam_results(exam=published.exam, transition="freeze", user=admin_user)
+    assert not TranscriptArtifact.objects.exists()
+    assert get_transcript_artifact(student).snapshot["results"][0]["status"] == ResultHeader.STATUS_FROZEN
+    assert len(render_count) == 3
+
+
+def test_email_job_attaches_stored_pdf(released):
+    student, _published, _draft = released
+
+    result = generate_and_email_transcript(student.id, "student@example.com")
+
+    assert result["status"] == "success"
+    artifact = TranscriptArtifact.objects.get(id=result["artifact_id"])
+    (message,) = mail.outbox
+    filename, content, mimetype = message.attachments[0]
+    assert (filename, mimetype) == ("transcript_TRN-1.pdf", "application/pdf")
+    with artifact.pdf.open("rb") as pdf:
+        assert content == pdf.read()
+
+
+def test_concurrent_first_downloads_keep_the_winning_artifact(
+    released, render_count, monkeypatch, django_capture_on_commit_callbacks
+):
+    student = released[0]
+    invalidate = artifacts.invalidate_transcript_artifacts
+    winners = []
+
+    def other_request_commits_first(students, **kwargs):
+        # Another download renders and stores this version after our cache miss
+        monkeypatch.setattr(artifacts, "invalidate_transcript_artifacts", invalidate)
+        winners.append(get_transcript_artifact(student))
+        return invalidate(students, **kwargs)
+
+    monkeypatch.setattr(artifacts, "invalidate_transcript_artifacts", other_request_commits_first)
+    with django_capture_on_commit_callbacks(execute=True):
+        artifact = get_transcript_artifact(student)
+
+    assert artifact.pk == winners[0].pk == TranscriptArtifact.objects.get().pk
+    assert artifact.pdf.storage.exists(artifact.pdf.name)
+    assert len(render_count) == 2
+
+
+def test_artifact_with_missing_file_is_rendered_again(released, render_count):
+    student = released[0]
+    first = get_transcript_artifact(student)
+    first.pdf.storage.delete(first.pdf.name)
+
+    second = get_transcript_artifact(student)
+
+    assert second.pk != first.pk
+    assert TranscriptArtifact.objects.get().pk == second.pk
+    assert second.pdf.storage.exists(second.pdf.name)
+    assert len(render_count) == 2
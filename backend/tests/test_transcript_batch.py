@@ -0,0 +1,132 @@
+import io
+import json
+import zipfile
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Group, Program
+from sims_backend.exams.models import Exam
+from sims_backend.finance.models import FeePlan, FeeType, FinancePolicy
+from sims_backend.finance.services import bulk_finance_gate_checks, create_voucher_from_feeplan, finance_gate_checks
+from sims_backend.results.models import ResultHeader
+from sims_backend.students.models import Student
+from sims_backend.transcripts import batch as batch_module
+from sims_backend.transcripts.artifacts import get_transcript_artifact
+from sims_backend.transcripts.batch import run_transcript_batch_job
+from sims_backend.transcripts.models import TranscriptArtifact, TranscriptBatchJob
+
+
+@pytest.fixture
+def cohort(db, admin_user):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2020", start_year=2020)
+    group = Group.objects.create(batch=batch, name="Group A")
+    term = AcademicPeriod.objects.create(name="Final Year", period_type="YEAR")
+    exams = [Exam.objects.create(title=f"Final {i}", academic_period=term) for i in range(2)]
+    students = []
+    for i in range(10):
+        student = Student.objects.create(
+            reg_no=f"GRAD-{i:02d}", name=f"Graduate {i}", program=program, batch=batch, group=group
+        )
+        for exam in exams:
+            ResultHeader.objects.create(
+                exam=exam, student=student, status=ResultHeader.STATUS_PUBLISHED, total_obtained=60 + i, total_max=100
+            )
+        students.append(student)
+
+    FinancePolicy.objects.create(rule_key="BLOCK_TRANSCRIPT_IF_DUES", threshold_amount=Decimal("0"))
+    fee_type = FeeType.objects.create(code="TUITION", name="Tuition Fee")
+    FeePlan.objects.create(
+        program=program, term=term, fee_type=fee_type, amount=Decimal("500.00"), frequency=FeePlan.FREQ_PER_TERM
+    )
+    create_voucher_from_feeplan(student=students[3], term=term, created_by=admin_user, due_date=date.today())
+    return batch, students
+
+
+def test_bulk_gate_checks_match_single(cohort, django_assert_num_queries):
+    _batch, students = cohort
+    with django_assert_num_queries(2):
+        gates = bulk_finance_gate_checks([s.id for s in students])
+    for student in students:
+        single = finance_gate_checks(student, None)
+        assert gates[student.id]["outstanding"] == single["outstanding"]
+        assert gates[student.id]["gating"] == single["gating"]
+
+
+def test_batch_job_builds_zip_with_manifest(cohort):
+    batch, students = cohort
+    # One student already has a current artifact, which is reused rather than re-rendered
+    reused = get_transcript_artifact(students[0])
+    job = TranscriptBatchJob.objects.create(batch=batch)
+
+    summary = run_transcript_batch_job(job.id, max_workers=2)
+
+    job.refresh_from_db()
+    assert summary["status"] == job.status == TranscriptBatchJob.STATUS_COMPLETED
+    assert (job.total, job.processed, job.generated, job.blocked) == (10, 10, 9, 1)
+    assert job.progress_percent == 100.0
+    with job.archive.open("rb") as archive_file:
+        archive = zipfile.ZipFile(io.BytesIO(archive_file.read()))
+    manifest = json.loads(archive.read("manifest.json"))
+    assert len([name for name in archive.namelist() if name.endswith(".pdf")]) == 9
+    assert manifest["blocked"][0]["reg_no"] == "GRAD-03"
+    assert manifest["blocked"][0]["reasons"]
+    assert [entry["reg_no"] for entry in manifest["generated"] if entry["reused"]] == ["GRAD-00"]
+    assert TranscriptArtifact.objects.count() == 9
+    assert TranscriptArtifact.objects.get(student=students[0]).id == reused.id
+
+
+def test_batch_endpoints(admin_client, faculty_client, cohort, django_capture_on_commit_callbacks, monkeypatch):
+    batch, _students = cohort
+
+    def unavailable(name):
+        raise ConnectionError("Redis is down")
+
+    # Without Redis the job runs inline once the request commits
+    monkeypatch.setattr("sims_backend.transcripts.batch.django_rq.get_queue", unavailable)
+
+    assert faculty_client.post("/api/transcripts/batch/", {"batch_id": batch.id}, format="json").status_code == 403
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.post("/api/transcripts/batch/", {"batch_id": batch.id}, format="json")
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    status_data = admin_client.get(f"/api/transcripts/batch/{job_id}/").json()
+    assert status_data["status"] == "COMPLETED"
+    assert [s["reg_no"] for s in status_data["blocked_students"]] == ["GRAD-03"]
+    download = admin_client.get(f"/api/transcripts/batch/{job_id}/download/")
+    assert download.status_code == 200
+    assert "manifest.json" in zipfile.ZipFile(io.BytesIO(b"".join(download.streaming_content))).namelist()
+
+
+def test_batch_job_drops_files_of_artifacts_stored_concurrently(cohort, monkeypatch):
+    batch, students = cohort
+    parallel_map = batch_module.parallel_map
+    saved = []
+
+    def render_while_request_stores_one(*args, **kwargs):
+        pdfs = parallel_map(*args, **kwargs)
+        yield next(pdfs)
+        # A single-transcript request stores GRAD-01 while the batch is still rendering
+        get_transcript_artifact(students[1])
+        yield from pdfs
+
+    def bulk_create(artifacts, **kwargs):
+        saved.extend((artifact.student_id, artifact.pdf.name) for artifact in artifacts)
+        return create(artifacts, **kwargs)
+
+    create = TranscriptArtifact.objects.bulk_create
+    monkeypatch.setattr(batch_module, "parallel_map", render_while_request_stores_one)
+    monkeypatch.setattr(TranscriptArtifact.objects, "bulk_create", bulk_create)
+    job = TranscriptBatchJob.objects.create(batch=batch)
+
+    assert run_transcript_batch_job(job.id)["status"] == TranscriptBatchJob.STATUS_COMPLETED
+
+    stored = set(TranscriptArtifact.objects.values_list("pdf", flat=True))
+    assert len(stored) == 9
+    storage = TranscriptArtifact._meta.get_field("pdf").storage
+    for _student_id, name in saved:
+        assert storage.exists(name) == (name in stored)
+    assert [student_id for student_id, name in saved if name not in stored] == [students[1].id]
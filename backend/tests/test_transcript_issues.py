@@ -0,0 +1,97 @@
+import pytest
+
+from sims_backend.academics.models import AcademicPeriod, Batch, Group, Program
+from sims_backend.exams.models import Exam
+from sims_backend.results.models import ResultHeader
+from sims_backend.students.models import Student
+from sims_backend.transcripts import issues
+from sims_backend.transcripts.artifacts import get_transcript_artifact, invalidate_transcript_artifacts
+from sims_backend.transcripts.models import TranscriptIssue
+
+
+@pytest.fixture
+def released(db):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2024", start_year=2024)
+    group = Group.objects.create(batch=batch, name="Group A")
+    period = AcademicPeriod.objects.create(name="Year 1", period_type="YEAR")
+    student = Student.objects.create(reg_no="ISS-1", name="Issued Student", program=program, batch=batch, group=group)
+    ResultHeader.objects.create(
+        exam=Exam.objects.create(title="Anatomy", academic_period=period),
+        student=student,
+        status=ResultHeader.STATUS_PUBLISHED,
+        total_obtained=70,
+        total_max=100,
+    )
+    draft = ResultHeader.objects.create(
+        exam=Exam.objects.create(title="Physiology", academic_period=period),
+        student=student,
+        total_obtained=55,
+        total_max=100,
+    )
+    return student, draft
+
+
+@pytest.fixture
+def qr_count(monkeypatch):
+    calls = []
+    original = issues.render_qr_png
+
+    def counting(data):
+        calls.append(data)
+        return original(data)
+
+    monkeypatch.setattr(issues, "render_qr_png", counting)
+    return calls
+
+
+def test_issue_token_verifies_with_one_lookup(api_client, released, qr_count, django_assert_num_queries):
+    student, _draft = released
+    artifact = get_transcript_artifact(student)
+    issue = TranscriptIssue.objects.get()
+    with artifact.pdf.open("rb") as pdf:
+        assert b"/Subtype /Image" in pdf.read()
+    assert artifact.snapshot["issue_id"] == issue.id
+    assert qr_count == [artifact.snapshot["verify_url"]]
+
+    with django_assert_num_queries(1):
+        response = api_client.get(f"/api/transcripts/verify/{artifact.snapshot['token']}/")
+
+    data = response.json()
+    assert data["valid"] is True
+    assert (data["issue_id"], data["student_id"], data["reg_no"]) == (issue.id, student.id, "ISS-1")
+    assert data["document_hash"] == artifact.results_hash
+    assert "public" in response["Cache-Control"]
+    assert f"max-age={issues.VERIFY_CACHE_SECONDS}" in response["Cache-Control"]
+    assert response["ETag"] == f'"{artifact.results_hash}"'
+
+
+def test_issue_and_qr_are_reused_until_results_change(api_client, admin_user, released, qr_count):
+    student, draft = released
+    first = get_transcript_artifact(student)
+
+    # Re-rendering the same results keeps the issue, its token and its QR image
+    invalidate_transcript_artifacts([student.id])
+    again = get_transcript_artifact(student)
+    assert again.id != first.id
+    assert again.snapshot["token"] == first.snapshot["token"]
+    assert len(qr_count) == 1
+
+    draft.publish(admin_user)
+    newer = get_transcript_artifact(student)
+    assert newer.snapshot["issue_id"] != first.snapshot["issue_id"]
+    assert len(qr_count) == 2
+    assert TranscriptIssue.objects.count() == 2
+
+    # The earlier document still verifies against the hash it was issued with
+    old = api_client.get(f"/api/transcripts/verify/{first.snapshot['token']}/").json()
+    assert old["valid"] is True
+    assert old["document_hash"] == first.results_hash != newer.results_hash
+
+
+def test_invalid_token_is_cached_briefly(api_client, released):
+    response = api_client.get("/api/transcripts/verify/12:forged/")
+
+    assert response.json()["valid"] is False
+    assert f"max-age={issues.UNVERIFIED_CACHE_SECONDS}" in response["Cache-Control"]
+    assert not response.has_header("ETag")
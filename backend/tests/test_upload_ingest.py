@@ -0,0 +1,101 @@
+import hashlib
+import io
+from datetime import datetime
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from openpyxl import Workbook
+
+from sims_backend.academics.models import Batch, Group, Program
+from sims_backend.students.imports.ingest import UploadReader
+from sims_backend.students.imports.services import StudentImportService
+
+
+class CountingFile(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def xlsx_bytes(rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def test_csv_is_decoded_across_chunks_and_hashed_in_the_same_pass():
+    content = 'reg_no,name\nR-1,"Zoë\nSmith"\nR-2,Ann\n'.encode("utf-8-sig")
+    # A 3-byte chunk size splits the BOM, the "ë" and the quoted newline across reads
+    reader = UploadReader(io.BytesIO(content), chunk_size=3)
+
+    rows = list(reader)
+
+    assert rows == [{"reg_no": "R-1", "name": "Zoë\nSmith"}, {"reg_no": "R-2", "name": "Ann"}]
+    assert reader.hexdigest() == hashlib.sha256(content).hexdigest()
+
+
+def test_encoding_detection():
+    utf16 = "reg_no,name\nR-1,Zoë\n".encode("utf-16")
+    latin1 = "reg_no,name\nR-1,Zoë\n".encode("latin-1")
+
+    assert list(UploadReader(io.BytesIO(utf16)))[0]["name"] == "Zoë"
+    assert list(UploadReader(io.BytesIO(latin1), chunk_size=4))[0]["name"] == "Zoë"
+
+
+def test_rows_are_streamed_not_read_up_front():
+    content = b"reg_no\n" + b"".join(b"R-%05d\n" % i for i in range(20000))
+    file = CountingFile(content)
+    rows = iter(UploadReader(file, chunk_size=1024))
+
+    assert next(rows) == {"reg_no": "R-00000"}
+    assert file.bytes_read <= 1024
+    assert sum(1 for _ in rows) == 19999
+
+
+def test_xlsx_rows_read_natively():
+    content = xlsx_bytes(
+        [
+            [],
+            ["reg_no", "name", "date_of_birth", "phone"],
+            ["R-1", "Ann Lee", datetime(2004, 5, 6), 3001234567],
+            [None, None, None, None],
+            ["R-2", "Bo Kim"],
+        ]
+    )
+    reader = UploadReader(SimpleUploadedFile("students.xlsx", content))
+
+    rows = list(reader)
+
+    assert reader.is_xlsx
+    assert rows == [
+        {"reg_no": "R-1", "name": "Ann Lee", "date_of_birth": "2004-05-06", "phone": "3001234567"},
+        {"reg_no": "R-2", "name": "Bo Kim", "date_of_birth": "", "phone": ""},
+    ]
+    assert reader.hexdigest() == hashlib.sha256(content).hexdigest()
+
+
+def test_student_import_accepts_xlsx(db, admin_user):
+    program = Program.objects.create(name="MBBS")
+    batch = Batch.objects.create(program=program, name="2029 Batch", start_year=2029)
+    Group.objects.create(batch=batch, name="Group A")
+    content = xlsx_bytes(
+        [
+            ["reg_no", "name", "program_name", "batch_name", "group_name", "status"],
+            ["R-1", "Ann Lee", "MBBS", "2029 Batch", "Group A", "active"],
+            ["R-2", "Bo Kim", "MBBS", "2029 Batch", "Group A", "active"],
+        ]
+    )
+
+    preview = StudentImportService.preview(SimpleUploadedFile("students.xlsx", content), admin_user)
+    assert (preview["total_rows"], preview["valid_rows"]) == (2, 2)
+
+    committed = StudentImportService.commit(preview["import_job_id"], admin_user)
+    assert (committed["status"], committed["created_count"]) == ("COMMITTED", 2)